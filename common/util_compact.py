@@ -0,0 +1,46 @@
+"""
+紧凑内存模式工具：行情与特征表的降精度/分类编码。
+
+数学原理：
+1. float32 有 24 位有效尾数（约 7 位十进制有效数字），价格与成交量的相对误差不超过 2^-24 ≈ 6e-8，
+   指标内部仍以 float64 计算，仅在存储时降为 float32。
+2. 重复取值的字符串列（股票代码/名称/市场）以分类编码存储：每行只占一个整数码，字符串只保存一份。
+3. 布尔信号列以 int8 存储（0/1），与 bool 同为 1 字节但可直接参与数值运算与拼接。
+"""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+PRICE_VOLUME_COLUMNS = ("open", "high", "low", "close", "adj_close", "volume", "amount")
+CATEGORY_COLUMNS = ("stock_code", "stock_name", "market")
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    float_columns: Optional[Iterable[str]] = None,
+    category_columns: Iterable[str] = CATEGORY_COLUMNS,
+) -> pd.DataFrame:
+    """
+    返回紧凑存储的副本：浮点列转 float32，分类列转 category，布尔列转 int8。
+
+    参数：
+    - float_columns: 需要转为 float32 的列（不存在的列忽略），为空时转换全部 float64 列
+    - category_columns: 需要分类编码的字符串列（不存在的列忽略）
+    """
+    data = df.copy()
+    if float_columns is None:
+        float_columns = [name for name in data.columns if data[name].dtype == np.float64]
+    for name in float_columns:
+        if name in data.columns:
+            data[name] = pd.to_numeric(data[name], errors="coerce").astype(np.float32)
+    for name in category_columns:
+        if name in data.columns and not isinstance(data[name].dtype, pd.CategoricalDtype):
+            data[name] = data[name].astype("category")
+    for name in data.columns:
+        if data[name].dtype == bool:
+            data[name] = data[name].astype(np.int8)
+    return data
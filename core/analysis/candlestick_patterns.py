@@ -1,6 +1,12 @@
 ﻿"""
 蜡烛图形态检测模块。
 基于 TA-Lib 识别常见形态（锤头线、晨星、吞没等）。
+
+全市场扫描：
+1. 每个标的只提取一次连续 float64 的 OHLC 数组，依次评估 TA-Lib 全部 CDL* 形态函数。
+2. 形态只依赖最近 lookback 根 K 线，日常扫描只取最后 N 根 + 最大 lookback 的尾部计算，结果不变。
+3. 数据目录下的 CSV 由进程池并行扫描，输出稀疏表（symbol, date, pattern, strength），仅保留非零信号；
+   单个文件读取或计算失败只记录错误，不中断其余标的的扫描。
 """
 
 
@@ -9,12 +15,24 @@ from __future__ import annotations
 # Front Code X
 
 # 第一组：Python 标准库
-from typing import Dict
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Union
 
 # 第二组：第三方库（按字母排序）
+import numpy as np
 import pandas as pd
 
 # 第三组：项目内部导入
+from common.logger import create_log
+from common.util_csv import load_stock_data
+
+logger = create_log("candlestick_patterns")
+
+SCAN_COLUMNS = ["symbol", "date", "pattern", "strength"]
+# 无法查询 lookback 时的保守尾部长度（TA-Lib 形态的 lookback 均远小于该值）
+_DEFAULT_LOOKBACK = 32
 
 def _require_talib():
     try:
@@ -25,7 +43,12 @@ def _require_talib():
 
 
 def _get_ohlc(df: pd.DataFrame):
-    return df["Open"].to_numpy(), df["High"].to_numpy(), df["Low"].to_numpy(), df["Close"].to_numpy()
+    """提取 open/high/low/close 连续 float64 数组，兼容首字母大写与小写列名。"""
+    arrays = []
+    for name in ("Open", "High", "Low", "Close"):
+        column = name if name in df.columns else name.lower()
+        arrays.append(np.ascontiguousarray(df[column].to_numpy(), dtype=np.float64))
+    return tuple(arrays)
 
 
 def detect_doji(df: pd.DataFrame) -> pd.Series:
@@ -75,3 +98,137 @@ def detect_patterns(df: pd.DataFrame) -> Dict[str, pd.Series]:
         "BeltHold": detect_belt_hold(df),
     }
 
+
+def cdl_function_names() -> List[str]:
+    """TA-Lib 全部 CDL* 形态函数名（排序）。"""
+    talib = _require_talib()
+    groups = getattr(talib, "get_function_groups", None)
+    names = groups().get("Pattern Recognition", []) if callable(groups) else []
+    if not isinstance(names, list) or not names:
+        names = [name for name in dir(talib) if name.startswith("CDL")]
+    return sorted(names)
+
+
+def _max_lookback(names: Sequence[str]) -> int:
+    try:
+        from talib import abstract  # type: ignore
+
+        return max((abstract.Function(name).lookback for name in names), default=0)
+    except Exception:  # pragma: no cover - 旧版 TA-Lib 或 mock
+        return _DEFAULT_LOOKBACK
+
+
+def scan_patterns(
+    df: pd.DataFrame,
+    patterns: Optional[Iterable[str]] = None,
+    last_n: Optional[int] = None,
+    symbol: str = "",
+) -> pd.DataFrame:
+    """
+    对单个标的评估全部（或指定的）CDL 形态，返回稀疏表。
+
+    参数：
+    - patterns: TA-Lib 形态函数名（如 "CDLDOJI"），为空时使用全部 CDL* 函数
+    - last_n: 只保留最后 N 根 K 线的信号（只计算所需尾部）
+    - symbol: 写入结果 symbol 列的标的代码
+
+    返回：
+    - 列为 symbol/date/pattern/strength 的 DataFrame，strength 为 TA-Lib 输出（±100/±200）
+    """
+    talib = _require_talib()
+    names = list(patterns) if patterns is not None else cdl_function_names()
+    if last_n is not None:
+        df = df.iloc[-(last_n + _max_lookback(names)):] if last_n > 0 else df.iloc[:0]
+    o, h, l, c = _get_ohlc(df)
+    first = max(len(df) - last_n, 0) if last_n is not None else 0
+
+    frames = []
+    for name in names:
+        strength = np.asarray(getattr(talib, name)(o, h, l, c))[first:]
+        hits = np.flatnonzero(strength)
+        if hits.size:
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "symbol": symbol,
+                        "date": df.index[first + hits],
+                        "pattern": name,
+                        "strength": strength[hits].astype(np.int16),
+                    }
+                )
+            )
+    if not frames:
+        return pd.DataFrame(columns=SCAN_COLUMNS)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _symbol_from_path(path: Path) -> str:
+    """数据文件名形如 {代码}_{名称}_{开始}_{结束}.csv，取代码部分。"""
+    return path.stem.split("_")[0]
+
+
+def _scan_file(path: str, patterns: Optional[List[str]], last_n: Optional[int]) -> pd.DataFrame:
+    return scan_patterns(load_stock_data(path), patterns, last_n, symbol=_symbol_from_path(Path(path)))
+
+
+def _scan_frame(symbol: str, df: pd.DataFrame, patterns: Optional[List[str]], last_n: Optional[int]) -> pd.DataFrame:
+    return scan_patterns(df, patterns, last_n, symbol=symbol)
+
+
+def scan_universe(
+    source: Union[str, os.PathLike, Mapping[str, pd.DataFrame]],
+    patterns: Optional[Iterable[str]] = None,
+    last_n: Optional[int] = None,
+    max_workers: Optional[int] = None,
+    file_pattern: str = "*.csv",
+) -> pd.DataFrame:
+    """
+    全市场形态扫描。
+
+    参数：
+    - source: 数据目录（递归匹配 file_pattern 的 K 线 CSV），或 {symbol: DataFrame}
+    - patterns: 形态函数名，为空时使用全部 CDL* 函数
+    - last_n: 只保留每个标的最后 N 根 K 线的信号（日常扫描）
+    - max_workers: 进程数，为 1 时在当前进程顺序执行
+
+    返回：
+    - 按 symbol/date/pattern 排序的稀疏表（symbol, date, pattern, strength）；
+      扫描失败的标的不中断整体扫描，记录在 result.attrs["errors"]（{文件路径或 symbol: 错误信息}）
+    """
+    names = list(patterns) if patterns is not None else cdl_function_names()
+    if isinstance(source, Mapping):
+        jobs = [(symbol, _scan_frame, (symbol, df, names, last_n)) for symbol, df in source.items()]
+    else:
+        paths = sorted(Path(source).rglob(file_pattern))
+        jobs = [(str(path), _scan_file, (str(path), names, last_n)) for path in paths]
+
+    frames = []
+    errors: Dict[str, str] = {}
+
+    def _record_error(key: str, exc: Exception) -> None:
+        logger.warning(f"形态扫描失败：{key} ({type(exc).__name__}: {exc})")
+        errors[key] = f"{type(exc).__name__}: {exc}"
+
+    if max_workers == 1 or len(jobs) <= 1:
+        for key, func, args in jobs:
+            try:
+                frames.append(func(*args))
+            except Exception as exc:
+                _record_error(key, exc)
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [(key, executor.submit(func, *args)) for key, func, args in jobs]
+            for key, future in futures:
+                try:
+                    frames.append(future.result())
+                except Exception as exc:
+                    _record_error(key, exc)
+
+    frames = [frame for frame in frames if not frame.empty]
+    if frames:
+        result = pd.concat(frames, ignore_index=True)
+        result = result.sort_values(["symbol", "date", "pattern"], kind="stable", ignore_index=True)
+    else:
+        result = pd.DataFrame(columns=SCAN_COLUMNS)
+    result.attrs["errors"] = errors
+    return result
@@ -6,17 +6,78 @@
 2. 统一输出用于信号层规则判断的数值。
 """
 
-from core.analysis.indicators.volume import VolumeIndicatorParams, compute_latest_volume_features, compute_volume_features
-from core.analysis.indicators.vcp import VCPParams, compute_vcp_features, evaluate_vcp
-from core.analysis.indicators.vcp_plus import VCPPlusParams, evaluate_vcp_plus
+from core.analysis.indicators.volume import (
+    VolumeFeatureGrid,
+    VolumeFeatureStream,
+    VolumeIndicatorParams,
+    compute_latest_volume_features,
+    compute_volume_feature_grid,
+    compute_volume_features,
+    compute_volume_signals,
+    truncate_volume_features,
+    volume_signal_warmup,
+)
+from core.analysis.indicators.extrema import local_extrema, local_extrema_mask
+from core.analysis.indicators.feature_cache import FeatureCache, FeatureCacheStats
+from core.analysis.indicators.registry import FeatureRegistry, clear_registries, get_registry
+from core.analysis.indicators.rolling import (
+    RollingExtreme,
+    kdj_smooth,
+    rolling_max,
+    rolling_mean,
+    rolling_min,
+    rolling_slope,
+    rolling_std,
+    rolling_sum,
+    rolling_var,
+    rsi_averages,
+)
+from core.analysis.indicators.swing import ContractionSummary, SwingPointTracker
+from core.analysis.indicators.vcp import VCPParams, compute_vcp_features, create_vcp_swing_tracker, evaluate_vcp
+from core.analysis.indicators.vcp_plus import (
+    VCPPlusParams,
+    create_vcp_plus_swing_tracker,
+    evaluate_vcp_plus,
+    evaluate_vcp_plus_grid,
+    evaluate_vcp_plus_series,
+)
 
 __all__ = [
+    "VolumeFeatureGrid",
+    "VolumeFeatureStream",
     "VolumeIndicatorParams",
     "compute_latest_volume_features",
+    "compute_volume_feature_grid",
     "compute_volume_features",
+    "compute_volume_signals",
+    "truncate_volume_features",
+    "volume_signal_warmup",
+    "local_extrema",
+    "local_extrema_mask",
+    "FeatureCache",
+    "FeatureCacheStats",
+    "FeatureRegistry",
+    "clear_registries",
+    "get_registry",
+    "RollingExtreme",
+    "kdj_smooth",
+    "rolling_max",
+    "rolling_mean",
+    "rolling_min",
+    "rolling_slope",
+    "rolling_std",
+    "rolling_sum",
+    "rolling_var",
+    "rsi_averages",
+    "ContractionSummary",
+    "SwingPointTracker",
     "VCPParams",
     "compute_vcp_features",
+    "create_vcp_swing_tracker",
     "evaluate_vcp",
     "VCPPlusParams",
+    "create_vcp_plus_swing_tracker",
     "evaluate_vcp_plus",
+    "evaluate_vcp_plus_grid",
+    "evaluate_vcp_plus_series",
 ]
@@ -0,0 +1,52 @@
+"""
+局部极值点（波段高低点）向量化识别模块。
+供 VCP、VCPPlus 与 VCP 筛选器共享，支持单序列与批量（标的 × K 线）输入。
+
+数学原理：
+1. 局部高点：arr[i] 等于以 i 为中心、半径 order 的完整窗口 [i-order, i+order] 内最大值；局部低点同理取最小值。
+2. 窗口用 sliding_window_view 构造（零拷贝视图），一次归约得到全部窗口极值，替代逐点 Python 循环。
+3. 并列取值均判为极值；缺失值两种口径：
+   - 严格（默认）：窗口含 NaN 即不成立（等价于 window.max() 与 np.all 判定）
+   - 忽略（ignore_nan=True）：按 np.nanmax/np.nanmin 判定，中心为 NaN 或窗口全为 NaN 时不成立
+"""
+
+from __future__ import annotations
+
+import numpy as np
+
+
+def local_extrema_mask(values: np.ndarray, order: int, mode: str, ignore_nan: bool = False) -> np.ndarray:
+    """
+    局部极值布尔标记，沿最后一维识别。
+
+    参数：
+    - values: 一维数组，或二维数组（行=标的，列=时间）
+    - order: 窗口半径（前后各 order 根）
+    - mode: "max" 识别高点，"min" 识别低点
+    - ignore_nan: 是否按 nanmax/nanmin 口径忽略缺失值
+
+    返回：
+    - 与 values 同形状的布尔数组，首尾 order 根（窗口不完整）恒为 False
+    """
+    if mode not in {"max", "min"}:
+        raise ValueError("mode 必须是 'max' 或 'min'")
+    arr = np.asarray(values, dtype=float)
+    mask = np.zeros(arr.shape, dtype=bool)
+    size = arr.shape[-1] if arr.ndim else 0
+    width = order * 2 + 1
+    if size < width:
+        return mask
+
+    source = arr
+    if ignore_nan:
+        fill = -np.inf if mode == "max" else np.inf
+        source = np.where(np.isnan(arr), fill, arr)
+    windows = np.lib.stride_tricks.sliding_window_view(source, width, axis=-1)
+    extreme = windows.max(axis=-1) if mode == "max" else windows.min(axis=-1)
+    mask[..., order : size - order] = arr[..., order : size - order] == extreme
+    return mask
+
+
+def local_extrema(values: np.ndarray, order: int, mode: str, ignore_nan: bool = False) -> np.ndarray:
+    """一维序列的局部极值索引（升序），序列长度不足 2*order+1 时返回空数组。"""
+    return np.flatnonzero(local_extrema_mask(values, order, mode, ignore_nan=ignore_nan))
@@ -0,0 +1,198 @@
+"""
+指标特征磁盘缓存。
+以（输入数据指纹, 指标类型, 参数, 代码版本）为键缓存整段特征表，数据与参数不变的重复回测直接读取结果。
+
+数学原理：
+1. 键 = BLAKE2b(代码版本 ‖ 指标类型 ‖ 参数 ‖ 各输入列的名称/类型/形状/字节)，
+   任一输入值、参数或指标源码变化都会得到不同的键，旧条目自然失效。
+2. 列式存储：每个特征列保存为 .npz 内的一个数组（无 pickle），读取后按原列顺序与类型还原。
+3. 容量上限：总字节数超过 max_bytes 时按最近访问时间（命中时刷新文件 mtime）淘汰最旧条目（LRU）。
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import functools
+import hashlib
+import os
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+_SUFFIX = ".npz"
+_INDEX_KEY = "__index__"
+_COLUMNS_KEY = "__columns__"
+
+
+@dataclass
+class FeatureCacheStats:
+    """缓存命中统计。"""
+
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+@functools.lru_cache(maxsize=None)
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as handle:
+        return hashlib.blake2b(handle.read(), digest_size=16).hexdigest()
+
+
+def source_version(paths: Iterable[str | Path]) -> str:
+    """若干源码文件内容的联合摘要，作为缓存键中的代码版本。"""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in sorted(str(Path(p).resolve()) for p in paths):
+        digest.update(_file_digest(path).encode())
+    return digest.hexdigest()
+
+
+def default_code_version(*extra_paths: str | Path) -> str:
+    """core/analysis/indicators 全部模块（加上调用方给出的源码文件）的代码版本。"""
+    package_dir = Path(__file__).resolve().parent
+    return source_version([*package_dir.glob("*.py"), *extra_paths])
+
+
+def _params_token(params: Any) -> str:
+    if dataclasses.is_dataclass(params) and not isinstance(params, type):
+        params = dataclasses.asdict(params)
+    if isinstance(params, Mapping):
+        return repr(sorted((str(key), repr(value)) for key, value in params.items()))
+    return repr(params)
+
+
+class FeatureCache:
+    """
+    特征表磁盘缓存（每个键一个 .npz 文件）。
+
+    参数：
+    - root: 缓存目录（不存在时首次写入自动创建）
+    - max_bytes: 缓存总字节上限，超出后按 LRU 淘汰
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int = 256 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.stats = FeatureCacheStats()
+
+    def make_key(
+        self,
+        kind: str,
+        params: Any,
+        inputs: Mapping[str, np.ndarray],
+        code_version: Optional[str] = None,
+    ) -> str:
+        """
+        计算缓存键。
+
+        参数：
+        - kind: 指标类型标识（通常为指标类的限定名）
+        - params: 冻结参数 dataclass 或参数字典
+        - inputs: 参与计算的输入列（名称 -> 数组），内容即数据指纹
+        - code_version: 代码版本，默认取 default_code_version()
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update((code_version or default_code_version()).encode())
+        digest.update(kind.encode())
+        digest.update(_params_token(params).encode())
+        for name in sorted(inputs):
+            values = np.ascontiguousarray(inputs[name])
+            digest.update(f"{name}|{values.dtype.str}|{values.shape}".encode())
+            digest.update(values.tobytes())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}{_SUFFIX}"
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """读取缓存特征表，未命中（或文件损坏）返回 None。"""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                columns = [str(name) for name in stored[_COLUMNS_KEY]]
+                frame = pd.DataFrame(
+                    {name: stored[f"c{i}"] for i, name in enumerate(columns)},
+                    index=pd.Index(stored[_INDEX_KEY]),
+                    columns=columns,
+                )
+            os.utime(path)
+        except (OSError, KeyError, ValueError):
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return frame
+
+    def put(self, key: str, frame: pd.DataFrame) -> None:
+        """写入特征表（仅支持数值/布尔列），随后按容量上限淘汰旧条目。"""
+        arrays = {f"c{i}": frame[name].to_numpy() for i, name in enumerate(frame.columns)}
+        if any(values.dtype == object for values in arrays.values()):
+            raise TypeError("特征缓存仅支持数值与布尔列")
+        arrays[_COLUMNS_KEY] = np.array([str(name) for name in frame.columns])
+        arrays[_INDEX_KEY] = frame.index.to_numpy()
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        # 先写临时文件再原子替换，避免并发进程读到半截文件
+        temp = self.root / f".{key}.{uuid.uuid4().hex}.tmp"
+        with open(temp, "wb") as handle:
+            np.savez(handle, **arrays)
+        os.replace(temp, self._path(key))
+        self.stats.writes += 1
+        self._evict()
+
+    def get_or_compute(
+        self,
+        kind: str,
+        params: Any,
+        inputs: Mapping[str, np.ndarray],
+        compute: Callable[[], pd.DataFrame],
+        code_version: Optional[str] = None,
+    ) -> pd.DataFrame:
+        """命中则直接返回缓存结果，否则调用 compute() 计算并写入缓存。"""
+        key = self.make_key(kind, params, inputs, code_version)
+        frame = self.get(key)
+        if frame is None:
+            frame = compute()
+            self.put(key, frame)
+        return frame
+
+    def size_bytes(self) -> int:
+        """当前缓存占用的总字节数。"""
+        return sum(entry.stat().st_size for entry in self.root.glob(f"*{_SUFFIX}"))
+
+    def clear(self) -> None:
+        """删除全部缓存条目。"""
+        for entry in self.root.glob(f"*{_SUFFIX}"):
+            entry.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        self.stats.evictions += _evict_lru(self.root, _SUFFIX, self.max_bytes)
+
+
+def _evict_lru(root: Path, suffix: str, max_bytes: int) -> int:
+    """root 下后缀为 suffix 的条目总字节数超过 max_bytes 时，按修改时间从旧到新删除，返回删除条目数。"""
+    entries = []
+    for entry in root.glob(f"*{suffix}"):
+        try:
+            stat = entry.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime_ns, stat.st_size, entry))
+    total = sum(size for _, size, _ in entries)
+    evicted = 0
+    for _, size, entry in sorted(entries, key=lambda item: item[0]):
+        if total <= max_bytes:
+            break
+        entry.unlink(missing_ok=True)
+        total -= size
+        evicted += 1
+    return evicted
@@ -0,0 +1,241 @@
+"""
+单标的特征注册表（计算图）。
+同一标的的同一段数据被多个指标/筛选器使用时，MA50/150/200、52 周高低点、成交量均线等命名序列只计算一次。
+
+数学原理：
+1. 每个节点是一条与原始数据等长的全历史序列，名称即其定义（如 sma(close,200)、slope(sma(close,200),20)），
+   节点依赖其他节点或原始列，构成有向无环图；同名节点只计算一次，之后直接复用。
+2. 回溯窗口视图：滚动类节点在位置 t 只依赖 [t-warmup, t] 的数据，warmup 沿依赖链累加
+   （sma/rolling 为 window-1，slope 再加 window-1）。对 df.tail(lookback) 重新计算的结果
+   等于全历史节点的最后 lookback 项、并把前 warmup 项置为 NaN，因此截取即可复现逐窗口计算。
+3. 进程级共享：get_registry(symbol, df) 按标的保存注册表，输入列（high/low/close/volume）的内容指纹
+   与已有注册表一致时直接复用，bt 指标与筛选器在同一标的上共享节点；历史被修订或追加 bar 后指纹变化，按新数据重建。
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import Counter, OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from core.analysis.indicators.rolling import rolling_max, rolling_mean, rolling_min, rolling_slope
+
+
+class FeatureRegistry:
+    """
+    单标的特征注册表：节点按名称缓存，记录每个节点被请求的次数。
+
+    参数：
+    - df: 该标的的完整 K 线数据（列名大小写不敏感）
+    - symbol: 标的代码（仅用于标识）
+    """
+
+    def __init__(self, df: pd.DataFrame, symbol: str | None = None):
+        self.df = df
+        self.symbol = symbol
+        self.size = len(df)
+        self._values: Dict[str, np.ndarray] = {}
+        self._warmup: Dict[str, int] = {}
+        self.usage: Counter = Counter()
+        self._inputs = list(df.columns)
+        self._fingerprint: Optional[str] = None
+
+    # ========== 节点存取 ==========
+    def _column(self, name: str) -> np.ndarray:
+        for candidate in (name, name.lower(), name.upper(), name.capitalize()):
+            if candidate in self.df.columns:
+                return self.df[candidate].to_numpy(dtype=float)
+        raise KeyError(f"缺少列: {name}")
+
+    def node(self, name: str, compute: Callable[[], np.ndarray], warmup: int = 0) -> str:
+        """
+        注册（或复用）名为 name 的节点，返回节点名。
+
+        compute 只在节点首次出现时调用；warmup 为该节点相对原始数据的预热长度。
+        """
+        self.usage[name] += 1
+        if name not in self._values:
+            values = np.asarray(compute(), dtype=float)
+            if values.shape != (self.size,):
+                raise ValueError(f"节点 {name} 长度应为 {self.size}，实际为 {values.shape}")
+            self._values[name] = values
+            self._warmup[name] = warmup
+        return name
+
+    def _source(self, source: str) -> str:
+        """原始列注册为 warmup=0 的叶子节点（不计入复用统计）。"""
+        if source not in self._values:
+            self._values[source] = self._column(source)
+            self._warmup[source] = 0
+        return source
+
+    def values(self, name: str, lookback: Optional[int] = None) -> np.ndarray:
+        """
+        节点取值（只读视图）。
+
+        lookback 不为空时返回回溯窗口视图：最后 lookback 项，前 warmup 项置为 NaN，
+        与对 df.tail(lookback) 重新计算的结果一致。
+        """
+        values = self._values[name]
+        if lookback is None:
+            view = values.view()
+            view.flags.writeable = False
+            return view
+        lookback = min(lookback, self.size)
+        tail = values[self.size - lookback :].copy()
+        tail[: min(self._warmup[name], lookback)] = np.nan
+        return tail
+
+    def last(self, name: str, lookback: Optional[int] = None, offset: int = 1) -> float:
+        """回溯窗口视图的倒数第 offset 项。"""
+        return self.values(name, lookback)[-offset]
+
+    # ========== 常用节点 ==========
+    def sma(self, source: str, window: int) -> str:
+        """简单移动平均 sma(source,window)。"""
+        source = self._source(source)
+        return self.node(
+            f"sma({source},{window})",
+            lambda: rolling_mean(self._values[source], window),
+            self._warmup[source] + window - 1,
+        )
+
+    def rolling_min(self, source: str, window: int) -> str:
+        """滚动最小值 rolling_min(source,window)。"""
+        source = self._source(source)
+        return self.node(
+            f"rolling_min({source},{window})",
+            lambda: rolling_min(self._values[source], window),
+            self._warmup[source] + window - 1,
+        )
+
+    def rolling_max(self, source: str, window: int) -> str:
+        """滚动最大值 rolling_max(source,window)。"""
+        source = self._source(source)
+        return self.node(
+            f"rolling_max({source},{window})",
+            lambda: rolling_max(self._values[source], window),
+            self._warmup[source] + window - 1,
+        )
+
+    def slope(self, source: str, window: int) -> str:
+        """滚动线性回归斜率 slope(source,window)。"""
+        source = self._source(source)
+        return self.node(
+            f"slope({source},{window})",
+            lambda: rolling_slope(self._values[source], window),
+            self._warmup[source] + window - 1,
+        )
+
+    def ratio(self, numerator: str, denominator: str) -> str:
+        """逐点比值 ratio(numerator,denominator)，分母为 0 时记为 NaN。"""
+        numerator = self._source(numerator)
+        denominator = self._source(denominator)
+
+        def compute() -> np.ndarray:
+            den = self._values[denominator]
+            return self._values[numerator] / np.where(den == 0, np.nan, den)
+
+        return self.node(
+            f"ratio({numerator},{denominator})",
+            compute,
+            max(self._warmup[numerator], self._warmup[denominator]),
+        )
+
+    # ========== 复用情况 ==========
+    def nodes(self) -> List[str]:
+        """已计算的节点名（按首次注册顺序，不含原始列）。"""
+        return list(self.usage)
+
+    def reused(self) -> Dict[str, int]:
+        """被复用过的节点及其复用次数（请求次数 - 1）。"""
+        return {name: count - 1 for name, count in self.usage.items() if count > 1}
+
+    def matches(self, df: pd.DataFrame) -> bool:
+        """df 与注册表是否对应同一段数据：长度相同且注册表输入列的内容指纹一致（列名大小写不敏感）。"""
+        if df is self.df:
+            return True
+        if self._fingerprint is None:
+            self._fingerprint = _fingerprint(self.df, self._inputs)
+        return len(df) == self.size and _fingerprint(df, self._inputs) == self._fingerprint
+
+    def check(self, df: pd.DataFrame) -> None:
+        """
+        确认 df 与注册表对应同一段数据，否则抛出 ValueError。
+
+        比较注册表输入列的内容指纹（长度 + 各列取值哈希），df 可额外带有派生列、列名大小写可不同。
+        """
+        if not self.matches(df):
+            raise ValueError(f"数据与注册表的输入列不一致（标的 {self.symbol}，数据长度 {len(df)}，注册表长度 {self.size}）")
+
+    def adopt(self, df: pd.DataFrame) -> bool:
+        """
+        供同一标的的另一使用方复用：df 与注册表对应同一段数据、且与已并入的附加列取值相同时，
+        把 df 中注册表尚未包含的列（如基准收盘价）并入供节点读取并返回 True，否则返回 False。
+        """
+        if not self.matches(df):
+            return False
+        known = {str(col).lower(): col for col in self.df.columns}
+        inputs = {str(col).lower() for col in self._inputs}
+        extra = {}
+        for col in df.columns:
+            name = str(col).lower()
+            if name in inputs:
+                continue
+            if name not in known:
+                extra[str(col)] = df[col].to_numpy()
+            elif _fingerprint(df, [col]) != _fingerprint(self.df, [known[name]]):
+                return False
+        if extra:
+            self.df = self.df.assign(**extra)
+        return True
+
+
+def _fingerprint(df: pd.DataFrame, columns: Iterable[str]) -> Optional[str]:
+    """按列名（大小写不敏感）取出 columns 并对其内容做哈希，缺列时返回 None。"""
+    lookup = {str(col).lower(): col for col in df.columns}
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(len(df)).encode())
+    for name in columns:
+        col = lookup.get(str(name).lower())
+        if col is None:
+            return None
+        digest.update(str(name).lower().encode())
+        digest.update(pd.util.hash_pandas_object(df[col], index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+# 进程级共享注册表的输入列：其余列（开盘价、基准收盘价等）作为附加列并入，不参与数据指纹
+SHARED_INPUT_COLUMNS = ("high", "low", "close", "volume")
+MAX_SHARED_REGISTRIES = 64
+
+_shared_registries: "OrderedDict[str, FeatureRegistry]" = OrderedDict()
+
+
+def get_registry(symbol: str | None, df: pd.DataFrame) -> FeatureRegistry:
+    """
+    进程级按标的取特征注册表，同一标的的同一段数据在 bt 指标与筛选器之间共享节点。
+
+    已保存的注册表与 df 对应同一段数据时直接复用（见 FeatureRegistry.adopt），否则按 df 重建并替换；
+    symbol 为空时返回不共享的新注册表。最多保留 MAX_SHARED_REGISTRIES 个标的，超出后淘汰最久未使用的。
+    """
+    if not symbol:
+        return FeatureRegistry(df)
+    registry = _shared_registries.get(symbol)
+    if registry is None or not registry.adopt(df):
+        inputs = [col for col in df.columns if str(col).lower() in SHARED_INPUT_COLUMNS] or list(df.columns)
+        registry = FeatureRegistry(df[inputs], symbol=symbol)
+        registry.adopt(df)
+        _shared_registries[symbol] = registry
+    _shared_registries.move_to_end(symbol)
+    while len(_shared_registries) > MAX_SHARED_REGISTRIES:
+        _shared_registries.popitem(last=False)
+    return registry
+
+
+def clear_registries() -> None:
+    """清空进程级共享注册表。"""
+    _shared_registries.clear()
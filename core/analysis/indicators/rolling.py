@@ -0,0 +1,439 @@
+"""
+滚动窗口统计基础函数（NumPy 实现）。
+供 core/analysis 下的指标与筛选模块共享，避免逐窗口调用 Python 函数的 rolling.apply。
+
+数学原理：
+1. 滚动最小二乘斜率：窗口内 x = 1..m，斜率 = (m·Σxy - Σx·Σy) / (m·Σx² - (Σx)²)，
+   其中 Σx、Σx² 为闭式，Σy 与 Σxy 由前缀和相减得到，整体 O(N)。
+2. 数值稳定：前缀和按不小于窗口长度的分块重新起算，并先减去首个有效值（斜率对平移不变），
+   使误差不随序列长度累积。
+3. 缺失值：NaN 在求和中按 0 处理（与 np.nansum 一致），有效值个数不足 min_periods 的窗口输出 NaN；
+   ±inf 与 pandas rolling 一致视为缺失值。
+4. 滚动最大/最小（批量）：按窗口长度分块，块内前缀极值与后缀极值各一次累积，
+   窗口 [i-w+1, i] 的极值 = max(后缀[i-w+1], 前缀[i])，整体 O(N)（van Herk / Gil-Werman）。
+5. 滚动最大/最小（增量）：单调双端队列只保留可能成为极值的候选，每次更新摊还 O(1)。
+6. 滚动和/均值：补偿前缀和（double-double）P = hi + lo，每步用 TwoSum 取回加法的舍入误差
+   s = a + b，err = (a - (s - b')) + (b - b')（b' = s - a），窗口和 = P[i] - P[i-w] 再舍入一次，
+   结果即窗口真实和的就近舍入（与 pandas 的 Kahan 累加一致），均值 = 和 / n；
+   窗口内有效值全部相等时均值直接取该值（与 pandas 同值窗口的特判一致），rolling_mean(x, 1) == x。
+7. 滚动方差：分块前缀和求 Σ(x-c)、Σ(x-c)²，c 取所在块有效值均值；
+   跨块窗口把前一块尾部换算到当前块参考值：Σ(x-c₂)² = Σ(x-c₁)² + 2δΣ(x-c₁) + kδ²（δ = c₁-c₂），
+   方差 = Σ(x-c)²/n - (Σ(x-c)/n)²，参考值贴近数据，避免 E[x²]-E[x]² 的大数相消；同值窗口方差记为 0。
+8. RSI 涨跌均值：delta = x_t - x_{t-1}，涨幅 = max(delta, 0)、跌幅 = max(-delta, 0) 各取滚动均值；
+   KDJ 平滑：K = MA(RSV, 3)，D = MA(K, 3)，J = 3K - 2D。
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Optional
+
+import numpy as np
+
+_BLOCK_SIZE = 64
+
+
+def _block_prefix(values: np.ndarray, block: int) -> np.ndarray:
+    """按分块计算前缀和：返回形状 (rows, blocks, block + 1)，第 0 列为 0。"""
+    rows, size = values.shape
+    pad = (-size) % block
+    padded = np.pad(values, ((0, 0), (0, pad)))
+    blocks = padded.reshape(rows, -1, block)
+    prefix = np.zeros((rows, blocks.shape[1], block + 1), dtype=float)
+    np.cumsum(blocks, axis=2, out=prefix[:, :, 1:])
+    return prefix
+
+
+def rolling_slope(values: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    滚动线性回归斜率，等价于 rolling(window, min_periods).apply(_trend_value, raw=True)。
+
+    参数：
+    - values: 一维数组，或二维数组（行=标的，列=时间，沿最后一维滚动）
+    - window: 窗口长度
+    - min_periods: 窗口内最少有效值个数（默认等于 window）；不足 window 的前段窗口按实际长度回归
+
+    返回：
+    - 与 values 同形状的斜率数组
+    """
+    if window < 1:
+        raise ValueError("window 必须为正整数")
+    if min_periods is None:
+        min_periods = window
+
+    y = np.asarray(values, dtype=float)
+    shape = y.shape
+    y = y.reshape(-1, shape[-1]) if y.ndim > 1 else y.reshape(1, -1)
+    rows, size = y.shape
+    if size == 0:
+        return np.empty(shape, dtype=float)
+
+    valid = np.isfinite(y)
+    # 斜率对整体平移不变：减去首个有效值降低前缀和量级；NaN 按 0 计入，平移后为 -ref
+    first = np.argmax(valid, axis=1)
+    ref = np.where(valid.any(axis=1), y[np.arange(rows), first], 0.0)[:, None]
+    centered = np.where(valid, y - ref, -ref)
+
+    block = max(window, _BLOCK_SIZE)
+    local = np.arange(block, dtype=float)
+    prefix_y = _block_prefix(centered, block)
+    prefix_py = _block_prefix(centered * np.resize(local, size), block)
+    prefix_count = np.concatenate([np.zeros((rows, 1), dtype=int), np.cumsum(valid, axis=1)], axis=1)
+
+    end = np.arange(size)
+    length = np.minimum(end + 1, window)
+    start = end + 1 - length
+    end_block, end_local = np.divmod(end, block)
+    start_block, start_local = np.divmod(start, block)
+    same = start_block == end_block
+
+    # 当前块内部分：[max(start, 块起点), end]
+    head = np.where(same, start_local, 0)
+    sum_y = prefix_y[:, end_block, end_local + 1] - prefix_y[:, end_block, head]
+    sum_py = prefix_py[:, end_block, end_local + 1] - prefix_py[:, end_block, head]
+    sum_xy = sum_py + (end_block * block - start + 1) * sum_y
+
+    # 跨块时加上前一块的尾部：[start, 前一块终点]
+    tail_y = np.where(same, 0.0, prefix_y[:, start_block, block] - prefix_y[:, start_block, start_local])
+    tail_py = np.where(same, 0.0, prefix_py[:, start_block, block] - prefix_py[:, start_block, start_local])
+    sum_y = sum_y + tail_y
+    sum_xy = sum_xy + tail_py + (start_block * block - start + 1) * tail_y
+
+    sum_x = length * (length + 1) / 2.0
+    denominator = length * length * (length * length - 1) / 12.0
+    numerator = length * sum_xy - sum_x * sum_y
+    slope = np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator != 0)
+
+    count = prefix_count[:, end + 1] - prefix_count[:, start]
+    slope[count < min_periods] = np.nan
+    return slope.reshape(shape)
+
+
+def _as_rows(values: np.ndarray) -> tuple[np.ndarray, tuple]:
+    y = np.asarray(values, dtype=float)
+    shape = y.shape
+    return (y.reshape(math.prod(shape[:-1]), shape[-1]) if y.ndim > 1 else y.reshape(1, -1)), shape
+
+
+def _rolling_extreme(values: np.ndarray, window: int, min_periods: Optional[int], mode: str) -> np.ndarray:
+    if window < 1:
+        raise ValueError("window 必须为正整数")
+    if mode not in {"max", "min"}:
+        raise ValueError("mode 必须是 'max' 或 'min'")
+    if min_periods is None:
+        min_periods = window
+
+    y, shape = _as_rows(values)
+    rows, size = y.shape
+    if size == 0:
+        return np.empty(shape, dtype=float)
+
+    valid = np.isfinite(y)
+    fill = -np.inf if mode == "max" else np.inf
+    combine = np.maximum if mode == "max" else np.minimum
+    pad = (-size) % window
+    blocks = np.pad(np.where(valid, y, fill), ((0, 0), (0, pad)), constant_values=fill).reshape(rows, -1, window)
+    prefix = combine.accumulate(blocks, axis=2).reshape(rows, -1)
+    suffix = combine.accumulate(blocks[:, :, ::-1], axis=2)[:, :, ::-1].reshape(rows, -1)
+
+    end = np.arange(size)
+    start = np.maximum(end - window + 1, 0)
+    result = np.where(start == 0, prefix[:, end], combine(suffix[:, start], prefix[:, end]))
+
+    prefix_count = np.concatenate([np.zeros((rows, 1), dtype=int), np.cumsum(valid, axis=1)], axis=1)
+    count = prefix_count[:, end + 1] - prefix_count[:, start]
+    result[count < max(min_periods, 1)] = np.nan
+    return result.reshape(shape)
+
+
+def rolling_max(values: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    滚动最大值，等价于 pd.Series.rolling(window, min_periods).max()。
+
+    values 可为一维数组或二维数组（行=标的，列=时间，沿最后一维滚动）；min_periods 默认等于 window。
+    """
+    return _rolling_extreme(values, window, min_periods, "max")
+
+
+def rolling_min(values: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    滚动最小值，等价于 pd.Series.rolling(window, min_periods).min()。
+
+    values 可为一维数组或二维数组（行=标的，列=时间，沿最后一维滚动）；min_periods 默认等于 window。
+    """
+    return _rolling_extreme(values, window, min_periods, "min")
+
+
+class RollingExtreme:
+    """
+    增量滚动最大/最小值：逐个 push 新值，value() 返回与 rolling_max/rolling_min 最后一项相同的结果。
+
+    单调队列保存 (位置, 数值) 候选，队首即窗口极值；缺失值（NaN/±inf）只记录位置用于计数。
+    """
+
+    def __init__(self, window: int, mode: str, min_periods: Optional[int] = None):
+        if window < 1:
+            raise ValueError("window 必须为正整数")
+        if mode not in {"max", "min"}:
+            raise ValueError("mode 必须是 'max' 或 'min'")
+        self.window = window
+        self.mode = mode
+        self.min_periods = window if min_periods is None else min_periods
+        self.count = 0
+        self.missing_positions: deque = deque()
+        self.candidates: deque = deque()
+
+    def push(self, value: float) -> None:
+        position = self.count
+        self.count += 1
+        if not math.isfinite(value):
+            self.missing_positions.append(position)
+        else:
+            if self.mode == "max":
+                while self.candidates and self.candidates[-1][1] <= value:
+                    self.candidates.pop()
+            else:
+                while self.candidates and self.candidates[-1][1] >= value:
+                    self.candidates.pop()
+            self.candidates.append((position, value))
+        oldest = self.count - self.window
+        while self.candidates and self.candidates[0][0] < oldest:
+            self.candidates.popleft()
+        while self.missing_positions and self.missing_positions[0] < oldest:
+            self.missing_positions.popleft()
+
+    def value(self) -> float:
+        observed = min(self.count, self.window) - len(self.missing_positions)
+        if observed < max(self.min_periods, 1) or not self.candidates:
+            return math.nan
+        return self.candidates[0][1]
+
+
+def _window_moments(values: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, tuple]:
+    """
+    滚动窗口的一、二阶矩（相对窗口末端所在块的参考值）。
+
+    返回：
+    - (count, s1, s2, ref, shape)：有效值个数、Σ(x-ref)、Σ(x-ref)²、参考值，形状均为 (rows, size)
+    """
+    if window < 1:
+        raise ValueError("window 必须为正整数")
+    y, shape = _as_rows(values)
+    rows, size = y.shape
+    valid = np.isfinite(y)
+
+    block = max(window, _BLOCK_SIZE)
+    pad = (-size) % block
+    blocks = np.pad(np.where(valid, y, 0.0), ((0, 0), (0, pad))).reshape(rows, -1, block)
+    block_valid = np.pad(valid, ((0, 0), (0, pad))).reshape(rows, -1, block)
+    block_count = block_valid.sum(axis=2)
+    ref = np.divide(blocks.sum(axis=2), block_count, out=np.zeros(block_count.shape), where=block_count > 0)
+    deviation = np.where(block_valid, blocks - ref[:, :, None], 0.0)
+
+    prefix_1 = np.zeros((rows, blocks.shape[1], block + 1), dtype=float)
+    prefix_2 = np.zeros_like(prefix_1)
+    prefix_c = np.zeros((rows, blocks.shape[1], block + 1), dtype=int)
+    np.cumsum(deviation, axis=2, out=prefix_1[:, :, 1:])
+    np.cumsum(deviation * deviation, axis=2, out=prefix_2[:, :, 1:])
+    np.cumsum(block_valid, axis=2, out=prefix_c[:, :, 1:])
+
+    end = np.arange(size)
+    start = np.maximum(end - window + 1, 0)
+    end_block, end_local = np.divmod(end, block)
+    start_block, start_local = np.divmod(start, block)
+    same = start_block == end_block
+
+    # 当前块内部分：[max(start, 块起点), end]
+    head = np.where(same, start_local, 0)
+    count = prefix_c[:, end_block, end_local + 1] - prefix_c[:, end_block, head]
+    s1 = prefix_1[:, end_block, end_local + 1] - prefix_1[:, end_block, head]
+    s2 = prefix_2[:, end_block, end_local + 1] - prefix_2[:, end_block, head]
+
+    # 跨块时前一块尾部 [start, 前一块终点]，换算到当前块参考值
+    tail_c = np.where(same, 0, prefix_c[:, start_block, block] - prefix_c[:, start_block, start_local])
+    tail_1 = np.where(same, 0.0, prefix_1[:, start_block, block] - prefix_1[:, start_block, start_local])
+    tail_2 = np.where(same, 0.0, prefix_2[:, start_block, block] - prefix_2[:, start_block, start_local])
+    delta = ref[:, start_block] - ref[:, end_block]
+    count = count + tail_c
+    s1 = s1 + tail_1 + tail_c * delta
+    s2 = s2 + tail_2 + 2 * delta * tail_1 + tail_c * delta * delta
+    return count, s1, s2, ref[:, end_block], shape
+
+
+def _two_sum(a: np.ndarray, b: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """无误差加法：返回 (s, err)，s = fl(a + b)，s + err 精确等于 a + b。"""
+    total = a + b
+    b_virtual = total - a
+    return total, (a - (total - b_virtual)) + (b - b_virtual)
+
+
+def _compensated_prefix(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    补偿前缀和（包含当前项）：返回 (hi, lo)，hi + lo 为前缀和的 double-double 近似。
+
+    按 _BLOCK_SIZE 分块，块内逐列 TwoSum 累加（各块同时向量化推进）；块总和的前缀递归求得后平移到块内。
+    """
+    rows, size = values.shape
+    block = _BLOCK_SIZE
+    pad = (-size) % block
+    blocks = np.pad(values, ((0, 0), (0, pad))).reshape(rows, -1, block)
+    hi = np.empty(blocks.shape, dtype=float)
+    lo = np.empty(blocks.shape, dtype=float)
+    total = np.zeros(blocks.shape[:2], dtype=float)
+    error = np.zeros(blocks.shape[:2], dtype=float)
+    for column in range(block):
+        total, err = _two_sum(total, blocks[:, :, column])
+        error = error + err
+        hi[:, :, column] = total
+        lo[:, :, column] = error
+
+    if blocks.shape[1] > 1:
+        # 各块起点的偏移 = 之前所有块总和（本身再做一次补偿前缀和）
+        offset_hi, offset_lo = _compensated_prefix(hi[:, :, -1])
+        offset_lo = offset_lo + np.cumsum(lo[:, :, -1], axis=1)
+        offset_hi = np.concatenate([np.zeros((rows, 1)), offset_hi[:, :-1]], axis=1)[:, :, None]
+        offset_lo = np.concatenate([np.zeros((rows, 1)), offset_lo[:, :-1]], axis=1)[:, :, None]
+        hi, err = _two_sum(offset_hi, hi)
+        lo = lo + offset_lo + err
+    return hi.reshape(rows, -1)[:, :size], lo.reshape(rows, -1)[:, :size]
+
+
+def _two_prod(a: np.ndarray, b: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """无误差乘法（Veltkamp 拆分 + Dekker）：返回 (p, err)，p = fl(a·b)，p + err 精确等于 a·b。"""
+    product = a * b
+    a_hi, a_lo = _split(a)
+    b_hi, b_lo = _split(b)
+    return product, ((a_hi * b_hi - product) + a_hi * b_lo + a_lo * b_hi) + a_lo * b_lo
+
+
+def _split(a: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    scaled = 134217729.0 * a  # 2^27 + 1
+    hi = scaled - (scaled - a)
+    return hi, a - hi
+
+
+def _window_sums(values: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    滚动窗口有效值个数与和（补偿前缀和相减）。
+
+    返回：
+    - (y, count, head, tail)：二维化输入、有效值个数、窗口和的就近舍入值及其余项（head + tail 为 double-double 和），
+      形状均为 (rows, size)
+    """
+    if window < 1:
+        raise ValueError("window 必须为正整数")
+    y, _ = _as_rows(values)
+    rows, size = y.shape
+    valid = np.isfinite(y)
+    hi, lo = _compensated_prefix(np.where(valid, y, 0.0))
+    hi = np.concatenate([np.zeros((rows, 1)), hi], axis=1)
+    lo = np.concatenate([np.zeros((rows, 1)), lo], axis=1)
+    prefix_count = np.concatenate([np.zeros((rows, 1), dtype=int), np.cumsum(valid, axis=1)], axis=1)
+
+    end = np.arange(1, size + 1)
+    start = np.maximum(end - window, 0)
+    partial, err = _two_sum(hi[:, end], -hi[:, start])
+    err = err + (lo[:, end] - lo[:, start])
+    head = partial + err
+    tail = err - (head - partial)
+    count = prefix_count[:, end] - prefix_count[:, start]
+    return y, count, head, tail
+
+
+def _constant_windows(y: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """窗口内有效值是否全部相等（无有效值时为 False），以及窗口最大值。"""
+    highest = _rolling_extreme(y, window, 1, "max")
+    return highest == _rolling_extreme(y, window, 1, "min"), highest
+
+
+def rolling_sum(values: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    滚动求和，等价于 pd.Series.rolling(window, min_periods).sum()。
+
+    values 可为一维数组或二维数组（行=标的，列=时间，沿最后一维滚动）；min_periods 默认等于 window。
+    """
+    if min_periods is None:
+        min_periods = window
+    shape = np.shape(values)
+    _, count, total, _ = _window_sums(values, window)
+    total[count < min_periods] = np.nan
+    return total.reshape(shape)
+
+
+def rolling_mean(values: np.ndarray, window: int, min_periods: Optional[int] = None) -> np.ndarray:
+    """
+    滚动均值，等价于 pd.Series.rolling(window, min_periods).mean()。
+
+    values 可为一维数组或二维数组（行=标的，列=时间，沿最后一维滚动）；min_periods 默认等于 window。
+    """
+    if min_periods is None:
+        min_periods = window
+    shape = np.shape(values)
+    y, count, head, tail = _window_sums(values, window)
+    enough = count >= max(min_periods, 1)
+    n = count[enough].astype(float)
+    head, tail = head[enough], tail[enough]
+    # 商 q = head / n 后用余项 (head + tail - q·n) / n 修正一次，得到 Σx / n 的就近舍入
+    quotient = head / n
+    product, err = _two_prod(quotient, n)
+    result = np.full(count.shape, np.nan)
+    result[enough] = quotient + (((head - product) - err) + tail) / n
+    # 同值窗口直接取该值，不经过 n·x / n 的两次舍入
+    constant, value = _constant_windows(y, window)
+    constant &= enough
+    result[constant] = value[constant]
+    return result.reshape(shape)
+
+
+def rolling_var(values: np.ndarray, window: int, min_periods: Optional[int] = None, ddof: int = 0) -> np.ndarray:
+    """
+    滚动方差，等价于 pd.Series.rolling(window, min_periods).var(ddof=ddof)。
+
+    注意 ddof 默认为 0（总体方差，与本项目布林带/量能波动口径一致），而非 pandas 默认的 1。
+    """
+    if min_periods is None:
+        min_periods = window
+    count, s1, s2, _, shape = _window_moments(values, window)
+    enough = (count >= max(min_periods, 1)) & (count > ddof)
+    result = np.full(count.shape, np.nan)
+    n = count[enough]
+    mean = s1[enough] / n
+    result[enough] = np.maximum(s2[enough] / n - mean * mean, 0.0) * n / (n - ddof)
+    # 单个有效值或同值窗口的方差恒为 0，不受前缀和相减的舍入误差影响
+    constant, _ = _constant_windows(_as_rows(values)[0], window)
+    result[enough & ((count == 1) | constant)] = 0.0
+    return result.reshape(shape)
+
+
+def rolling_std(values: np.ndarray, window: int, min_periods: Optional[int] = None, ddof: int = 0) -> np.ndarray:
+    """滚动标准差，等价于 pd.Series.rolling(window, min_periods).std(ddof=ddof)，ddof 默认 0。"""
+    return np.sqrt(rolling_var(values, window, min_periods, ddof))
+
+
+def rsi_averages(
+    values: np.ndarray, window: int, min_periods: Optional[int] = None, missing_as_zero: bool = False
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    RSI 的平均涨幅与平均跌幅（简单移动平均口径）。
+
+    等价于 delta = s.diff()；delta.clip(lower=0) 与 -delta.clip(upper=0) 分别 rolling(window, min_periods).mean()。
+    首根 K 线无前值，delta 为 NaN，默认按缺失值计数；missing_as_zero=True 时缺失的 delta 记为 0
+    （等价于 delta.where(delta > 0, 0.0) 写法）。
+    """
+    y, shape = _as_rows(values)
+    delta = np.full(y.shape, np.nan)
+    delta[:, 1:] = y[:, 1:] - y[:, :-1]
+    missing = 0.0 if missing_as_zero else np.nan
+    up = np.where(delta > 0, delta, np.where(np.isnan(delta), missing, 0.0))
+    down = np.where(delta < 0, -delta, np.where(np.isnan(delta), missing, 0.0))
+    avg_up = rolling_mean(up, window, min_periods)
+    avg_down = rolling_mean(down, window, min_periods)
+    return avg_up.reshape(shape), avg_down.reshape(shape)
+
+
+def kdj_smooth(rsv: np.ndarray, window: int = 3) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """KDJ 平滑：K = RSV 的 window 期均值，D = K 的 window 期均值，J = 3K - 2D。"""
+    k = rolling_mean(rsv, window)
+    d = rolling_mean(k, window)
+    return k, d, 3 * k - 2 * d
@@ -0,0 +1,348 @@
+"""
+波段高低点（Swing Point）增量跟踪模块。
+逐根 K 线确认局部极值，维护高低点交替序列与收缩列表，供 VCP / VCPPlus 指标与筛选器复用。
+
+数学原理：
+1. 极值确认：第 t 根 K 线到达时，只有中心点 c = t - order 的窗口 [c-order, c+order] 变得完整，
+   用单调队列维护该窗口的最高/最低价，判断 c 是否为局部高/低点，每根摊还 O(1)。
+2. 高低点交替：按时间合并高低点事件，同类连续事件折叠为最后一个（同一根 K 线同时为高低点时作为分隔），
+   仅序列末尾需要按 _adjust_local_high_low 的规则修正，因此追加/淘汰都是 O(1)。
+3. 收缩计算：收缩幅度从最近的高低点向前配对，num_contractions 只依赖首个非递增位置之前的前缀，
+   结果在高低点变化时才重新计算。
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+_HIGH = "H"
+_LOW = "L"
+_BOTH = "T"
+
+
+@dataclass(frozen=True)
+class ContractionSummary:
+    """
+    收缩统计摘要（索引均为自第一根 K 线起的绝对位置）。
+
+    - contraction: 从最近一次开始、逐次递增的收缩幅度前缀
+    - num_contractions: 逐次递增的收缩个数
+    - anchor_high_index: 倒数第 num_contractions 个高点（用于计算收缩周数），无则为 None
+    - last_high_index / last_high_value: 最近一个高点（用于盘整判断），无则为 None
+    """
+
+    contraction: Tuple[float, ...] = ()
+    num_contractions: int = 0
+    anchor_high_index: Optional[int] = None
+    last_high_index: Optional[int] = None
+    last_high_value: Optional[float] = None
+
+    @property
+    def max_contraction(self) -> Optional[float]:
+        return self.contraction[self.num_contractions - 1] if self.num_contractions >= 1 else None
+
+    @property
+    def min_contraction(self) -> Optional[float]:
+        return self.contraction[0] if self.num_contractions >= 1 else None
+
+
+class _ExtremumWindow:
+    """长度为 2*order+1 的滑动窗口，判断窗口中心是否为最大/最小值。"""
+
+    def __init__(self, order: int, mode: str, ignore_nan: bool):
+        self.width = order * 2 + 1
+        self.order = order
+        self.mode = mode
+        self.ignore_nan = ignore_nan
+        self.count = 0
+        self.values: deque = deque(maxlen=self.width)
+        self.nan_positions: deque = deque()
+        self.candidates: deque = deque()
+
+    def push(self, value: float) -> bool:
+        """加入新值，返回当前窗口中心（position - order）是否为极值点。"""
+        position = self.count
+        self.count += 1
+        self.values.append(value)
+        if math.isnan(value):
+            self.nan_positions.append(position)
+        else:
+            if self.mode == "max":
+                while self.candidates and self.candidates[-1][1] <= value:
+                    self.candidates.pop()
+            else:
+                while self.candidates and self.candidates[-1][1] >= value:
+                    self.candidates.pop()
+            self.candidates.append((position, value))
+        oldest = self.count - self.width
+        while self.candidates and self.candidates[0][0] < oldest:
+            self.candidates.popleft()
+        while self.nan_positions and self.nan_positions[0] < oldest:
+            self.nan_positions.popleft()
+
+        if self.count < self.width or not self.candidates:
+            return False
+        if self.nan_positions and not self.ignore_nan:
+            return False
+        return self.values[self.order] == self.candidates[0][1]
+
+
+class SwingPointTracker:
+    """
+    增量式波段高低点跟踪器：每根 K 线调用一次 update(high, low)。
+
+    参数：
+    - order: 局部极值半径（前后各 order 根）
+    - lookback: 只保留最近 lookback 根 K 线内的极值（None 表示不限）
+    - adjust: 是否按 VCPPlus 的 _adjust_local_high_low 规则生成高低点交替序列
+    - ignore_nan: True 时按 nanmax/nanmin 判定（VCPPlus），False 时窗口含 NaN 即不成立（VCP/筛选器）
+    - skip_zero_high: 高点价格为 0 时跳过该收缩（VCPPlus 的除零保护）
+    - min_swing_points: 高点与低点都至少有该数量时才计算收缩
+
+    与批量实现的对应关系：
+    - VCPIndicator / compute_vcp_features：adjust=False, ignore_nan=False, lookback=lookback_period
+    - VCPPlusIndicator / evaluate_vcp_plus：adjust=True, ignore_nan=True, skip_zero_high=True
+    - vcp_screener.vcp：adjust=False, ignore_nan=False, lookback=None, min_swing_points=1
+    """
+
+    def __init__(
+        self,
+        order: int = 10,
+        lookback: Optional[int] = None,
+        adjust: bool = False,
+        ignore_nan: bool = False,
+        skip_zero_high: bool = False,
+        min_swing_points: int = 2,
+    ):
+        if order < 1:
+            raise ValueError("order 必须为正整数")
+        self.order = order
+        self.lookback = lookback
+        self.adjust = adjust
+        self.ignore_nan = ignore_nan
+        self.skip_zero_high = skip_zero_high
+        self.min_swing_points = min_swing_points
+        self.bar_count = 0
+
+        self._high_window = _ExtremumWindow(order, "max", ignore_nan)
+        self._low_window = _ExtremumWindow(order, "min", ignore_nan)
+        # 原始极值事件：(绝对索引, 价格)
+        self._raw_high: deque = deque()
+        self._raw_low: deque = deque()
+        # 折叠后的高低点事件：[类型, 最后索引, 事件数, 高点价格, 低点价格]
+        self._runs: deque = deque()
+        self._num_high_runs = 0
+        self._num_low_runs = 0
+        self._summary: Optional[ContractionSummary] = None
+
+    @classmethod
+    def from_arrays(cls, highs: Iterable[float], lows: Iterable[float], **kwargs) -> "SwingPointTracker":
+        """用历史高低价序列初始化跟踪器。"""
+        tracker = cls(**kwargs)
+        for high, low in zip(highs, lows):
+            tracker.update(high, low)
+        return tracker
+
+    @property
+    def window_start(self) -> int:
+        """当前回溯窗口第一根 K 线的绝对索引。"""
+        if self.lookback is None:
+            return 0
+        return max(0, self.bar_count - self.lookback)
+
+    def update(self, high: float, low: float) -> None:
+        """输入一根新 K 线，确认 order 根之前的中心点是否为高/低点。"""
+        high = np.float64(high)
+        low = np.float64(low)
+        is_high = self._high_window.push(high)
+        is_low = self._low_window.push(low)
+        self.bar_count += 1
+        changed = False
+
+        if is_high or is_low:
+            center = self.bar_count - 1 - self.order
+            high_value = self._high_window.values[self.order]
+            low_value = self._low_window.values[self.order]
+            if is_high:
+                self._raw_high.append((center, high_value))
+            if is_low:
+                self._raw_low.append((center, low_value))
+            self._append_run(center, is_high, is_low, high_value, low_value)
+            changed = True
+
+        if self._trim():
+            changed = True
+        if changed:
+            self._summary = None
+
+    def _append_run(self, center: int, is_high: bool, is_low: bool, high_value: float, low_value: float) -> None:
+        kind = _BOTH if is_high and is_low else (_HIGH if is_high else _LOW)
+        if self._runs and kind != _BOTH and self._runs[-1][0] == kind:
+            run = self._runs[-1]
+            run[1] = center
+            run[2] += 1
+            run[3] = high_value
+            run[4] = low_value
+            return
+        self._runs.append([kind, center, 1, high_value, low_value])
+        if kind == _HIGH:
+            self._num_high_runs += 1
+        elif kind == _LOW:
+            self._num_low_runs += 1
+
+    def _trim(self) -> bool:
+        """淘汰落出回溯窗口的极值（中心点需满足 index >= window_start + order）。"""
+        bound = self.window_start + self.order
+        trimmed = False
+        while self._raw_high and self._raw_high[0][0] < bound:
+            self._raw_high.popleft()
+            trimmed = True
+        while self._raw_low and self._raw_low[0][0] < bound:
+            self._raw_low.popleft()
+            trimmed = True
+        while self._runs and self._runs[0][1] < bound:
+            kind = self._runs.popleft()[0]
+            if kind == _HIGH:
+                self._num_high_runs -= 1
+            elif kind == _LOW:
+                self._num_low_runs -= 1
+        return trimmed
+
+    # ========== 高低点序列（倒序惰性生成） ==========
+
+    def _runs_reversed(self, kind: str, skip: int = 0) -> Iterator[Tuple[int, float]]:
+        value_pos = 3 if kind == _HIGH else 4
+        for run in reversed(self._runs):
+            if run[0] != kind:
+                continue
+            if skip:
+                skip -= 1
+                continue
+            yield run[1], run[value_pos]
+
+    def _final_kind(self) -> Optional[str]:
+        if not self._raw_high or not self._raw_low:
+            return None
+        return self._runs[-1][0]
+
+    def _highs_reversed(self) -> Iterator[Tuple[int, float]]:
+        if not self.adjust:
+            yield from reversed(self._raw_high)
+            return
+        final = self._final_kind()
+        if final is None:
+            return
+        if final == _HIGH:
+            if self._num_high_runs >= 2:
+                yield self._raw_high[-1]
+                yield self._raw_high[-1]
+                yield from self._runs_reversed(_HIGH, skip=2)
+            return
+        if final == _LOW and self._num_low_runs >= 2:
+            yield self._raw_high[-1]
+        yield from self._runs_reversed(_HIGH)
+
+    def _lows_reversed(self) -> Iterator[Tuple[int, float]]:
+        if not self.adjust:
+            yield from reversed(self._raw_low)
+            return
+        final = self._final_kind()
+        if final is None:
+            return
+        if final == _LOW:
+            if self._num_low_runs >= 2:
+                yield self._raw_low[-1]
+                yield self._raw_low[-(self._runs[-1][2] + 1)]
+                yield from self._runs_reversed(_LOW, skip=2)
+            return
+        if final == _HIGH and self._num_high_runs >= 2:
+            yield self._raw_low[-1]
+        yield from self._runs_reversed(_LOW)
+
+    def _sizes(self) -> Tuple[int, int]:
+        if not self.adjust:
+            return len(self._raw_high), len(self._raw_low)
+        final = self._final_kind()
+        if final is None:
+            return 0, 0
+        if final == _HIGH:
+            if self._num_high_runs >= 2:
+                return self._num_high_runs, self._num_low_runs + 1
+            return 0, self._num_low_runs
+        if final == _LOW:
+            if self._num_low_runs >= 2:
+                return self._num_high_runs + 1, self._num_low_runs
+            return self._num_high_runs, 0
+        return self._num_high_runs, self._num_low_runs
+
+    @property
+    def local_high(self) -> np.ndarray:
+        """当前窗口内的高点绝对索引（升序；adjust=True 时为交替修正后的序列）。"""
+        return np.array([idx for idx, _ in self._highs_reversed()][::-1], dtype=int)
+
+    @property
+    def local_low(self) -> np.ndarray:
+        """当前窗口内的低点绝对索引（升序；adjust=True 时为交替修正后的序列）。"""
+        return np.array([idx for idx, _ in self._lows_reversed()][::-1], dtype=int)
+
+    # ========== 收缩 ==========
+
+    def _iter_contractions(self) -> Iterator[float]:
+        num_high, num_low = self._sizes()
+        if num_high < self.min_swing_points or num_low < self.min_swing_points:
+            return
+        highs = self._highs_reversed()
+        lows = self._lows_reversed()
+        high = next(highs, None)
+        low = next(lows, None)
+        while high is not None and low is not None:
+            if low[0] > high[0]:
+                high_value = high[1]
+                if not (self.skip_zero_high and high_value == 0):
+                    yield round((high_value - low[1]) / high_value * 100, 2)
+                high = next(highs, None)
+                low = next(lows, None)
+            else:
+                high = next(highs, None)
+
+    def contractions(self) -> List[float]:
+        """完整收缩列表（从最近一次开始），与批量 _contractions 结果一致。"""
+        return list(self._iter_contractions())
+
+    def summary(self) -> ContractionSummary:
+        """收缩统计摘要，仅在高低点变化后重新计算。"""
+        if self._summary is not None:
+            return self._summary
+
+        prefix: List[float] = []
+        for value in self._iter_contractions():
+            if value > (prefix[-1] if prefix else 0):
+                prefix.append(value)
+            else:
+                break
+        num_c = len(prefix)
+
+        anchor_index = None
+        last_index = None
+        last_value = None
+        for position, (idx, value) in enumerate(self._highs_reversed()):
+            if position == 0:
+                last_index, last_value = idx, value
+            if num_c >= 1 and position == num_c - 1:
+                anchor_index = idx
+            if position >= max(num_c - 1, 0):
+                break
+
+        self._summary = ContractionSummary(
+            contraction=tuple(prefix),
+            num_contractions=num_c,
+            anchor_high_index=anchor_index,
+            last_high_index=last_index,
+            last_high_value=last_value,
+        )
+        return self._summary
@@ -15,6 +15,12 @@ from typing import Dict, List
 import numpy as np
 import pandas as pd
 
+from core.analysis.indicators.extrema import local_extrema
+from core.analysis.indicators.registry import FeatureRegistry
+from core.analysis.indicators.rolling import rolling_max, rolling_mean, rolling_min
+from core.analysis.indicators.swing import SwingPointTracker
+from core.analysis.kernels import contraction_depths
+
 
 @dataclass(frozen=True)
 class VCPParams:
@@ -40,36 +46,8 @@ def _resolve_column(df: pd.DataFrame, name: str) -> pd.Series:
     raise KeyError(f"缺少列: {name}")
 
 
-def _local_extrema(arr: np.ndarray, order: int, mode: str) -> np.ndarray:
-    if len(arr) < order * 2 + 1:
-        return np.array([], dtype=int)
-    idx = []
-    for i in range(order, len(arr) - order):
-        window = arr[i - order : i + order + 1]
-        center = arr[i]
-        if mode == "max" and center == window.max():
-            idx.append(i)
-        if mode == "min" and center == window.min():
-            idx.append(i)
-    return np.array(idx, dtype=int)
-
-
 def _contractions(highs: np.ndarray, lows: np.ndarray, local_high: np.ndarray, local_low: np.ndarray) -> list[float]:
-    contraction = []
-    high_idx = local_high[::-1]
-    low_idx = local_low[::-1]
-    i = 0
-    j = 0
-    while i < len(low_idx) and j < len(high_idx):
-        if low_idx[i] > high_idx[j]:
-            high_val = highs[high_idx[j]]
-            low_val = lows[low_idx[i]]
-            contraction.append(round((high_val - low_val) / high_val * 100, 2))
-            i += 1
-            j += 1
-        else:
-            j += 1
-    return contraction
+    return contraction_depths(highs, lows, local_high, local_low)
 
 
 def _num_contractions(contraction: list[float]) -> int:
@@ -84,10 +62,46 @@ def _num_contractions(contraction: list[float]) -> int:
     return num
 
 
-def compute_vcp_features(df: pd.DataFrame, params: VCPParams | None = None) -> Dict[str, float | int | List[int] | List[float] | pd.Series | None]:
+def contraction_summary(contraction: list[float], local_high, lookback: int) -> tuple[int, float, float, float]:
+    """
+    由收缩序列与回溯窗口内的局部高点位置得到 (收缩次数, 最大收缩, 最小收缩, 形态持续周数)。
+    """
+    num_c = _num_contractions(contraction) if contraction else 0
+
+    # ========== 提取收缩深度数据 ==========
+    # 最大收缩幅度：第 num_c 个收缩的幅度（按逐减顺序，最后一个收缩最小）
+    max_c = contraction[num_c - 1] if num_c >= 1 else 0.0
+
+    # 最小收缩幅度：第一个收缩的幅度（按逐减顺序，第一个收缩最大）
+    min_c = contraction[0] if num_c >= 1 else 0.0
+
+    if contraction and num_c >= 1 and len(local_high) >= num_c:
+        weeks_of_contraction = (lookback - local_high[::-1][num_c - 1]) / 5
+    else:
+        weeks_of_contraction = 0.0
+    return num_c, max_c, min_c, weeks_of_contraction
+
+
+def create_vcp_swing_tracker(params: VCPParams | None = None) -> SwingPointTracker:
+    """创建与 compute_vcp_features 极值判定一致的增量高低点跟踪器。"""
+    if params is None:
+        params = VCPParams()
+    return SwingPointTracker(order=params.local_extrema_order, lookback=params.lookback_period)
+
+
+def compute_vcp_features(
+    df: pd.DataFrame,
+    params: VCPParams | None = None,
+    swing: SwingPointTracker | None = None,
+    registry: FeatureRegistry | None = None,
+) -> Dict[str, float | int | List[int] | List[float] | pd.Series | None]:
     """
     计算 VCP 相关技术指标特征（不做条件判定）。
 
+    swing 为已逐根更新到 df 最后一根 K 线的跟踪器（见 create_vcp_swing_tracker）时，
+    直接复用其高低点与收缩结果，避免每次重新扫描回溯窗口。
+    registry 为基于同一 df 的特征注册表时，均线、52 周高低点与成交量均线从注册表读取（与其他指标共享）。
+
     返回特征包含：
     - 均线数值与斜率
     - 52周高低点
@@ -143,75 +157,76 @@ def compute_vcp_features(df: pd.DataFrame, params: VCPParams | None = None) -> D
 
     # ========== 计算关键均线 ==========
     # MA50：短期均线，判断价格是否处于上升态
-    ma_50 = close_tail.rolling(window=params.ma_50_period, min_periods=params.ma_50_period).mean()
-    
     # MA150：中期均线，作为中期支撑位
-    ma_150 = close_tail.rolling(window=params.ma_150_period, min_periods=params.ma_150_period).mean()
-    
     # MA200：长期均线，判断长期趋势是否向上
-    ma_200 = close_tail.rolling(window=params.ma_200_period, min_periods=params.ma_200_period).mean()
-
     # ========== 计算 52 周高低点 ==========
-    # 52周最低价（252个交易日），用于判断当前价格相对底部的高度
-    week_52_low = low_tail.rolling(window=252, min_periods=252).min()
-    
-    # 52周最高价（252个交易日），用于判断当前价格相对顶部的位置
-    week_52_high = high_tail.rolling(window=252, min_periods=252).max()
+    # 52周最低价/最高价（252个交易日），用于判断当前价格相对底部的高度与相对顶部的位置
+    if registry is not None:
+        registry.check(df)
+        ma_50 = registry.values(registry.sma("close", params.ma_50_period), lookback)
+        ma_150 = registry.values(registry.sma("close", params.ma_150_period), lookback)
+        ma_200 = registry.values(registry.sma("close", params.ma_200_period), lookback)
+        week_52_low = registry.values(registry.rolling_min("low", 252), lookback)
+        week_52_high = registry.values(registry.rolling_max("high", 252), lookback)
+    else:
+        close_values = close_tail.to_numpy(dtype=float)
+        ma_50 = rolling_mean(close_values, params.ma_50_period)
+        ma_150 = rolling_mean(close_values, params.ma_150_period)
+        ma_200 = rolling_mean(close_values, params.ma_200_period)
+        week_52_low = rolling_min(low_tail.to_numpy(dtype=float), 252)
+        week_52_high = rolling_max(high_tail.to_numpy(dtype=float), 252)
 
     # ========== 计算 MA200 趋势斜率 ==========
     # MA200斜率 = 当前MA200 - 过去N日MA200（N由ma_trend_period决定，默认20）
     # 正数表示长期均线向上，是 Stage 2 上升趋势的判断依据
-    ma_200_slope = ma_200.iloc[-1] - ma_200.iloc[-params.ma_trend_period]
+    ma_200_slope = ma_200[-1] - ma_200[-params.ma_trend_period]
 
     # ========== 提取局部极值点 ==========
     # 将数据转为 numpy 数组便于处理
     highs = high_tail.to_numpy(dtype=float)
     lows = low_tail.to_numpy(dtype=float)
 
-    # 局部高点：当前K线的最高价 = 前后 order 根K线中的最高价（默认order=10）
-    # 识别波段的顶部，用于计算收缩
-    local_high = _local_extrema(highs, params.local_extrema_order, mode="max")
-    
-    # 局部低点：当前K线的最低价 = 前后 order 根K线中的最低价（默认order=10）
-    # 识别波段的底部，用于计算收缩
-    local_low = _local_extrema(lows, params.local_extrema_order, mode="min")
-
-    # ========== 计算波段收缩幅度 ==========
-    # 收缩 = (高点 - 低点) / 高点 × 100（百分比形式）
-    # 按时间从旧到新，收缩幅度应该逐次递减（即收缩深度越来越小）
-    contraction = _contractions(highs, lows, local_high, local_low) if len(local_high) >= 2 and len(local_low) >= 2 else []
-    
-    num_c = _num_contractions(contraction) if contraction else 0
-
-    # ========== 提取收缩深度数据 ==========
-    # 最大收缩幅度：第 num_c 个收缩的幅度（按逐减顺序，最后一个收缩最小）
-    max_c = contraction[num_c - 1] if num_c >= 1 else 0.0
+    if swing is not None:
+        # 增量跟踪器返回绝对索引，换算为回溯窗口内的相对位置
+        offset = swing.bar_count - lookback
+        local_high = swing.local_high - offset
+        local_low = swing.local_low - offset
+        contraction = swing.contractions()
+    else:
+        # 局部高点：当前K线的最高价 = 前后 order 根K线中的最高价（默认order=10）
+        # 识别波段的顶部，用于计算收缩
+        local_high = local_extrema(highs, params.local_extrema_order, "max")
+
+        # 局部低点：当前K线的最低价 = 前后 order 根K线中的最低价（默认order=10）
+        # 识别波段的底部，用于计算收缩
+        local_low = local_extrema(lows, params.local_extrema_order, "min")
+
+        # ========== 计算波段收缩幅度 ==========
+        # 收缩 = (高点 - 低点) / 高点 × 100（百分比形式）
+        # 按时间从旧到新，收缩幅度应该逐次递减（即收缩深度越来越小）
+        contraction = _contractions(highs, lows, local_high, local_low) if len(local_high) >= 2 and len(local_low) >= 2 else []
     
-    # 最小收缩幅度：第一个收缩的幅度（按逐减顺序，第一个收缩最大）
-    min_c = contraction[0] if num_c >= 1 else 0.0
+    num_c, max_c, min_c, weeks_of_contraction = contraction_summary(contraction, local_high, lookback)
 
-    if contraction and num_c >= 1 and len(local_high) >= num_c:
-        weeks = (lookback - local_high[::-1][num_c - 1]) / 5
-        weeks_of_contraction = weeks
+    # 短期成交量均线（5日）与长期成交量均线（30日）
+    if registry is not None:
+        vol_ma_short = registry.values(registry.sma("volume", params.vol_short_period), lookback)
+        vol_ma_long = registry.values(registry.sma("volume", params.vol_long_period), lookback)
     else:
-        weeks_of_contraction = 0.0
-
-    # 短期成交量均线（5日）
-    vol_ma_short = volume_tail.rolling(window=params.vol_short_period, min_periods=params.vol_short_period).mean()
-    
-    # 长期成交量均线（30日）
-    vol_ma_long = volume_tail.rolling(window=params.vol_long_period, min_periods=params.vol_long_period).mean()
+        volume_values = volume_tail.to_numpy(dtype=float)
+        vol_ma_short = rolling_mean(volume_values, params.vol_short_period)
+        vol_ma_long = rolling_mean(volume_values, params.vol_long_period)
     
     return {
         "close_last": close_tail.iloc[-1],
         "high_last": high_tail.iloc[-1],
         "low_last": low_tail.iloc[-1],
-        "ma_50": ma_50.iloc[-1],
-        "ma_150": ma_150.iloc[-1],
-        "ma_200": ma_200.iloc[-1],
+        "ma_50": ma_50[-1],
+        "ma_150": ma_150[-1],
+        "ma_200": ma_200[-1],
         "ma_200_slope": ma_200_slope,
-        "week_52_low": week_52_low.iloc[-1],
-        "week_52_high": week_52_high.iloc[-1],
+        "week_52_low": week_52_low[-1],
+        "week_52_high": week_52_high[-1],
         "local_high": local_high.tolist(),
         "local_low": local_low.tolist(),
         "contraction": contraction,
@@ -219,14 +234,87 @@ def compute_vcp_features(df: pd.DataFrame, params: VCPParams | None = None) -> D
         "max_contraction": max_c,
         "min_contraction": min_c,
         "weeks_of_contraction": weeks_of_contraction,
-        "vol_ma_short": vol_ma_short.iloc[-1],
-        "vol_ma_long": vol_ma_long.iloc[-1],
+        "vol_ma_short": vol_ma_short[-1],
+        "vol_ma_long": vol_ma_long[-1],
         "lookback": lookback,
     }
 
 
-def evaluate_vcp(df: pd.DataFrame, params: VCPParams | None = None) -> Dict[str, float | int | List[int] | List[float] | pd.Series | None]:
+VCP_TREND_COLUMNS = (
+    "close_last",
+    "ma_50",
+    "ma_150",
+    "ma_200",
+    "ma_200_slope",
+    "week_52_low",
+    "week_52_high",
+    "vol_ma_short",
+    "vol_ma_long",
+)
+
+
+def compute_vcp_feature_series(
+    df: pd.DataFrame,
+    params: VCPParams | None = None,
+    registry: FeatureRegistry | None = None,
+) -> pd.DataFrame:
+    """
+    整段数据一次性计算 compute_vcp_features 中与形态无关的标量特征（均线、MA200 斜率、52 周高低点、成交量均线）。
+
+    第 i 行等于对以第 i 行结尾的回溯窗口（长度 min(i + 1, lookback_period)）调用 compute_vcp_features 的结果：
+    窗口内滚动统计在窗口长度不足其周期时为 NaN，窗口短于最小数据要求时整行为 NaN。
+    全历史序列取自特征注册表 registry（不传时基于 df 新建），与其他指标共享同名节点。
+    """
+    if params is None:
+        params = VCPParams()
+    if registry is None:
+        registry = FeatureRegistry(df)
+    else:
+        registry.check(df)
+
+    def series(name: str) -> np.ndarray:
+        return registry.values(name)
+
+    lookback = np.minimum(np.arange(1, len(df) + 1), params.lookback_period)
+
+    def windowed(values: np.ndarray, period: int) -> np.ndarray:
+        # 回溯窗口短于周期时，窗口内滚动统计的末项为 NaN
+        return np.where(lookback >= period, values, np.nan)
+
+    ma_200 = series(registry.sma("close", params.ma_200_period))
+    # 窗口内 ma_200[-ma_trend_period] 即向前 ma_trend_period - 1 根的 MA200
+    shift = params.ma_trend_period - 1
+    ma_200_prev = np.full(len(df), np.nan)
+    ma_200_prev[shift:] = ma_200[: len(df) - shift]
+    frame = pd.DataFrame(
+        {
+            "close_last": _resolve_column(df, "close").to_numpy(dtype=float),
+            "ma_50": windowed(series(registry.sma("close", params.ma_50_period)), params.ma_50_period),
+            "ma_150": windowed(series(registry.sma("close", params.ma_150_period)), params.ma_150_period),
+            "ma_200": windowed(ma_200, params.ma_200_period),
+            "ma_200_slope": windowed(ma_200 - ma_200_prev, params.ma_200_period + shift),
+            "week_52_low": windowed(series(registry.rolling_min("low", 252)), 252),
+            "week_52_high": windowed(series(registry.rolling_max("high", 252)), 252),
+            "vol_ma_short": windowed(
+                series(registry.sma("volume", params.vol_short_period)), params.vol_short_period
+            ),
+            "vol_ma_long": windowed(series(registry.sma("volume", params.vol_long_period)), params.vol_long_period),
+        },
+        index=df.index,
+    )
+    # 数据充分性检查（与 compute_vcp_features 的 min_required 一致）
+    min_required = max(params.ma_200_period + params.ma_trend_period, params.local_extrema_order * 2 + 1)
+    frame.loc[lookback < min_required, :] = np.nan
+    return frame
+
+
+def evaluate_vcp(
+    df: pd.DataFrame,
+    params: VCPParams | None = None,
+    swing: SwingPointTracker | None = None,
+    registry: FeatureRegistry | None = None,
+) -> Dict[str, float | int | List[int] | List[float] | pd.Series | None]:
     """
     兼容接口：返回 VCP 技术指标特征，不做条件判定。
     """
-    return compute_vcp_features(df, params)
+    return compute_vcp_features(df, params, swing=swing, registry=registry)
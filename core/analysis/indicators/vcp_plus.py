@@ -11,11 +11,18 @@ VCPPlus 指标计算模块（基于完整 VCP 筛选逻辑）。
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Iterable, Optional
+from typing import Dict, Iterable, Optional, Sequence
 
 import numpy as np
 import pandas as pd
 
+from common.util_compact import compact_frame
+from core.analysis.indicators.extrema import local_extrema, local_extrema_mask
+from core.analysis.indicators.registry import FeatureRegistry
+from core.analysis.indicators.rolling import rolling_max, rolling_mean, rolling_min, rolling_slope
+from core.analysis.indicators.swing import SwingPointTracker
+from core.analysis.kernels import adjust_local_high_low, contraction_depths
+
 
 @dataclass(frozen=True)
 class VCPPlusParams:
@@ -56,80 +63,8 @@ def _resolve_optional_column(df: pd.DataFrame, candidates: Iterable[str]) -> Opt
     return None
 
 
-def _trend_value(values: np.ndarray) -> float:
-    if values.size == 0:
-        return 0.0
-    y = values.astype(float)
-    x = np.arange(1, len(y) + 1, dtype=float)
-    summed_x = x.sum()
-    summed_y = np.nansum(y)
-    summed_x2 = np.dot(x, x)
-    summed_xy = np.nansum(x * y)
-    numerator = len(y) * summed_xy - summed_x * summed_y
-    denominator = len(y) * summed_x2 - summed_x ** 2
-    if denominator == 0:
-        return 0.0
-    return numerator / denominator
-
-
-def _local_extrema(arr: np.ndarray, order: int, mode: str) -> np.ndarray:
-    if len(arr) < order * 2 + 1:
-        return np.array([], dtype=int)
-    idx = []
-    for i in range(order, len(arr) - order):
-        window = arr[i - order : i + order + 1]
-        if mode == "max":
-            if arr[i] == np.nanmax(window):
-                idx.append(i)
-        elif mode == "min":
-            if arr[i] == np.nanmin(window):
-                idx.append(i)
-    return np.array(idx, dtype=int)
-
-
 def _adjust_local_high_low(local_high: np.ndarray, local_low: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
-    if local_high.size == 0 or local_low.size == 0:
-        return np.array([], dtype=int), np.array([], dtype=int)
-
-    i = 0
-    j = 0
-    adjusted_high: list[int] = []
-    adjusted_low: list[int] = []
-
-    while i < len(local_high) and j < len(local_low):
-        if local_high[i] < local_low[j]:
-            while i < len(local_high) and local_high[i] < local_low[j]:
-                i += 1
-            if i > 0:
-                adjusted_high.append(local_high[i - 1])
-        elif local_high[i] > local_low[j]:
-            while j < len(local_low) and local_high[i] > local_low[j]:
-                j += 1
-            if j > 0:
-                adjusted_low.append(local_low[j - 1])
-        else:
-            i += 1
-            j += 1
-
-    if i < len(local_high) and adjusted_high and j > 0:
-        adjusted_high.pop(-1)
-        while i < len(local_high) and local_high[i] > local_low[j - 1]:
-            i += 1
-        if i > 0:
-            adjusted_high.append(local_high[i - 1])
-        adjusted_high.append(local_high[-1])
-        adjusted_low.append(local_low[j - 1])
-
-    if j < len(local_low) and adjusted_low and i > 0:
-        adjusted_low.pop(-1)
-        while j < len(local_low) and local_high[i - 1] > local_low[j]:
-            j += 1
-        if j > 0:
-            adjusted_low.append(local_low[j - 1])
-        adjusted_low.append(local_low[-1])
-        adjusted_high.append(local_high[i - 1])
-
-    return np.array(adjusted_high, dtype=int), np.array(adjusted_low, dtype=int)
+    return adjust_local_high_low(local_high, local_low)
 
 
 def _contractions(
@@ -138,22 +73,7 @@ def _contractions(
     local_high: np.ndarray,
     local_low: np.ndarray,
 ) -> list[float]:
-    contraction = []
-    high_idx = local_high[::-1]
-    low_idx = local_low[::-1]
-    i = 0
-    j = 0
-    while i < len(low_idx) and j < len(high_idx):
-        if low_idx[i] > high_idx[j]:
-            high_val = highs[high_idx[j]]
-            low_val = lows[low_idx[i]]
-            if high_val != 0:
-                contraction.append(round((high_val - low_val) / high_val * 100, 2))
-            i += 1
-            j += 1
-        else:
-            j += 1
-    return contraction
+    return contraction_depths(highs, lows, local_high, local_low, skip_zero_high=True)
 
 
 def _num_contractions(contraction: list[float]) -> int:
@@ -168,9 +88,31 @@ def _num_contractions(contraction: list[float]) -> int:
     return num
 
 
-def evaluate_vcp_plus(df: pd.DataFrame, params: VCPPlusParams | None = None) -> Dict[str, float | int | bool | None]:
+def create_vcp_plus_swing_tracker(params: VCPPlusParams | None = None) -> SwingPointTracker:
+    """创建与 evaluate_vcp_plus 极值判定及高低点交替规则一致的增量跟踪器。"""
+    if params is None:
+        params = VCPPlusParams()
+    return SwingPointTracker(
+        order=params.local_extrema_order,
+        lookback=params.lookback_period,
+        adjust=True,
+        ignore_nan=True,
+        skip_zero_high=True,
+    )
+
+
+def evaluate_vcp_plus(
+    df: pd.DataFrame,
+    params: VCPPlusParams | None = None,
+    swing: SwingPointTracker | None = None,
+    registry: FeatureRegistry | None = None,
+) -> Dict[str, float | int | bool | None]:
     """
     评估 VCPPlus 形态是否成立，并返回关键统计值。
+
+    swing 为已逐根更新到 df 最后一根 K 线的跟踪器（见 create_vcp_plus_swing_tracker）时，
+    收缩统计直接取自跟踪器，不再重新扫描回溯窗口。
+    registry 为基于同一 df 的特征注册表时，均线、周高低点、斜率与成交量均线从注册表读取。
     """
     if params is None:
         params = VCPPlusParams()
@@ -208,18 +150,31 @@ def evaluate_vcp_plus(df: pd.DataFrame, params: VCPPlusParams | None = None) ->
             "rs_rating": None,
         }
 
-    ma_50 = close_tail.rolling(window=params.ma_50_period, min_periods=params.ma_50_period).mean()
-    ma_150 = close_tail.rolling(window=params.ma_150_period, min_periods=params.ma_150_period).mean()
-    ma_200 = close_tail.rolling(window=params.ma_200_period, min_periods=params.ma_200_period).mean()
-
     week_window = params.week_window if len(df_tail) >= params.week_window else len(df_tail)
-    week_low = low_tail.rolling(window=week_window, min_periods=week_window).min()
-    week_high = high_tail.rolling(window=week_window, min_periods=week_window).max()
-
-    ma_200_slope = ma_200.rolling(
-        window=params.ma_trend_period,
-        min_periods=params.ma_trend_period,
-    ).apply(_trend_value, raw=True)
+    if registry is not None:
+        registry.check(df)
+        sma_200 = registry.sma("close", params.ma_200_period)
+        ma_50_values = registry.values(registry.sma("close", params.ma_50_period), lookback)
+        ma_150_values = registry.values(registry.sma("close", params.ma_150_period), lookback)
+        ma_200_values = registry.values(sma_200, lookback)
+        week_low_values = registry.values(registry.rolling_min("low", week_window), lookback)
+        week_high_values = registry.values(registry.rolling_max("high", week_window), lookback)
+        ma_200_slope_values = registry.values(registry.slope(sma_200, params.ma_trend_period), lookback)
+    else:
+        close_values = close_tail.to_numpy(dtype=float)
+        ma_50_values = rolling_mean(close_values, params.ma_50_period)
+        ma_150_values = rolling_mean(close_values, params.ma_150_period)
+        ma_200_values = rolling_mean(close_values, params.ma_200_period)
+        week_low_values = rolling_min(low_tail.to_numpy(dtype=float), week_window)
+        week_high_values = rolling_max(high_tail.to_numpy(dtype=float), week_window)
+        ma_200_slope_values = rolling_slope(ma_200_values, params.ma_trend_period)
+
+    ma_50 = pd.Series(ma_50_values, index=close_tail.index)
+    ma_150 = pd.Series(ma_150_values, index=close_tail.index)
+    ma_200 = pd.Series(ma_200_values, index=close_tail.index)
+    week_low = pd.Series(week_low_values, index=low_tail.index)
+    week_high = pd.Series(week_high_values, index=high_tail.index)
+    ma_200_slope = pd.Series(ma_200_slope_values, index=ma_200.index)
 
     condition_1 = (close_tail > ma_150) & (close_tail > ma_200) & (close_tail > ma_50)
     condition_2 = (ma_150 > ma_200) & (ma_50 > ma_150)
@@ -228,12 +183,14 @@ def evaluate_vcp_plus(df: pd.DataFrame, params: VCPPlusParams | None = None) ->
     condition_7 = high_tail > (week_high * 0.75)
 
     if benchmark_close is not None:
-        benchmark_tail = benchmark_close.tail(lookback)
-        rs_line = close_tail / benchmark_tail.replace(0, np.nan)
-        rs_slope = rs_line.rolling(
-            window=params.rs_trend_period,
-            min_periods=params.rs_trend_period,
-        ).apply(_trend_value, raw=True)
+        if registry is not None:
+            rs_node = registry.slope(registry.ratio("close", str(benchmark_close.name)), params.rs_trend_period)
+            rs_slope_values = registry.values(rs_node, lookback)
+        else:
+            benchmark_tail = benchmark_close.tail(lookback)
+            rs_line = close_tail / benchmark_tail.replace(0, np.nan)
+            rs_slope_values = rolling_slope(rs_line.to_numpy(dtype=float), params.rs_trend_period)
+        rs_slope = pd.Series(rs_slope_values, index=close_tail.index)
         condition_8 = rs_slope > 0.0
     else:
         condition_8 = pd.Series([False] * len(df_tail), index=df_tail.index)
@@ -250,38 +207,48 @@ def evaluate_vcp_plus(df: pd.DataFrame, params: VCPPlusParams | None = None) ->
         and condition_8.iloc[-1]
     )
 
-    highs = high_tail.to_numpy(dtype=float)
-    lows = low_tail.to_numpy(dtype=float)
-    local_high = _local_extrema(highs, params.local_extrema_order, mode="max")
-    local_low = _local_extrema(lows, params.local_extrema_order, mode="min")
-    local_high, local_low = _adjust_local_high_low(local_high, local_low)
-
-    contraction = (
-        _contractions(highs, lows, local_high, local_low)
-        if local_high.size >= 2 and local_low.size >= 2
-        else []
-    )
-    num_c = _num_contractions(contraction) if contraction else 0
-    max_c = contraction[num_c - 1] if num_c >= 1 else np.nan
-    min_c = contraction[0] if num_c >= 1 else np.nan
-
-    weeks_of_contraction = 0.0
-    if contraction and num_c >= 1 and local_high.size >= num_c:
-        weeks_of_contraction = (len(df_tail.index) - local_high[::-1][num_c - 1]) / 5
-
-    vol_ma_short = volume_tail.rolling(
-        window=params.vol_short_period,
-        min_periods=params.vol_short_period,
-    ).mean()
-    vol_ma_long = volume_tail.rolling(
-        window=params.vol_long_period,
-        min_periods=params.vol_long_period,
-    ).mean()
-    vol_contraction = bool(vol_ma_short.iloc[-1] < vol_ma_long.iloc[-1])
+    if swing is not None:
+        summary = swing.summary()
+        num_c = summary.num_contractions
+        max_c = summary.max_contraction if num_c >= 1 else np.nan
+        min_c = summary.min_contraction if num_c >= 1 else np.nan
+        weeks_of_contraction = 0.0
+        if summary.anchor_high_index is not None:
+            weeks_of_contraction = (swing.bar_count - summary.anchor_high_index) / 5
+        last_high_value = summary.last_high_value
+    else:
+        highs = high_tail.to_numpy(dtype=float)
+        lows = low_tail.to_numpy(dtype=float)
+        local_high = local_extrema(highs, params.local_extrema_order, "max", ignore_nan=True)
+        local_low = local_extrema(lows, params.local_extrema_order, "min", ignore_nan=True)
+        local_high, local_low = _adjust_local_high_low(local_high, local_low)
+
+        contraction = (
+            _contractions(highs, lows, local_high, local_low)
+            if local_high.size >= 2 and local_low.size >= 2
+            else []
+        )
+        num_c = _num_contractions(contraction) if contraction else 0
+        max_c = contraction[num_c - 1] if num_c >= 1 else np.nan
+        min_c = contraction[0] if num_c >= 1 else np.nan
+
+        weeks_of_contraction = 0.0
+        if contraction and num_c >= 1 and local_high.size >= num_c:
+            weeks_of_contraction = (len(df_tail.index) - local_high[::-1][num_c - 1]) / 5
+        last_high_value = highs[local_high[-1]] if local_high.size > 0 else None
+
+    if registry is not None:
+        vol_ma_short = registry.values(registry.sma("volume", params.vol_short_period), lookback)
+        vol_ma_long = registry.values(registry.sma("volume", params.vol_long_period), lookback)
+    else:
+        volume_values = volume_tail.to_numpy(dtype=float)
+        vol_ma_short = rolling_mean(volume_values, params.vol_short_period)
+        vol_ma_long = rolling_mean(volume_values, params.vol_long_period)
+    vol_contraction = bool(vol_ma_short[-1] < vol_ma_long[-1])
 
     consolidation_ok = False
-    if local_high.size > 0:
-        consolidation_ok = bool(high_tail.iloc[-1] < high_tail.iloc[local_high[-1]])
+    if last_high_value is not None:
+        consolidation_ok = bool(high_tail.iloc[-1] < last_high_value)
     if not params.require_consolidation:
         consolidation_ok = True
 
@@ -312,3 +279,261 @@ def evaluate_vcp_plus(df: pd.DataFrame, params: VCPPlusParams | None = None) ->
         "weeks_of_contraction": weeks_of_contraction,
         "rs_rating": rs_rating,
     }
+
+
+def _tail_window_extreme(series: pd.Series, week_window: int, lookback_period: int, mode: str) -> np.ndarray:
+    """
+    复现 evaluate_vcp_plus 的 52 周区间：区间长度 = min(week_window, 回溯窗口长度)，
+    即 W = min(week_window, lookback_period) 的滚动极值；前 W-1 根以全部历史为区间，要求区间内无缺失值。
+    """
+    window = min(week_window, lookback_period)
+    values = series.to_numpy(dtype=float)
+    rolling_extreme = rolling_max if mode == "max" else rolling_min
+    full = rolling_extreme(values, window)
+    partial = rolling_extreme(values, window, min_periods=1)
+    head = np.arange(len(values)) < window - 1
+    complete = np.cumsum(~np.isfinite(values)) == 0
+    return np.where(head, np.where(complete, partial, np.nan), full)
+
+
+def evaluate_vcp_plus_series(
+    df: pd.DataFrame,
+    params: VCPPlusParams | None = None,
+    compact: bool = False,
+    registry: FeatureRegistry | None = None,
+) -> pd.DataFrame:
+    """
+    一次性计算每个 bar 的 VCPPlus 评估结果。
+
+    第 i 行等价于 evaluate_vcp_plus(df.iloc[: i + 1], params)，但均线、52 周区间、斜率与
+    局部极值均在全序列上只计算一次；收缩配对仅在回溯窗口内的极值集合变化时重算。
+    registry 为基于同一 df 的特征注册表时，均线、斜率与成交量均线从注册表读取（与其他指标共享）。
+
+    Returns:
+        DataFrame: stage2_pass / vcp_pass / rs_pass / num_contractions / max_contraction /
+        min_contraction / weeks_of_contraction / rs_rating（缺失为 NaN）；
+        compact=True 时浮点列为 float32、布尔列为 int8
+    """
+    if params is None:
+        params = VCPPlusParams()
+    if registry is not None:
+        registry.check(df)
+    result = _evaluate_series(df, params, {}, registry)
+    return compact_frame(result) if compact else result
+
+
+def evaluate_vcp_plus_grid(df: pd.DataFrame, param_grid: Sequence[VCPPlusParams]) -> pd.DataFrame:
+    """
+    一次评估多组 VCPPlus 参数（参数扫描用），返回长表。
+
+    各组参数共享同一份中间序列：相同周期的均线、周区间、斜率、局部极值与收缩配对结果只计算一次。
+
+    Returns:
+        DataFrame: 以 (param_id, 原索引) 为行索引，列同 evaluate_vcp_plus_series
+    """
+    shared: Dict[tuple, object] = {}
+    frames = [_evaluate_series(df, params, shared) for params in param_grid]
+    if not frames:
+        return evaluate_vcp_plus_series(df).iloc[:0]
+    return pd.concat(frames, keys=range(len(frames)), names=["param_id", df.index.name])
+
+
+def _evaluate_series(
+    df: pd.DataFrame,
+    params: VCPPlusParams,
+    shared: Dict[tuple, object],
+    registry: FeatureRegistry | None = None,
+) -> pd.DataFrame:
+    """
+    evaluate_vcp_plus_series 的实现；shared 为跨参数组共享的中间结果缓存（按计算定义作键），
+    registry 不为空时均线、斜率与成交量均线改为注册表节点。
+    """
+
+    def memo(key: tuple, compute):
+        if key not in shared:
+            shared[key] = compute()
+        return shared[key]
+
+    def sma(source: str, values: np.ndarray, period: int) -> np.ndarray:
+        if registry is not None:
+            return registry.values(registry.sma(source, period))
+        return memo(("sma" if source == "close" else "vol_sma", period), lambda: rolling_mean(values, period))
+
+    close = _resolve_column(df, "close")
+    high = _resolve_column(df, "high")
+    low = _resolve_column(df, "low")
+    volume = _resolve_column(df, "volume")
+    benchmark_close = _resolve_optional_column(
+        df,
+        [params.benchmark_close_column, "spx_close", "benchmark_close", "index_close"],
+    )
+    rs_rating_series = _resolve_optional_column(
+        df,
+        [params.rs_rating_column, "rs_rating", "rs_score"],
+    )
+
+    size = len(df)
+    bars = np.arange(1, size + 1)
+    # 每个 bar 的回溯窗口长度与起点（对应 df.tail(lookback)）
+    lookbacks = np.minimum(bars, params.lookback_period)
+    starts = bars - lookbacks
+    min_required = max(params.ma_200_period + params.ma_trend_period, params.local_extrema_order * 2 + 1)
+    valid = lookbacks >= min_required
+
+    # ========== Stage 2 趋势模板（全序列向量化） ==========
+    close_values = close.to_numpy(dtype=float)
+    high_values = high.to_numpy(dtype=float)
+    low_values = low.to_numpy(dtype=float)
+    ma_50, ma_150, ma_200 = (
+        sma("close", close_values, period)
+        for period in (params.ma_50_period, params.ma_150_period, params.ma_200_period)
+    )
+
+    week_window = min(params.week_window, params.lookback_period)
+    week_low = memo(
+        ("week_low", week_window),
+        lambda: _tail_window_extreme(low, params.week_window, params.lookback_period, "min"),
+    )
+    week_high = memo(
+        ("week_high", week_window),
+        lambda: _tail_window_extreme(high, params.week_window, params.lookback_period, "max"),
+    )
+
+    if registry is not None:
+        ma_200_slope = registry.values(
+            registry.slope(registry.sma("close", params.ma_200_period), params.ma_trend_period)
+        )
+    else:
+        ma_200_slope = memo(
+            ("slope", params.ma_200_period, params.ma_trend_period),
+            lambda: rolling_slope(ma_200, params.ma_trend_period),
+        )
+
+    with np.errstate(invalid="ignore"):
+        condition_1 = (close_values > ma_150) & (close_values > ma_200) & (close_values > ma_50)
+        condition_2 = (ma_150 > ma_200) & (ma_50 > ma_150)
+        condition_3 = ma_200_slope > 0.0
+        condition_6 = low_values > (week_low * 1.3)
+        condition_7 = high_values > (week_high * 0.75)
+
+    if not params.require_rs_slope:
+        condition_8 = np.ones(size, dtype=bool)
+    elif benchmark_close is not None and registry is not None:
+        rs_node = registry.slope(registry.ratio("close", str(benchmark_close.name)), params.rs_trend_period)
+        condition_8 = registry.values(rs_node) > 0.0
+    elif benchmark_close is not None:
+        rs_slope = memo(
+            ("rs_slope", benchmark_close.name, params.rs_trend_period),
+            lambda: rolling_slope(
+                (close / benchmark_close.replace(0, np.nan)).to_numpy(dtype=float), params.rs_trend_period
+            ),
+        )
+        condition_8 = rs_slope > 0.0
+    else:
+        condition_8 = np.zeros(size, dtype=bool)
+
+    stage2 = (
+        condition_1
+        & condition_2
+        & condition_3
+        & condition_6
+        & condition_7
+        & condition_8
+        & valid
+    )
+
+    volume_values = volume.to_numpy(dtype=float)
+    vol_ma_short, vol_ma_long = (
+        sma("volume", volume_values, period) for period in (params.vol_short_period, params.vol_long_period)
+    )
+    with np.errstate(invalid="ignore"):
+        vol_contraction = vol_ma_short < vol_ma_long
+
+    # ========== RS Rating ==========
+    if rs_rating_series is not None:
+        rs_rating = pd.to_numeric(rs_rating_series, errors="coerce").to_numpy(dtype=float)
+        if params.require_rs_rating:
+            with np.errstate(invalid="ignore"):
+                rs_pass = ~np.isnan(rs_rating) & (rs_rating >= params.min_rs_rating)
+        else:
+            rs_pass = np.ones(size, dtype=bool)
+    else:
+        rs_rating = np.full(size, np.nan)
+        rs_pass = np.full(size, not params.require_rs_rating)
+    rs_pass = rs_pass & valid
+    rs_rating = np.where(valid, rs_rating, np.nan)
+
+    # ========== 局部极值（全序列一次）与收缩配对 ==========
+    order = params.local_extrema_order
+    high_idx, low_idx = memo(
+        ("extrema", order),
+        lambda: (
+            np.flatnonzero(local_extrema_mask(high_values, order, "max", ignore_nan=True)),
+            np.flatnonzero(local_extrema_mask(low_values, order, "min", ignore_nan=True)),
+        ),
+    )
+
+    num_contractions = np.zeros(size, dtype=int)
+    max_contraction = np.full(size, np.nan)
+    min_contraction = np.full(size, np.nan)
+    weeks_of_contraction = np.zeros(size)
+    vcp_pass = np.zeros(size, dtype=bool)
+
+    # 收缩配对只取决于窗口内的极值集合，按阶数在参数组之间共享
+    cache: Dict[tuple, tuple] = memo(("contractions", order), dict)
+    for i in np.flatnonzero(valid):
+        # 窗口内可确认的极值：左右 order 根均位于 [start, i] 内
+        lower = starts[i] + order
+        upper = i - order
+        key = (
+            int(np.searchsorted(high_idx, lower, side="left")),
+            int(np.searchsorted(high_idx, upper, side="right")),
+            int(np.searchsorted(low_idx, lower, side="left")),
+            int(np.searchsorted(low_idx, upper, side="right")),
+        )
+        h_lo, h_hi, l_lo, l_hi = key
+        if key not in cache:
+            local_high, local_low = _adjust_local_high_low(high_idx[h_lo:h_hi], low_idx[l_lo:l_hi])
+            contraction = (
+                _contractions(high_values, low_values, local_high, local_low)
+                if local_high.size >= 2 and local_low.size >= 2
+                else []
+            )
+            num_c = _num_contractions(contraction) if contraction else 0
+            cache[key] = (local_high, contraction, num_c)
+        local_high, contraction, num_c = cache[key]
+
+        max_c = contraction[num_c - 1] if num_c >= 1 else np.nan
+        min_c = contraction[0] if num_c >= 1 else np.nan
+        weeks = 0.0
+        if contraction and num_c >= 1 and local_high.size >= num_c:
+            weeks = (i + 1 - local_high[::-1][num_c - 1]) / 5
+
+        consolidation_ok = bool(high_values[i] < high_values[local_high[-1]]) if local_high.size > 0 else False
+        if not params.require_consolidation:
+            consolidation_ok = True
+
+        flag_num = params.min_contractions <= num_c <= params.max_contractions
+        flag_max = bool(max_c <= params.max_contraction_depth) if not np.isnan(max_c) else False
+        flag_min = bool(min_c <= params.min_contraction_depth) if not np.isnan(min_c) else False
+        flag_week = weeks >= params.min_weeks
+
+        num_contractions[i] = num_c
+        max_contraction[i] = max_c
+        min_contraction[i] = min_c
+        weeks_of_contraction[i] = weeks
+        vcp_pass[i] = bool(flag_num and flag_max and flag_min and flag_week and vol_contraction[i] and consolidation_ok)
+
+    return pd.DataFrame(
+        {
+            "stage2_pass": stage2,
+            "vcp_pass": vcp_pass,
+            "rs_pass": rs_pass,
+            "num_contractions": num_contractions,
+            "max_contraction": max_contraction,
+            "min_contraction": min_contraction,
+            "weeks_of_contraction": weeks_of_contraction,
+            "rs_rating": rs_rating,
+        },
+        index=df.index,
+    )
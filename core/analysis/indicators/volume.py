@@ -5,16 +5,33 @@
 数学原理：
 1. 移动平均与标准差用于量能放大判断。
 2. RSI / Bollinger / KDJ 用于动量与波动区间识别。
+3. 参数扫描：同一窗口的滚动统计只依赖窗口长度，多组参数按窗口去重后共享中间序列，
+   布林带宽度等仅作用于最终组合的参数不触发重算。
+4. 流式版本维护滑动窗口的和与平方和（以首个观测值平移后累计），
+   均值 = Σ(x-c)/n + c，方差 = Σ(x-c)²/n - (Σ(x-c)/n)²，每根 bar O(1) 更新。
 """
 
 from __future__ import annotations
 
+import math
+from collections import deque
 from dataclasses import dataclass
-from typing import Dict
+from typing import Dict, Sequence
 
 import numpy as np
 import pandas as pd
 
+from common.util_compact import compact_frame
+from core.analysis.indicators.rolling import (
+    RollingExtreme,
+    kdj_smooth,
+    rolling_max,
+    rolling_mean,
+    rolling_min,
+    rolling_std,
+    rsi_averages,
+)
+
 
 @dataclass(frozen=True)
 class VolumeIndicatorParams:
@@ -36,97 +53,133 @@ def _resolve_column(df: pd.DataFrame, name: str) -> pd.Series:
     raise KeyError(f"缺少列: {name}")
 
 
-def compute_volume_features(df: pd.DataFrame, params: VolumeIndicatorParams | None = None) -> pd.DataFrame:
-    """计算成交量策略所需的基础指标序列。"""
+VOLUME_FEATURE_COLUMNS = (
+    "ma_vol_today",
+    "ma_close_today",
+    "ma_vol_5",
+    "ma_close_5",
+    "ma_vol_20",
+    "ma_close_20",
+    "vol_std_5",
+    "vol_std_20",
+    "rsi",
+    "rsi_prev",
+    "boll_top",
+    "boll_bot",
+    "k",
+    "d",
+    "j",
+    "is_3_down",
+    "is_3_up",
+)
+_BOOL_COLUMNS = ("is_3_down", "is_3_up")
 
-    if params is None:
-        params = VolumeIndicatorParams()
 
-    # 解析 OHLCV 数据列（容错处理大小写）
-    open_ = _resolve_column(df, "open")
-    high = _resolve_column(df, "high")
-    low = _resolve_column(df, "low")
-    close = _resolve_column(df, "close")
-    volume = _resolve_column(df, "volume")
-
-    # ========== 成交量与收盘价的移动平均 ==========
-    # n1=1：今日均线（基本为原值）
-    ma_vol_today = volume.rolling(window=params.n1, min_periods=params.n1).mean()
-    ma_close_today = close.rolling(window=params.n1, min_periods=params.n1).mean()
-
-    # n2=5：5日均线，用于短期趋势识别
-    ma_vol_5 = volume.rolling(window=params.n2, min_periods=params.n2).mean()
-    ma_close_5 = close.rolling(window=params.n2, min_periods=params.n2).mean()
-
-    # n3=20：20日均线，用于中期趋势识别
-    ma_vol_20 = volume.rolling(window=params.n3, min_periods=params.n3).mean()
-    ma_close_20 = close.rolling(window=params.n3, min_periods=params.n3).mean()
-
-    # ========== 成交量标准差（量能波动程度） ==========
-    # 用于判断成交量是否显著放大或缩小
-    vol_std_5 = volume.rolling(window=params.n2, min_periods=params.n2).std(ddof=0)
-    vol_std_20 = volume.rolling(window=params.n3, min_periods=params.n3).std(ddof=0)
-
-    # ========== RSI（相对强弱指数）==========
-    # 衡量近期上涨与下跌的强度对比，范围 [0, 100]
-    delta = close.diff()  # 收盘价变化
-    rsi_up = delta.clip(lower=0)  # 仅保留上涨部分
-    rsi_down = -delta.clip(upper=0)  # 仅保留下跌部分（转正数）
-    
-    # 计算平均涨幅与平均跌幅
-    rsi_avg_up = rsi_up.rolling(window=params.rsi_period, min_periods=params.rsi_period).mean()
-    rsi_avg_down = rsi_down.rolling(window=params.rsi_period, min_periods=params.rsi_period).mean()
-    
-    # RSI = (平均涨幅 / (平均涨幅 + 平均跌幅)) * 100，避免除零
-    rsi = rsi_avg_up / (rsi_avg_up + rsi_avg_down + 1e-10) * 100
-
-    # ========== 布林带（Bollinger Bands）==========
-    # 用于识别价格的高低位置与波动区间
-    boll_mid = close.rolling(window=params.boll_period, min_periods=params.boll_period).mean()  # 中线
-    boll_std = close.rolling(window=params.boll_period, min_periods=params.boll_period).std(ddof=0)  # 标准差
-    boll_top = boll_mid + boll_std * params.boll_width  # 上轨（中线 + 2*std）
-    boll_bot = boll_mid - boll_std * params.boll_width  # 下轨（中线 - 2*std）
-
-    # ========== KDJ 指标（随机指标）==========
-    # 用于识别超买超卖状态
-    lowest = low.rolling(window=params.kdj_period, min_periods=params.kdj_period).min()  # N期最低价
-    highest_3 = high.rolling(window=3, min_periods=3).max()  # 3期最高价
-    lowest_3 = low.rolling(window=3, min_periods=3).min()  # 3期最低价
-    
-    # RSV（未成熟随机值）= (收盘价 - N期最低价) / (3期最高价 - 3期最低价) * 100
-    rsv = (close - lowest) / (highest_3 - lowest_3 + 1e-10) * 100
-    
-    # K线：RSV的3期简单移动平均
-    k = rsv.rolling(window=3, min_periods=3).mean()
-    
-    # D线：K线的3期简单移动平均
-    d = k.rolling(window=3, min_periods=3).mean()
-    
-    # J线：3*K - 2*D，用于增强信号灵敏度
-    j = 3 * k - 2 * d
-
-    # ========== 连续涨跌判断 ==========
-    # 用于识别连续上涨或下跌的模式
-    is_down = close < open_  # 下跌K线（收盘 < 开盘）
-    is_up = close > open_  # 上涨K线（收盘 > 开盘）
-    
-    # 连续3根下跌K线
-    is_3_down = (
-        is_down.rolling(window=3, min_periods=3)
-        .apply(lambda x: 1.0 if np.all(x) else 0.0, raw=True)
-        .astype(bool)
-    )
-    
-    # 连续3根上涨K线
-    is_3_up = (
-        is_up.rolling(window=3, min_periods=3)
-        .apply(lambda x: 1.0 if np.all(x) else 0.0, raw=True)
-        .astype(bool)
-    )
+class _VolumeFeatureKernel:
+    """
+    单段 OHLCV 数据上的特征计算核：按窗口长度缓存中间序列。
 
-    # ========== 返回特征 DataFrame ==========
-    features = pd.DataFrame(
-        {
+    同一窗口的均线/标准差、同一周期的 RSI 与 KDJ 只计算一次，多组参数共享；
+    compute_volume_features 与 compute_volume_feature_grid 均经由该核计算，结果逐位一致。
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        # 解析 OHLCV 数据列（容错处理大小写）
+        self.open = _resolve_column(df, "open").to_numpy(dtype=float)
+        self.high = _resolve_column(df, "high").to_numpy(dtype=float)
+        self.low = _resolve_column(df, "low").to_numpy(dtype=float)
+        self.close = _resolve_column(df, "close").to_numpy(dtype=float)
+        self.volume = _resolve_column(df, "volume").to_numpy(dtype=float)
+        # 成交量与收盘价同窗口统计合并为一个二维批次（行 0 = 成交量，行 1 = 收盘价）
+        self._vol_close = np.vstack([self.volume, self.close])
+        self._cache: Dict[tuple, object] = {}
+
+    def _memo(self, key: tuple, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def mean(self, window: int) -> np.ndarray:
+        """成交量与收盘价的 window 日均线，返回二维数组（行 0 = 成交量，行 1 = 收盘价）。"""
+        return self._memo(("mean", window), lambda: rolling_mean(self._vol_close, window))
+
+    def std(self, window: int) -> np.ndarray:
+        """成交量与收盘价的 window 日标准差（ddof=0），行序同 mean。"""
+        return self._memo(("std", window), lambda: rolling_std(self._vol_close, window))
+
+    def rsi(self, period: int) -> tuple[np.ndarray, np.ndarray]:
+        """RSI 与前一日 RSI。"""
+
+        def compute():
+            # 平均涨幅与平均跌幅：收盘价变化 clip 后的滚动均值
+            avg_up, avg_down = rsi_averages(self.close, period)
+            # RSI = (平均涨幅 / (平均涨幅 + 平均跌幅)) * 100，避免除零
+            rsi = avg_up / (avg_up + avg_down + 1e-10) * 100
+            rsi_prev = np.full_like(rsi, np.nan)  # 前一日 RSI（用于信号交叉判断）
+            rsi_prev[1:] = rsi[:-1]
+            return rsi, rsi_prev
+
+        return self._memo(("rsi", period), compute)
+
+    def kdj(self, period: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """KDJ 三线。"""
+
+        def compute():
+            lowest = rolling_min(self.low, period)  # N期最低价
+            highest_3, lowest_3 = self._memo(
+                ("range_3",), lambda: (rolling_max(self.high, 3), rolling_min(self.low, 3))
+            )  # 3期最高价 / 3期最低价
+            # RSV（未成熟随机值）= (收盘价 - N期最低价) / (3期最高价 - 3期最低价) * 100
+            rsv = (self.close - lowest) / (highest_3 - lowest_3 + 1e-10) * 100
+            # K线：RSV的3期简单移动平均；D线：K线的3期简单移动平均；J线：3*K - 2*D
+            return kdj_smooth(rsv, 3)
+
+        return self._memo(("kdj", period), compute)
+
+    def streaks(self) -> tuple[np.ndarray, np.ndarray]:
+        """连续 3 根下跌/上涨 K 线标记。"""
+
+        def compute():
+            is_down = (self.close < self.open).astype(float)  # 下跌K线（收盘 < 开盘）
+            is_up = (self.close > self.open).astype(float)  # 上涨K线（收盘 > 开盘）
+            # 连续3根下跌/上涨K线：3期最小值为 1；不足 3 根时为 NaN，与 astype(bool) 口径一致视为 True
+            return rolling_min(is_down, 3) != 0, rolling_min(is_up, 3) != 0
+
+        return self._memo(("streaks",), compute)
+
+    def features(self, params: VolumeIndicatorParams) -> Dict[str, np.ndarray]:
+        """按 VOLUME_FEATURE_COLUMNS 顺序返回一组参数下的全部特征序列。"""
+
+        # ========== 成交量与收盘价的移动平均 ==========
+        # n1=1：今日均线（基本为原值）；n2=5：短期趋势；n3=20：中期趋势
+        ma_vol_today, ma_close_today = self.mean(params.n1)
+        ma_vol_5, ma_close_5 = self.mean(params.n2)
+        ma_vol_20, ma_close_20 = self.mean(params.n3)
+
+        # ========== 成交量标准差（量能波动程度） ==========
+        # 用于判断成交量是否显著放大或缩小
+        vol_std_5 = self.std(params.n2)[0]
+        vol_std_20 = self.std(params.n3)[0]
+
+        # ========== RSI（相对强弱指数）==========
+        # 衡量近期上涨与下跌的强度对比，范围 [0, 100]
+        rsi, rsi_prev = self.rsi(params.rsi_period)
+
+        # ========== 布林带（Bollinger Bands）==========
+        # 用于识别价格的高低位置与波动区间
+        boll_mid = self.mean(params.boll_period)[1]  # 中线
+        boll_std = self.std(params.boll_period)[1]  # 标准差
+        boll_top = boll_mid + boll_std * params.boll_width  # 上轨（中线 + 2*std）
+        boll_bot = boll_mid - boll_std * params.boll_width  # 下轨（中线 - 2*std）
+
+        # ========== KDJ 指标（随机指标）==========
+        # 用于识别超买超卖状态
+        k, d, j = self.kdj(params.kdj_period)
+
+        # ========== 连续涨跌判断 ==========
+        is_3_down, is_3_up = self.streaks()
+
+        return {
             "ma_vol_today": ma_vol_today,
             "ma_close_today": ma_close_today,
             "ma_vol_5": ma_vol_5,
@@ -136,7 +189,7 @@ def compute_volume_features(df: pd.DataFrame, params: VolumeIndicatorParams | No
             "vol_std_5": vol_std_5,
             "vol_std_20": vol_std_20,
             "rsi": rsi,
-            "rsi_prev": rsi.shift(1),  # 前一日 RSI（用于信号交叉判断）
+            "rsi_prev": rsi_prev,
             "boll_top": boll_top,
             "boll_bot": boll_bot,
             "k": k,
@@ -144,11 +197,76 @@ def compute_volume_features(df: pd.DataFrame, params: VolumeIndicatorParams | No
             "j": j,
             "is_3_down": is_3_down,
             "is_3_up": is_3_up,
-        },
-        index=df.index,
-    )
+        }
 
-    return features
+
+def compute_volume_features(
+    df: pd.DataFrame, params: VolumeIndicatorParams | None = None, compact: bool = False
+) -> pd.DataFrame:
+    """
+    计算成交量策略所需的基础指标序列。
+
+    compact=True 时数值列以 float32、连续涨跌标记以 int8 返回（内部仍以 float64 计算）。
+    """
+
+    if params is None:
+        params = VolumeIndicatorParams()
+    features = pd.DataFrame(_VolumeFeatureKernel(df).features(params), index=df.index)
+    return compact_frame(features) if compact else features
+
+
+@dataclass(frozen=True)
+class VolumeFeatureGrid:
+    """
+    多组参数的成交量特征批量结果。
+
+    values 形状为 (参数组数, 特征数, bar 数)，第 i 组参数的特征表等于
+    compute_volume_features(df, params[i])。
+    """
+
+    params: tuple
+    columns: tuple
+    index: pd.Index
+    values: np.ndarray
+
+    def frame(self, position: int) -> pd.DataFrame:
+        """第 position 组参数的特征表（与 compute_volume_features 输出一致）。"""
+        frame = pd.DataFrame(self.values[position].T, index=self.index, columns=list(self.columns))
+        for name in _BOOL_COLUMNS:
+            frame[name] = frame[name].astype(bool)
+        return frame
+
+    def to_long(self) -> pd.DataFrame:
+        """长表：以 (param_id, 原索引) 为行索引，每列一个特征。"""
+        size = len(self.index)
+        index = pd.MultiIndex.from_arrays(
+            [np.repeat(np.arange(len(self.params)), size), np.tile(self.index.to_numpy(), len(self.params))],
+            names=["param_id", self.index.name],
+        )
+        flat = self.values.transpose(0, 2, 1).reshape(-1, len(self.columns))
+        frame = pd.DataFrame(flat, index=index, columns=list(self.columns))
+        for name in _BOOL_COLUMNS:
+            frame[name] = frame[name].astype(bool)
+        return frame
+
+
+def compute_volume_feature_grid(
+    df: pd.DataFrame, param_grid: Sequence[VolumeIndicatorParams]
+) -> VolumeFeatureGrid:
+    """
+    一次计算多组参数的成交量特征（参数扫描用）。
+
+    各组参数共用同一份输入与中间序列：相同窗口的均线/标准差、相同周期的 RSI/KDJ 只计算一次，
+    总开销取决于参数网格中不同窗口的个数，而非参数组数。
+    """
+    kernel = _VolumeFeatureKernel(df)
+    param_grid = tuple(param_grid)
+    values = np.empty((len(param_grid), len(VOLUME_FEATURE_COLUMNS), len(df)))
+    for position, params in enumerate(param_grid):
+        features = kernel.features(params)
+        for column, name in enumerate(VOLUME_FEATURE_COLUMNS):
+            values[position, column] = features[name]
+    return VolumeFeatureGrid(params=param_grid, columns=VOLUME_FEATURE_COLUMNS, index=df.index, values=values)
 
 
 def compute_latest_volume_features(
@@ -161,3 +279,325 @@ def compute_latest_volume_features(
         return {}
     latest = features.iloc[-1]
     return latest.to_dict()
+
+
+def volume_signal_warmup(params: VolumeIndicatorParams | None = None) -> int:
+    """
+    信号所需的前置 bar 数：第 t 根 bar 的特征只依赖 [t - warmup, t] 的数据。
+
+    RSI 比较前一日值且差分多占一根（rsi_period + 2），KDJ 在 N 期最低价后再做两次 3 期平滑（kdj_period + 4）。
+    """
+    if params is None:
+        params = VolumeIndicatorParams()
+    return max(params.n1, params.n2, params.n3, params.boll_period, params.rsi_period + 2, params.kdj_period + 4)
+
+
+def truncate_volume_features(
+    features: pd.DataFrame, params: VolumeIndicatorParams | None = None, window: int | None = None
+) -> pd.DataFrame:
+    """
+    逐 bar 只用最近 window 根 bar 计算特征时的取值（整段特征表的同一 bar 上按窗口截断）。
+
+    均线、标准差、布林带只看各自周期内的数据，周期不超过 window 时与整段计算相同；
+    RSI 前值需要 rsi_period + 2 根、K 线需要 kdj_period + 2 根、D/J 线需要 kdj_period + 4 根，
+    超过 window 时窗口内算不出，置为 NaN（NaN 参与的比较恒为假）。
+    """
+    if params is None:
+        params = VolumeIndicatorParams()
+    if window is None:
+        window = max(params.n3, params.rsi_period + 1, params.boll_period, params.kdj_period, 3)
+    required = {
+        "ma_vol_today": params.n1,
+        "ma_close_today": params.n1,
+        "ma_vol_5": params.n2,
+        "ma_close_5": params.n2,
+        "ma_vol_20": params.n3,
+        "ma_close_20": params.n3,
+        "vol_std_5": params.n2,
+        "vol_std_20": params.n3,
+        "rsi": params.rsi_period + 1,
+        "rsi_prev": params.rsi_period + 2,
+        "boll_top": params.boll_period,
+        "boll_bot": params.boll_period,
+        "k": params.kdj_period + 2,
+        "d": params.kdj_period + 4,
+        "j": params.kdj_period + 4,
+    }
+    missing = [name for name, bars in required.items() if bars > window]
+    if not missing:
+        return features
+    features = features.copy()
+    features[missing] = np.nan
+    return features
+
+
+def compute_volume_signals(
+    df: pd.DataFrame,
+    params: VolumeIndicatorParams | None = None,
+    features: pd.DataFrame | None = None,
+    min_len: int | None = None,
+    compact: bool = False,
+    bar_offset: int = 0,
+) -> pd.DataFrame:
+    """
+    向量化计算成交量主信号与增强信号（与指标逐 bar 判定规则一致）。
+
+    Args:
+        df: 完整 OHLC 数据（行序即 bar 序）
+        params: 指标参数
+        features: 已计算好的特征（为空时内部调用 compute_volume_features）
+        min_len: 最小有效 bar 数（len(self) < min_len 时不产生信号）
+        compact: 为 True 时信号列以 int8（0/1）返回
+        bar_offset: df 第 0 行之前已有的 bar 数（只计算历史尾段时使用，第 i 行的 bar 序号为 i + bar_offset + 1）
+
+    Returns:
+        DataFrame: main_buy / main_sell / enhanced_buy / enhanced_sell 四列布尔值
+    """
+
+    if params is None:
+        params = VolumeIndicatorParams()
+    if features is None:
+        features = compute_volume_features(df, params)
+    if min_len is None:
+        min_len = max(params.n3, params.rsi_period + 1, params.boll_period, params.kdj_period, 3)
+
+    low = _resolve_column(df, "low").to_numpy(dtype=float)
+    high = _resolve_column(df, "high").to_numpy(dtype=float)
+    close = _resolve_column(df, "close").to_numpy(dtype=float)
+
+    ma_vol_today = features["ma_vol_today"].to_numpy(dtype=float)
+    ma_close_today = features["ma_close_today"].to_numpy(dtype=float)
+    ma_vol_5 = features["ma_vol_5"].to_numpy(dtype=float)
+    ma_close_5 = features["ma_close_5"].to_numpy(dtype=float)
+    ma_vol_20 = features["ma_vol_20"].to_numpy(dtype=float)
+    ma_close_20 = features["ma_close_20"].to_numpy(dtype=float)
+    vol_std_5 = features["vol_std_5"].to_numpy(dtype=float)
+    vol_std_20 = features["vol_std_20"].to_numpy(dtype=float)
+    rsi = features["rsi"].to_numpy(dtype=float)
+    rsi_prev = features["rsi_prev"].to_numpy(dtype=float)
+    boll_top = features["boll_top"].to_numpy(dtype=float)
+    boll_bot = features["boll_bot"].to_numpy(dtype=float)
+    k_val = features["k"].to_numpy(dtype=float)
+    d_val = features["d"].to_numpy(dtype=float)
+    j_val = features["j"].to_numpy(dtype=float)
+    is_3_down = features["is_3_down"].to_numpy(dtype=bool)
+    is_3_up = features["is_3_up"].to_numpy(dtype=bool)
+
+    # bar 序号（对应 backtrader 中的 len(self)）
+    bar_count = np.arange(1, len(df) + 1) + bar_offset
+
+    with np.errstate(invalid="ignore"):
+        # ========== 成交量倍数与量能计数 ==========
+        vol_multiplier_5 = 0.9 + np.minimum(vol_std_5 / (ma_vol_5 + 1e-10), 0.6)
+        vol_multiplier_20 = 0.8 + np.minimum(vol_std_20 / (ma_vol_20 + 1e-10), 0.5)
+        vo_count_5 = np.where(ma_vol_today > ma_vol_5 * vol_multiplier_5, ma_vol_today - ma_vol_5, 0.0)
+        vo_count_20 = np.where(ma_vol_today > ma_vol_20 * vol_multiplier_20, ma_vol_today - ma_vol_20, 0.0)
+
+        # ========== 均线方向计数 ==========
+        ma_count_buy_5 = np.where(is_3_down & (ma_close_5 > ma_close_today), ma_close_5 - ma_close_today, 0.0)
+        ma_count_sell_5 = np.where(is_3_up & (ma_close_5 < ma_close_today), ma_close_today - ma_close_5, 0.0)
+        ma_count_buy_20 = np.where(is_3_down & (ma_close_20 > ma_close_today), ma_close_20 - ma_close_today, 0.0)
+        ma_count_sell_20 = np.where(is_3_up & (ma_close_20 < ma_close_today), ma_close_today - ma_close_20, 0.0)
+
+        # ========== 综合信号（乘积非零即计数） ==========
+        buy_signal_5 = np.where((vo_count_5 > 0) & (ma_count_buy_5 > 0), -vo_count_5 * ma_count_buy_5, 0.0)
+        sell_signal_5 = np.where((vo_count_5 > 0) & (ma_count_sell_5 > 0), vo_count_5 * ma_count_sell_5, 0.0)
+        buy_signal_20 = np.where((vo_count_20 > 0) & (ma_count_buy_20 > 0), -vo_count_20 * ma_count_buy_20, 0.0)
+        sell_signal_20 = np.where((vo_count_20 > 0) & (ma_count_sell_20 > 0), vo_count_20 * ma_count_sell_20, 0.0)
+
+        buy_signal_count = (buy_signal_5 != 0).astype(int) + (buy_signal_20 != 0).astype(int)
+        sell_signal_count = (sell_signal_5 != 0).astype(int) + (sell_signal_20 != 0).astype(int)
+
+        valid = bar_count >= min_len
+        main_buy = valid & (buy_signal_count >= 2) & (bar_count > 50)
+        main_sell = valid & (sell_signal_count >= 2) & (bar_count > 50)
+
+        # ========== RSI / 布林带 / KDJ 条件 ==========
+        rsi_ready = bar_count > params.rsi_period
+        rsi_buy = (rsi < 30) | (rsi_ready & (rsi > 30) & (rsi_prev < 30))
+        rsi_sell = (rsi > 70) | (rsi_ready & (rsi < 70) & (rsi_prev > 70))
+        boll_buy = (low < boll_bot) | (close > boll_bot)
+        boll_sell = (high > boll_top) | (close < boll_top)
+        kdj_buy = ((k_val < 20) & (d_val < 20)) | (j_val < 20)
+        kdj_sell = ((k_val > 80) & (d_val > 80)) | (j_val > 80)
+
+    enhanced_buy = main_buy & rsi_buy & boll_buy & kdj_buy
+    enhanced_sell = main_sell & rsi_sell & boll_sell & kdj_sell
+
+    signals = pd.DataFrame(
+        {
+            "main_buy": main_buy,
+            "main_sell": main_sell,
+            "enhanced_buy": enhanced_buy,
+            "enhanced_sell": enhanced_sell,
+        },
+        index=df.index,
+    )
+    return compact_frame(signals) if compact else signals
+
+
+class _RollingSum:
+    """定长窗口的滑动和与平方和，O(1) 更新；窗口内含 NaN 时输出 NaN（与 pandas min_periods=window 一致）。"""
+
+    # 每累计若干次增删后按窗口重算一次，抑制浮点误差漂移（摊还 O(1)）
+    _RESYNC_INTERVAL = 1024
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque()
+        self.shift: float | None = None
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.nan_count = 0
+        self._updates = 0
+
+    def push(self, value: float) -> None:
+        if math.isnan(value):
+            self.nan_count += 1
+        else:
+            if self.shift is None:
+                self.shift = value
+            diff = value - self.shift
+            self.total += diff
+            self.total_sq += diff * diff
+        self.values.append(value)
+        if len(self.values) > self.window:
+            self._remove(self.values.popleft())
+        self._updates += 1
+        if self._updates >= self._RESYNC_INTERVAL:
+            self._resync()
+
+    def _remove(self, value: float) -> None:
+        if math.isnan(value):
+            self.nan_count -= 1
+            return
+        diff = value - self.shift
+        self.total -= diff
+        self.total_sq -= diff * diff
+
+    def _resync(self) -> None:
+        diffs = [value - self.shift for value in self.values if not math.isnan(value)] if self.shift is not None else []
+        self.total = math.fsum(diffs)
+        self.total_sq = math.fsum(diff * diff for diff in diffs)
+        self._updates = 0
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window and self.nan_count == 0
+
+    def mean(self) -> float:
+        if not self.ready:
+            return math.nan
+        return self.shift + self.total / self.window
+
+    def std(self) -> float:
+        """总体标准差（ddof=0）。"""
+        if not self.ready:
+            return math.nan
+        mean_diff = self.total / self.window
+        variance = self.total_sq / self.window - mean_diff * mean_diff
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+
+class VolumeFeatureStream:
+    """
+    成交量特征的流式累加器：逐根输入 OHLCV，输出与 compute_latest_volume_features 相同的特征字典。
+
+    每次 update 只做常数次浮点运算与双端队列操作，不构造任何 pandas 对象，
+    适用于实时行情与增量计算场景。
+    """
+
+    def __init__(self, params: VolumeIndicatorParams | None = None):
+        if params is None:
+            params = VolumeIndicatorParams()
+        self.params = params
+        self.bar_count = 0
+
+        self._vol_today = _RollingSum(params.n1)
+        self._close_today = _RollingSum(params.n1)
+        self._vol_5 = _RollingSum(params.n2)
+        self._close_5 = _RollingSum(params.n2)
+        self._vol_20 = _RollingSum(params.n3)
+        self._close_20 = _RollingSum(params.n3)
+        self._rsi_up = _RollingSum(params.rsi_period)
+        self._rsi_down = _RollingSum(params.rsi_period)
+        self._boll = _RollingSum(params.boll_period)
+        self._lowest = RollingExtreme(params.kdj_period, "min")
+        self._highest_3 = RollingExtreme(3, "max")
+        self._lowest_3 = RollingExtreme(3, "min")
+        self._rsv = _RollingSum(3)
+        self._k = _RollingSum(3)
+
+        self._prev_close = math.nan
+        self._prev_rsi = math.nan
+        self._down_run = 0
+        self._up_run = 0
+
+    def update(self, open_: float, high: float, low: float, close: float, volume: float) -> Dict[str, float | bool]:
+        """输入一根 K 线，返回该 bar 的最新特征。"""
+
+        params = self.params
+        open_, high, low, close, volume = float(open_), float(high), float(low), float(close), float(volume)
+        self.bar_count += 1
+
+        # ========== 均线与成交量标准差 ==========
+        for window in (self._vol_today, self._vol_5, self._vol_20):
+            window.push(volume)
+        for window in (self._close_today, self._close_5, self._close_20, self._boll):
+            window.push(close)
+
+        # ========== RSI：涨跌幅滑动均值 ==========
+        delta = close - self._prev_close
+        self._prev_close = close
+        if math.isnan(delta):
+            self._rsi_up.push(math.nan)
+            self._rsi_down.push(math.nan)
+        else:
+            self._rsi_up.push(max(delta, 0.0))
+            self._rsi_down.push(-min(delta, 0.0))
+        rsi_avg_up = self._rsi_up.mean()
+        rsi_avg_down = self._rsi_down.mean()
+        rsi = rsi_avg_up / (rsi_avg_up + rsi_avg_down + 1e-10) * 100
+        rsi_prev = self._prev_rsi
+        self._prev_rsi = rsi
+
+        # ========== 布林带 ==========
+        boll_mid = self._boll.mean()
+        boll_std = self._boll.std()
+
+        # ========== KDJ ==========
+        self._lowest.push(low)
+        self._highest_3.push(high)
+        self._lowest_3.push(low)
+        lowest = self._lowest.value()
+        rsv = (close - lowest) / (self._highest_3.value() - self._lowest_3.value() + 1e-10) * 100
+        self._rsv.push(rsv)
+        k = self._rsv.mean()
+        self._k.push(k)
+        d = self._k.mean()
+
+        # ========== 连续涨跌计数 ==========
+        self._down_run = self._down_run + 1 if close < open_ else 0
+        self._up_run = self._up_run + 1 if close > open_ else 0
+        # 与批量版一致：不足 3 根时滚动结果为 NaN，astype(bool) 后为 True
+        warming_up = self.bar_count < 3
+
+        return {
+            "ma_vol_today": self._vol_today.mean(),
+            "ma_close_today": self._close_today.mean(),
+            "ma_vol_5": self._vol_5.mean(),
+            "ma_close_5": self._close_5.mean(),
+            "ma_vol_20": self._vol_20.mean(),
+            "ma_close_20": self._close_20.mean(),
+            "vol_std_5": self._vol_5.std(),
+            "vol_std_20": self._vol_20.std(),
+            "rsi": rsi,
+            "rsi_prev": rsi_prev,
+            "boll_top": boll_mid + boll_std * params.boll_width,
+            "boll_bot": boll_mid - boll_std * params.boll_width,
+            "k": k,
+            "d": d,
+            "j": 3 * k - 2 * d,
+            "is_3_down": warming_up or self._down_run >= 3,
+            "is_3_up": warming_up or self._up_run >= 3,
+        }
@@ -0,0 +1,409 @@
+"""
+热点循环内核：可选 Numba JIT 后端，未安装时回退为纯 NumPy/Python 实现。
+
+无法用 NumPy 数组运算干净表达的顺序依赖循环集中在这里，两套后端逐位一致：
+- VCP 高低点交替修正与收缩配对
+- RSRS 持仓状态机（滞回阈值）
+- 回测报告的逐笔持仓/资金推演
+- 蒙特卡洛价格路径
+
+后端在导入时按 settings.KERNEL_BACKEND 选择（"auto" 在安装 numba 时使用 JIT），
+运行期可用 set_kernel_backend 强制切换。
+
+数学原理：
+1. 高低点交替修正：双指针合并两个有序极值下标序列，连续同类极值只保留最后一个，
+   序列末尾按相同规则补齐，保证高低点交替出现。
+2. 收缩配对：从最新的低点向前找时间更早的高点配对，收缩幅度 = (高点 - 低点) / 高点 × 100。
+3. 滞回状态机：信号 > 上阈值置 1，< 下阈值置 0，其余（含缺失值）保持前一状态，
+   等价于对"触发点状态"做前向填充。
+4. 持仓推演：按成交顺序累计持仓量、持仓成本与现金，逐 bar 取最后一笔成交后的状态，
+   总资产 = 现金 + 持仓量 × 收盘价。
+5. 几何随机游走：P_t = max(0, P_{t-1} + ε_t · P_{t-1})，各路径独立。
+"""
+
+from __future__ import annotations
+
+import warnings
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+import settings
+
+try:
+    import numba
+except ImportError:  # 未安装 JIT 依赖时只提供 NumPy 后端
+    numba = None
+
+KERNEL_BACKENDS = ("numpy", "numba")
+NUMBA_AVAILABLE = numba is not None
+
+
+# ---------------------------------------------------------------------------
+# NumPy 后端
+# ---------------------------------------------------------------------------
+
+def _adjust_local_high_low_numpy(local_high: np.ndarray, local_low: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    i = 0
+    j = 0
+    adjusted_high: list[int] = []
+    adjusted_low: list[int] = []
+
+    while i < len(local_high) and j < len(local_low):
+        if local_high[i] < local_low[j]:
+            while i < len(local_high) and local_high[i] < local_low[j]:
+                i += 1
+            if i > 0:
+                adjusted_high.append(local_high[i - 1])
+        elif local_high[i] > local_low[j]:
+            while j < len(local_low) and local_high[i] > local_low[j]:
+                j += 1
+            if j > 0:
+                adjusted_low.append(local_low[j - 1])
+        else:
+            i += 1
+            j += 1
+
+    if i < len(local_high) and adjusted_high and j > 0:
+        adjusted_high.pop(-1)
+        while i < len(local_high) and local_high[i] > local_low[j - 1]:
+            i += 1
+        if i > 0:
+            adjusted_high.append(local_high[i - 1])
+        adjusted_high.append(local_high[-1])
+        adjusted_low.append(local_low[j - 1])
+
+    if j < len(local_low) and adjusted_low and i > 0:
+        adjusted_low.pop(-1)
+        while j < len(local_low) and local_high[i - 1] > local_low[j]:
+            j += 1
+        if j > 0:
+            adjusted_low.append(local_low[j - 1])
+        adjusted_low.append(local_low[-1])
+        adjusted_high.append(local_high[i - 1])
+
+    return np.array(adjusted_high, dtype=np.int64), np.array(adjusted_low, dtype=np.int64)
+
+
+def _contraction_depths_numpy(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    local_high: np.ndarray,
+    local_low: np.ndarray,
+    skip_zero_high: bool,
+) -> np.ndarray:
+    depths = []
+    high_idx = local_high[::-1]
+    low_idx = local_low[::-1]
+    i = 0
+    j = 0
+    while i < len(low_idx) and j < len(high_idx):
+        if low_idx[i] > high_idx[j]:
+            high_val = highs[high_idx[j]]
+            if high_val != 0 or not skip_zero_high:
+                depths.append((high_val - lows[low_idx[i]]) / high_val * 100)
+            i += 1
+            j += 1
+        else:
+            j += 1
+    return np.array(depths, dtype=float)
+
+
+def _hysteresis_position_numpy(values: np.ndarray, upper: float, lower: float) -> np.ndarray:
+    state = np.full(values.shape, np.nan)
+    state[values < lower] = 0.0
+    state[values > upper] = 1.0
+    # 前向填充触发点状态，首个触发点之前为 0
+    triggered = ~np.isnan(state)
+    last = np.maximum.accumulate(np.where(triggered, np.arange(values.size), -1))
+    position = np.where(last >= 0, state[np.maximum(last, 0)], 0.0)
+    return position
+
+
+def _trade_walk_loop(
+    is_buy: np.ndarray,
+    price: np.ndarray,
+    size: np.ndarray,
+    commission: np.ndarray,
+    initial_capital: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    count = len(is_buy)
+    holdings = np.zeros(count)
+    adjusted = np.zeros(count)
+    capital = np.zeros(count)
+    total_holdings = 0.0
+    total_cost = 0.0
+    adjusted_cost = 0.0
+    cash = float(initial_capital)
+    for k in range(count):
+        if is_buy[k]:
+            current_cost = size[k] * price[k] + commission[k]
+            total_cost += current_cost
+            cash -= current_cost
+            total_holdings += size[k]
+            adjusted_cost = total_cost / total_holdings
+        else:
+            current_cost = size[k] * price[k] - commission[k]
+            total_cost -= current_cost
+            cash += current_cost
+            total_holdings -= size[k]
+            if total_holdings <= 0:
+                adjusted_cost = 0.0
+                total_cost = 0.0
+                total_holdings = 0.0
+            else:
+                adjusted_cost = total_cost / total_holdings
+        holdings[k] = total_holdings
+        adjusted[k] = adjusted_cost
+        capital[k] = cash
+    return holdings, adjusted, capital
+
+
+def _gbm_final_prices_numpy(start_price: float, shocks: np.ndarray) -> np.ndarray:
+    prices = np.full(shocks.shape[0], float(start_price))
+    for i in range(1, shocks.shape[1]):
+        prices = np.maximum(0, prices + shocks[:, i] * prices)
+    return prices
+
+
+# ---------------------------------------------------------------------------
+# Numba 后端（与 NumPy 后端逐位一致，首次调用时编译）
+# ---------------------------------------------------------------------------
+
+def _adjust_local_high_low_loop(local_high: np.ndarray, local_low: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    n_high = local_high.shape[0]
+    n_low = local_low.shape[0]
+    out_high = np.empty(n_high + 4, dtype=np.int64)
+    out_low = np.empty(n_low + 4, dtype=np.int64)
+    k_high = 0
+    k_low = 0
+    i = 0
+    j = 0
+    while i < n_high and j < n_low:
+        if local_high[i] < local_low[j]:
+            while i < n_high and local_high[i] < local_low[j]:
+                i += 1
+            if i > 0:
+                out_high[k_high] = local_high[i - 1]
+                k_high += 1
+        elif local_high[i] > local_low[j]:
+            while j < n_low and local_high[i] > local_low[j]:
+                j += 1
+            if j > 0:
+                out_low[k_low] = local_low[j - 1]
+                k_low += 1
+        else:
+            i += 1
+            j += 1
+
+    if i < n_high and k_high > 0 and j > 0:
+        k_high -= 1
+        while i < n_high and local_high[i] > local_low[j - 1]:
+            i += 1
+        if i > 0:
+            out_high[k_high] = local_high[i - 1]
+            k_high += 1
+        out_high[k_high] = local_high[n_high - 1]
+        k_high += 1
+        out_low[k_low] = local_low[j - 1]
+        k_low += 1
+
+    if j < n_low and k_low > 0 and i > 0:
+        k_low -= 1
+        while j < n_low and local_high[i - 1] > local_low[j]:
+            j += 1
+        if j > 0:
+            out_low[k_low] = local_low[j - 1]
+            k_low += 1
+        out_low[k_low] = local_low[n_low - 1]
+        k_low += 1
+        out_high[k_high] = local_high[i - 1]
+        k_high += 1
+
+    return out_high[:k_high].copy(), out_low[:k_low].copy()
+
+
+def _contraction_depths_loop(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    local_high: np.ndarray,
+    local_low: np.ndarray,
+    skip_zero_high: bool,
+) -> np.ndarray:
+    n_high = local_high.shape[0]
+    n_low = local_low.shape[0]
+    depths = np.empty(min(n_high, n_low), dtype=np.float64)
+    count = 0
+    i = 0
+    j = 0
+    while i < n_low and j < n_high:
+        low_pos = local_low[n_low - 1 - i]
+        high_pos = local_high[n_high - 1 - j]
+        if low_pos > high_pos:
+            high_val = highs[high_pos]
+            if high_val != 0 or not skip_zero_high:
+                depths[count] = (high_val - lows[low_pos]) / high_val * 100
+                count += 1
+            i += 1
+            j += 1
+        else:
+            j += 1
+    return depths[:count].copy()
+
+
+def _hysteresis_position_loop(values: np.ndarray, upper: float, lower: float) -> np.ndarray:
+    position = np.zeros(values.shape[0])
+    current = 0.0
+    for i in range(values.shape[0]):
+        value = values[i]
+        if value > upper:
+            current = 1.0
+        elif value < lower:
+            current = 0.0
+        position[i] = current
+    return position
+
+
+def _gbm_final_prices_loop(start_price: float, shocks: np.ndarray) -> np.ndarray:
+    runs, days = shocks.shape
+    prices = np.empty(runs)
+    for r in range(runs):
+        price = start_price
+        for i in range(1, days):
+            price = max(0.0, price + shocks[r, i] * price)
+        prices[r] = price
+    return prices
+
+
+_NUMPY_KERNELS: Dict[str, Callable] = {
+    "adjust_local_high_low": _adjust_local_high_low_numpy,
+    "contraction_depths": _contraction_depths_numpy,
+    "hysteresis_position": _hysteresis_position_numpy,
+    "trade_walk": _trade_walk_loop,
+    "gbm_final_prices": _gbm_final_prices_numpy,
+}
+_LOOP_KERNELS: Dict[str, Callable] = {
+    "adjust_local_high_low": _adjust_local_high_low_loop,
+    "contraction_depths": _contraction_depths_loop,
+    "hysteresis_position": _hysteresis_position_loop,
+    "trade_walk": _trade_walk_loop,
+    "gbm_final_prices": _gbm_final_prices_loop,
+}
+_numba_kernels: Dict[str, Callable] = {}
+
+
+def _compiled(name: str) -> Callable:
+    kernel = _numba_kernels.get(name)
+    if kernel is None:
+        kernel = numba.njit(cache=True, nogil=True, error_model="numpy")(_LOOP_KERNELS[name])
+        _numba_kernels[name] = kernel
+    return kernel
+
+
+def _resolve_backend(name: str) -> str:
+    name = (name or "auto").lower()
+    if name == "auto":
+        return "numba" if NUMBA_AVAILABLE else "numpy"
+    if name not in KERNEL_BACKENDS:
+        raise ValueError(f"未知内核后端: {name}（可选 auto/{'/'.join(KERNEL_BACKENDS)}）")
+    if name == "numba" and not NUMBA_AVAILABLE:
+        raise ImportError("未安装 numba，无法使用 numba 内核后端")
+    return name
+
+
+def _initial_backend() -> str:
+    configured = getattr(settings, "KERNEL_BACKEND", "auto")
+    try:
+        return _resolve_backend(configured)
+    except ImportError as exc:
+        warnings.warn(f"{exc}，回退为 numpy 内核后端", RuntimeWarning, stacklevel=2)
+        return "numpy"
+
+
+_backend = _initial_backend()
+
+
+def available_kernel_backends() -> Tuple[str, ...]:
+    """当前环境可用的内核后端。"""
+    return tuple(name for name in KERNEL_BACKENDS if name != "numba" or NUMBA_AVAILABLE)
+
+
+def get_kernel_backend() -> str:
+    """当前使用的内核后端（"numpy" 或 "numba"）。"""
+    return _backend
+
+
+def set_kernel_backend(name: str) -> str:
+    """强制切换内核后端（"auto"/"numpy"/"numba"），返回之前的后端；numba 未安装时强制 numba 抛 ImportError。"""
+    global _backend
+    previous = _backend
+    _backend = _resolve_backend(name)
+    return previous
+
+
+def _kernel(name: str) -> Callable:
+    if _backend == "numba":
+        return _compiled(name)
+    return _NUMPY_KERNELS[name]
+
+
+def adjust_local_high_low(local_high: np.ndarray, local_low: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """按 VCPPlus 规则修正局部高低点下标，使高低点交替出现。"""
+    local_high = np.ascontiguousarray(local_high, dtype=np.int64)
+    local_low = np.ascontiguousarray(local_low, dtype=np.int64)
+    if local_high.size == 0 or local_low.size == 0:
+        return np.array([], dtype=int), np.array([], dtype=int)
+    return _kernel("adjust_local_high_low")(local_high, local_low)
+
+
+def contraction_depths(
+    highs: np.ndarray,
+    lows: np.ndarray,
+    local_high: np.ndarray,
+    local_low: np.ndarray,
+    skip_zero_high: bool = False,
+) -> list[float]:
+    """
+    从最新的低点向前与更早的高点配对，返回收缩幅度（百分比，保留两位小数，按时间从新到旧）。
+
+    参数：
+    - skip_zero_high: 是否跳过高点价格为 0 的配对（否则按浮点除法得到 inf/nan）
+    """
+    depths = _kernel("contraction_depths")(
+        np.ascontiguousarray(highs, dtype=float),
+        np.ascontiguousarray(lows, dtype=float),
+        np.ascontiguousarray(local_high, dtype=np.int64),
+        np.ascontiguousarray(local_low, dtype=np.int64),
+        bool(skip_zero_high),
+    )
+    return list(np.round(depths, 2))
+
+
+def hysteresis_position(values: np.ndarray, upper: float, lower: float) -> np.ndarray:
+    """滞回状态机：值 > upper 置 1，< lower 置 0，其余（含 NaN）保持前一状态，初始为 0。"""
+    return _kernel("hysteresis_position")(np.ascontiguousarray(values, dtype=float), float(upper), float(lower))
+
+
+def trade_walk(
+    is_buy: np.ndarray,
+    price: np.ndarray,
+    size: np.ndarray,
+    commission: np.ndarray,
+    initial_capital: float,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    按成交顺序推演持仓，返回每笔成交后的 (持仓量, 持仓成本, 现金)。
+    卖出后持仓不大于 0 时持仓量与持仓成本清零。
+    """
+    return _kernel("trade_walk")(
+        np.ascontiguousarray(is_buy, dtype=np.bool_),
+        np.ascontiguousarray(price, dtype=float),
+        np.ascontiguousarray(size, dtype=float),
+        np.ascontiguousarray(commission, dtype=float),
+        float(initial_capital),
+    )
+
+
+def gbm_final_prices(start_price: float, shocks: np.ndarray) -> np.ndarray:
+    """几何随机游走各路径的期末价格（shocks 形状 (runs, days)，第 0 天冲击不使用）。"""
+    return _kernel("gbm_final_prices")(float(start_price), np.ascontiguousarray(shocks, dtype=float))
@@ -12,25 +12,22 @@ Minervini 趋势模板过滤器（简化版）。
 
 from __future__ import annotations
 
-import numpy as np
 import pandas as pd
 
+from core.analysis.indicators.registry import FeatureRegistry, get_registry
+from core.analysis.indicators.rolling import rolling_slope
 
-def _slope(values: np.ndarray) -> float:
-    if len(values) < 2:
-        return 0.0
-    x = np.arange(1, len(values) + 1, dtype=float)
-    y = values.astype(float)
-    numerator = (len(values) * (x * y).sum()) - (x.sum() * y.sum())
-    denominator = (len(values) * (x * x).sum()) - (x.sum() ** 2)
-    if denominator == 0:
-        return 0.0
-    return numerator / denominator
 
-
-def minervini_trend_template(df: pd.DataFrame) -> pd.DataFrame:
+def minervini_trend_template(
+    df: pd.DataFrame,
+    registry: FeatureRegistry | None = None,
+    symbol: str | None = None,
+) -> pd.DataFrame:
     """
     返回包含 Pass 列的 DataFrame。
+
+    registry 为基于同一 df 的特征注册表时，均线与 MA200 斜率从注册表读取（与其他指标共享）；
+    未传 registry 但给出 symbol 时使用该标的的进程级共享注册表（get_registry）。
     """
     data = df.copy()
     data.columns = [str(col).strip().lower() for col in data.columns]
@@ -38,15 +35,26 @@ def minervini_trend_template(df: pd.DataFrame) -> pd.DataFrame:
         if col not in data.columns:
             raise ValueError(f"缺少必要列: {col}")
 
-    data["ma_50"] = data["close"].rolling(window=50).mean()
-    data["ma_150"] = data["close"].rolling(window=150).mean()
-    data["ma_200"] = data["close"].rolling(window=200).mean()
+    if registry is None and symbol:
+        registry = get_registry(symbol, data)
+
+    if registry is not None:
+        registry.check(data)
+        data["ma_50"] = registry.values(registry.sma("close", 50))
+        data["ma_150"] = registry.values(registry.sma("close", 150))
+        data["ma_200"] = registry.values(registry.sma("close", 200))
+        slope_values = registry.values(registry.slope(registry.sma("close", 200), 20))
+    else:
+        data["ma_50"] = data["close"].rolling(window=50).mean()
+        data["ma_150"] = data["close"].rolling(window=150).mean()
+        data["ma_200"] = data["close"].rolling(window=200).mean()
+        slope_values = rolling_slope(data["ma_200"].to_numpy(dtype=float), 20)
 
     data["condition_1"] = (data["close"] > data["ma_150"]) & (data["close"] > data["ma_200"]) & (
         data["close"] > data["ma_50"]
     )
     data["condition_2"] = (data["ma_150"] > data["ma_200"]) & (data["ma_50"] > data["ma_150"])
-    slope = data["ma_200"].rolling(window=20).apply(lambda x: _slope(x), raw=False)
+    slope = pd.Series(slope_values, index=data.index)
     data["condition_3"] = slope > 0.0
 
     data["pass"] = data[["condition_1", "condition_2", "condition_3"]].all(axis="columns")
@@ -6,15 +6,18 @@ RSI 信号示例（简化版）。
 
 数学原理：
 1. RSI = 100 - 100 / (1 + RS)
-2. RS = 平均上涨幅度 / 平均下跌幅度（使用滚动均值）
+2. RS = 平均上涨幅度 / 平均下跌幅度（使用滚动均值），平均下跌幅度为 0 时 RSI 记为缺失
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 
+from core.analysis.indicators.rolling import rsi_averages
+
 
 @dataclass(frozen=True)
 class RsiConfig:
@@ -34,15 +37,9 @@ def compute_rsi_signal(df: pd.DataFrame, config: RsiConfig | None = None) -> pd.
     if "close" not in data.columns:
         raise ValueError("缺少 close 列，无法计算 RSI。")
 
-    delta = data["close"].diff()
-    gain = delta.where(delta > 0, 0.0)
-    loss = -delta.where(delta < 0, 0.0)
-
-    avg_gain = gain.rolling(window=config.period).mean()
-    avg_loss = loss.rolling(window=config.period).mean()
-    rs = avg_gain / avg_loss.replace(0, pd.NA)
-    rsi = 100 - (100 / (1 + rs))
-    data["rsi"] = rsi
+    avg_gain, avg_loss = rsi_averages(data["close"].to_numpy(dtype=float), config.period, missing_as_zero=True)
+    rs = np.divide(avg_gain, avg_loss, out=np.full_like(avg_gain, np.nan), where=avg_loss != 0)
+    data["rsi"] = 100 - (100 / (1 + rs))
     data["rsi_signal"] = 0
     data.loc[data["rsi"] <= config.oversold, "rsi_signal"] = 1
     data.loc[data["rsi"] >= config.overbought, "rsi_signal"] = -1
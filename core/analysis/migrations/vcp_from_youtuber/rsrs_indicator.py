@@ -8,15 +8,23 @@ RSRS 指标实现（向量化）。
 1. 以低价为自变量、最高价为因变量，计算滚动线性回归斜率 Beta。
 2. 计算 Beta 的 Z-Score（窗口 M）。
 3. 修正指标：RSRS = Zscore * R2。
+4. 持仓：Zscore 上穿买入阈值置 1、下穿卖出阈值置 0，其余保持（对触发点状态前向填充）。
+5. 流式版本：窗口内 Σx、Σy、Σx²、Σy²、Σxy 滑动增减（先减去首个值抑制大数相消），
+   Beta = Sxy / Sxx，R² = Sxy² / (Sxx·Syy)，其中 Sxy = Σxy - ΣxΣy / n；
+   Beta 的滚动均值与样本标准差同样由滑动和得到，每根 K 线 O(1) 更新。
 """
 
 from __future__ import annotations
 
+import math
+from collections import deque
 from dataclasses import dataclass
 
 import numpy as np
 import pandas as pd
 
+from core.analysis.kernels import hysteresis_position
+
 
 @dataclass(frozen=True)
 class RsrsConfig:
@@ -95,18 +103,115 @@ def compute_rsrs(df: pd.DataFrame, config: RsrsConfig | None = None) -> pd.DataF
     data["zscore"] = (data["beta"] - z_mean) / z_std
     data["rsrs"] = data["zscore"] * data["r2"]
 
-    position = np.zeros(len(data))
-    current = 0
-    for i in range(len(data)):
-        z = data["zscore"].iloc[i]
-        if np.isnan(z):
-            position[i] = current
-            continue
-        if z > config.threshold_buy:
-            current = 1
-        elif z < config.threshold_sell:
-            current = 0
-        position[i] = current
+    # 滞回状态机：zscore 上穿买入阈值持有、下穿卖出阈值空仓，缺失值保持前一状态
+    position = hysteresis_position(data["zscore"].to_numpy(dtype=float), config.threshold_buy, config.threshold_sell)
     data["position"] = position
     return data
 
+
+class _RollingPairSums:
+    """定长窗口内 (x, y) 的一阶、二阶与交叉滑动和，O(1) 更新；窗口内含 NaN 时视为未就绪。"""
+
+    # 每累计若干次增删后按窗口重算一次，抑制浮点误差漂移（摊还 O(1)）
+    _RESYNC_INTERVAL = 1024
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque()
+        self.shift_x: float | None = None
+        self.shift_y: float | None = None
+        self.sx = self.sy = self.sxx = self.syy = self.sxy = 0.0
+        self.nan_count = 0
+        self._updates = 0
+
+    def push(self, x: float, y: float = 0.0) -> None:
+        if math.isnan(x) or math.isnan(y):
+            self.nan_count += 1
+        else:
+            if self.shift_x is None:
+                self.shift_x, self.shift_y = x, y
+            self._add(x - self.shift_x, y - self.shift_y, 1.0)
+        self.values.append((x, y))
+        if len(self.values) > self.window:
+            old_x, old_y = self.values.popleft()
+            if math.isnan(old_x) or math.isnan(old_y):
+                self.nan_count -= 1
+            else:
+                self._add(old_x - self.shift_x, old_y - self.shift_y, -1.0)
+        self._updates += 1
+        if self._updates >= self._RESYNC_INTERVAL:
+            self._resync()
+
+    def _add(self, dx: float, dy: float, sign: float) -> None:
+        self.sx += sign * dx
+        self.sy += sign * dy
+        self.sxx += sign * dx * dx
+        self.syy += sign * dy * dy
+        self.sxy += sign * dx * dy
+
+    def _resync(self) -> None:
+        self._updates = 0
+        if self.shift_x is None:
+            return
+        pairs = [(x - self.shift_x, y - self.shift_y) for x, y in self.values if not (math.isnan(x) or math.isnan(y))]
+        self.sx = math.fsum(dx for dx, _ in pairs)
+        self.sy = math.fsum(dy for _, dy in pairs)
+        self.sxx = math.fsum(dx * dx for dx, _ in pairs)
+        self.syy = math.fsum(dy * dy for _, dy in pairs)
+        self.sxy = math.fsum(dx * dy for dx, dy in pairs)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window and self.nan_count == 0
+
+    def centered(self) -> tuple[float, float, float]:
+        """窗口内离差平方和 (Sxx, Syy, Sxy)；方差相对一阶矩可忽略时记为 0（与两遍法的恒定窗口一致）。"""
+        n = self.window
+        var_x = self.sxx - self.sx * self.sx / n
+        var_y = self.syy - self.sy * self.sy / n
+        cov = self.sxy - self.sx * self.sy / n
+        var_x = var_x if var_x > 1e-12 * self.sxx else 0.0
+        var_y = var_y if var_y > 1e-12 * self.syy else 0.0
+        return var_x, var_y, cov
+
+
+class RsrsStream:
+    """
+    RSRS 流式计算：逐根输入最高价/最低价，输出与 compute_rsrs 同一行一致的 beta/r2/zscore/rsrs/position。
+
+    回归窗口与 Z-Score 窗口均用滑动和维护，每次 update 为 O(1)，适用于实时行情与逐 bar 回测。
+    """
+
+    def __init__(self, config: RsrsConfig | None = None):
+        if config is None:
+            config = RsrsConfig()
+        self.config = config
+        self.position = 0.0
+        self._regression = _RollingPairSums(config.window)
+        self._beta = _RollingPairSums(config.z_window)
+
+    def update(self, high: float, low: float) -> dict[str, float]:
+        """输入一根 K 线的最高价与最低价，返回该 bar 的 RSRS 结果。"""
+        config = self.config
+        self._regression.push(float(low), float(high))
+        beta = r2 = math.nan
+        if self._regression.ready:
+            var_low, var_high, cov = self._regression.centered()
+            if var_low != 0:
+                beta = cov / var_low
+            if var_low * var_high != 0:
+                r2 = cov * cov / (var_low * var_high)
+
+        self._beta.push(beta)
+        zscore = math.nan
+        if self._beta.ready:
+            var_beta, _, _ = self._beta.centered()
+            mean = self._beta.shift_x + self._beta.sx / config.z_window
+            if var_beta > 0 and config.z_window > 1:
+                zscore = (beta - mean) / math.sqrt(var_beta / (config.z_window - 1))
+
+        if zscore > config.threshold_buy:
+            self.position = 1.0
+        elif zscore < config.threshold_sell:
+            self.position = 0.0
+        return {"beta": beta, "r2": r2, "zscore": zscore, "rsrs": zscore * r2, "position": self.position}
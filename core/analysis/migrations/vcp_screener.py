@@ -19,6 +19,11 @@ from typing import Iterable
 import numpy as np
 import pandas as pd
 
+from core.analysis.indicators.extrema import local_extrema
+from core.analysis.indicators.registry import FeatureRegistry, get_registry
+from core.analysis.indicators.rolling import rolling_max, rolling_min, rolling_slope
+from core.analysis.indicators.swing import SwingPointTracker
+
 
 @dataclass(frozen=True)
 class VcpScreenerConfig:
@@ -54,27 +59,11 @@ def _require_columns(data: pd.DataFrame, cols: Iterable[str]) -> None:
         raise ValueError(f"缺少必要列: {missing}")
 
 
-def _local_extrema(arr: np.ndarray, order: int, mode: str) -> np.ndarray:
-    if len(arr) < order * 2 + 1:
-        return np.array([], dtype=int)
-    if mode not in {"max", "min"}:
-        raise ValueError("mode 必须是 'max' 或 'min'")
-    idx = []
-    for i in range(order, len(arr) - order):
-        window = arr[i - order : i + order + 1]
-        center = arr[i]
-        if mode == "max" and np.all(center >= window) and center == window.max():
-            idx.append(i)
-        if mode == "min" and np.all(center <= window) and center == window.min():
-            idx.append(i)
-    return np.array(idx, dtype=int)
-
-
 def local_high_low(data: pd.DataFrame, order: int = 10) -> tuple[np.ndarray, np.ndarray]:
     _require_columns(data, ["high", "low"])
     highs = data["high"].to_numpy()
     lows = data["low"].to_numpy()
-    return _local_extrema(highs, order, "max"), _local_extrema(lows, order, "min")
+    return local_extrema(highs, order, "max"), local_extrema(lows, order, "min")
 
 
 def contractions(data: pd.DataFrame, local_high: np.ndarray, local_low: np.ndarray) -> list[float]:
@@ -124,32 +113,44 @@ def weeks_of_contraction(data: pd.DataFrame, local_high: np.ndarray, num: int) -
     return (len(data.index) - idx) / 5
 
 
-def trend_template(data: pd.DataFrame, df_spx: pd.DataFrame | None = None) -> pd.DataFrame:
+def trend_template(
+    data: pd.DataFrame,
+    df_spx: pd.DataFrame | None = None,
+    registry: FeatureRegistry | None = None,
+) -> pd.DataFrame:
     """
     基于 Minervini 趋势模板判断 Stage 2。
+
+    registry 为基于同一 data 的特征注册表时，均线、52 周高低点与 MA200 斜率从注册表读取。
     """
     df = data.copy()
-    df["MA_50"] = df["close"].rolling(window=50).mean()
-    df["MA_150"] = df["close"].rolling(window=150).mean()
-    df["MA_200"] = df["close"].rolling(window=200).mean()
-
-    if len(df.index) > 5 * 52:
-        df["52_week_low"] = df["low"].rolling(window=5 * 52).min()
-        df["52_week_high"] = df["high"].rolling(window=5 * 52).max()
+    week_window = 5 * 52 if len(df.index) > 5 * 52 else max(len(df.index), 1)
+    if registry is not None:
+        registry.check(df)
+        df["MA_50"] = registry.values(registry.sma("close", 50))
+        df["MA_150"] = registry.values(registry.sma("close", 150))
+        df["MA_200"] = registry.values(registry.sma("close", 200))
+        df["52_week_low"] = registry.values(registry.rolling_min("low", week_window))
+        df["52_week_high"] = registry.values(registry.rolling_max("high", week_window))
+        ma_200_slope = registry.values(registry.slope(registry.sma("close", 200), 20))
     else:
-        df["52_week_low"] = df["low"].rolling(window=len(df.index)).min()
-        df["52_week_high"] = df["high"].rolling(window=len(df.index)).max()
+        df["MA_50"] = df["close"].rolling(window=50).mean()
+        df["MA_150"] = df["close"].rolling(window=150).mean()
+        df["MA_200"] = df["close"].rolling(window=200).mean()
+        df["52_week_low"] = rolling_min(df["low"].to_numpy(dtype=float), week_window)
+        df["52_week_high"] = rolling_max(df["high"].to_numpy(dtype=float), week_window)
+        ma_200_slope = rolling_slope(df["MA_200"].to_numpy(dtype=float), 20)
 
     df["condition_1"] = (df["close"] > df["MA_150"]) & (df["close"] > df["MA_200"]) & (df["close"] > df["MA_50"])
     df["condition_2"] = (df["MA_150"] > df["MA_200"]) & (df["MA_50"] > df["MA_150"])
-    slope = df["MA_200"].rolling(window=20).apply(lambda x: _slope(x), raw=False)
+    slope = pd.Series(ma_200_slope, index=df.index)
     df["condition_3"] = slope > 0.0
     df["condition_6"] = df["low"] > (df["52_week_low"] * 1.3)
     df["condition_7"] = df["high"] > (df["52_week_high"] * 0.75)
 
     if df_spx is not None and "close" in df_spx.columns:
         rs = df["close"] / df_spx["close"].reindex(df.index).ffill()
-        slope_rs = rs.rolling(window=20).apply(lambda x: _slope(x), raw=False)
+        slope_rs = pd.Series(rolling_slope(rs.to_numpy(dtype=float), 20), index=df.index)
         df["condition_8"] = slope_rs > 0.0
     else:
         df["condition_8"] = True
@@ -160,49 +161,68 @@ def trend_template(data: pd.DataFrame, df_spx: pd.DataFrame | None = None) -> pd
     return df
 
 
-def _slope(nums: pd.Series | np.ndarray) -> float:
-    values = np.asarray(nums, dtype=float)
-    if len(values) < 2:
-        return 0.0
-    x = np.arange(1, len(values) + 1, dtype=float)
-    y = values
-    numerator = (len(values) * (x * y).sum()) - (x.sum() * y.sum())
-    denominator = (len(values) * (x * x).sum()) - (x.sum() ** 2)
-    if denominator == 0:
-        return 0.0
-    return numerator / denominator
+def create_swing_tracker(config: VcpScreenerConfig | None = None) -> SwingPointTracker:
+    """
+    创建与 local_high_low/contractions 判定一致的增量高低点跟踪器。
 
+    每日筛选时可为每只股票保留一个跟踪器，只输入新增 K 线后传给 vcp(..., swing=tracker)。
+    """
+    if config is None:
+        config = VcpScreenerConfig()
+    return SwingPointTracker(order=config.order, min_swing_points=1)
 
-def vcp(data: pd.DataFrame, config: VcpScreenerConfig | None = None) -> tuple[int, float, float, float, int]:
+
+def vcp(
+    data: pd.DataFrame,
+    config: VcpScreenerConfig | None = None,
+    swing: SwingPointTracker | None = None,
+    registry: FeatureRegistry | None = None,
+) -> tuple[int, float, float, float, int]:
     """
     返回 (收缩次数, 最大收缩, 最小收缩, 收缩周数, 是否符合VCP)。
+
+    swing 为已逐根更新到 data 最后一根 K 线的跟踪器（见 create_swing_tracker）时，
+    收缩统计直接取自跟踪器。registry 为基于同一 data 的特征注册表时，成交量均线从注册表读取。
     """
     if config is None:
         config = VcpScreenerConfig()
-    local_high, local_low = local_high_low(data, order=config.order)
-    contraction = contractions(data, local_high, local_low)
-    num = num_of_contractions(contraction)
-    if num == 0:
-        return 0, 0.0, 0.0, 0.0, 0
-    max_c, min_c = max_min_contraction(contraction, num)
-    weeks = weeks_of_contraction(data, local_high, num)
+    if swing is not None:
+        summary = swing.summary()
+        num = summary.num_contractions
+        if num == 0:
+            return 0, 0.0, 0.0, 0.0, 0
+        max_c, min_c = summary.max_contraction, summary.min_contraction
+        weeks = (len(data.index) - summary.anchor_high_index) / 5
+        last_high_value = summary.last_high_value
+    else:
+        local_high, local_low = local_high_low(data, order=config.order)
+        contraction = contractions(data, local_high, local_low)
+        num = num_of_contractions(contraction)
+        if num == 0:
+            return 0, 0.0, 0.0, 0.0, 0
+        max_c, min_c = max_min_contraction(contraction, num)
+        weeks = weeks_of_contraction(data, local_high, num)
+        last_high_value = data["high"].iloc[local_high[-1]] if len(local_high) else None
 
     flag_num = int(config.min_contractions <= num <= config.max_contractions)
     flag_max = int(max_c <= config.max_contraction)
     flag_min = int(min_c <= config.min_contraction)
     flag_week = int(config.min_weeks <= weeks <= config.max_weeks)
 
-    data = data.copy()
-    data["30_day_avg_volume"] = data["volume"].rolling(window=30).mean()
-    data["5_day_avg_volume"] = data["volume"].rolling(window=5).mean()
-    data["vol_contraction"] = data["5_day_avg_volume"] < data["30_day_avg_volume"]
-    flag_vol = int(bool(data["vol_contraction"].iloc[-1]))
+    if registry is not None:
+        registry.check(data)
+        flag_vol = int(bool(registry.last(registry.sma("volume", 5)) < registry.last(registry.sma("volume", 30))))
+    else:
+        data = data.copy()
+        data["30_day_avg_volume"] = data["volume"].rolling(window=30).mean()
+        data["5_day_avg_volume"] = data["volume"].rolling(window=5).mean()
+        data["vol_contraction"] = data["5_day_avg_volume"] < data["30_day_avg_volume"]
+        flag_vol = int(bool(data["vol_contraction"].iloc[-1]))
 
-    if len(local_high) == 0:
+    if last_high_value is None:
         flag_consolidation = 0
     else:
-        last_high_idx = local_high[-1]
-        flag_consolidation = int(data["high"].iloc[-1] < data["high"].iloc[last_high_idx])
+        flag_consolidation = int(data["high"].iloc[-1] < last_high_value)
 
     flag_final = int(flag_num and flag_max and flag_min and flag_week and flag_vol and flag_consolidation)
     return num, max_c, min_c, weeks, flag_final
@@ -223,6 +243,8 @@ def screen_universe(
 ) -> pd.DataFrame:
     """
     对传入的股票数据字典进行 VCP 筛选，返回结果表。
+
+    各标的的均线、52 周高低点等节点取自进程级共享注册表（get_registry），同一进程内的 bt 指标与其他筛选器可直接复用。
     """
     if config is None:
         config = VcpScreenerConfig()
@@ -238,10 +260,11 @@ def screen_universe(
     for ticker, raw_df in ticker_data.items():
         data = _normalize_ohlcv(raw_df)
         _require_columns(data, ["close", "high", "low", "volume"])
-        trend = trend_template(data, df_spx=df_spx)
+        registry = get_registry(ticker, data)
+        trend = trend_template(data, df_spx=df_spx, registry=registry)
         if not bool(trend["Pass"].iloc[-1]):
             continue
-        vcp_result = vcp(data, config=config)
+        vcp_result = vcp(data, config=config, registry=registry)
         rs = rs_rating(ticker, rs_list or [])
         if vcp_result[-1] == 1 and rs >= config.rs_threshold:
             results.append(
@@ -17,8 +17,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
+import numpy as np
 import pandas as pd
 
+from core.analysis.indicators.rolling import rolling_max, rolling_mean, rolling_min
+
 
 @dataclass(frozen=True)
 class VcpConfig:
@@ -56,18 +59,19 @@ def compute_vcp_features(df: pd.DataFrame, config: VcpConfig | None = None) -> p
     _validate_columns(data)
 
     data = data.copy()
-    data["vol_ma"] = data["volume"].rolling(window=config.ma_window).mean()
-    data["price_ma"] = data["close"].rolling(window=config.price_ma_window).mean()
+    volume = data["volume"].to_numpy(dtype=float)
+    data["vol_ma"] = rolling_mean(volume, config.ma_window)
+    data["price_ma"] = rolling_mean(data["close"].to_numpy(dtype=float), config.price_ma_window)
 
     data["vol_below_prev"] = data["volume"] < data["volume"].shift(1)
     data["vol_below_ma"] = data["volume"] < data["vol_ma"]
-    data["vol_dry_consecutive"] = (
-        data["vol_below_ma"].rolling(window=config.tight_window).min().fillna(0).astype(bool)
-    )
+    # 窗口内全部缩量时最小值为 1；不足窗口（NaN）按未满足处理
+    data["vol_dry_consecutive"] = rolling_min(data["vol_below_ma"].to_numpy(dtype=float), config.tight_window) == 1.0
     data["vol_extreme_dry"] = data["volume"] < (data["vol_ma"] * config.dry_ratio)
 
-    price_range = (data["high"] - data["low"]) / data["close"]
-    data["price_tight"] = price_range.rolling(window=config.tight_window).max() < config.price_tight_threshold
+    price_range = ((data["high"] - data["low"]) / data["close"]).to_numpy(dtype=float)
+    with np.errstate(invalid="ignore"):
+        data["price_tight"] = rolling_max(price_range, config.tight_window) < config.price_tight_threshold
 
     return data
 
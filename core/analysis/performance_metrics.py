@@ -21,6 +21,7 @@ import numpy as np
 import pandas as pd
 
 # 第三组：项目内部导入
+from core.analysis.kernels import gbm_final_prices
 
 def _to_series(data) -> pd.Series:
     """将输入转换为 pandas Series。"""
@@ -182,11 +183,7 @@ def var_monte_carlo(
     rng = np.random.default_rng(seed)
     dt = 1 / float(days)
     shocks = rng.normal(loc=mu * dt, scale=sigma * np.sqrt(dt), size=(runs, days))
-    prices = np.zeros((runs, days))
-    prices[:, 0] = start_price
-    for i in range(1, days):
-        prices[:, i] = np.maximum(0, prices[:, i - 1] + shocks[:, i] * prices[:, i - 1])
-    final_prices = prices[:, -1]
+    final_prices = gbm_final_prices(start_price, shocks)
     q = np.percentile(final_prices, level * 100)
     var_value = start_price - q
     return float(var_value), float(q)
@@ -5,6 +5,14 @@
 数学原理：
 1. 移动平均与动量指标。
 2. 波动率与成交量衍生指标。
+3. 加权移动平均以滑动窗口与线性权重的卷积一次算出，累积类指标用累加和（缺失值保持缺失），
+   递推平滑（Heiken Ashi 开盘价、PMO 平滑）等价于 adjust=False 的指数加权均值。
+
+输入约定：
+- DataFrame 列名兼容 "Adj Close"/"High" 与标准化小写 schema（open/high/low/close/volume），
+  缺少复权收盘价列时回退到收盘价，无需先复制改名；返回带原索引的 Series。
+- 面板模式：传入 {字段: 二维数组}（行=标的，列=时间，各标的对齐）时逐列向量化计算，
+  返回同形状的二维 ndarray；Series 参数的函数同样接受一维或二维 ndarray。
 """
 
 
@@ -13,163 +21,241 @@ from __future__ import annotations
 # Front Code X
 
 # 第一组：Python 标准库
-from typing import Tuple
+from typing import Mapping, Optional, Tuple, Union
 
 # 第二组：第三方库（按字母排序）
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 # 第三组：项目内部导入
+from core.analysis.indicators.rolling import rolling_mean, rolling_sum, rsi_averages
 
-def accumulation_distribution_line(df: pd.DataFrame, period: int = 1) -> pd.Series:
+PriceData = Union[pd.DataFrame, Mapping[str, np.ndarray]]
+SeriesLike = Union[pd.Series, np.ndarray]
+
+_ADJ_CLOSE_COLUMNS = ("Adj Close", "adj_close", "Close")
+
+
+def _resolve(data: PriceData, *names: str) -> Tuple[str, np.ndarray]:
+    """按候选列名（含大小写变体）取列，返回 (列名, float 数组)。"""
+    for name in names:
+        for candidate in (name, name.lower(), name.upper(), name.capitalize()):
+            if candidate in data:
+                return candidate, np.asarray(data[candidate], dtype=float)
+    raise KeyError(f"缺少列: {names[0]}")
+
+
+def _column(data: PriceData, *names: str) -> np.ndarray:
+    return _resolve(data, *names)[1]
+
+
+def _wrap(like, values: np.ndarray, name: Optional[str] = None):
+    """DataFrame/Series 输入返回带原索引的 Series，数组与面板输入原样返回 ndarray。"""
+    if isinstance(like, pd.DataFrame):
+        return pd.Series(values, index=like.index, name=name)
+    if isinstance(like, pd.Series):
+        return pd.Series(values, index=like.index, name=name)
+    return values
+
+
+def _shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """沿最后一维后移 periods 位，前端补 NaN。"""
+    result = np.full(values.shape, np.nan)
+    if periods < values.shape[-1]:
+        result[..., periods:] = values[..., : values.shape[-1] - periods]
+    return result
+
+
+def _pct_change(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return values / _shift(values, periods) - 1
+
+
+def _cumsum(values: np.ndarray) -> np.ndarray:
+    """累加和，缺失值跳过且对应位置保持缺失（与 pandas cumsum 一致）。"""
+    result = np.nancumsum(values, axis=-1)
+    result[np.isnan(values)] = np.nan
+    return result
+
+
+def _ewm_mean(values: np.ndarray, **kwargs) -> np.ndarray:
+    """沿最后一维的指数加权均值，参数同 pandas ewm。"""
+    if values.ndim == 1:
+        return pd.Series(values).ewm(**kwargs).mean().to_numpy()
+    return np.ascontiguousarray(pd.DataFrame(values.T).ewm(**kwargs).mean().to_numpy().T)
+
+
+def _linear_weighted(values: np.ndarray, window: int) -> np.ndarray:
+    """权重 1..window 的滑动加权均值（卷积），前 window-1 个位置为 NaN。"""
+    weights = np.arange(1, window + 1, dtype=float)
+    result = np.full(values.shape, np.nan)
+    if window <= values.shape[-1]:
+        result[..., window - 1 :] = sliding_window_view(values, window, axis=-1) @ weights / weights.sum()
+    return result
+
+
+def accumulation_distribution_line(df: PriceData, period: int = 1) -> SeriesLike:
     """
     计算累积/派发线（ADL）。
     """
-    high = df["High"].shift(period)
-    low = df["Low"].shift(period)
-    close = df["Adj Close"]
-    mfm = ((close - low) - (high - close)) / (high - low)
-    mfv = mfm * df["Volume"].shift(period)
-    return mfv.cumsum()
+    high = _shift(_column(df, "High"), period)
+    low = _shift(_column(df, "Low"), period)
+    close = _column(df, *_ADJ_CLOSE_COLUMNS)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mfm = ((close - low) - (high - close)) / (high - low)
+    mfv = mfm * _shift(_column(df, "Volume"), period)
+    return _wrap(df, _cumsum(mfv))
 
 
-def adxvma(data: pd.DataFrame, period: int = 14, multiplier: float = 2, offset: float = 0.5) -> pd.Series:
+def adxvma(data: PriceData, period: int = 14, multiplier: float = 2, offset: float = 0.5) -> SeriesLike:
     """
     ADXVMA 指标（基于 ADX 与 EMA 的混合）。
     """
-    tr = pd.DataFrame(index=data.index)
-    tr["hl"] = (data["High"] - data["Low"]).abs()
-    tr["hc"] = (data["High"] - data["Close"].shift()).abs()
-    tr["lc"] = (data["Low"] - data["Close"].shift()).abs()
-    tr["tr"] = tr.max(axis=1)
-    atr = tr["tr"].rolling(period).mean()
+    high = _column(data, "High")
+    low = _column(data, "Low")
+    close = _column(data, "Close")
+    prev_close = _shift(close)
+    tr = np.fmax(np.fmax(np.abs(high - low), np.abs(high - prev_close)), np.abs(low - prev_close))
+    atr = rolling_mean(tr, period)
 
-    dx = pd.DataFrame(index=data.index)
-    dx["hd"] = data["High"] - data["High"].shift()
-    dx["ld"] = data["Low"].shift() - data["Low"]
-    dx["plus_dm"] = np.where((dx["hd"] > 0) & (dx["hd"] > dx["ld"]), dx["hd"], 0)
-    dx["minus_dm"] = np.where((dx["ld"] > 0) & (dx["ld"] > dx["hd"]), dx["ld"], 0)
-    dx["plus_di"] = 100 * dx["plus_dm"].rolling(period).sum() / atr
-    dx["minus_di"] = 100 * dx["minus_dm"].rolling(period).sum() / atr
-    dx["dx"] = 100 * (dx["plus_di"] - dx["minus_di"]).abs() / (dx["plus_di"] + dx["minus_di"])
-    return dx["dx"] * multiplier + data["Close"].ewm(alpha=1 / (period * offset)).mean() * (1 - multiplier)
+    hd = high - _shift(high)
+    ld = _shift(low) - low
+    plus_dm = np.where((hd > 0) & (hd > ld), hd, 0.0)
+    minus_dm = np.where((ld > 0) & (ld > hd), ld, 0.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        plus_di = 100 * rolling_sum(plus_dm, period) / atr
+        minus_di = 100 * rolling_sum(minus_dm, period) / atr
+        dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+    result = dx * multiplier + _ewm_mean(close, alpha=1 / (period * offset)) * (1 - multiplier)
+    return _wrap(data, result)
 
 
-def ease_of_movement(df: pd.DataFrame, period: int = 14) -> pd.Series:
+def ease_of_movement(df: PriceData, period: int = 14) -> SeriesLike:
     """
     Ease of Movement（EVM/EMV）。
     """
-    distance = ((df["High"] + df["Low"]) / 2) - ((df["High"].shift(1) + df["Low"].shift(1)) / 2)
-    box_ratio = (df["Volume"] / 100000000) / (df["High"] - df["Low"])
-    emv = distance / box_ratio
-    return emv.rolling(period).mean()
+    high = _column(df, "High")
+    low = _column(df, "Low")
+    midpoint = (high + low) / 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        box_ratio = (_column(df, "Volume") / 100000000) / (high - low)
+        emv = (midpoint - _shift(midpoint)) / box_ratio
+    return _wrap(df, rolling_mean(emv, period))
 
 
-def force_index(df: pd.DataFrame, period: int = 1) -> pd.Series:
+def force_index(df: PriceData, period: int = 1) -> SeriesLike:
     """
     Force Index。
     """
-    return (df["Adj Close"].diff(period) * df["Volume"]).rename("ForceIndex")
+    close = _column(df, *_ADJ_CLOSE_COLUMNS)
+    return _wrap(df, (close - _shift(close, period)) * _column(df, "Volume"), name="ForceIndex")
 
 
-def chaikin_oscillator(df: pd.DataFrame, short: int = 3, long: int = 10) -> pd.Series:
+def chaikin_oscillator(df: PriceData, short: int = 3, long: int = 10) -> SeriesLike:
     """
     Chaikin Oscillator。
     """
-    mfv = (2 * df["Adj Close"] - df["High"] - df["Low"]) / (df["High"] - df["Low"]) * df["Volume"]
-    ad = mfv.cumsum()
-    ema_short = ad.ewm(com=(short - 1) / 2).mean()
-    ema_long = ad.ewm(com=(long - 1) / 2).mean()
-    return (ema_short - ema_long).rename("Chaikin")
+    high = _column(df, "High")
+    low = _column(df, "Low")
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mfv = (2 * _column(df, *_ADJ_CLOSE_COLUMNS) - high - low) / (high - low) * _column(df, "Volume")
+    ad = _cumsum(mfv)
+    ema_short = _ewm_mean(ad, com=(short - 1) / 2)
+    ema_long = _ewm_mean(ad, com=(long - 1) / 2)
+    return _wrap(df, ema_short - ema_long, name="Chaikin")
 
 
-def tsi(df: pd.DataFrame, r: int = 25, s: int = 13) -> pd.Series:
+def tsi(df: PriceData, r: int = 25, s: int = 13) -> SeriesLike:
     """
     Ergodic True Strength Index。
     """
-    close = df["Adj Close"]
-    pc = close.pct_change().fillna(0)
+    name, close = _resolve(df, *_ADJ_CLOSE_COLUMNS)
+    pc = np.nan_to_num(_pct_change(close), nan=0.0, posinf=np.inf, neginf=-np.inf)
 
-    def _double_smooth(x: pd.Series, w: int) -> pd.Series:
-        return x.ewm(span=w).mean().ewm(span=w).mean()
+    def _double_smooth(x: np.ndarray, w: int) -> np.ndarray:
+        return _ewm_mean(_ewm_mean(x, span=w), span=w)
 
-    ema_r = _double_smooth(pc, r)
-    ema_s = _double_smooth(ema_r, s)
-    abs_ema_r = _double_smooth(pc.abs(), r)
-    abs_ema_s = _double_smooth(abs_ema_r, s)
-    return 100 * ema_s / abs_ema_s
+    ema_s = _double_smooth(_double_smooth(pc, r), s)
+    abs_ema_s = _double_smooth(_double_smooth(np.abs(pc), r), s)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _wrap(df, 100 * ema_s / abs_ema_s, name=name)
 
 
-def weighted_moving_average(series: pd.Series, window: int) -> pd.Series:
+def weighted_moving_average(series: SeriesLike, window: int) -> SeriesLike:
     """
     线性加权移动平均（WMA）。
     """
-    weights = np.arange(1, window + 1)
-    return series.rolling(window).apply(lambda x: np.dot(x, weights) / weights.sum(), raw=True)
+    return _wrap(series, _linear_weighted(np.asarray(series, dtype=float), window), getattr(series, "name", None))
 
 
-def fishy_turbo(df: pd.DataFrame, rsi_window: int = 6, wma_window: int = 6) -> pd.Series:
+def fishy_turbo(df: PriceData, rsi_window: int = 6, wma_window: int = 6) -> SeriesLike:
     """
     Fishy Turbo 指标。
     """
-    delta = df["Adj Close"].diff()
-    up = delta.clip(lower=0)
-    down = -1 * delta.clip(upper=0)
-    avg_gain = up.rolling(window=rsi_window, min_periods=1).mean()
-    avg_loss = down.rolling(window=rsi_window, min_periods=1).mean()
-    rs = avg_gain / avg_loss
+    name, close = _resolve(df, *_ADJ_CLOSE_COLUMNS)
+    avg_gain, avg_loss = rsi_averages(close, rsi_window, min_periods=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
     rsi = 100 - (100 / (1 + rs))
-    x = weighted_moving_average(0.1 * (rsi - 50), wma_window)
-    return (np.exp(2 * x) - 1) / (np.exp(2 * x) + 1)
+    x = _linear_weighted(0.1 * (rsi - 50), wma_window)
+    return _wrap(df, (np.exp(2 * x) - 1) / (np.exp(2 * x) + 1), name=name)
 
 
-def guppy_ema(series: pd.Series, lookback_period: int) -> pd.Series:
+def guppy_ema(series: SeriesLike, lookback_period: int) -> SeriesLike:
     """
     Guppy EMA 计算。
     """
-    return series.ewm(span=lookback_period, adjust=False).mean()
+    values = _ewm_mean(np.asarray(series, dtype=float), span=lookback_period, adjust=False)
+    return _wrap(series, values, getattr(series, "name", None))
 
 
-def heiken_ashi(df: pd.DataFrame) -> pd.DataFrame:
+def heiken_ashi(df: PriceData) -> Union[pd.DataFrame, dict]:
     """
     计算 Heiken Ashi K 线。
-    """
+
+    DataFrame 输入返回追加 HA_* 列的副本；面板输入返回 {HA_Open/HA_High/HA_Low/HA_Close: 二维数组}。
+    """
+    open_ = _column(df, "Open")
+    high = _column(df, "High")
+    low = _column(df, "Low")
+    close = _column(df, "Close")
+    ha_close = (open_ + high + low + close) / 4
+    # HA_Open[i] = (HA_Open[i-1] + HA_Close[i-1]) / 2，即 alpha=0.5 的递推平滑
+    seed = np.concatenate([(open_[..., :1] + close[..., :1]) / 2, ha_close[..., :-1]], axis=-1)
+    ha_open = _ewm_mean(seed, alpha=0.5, adjust=False) if seed.shape[-1] else seed
+    columns = {
+        "HA_Close": ha_close,
+        "HA_Open": ha_open,
+        "HA_High": np.fmax(np.fmax(ha_open, ha_close), high),
+        "HA_Low": np.fmin(np.fmin(ha_open, ha_close), low),
+    }
+    if not isinstance(df, pd.DataFrame):
+        return columns
     ha = df.copy()
-    ha["HA_Close"] = (ha["Open"] + ha["High"] + ha["Low"] + ha["Close"]) / 4
-    ha_open = np.zeros(len(ha))
-    ha_open[0] = (ha["Open"].iloc[0] + ha["Close"].iloc[0]) / 2
-    for i in range(1, len(ha)):
-        ha_open[i] = (ha_open[i - 1] + ha["HA_Close"].iloc[i - 1]) / 2
-    ha["HA_Open"] = ha_open
-    ha["HA_High"] = ha[["HA_Open", "HA_Close", "High"]].max(axis=1)
-    ha["HA_Low"] = ha[["HA_Open", "HA_Close", "Low"]].min(axis=1)
+    for name, values in columns.items():
+        ha[name] = values
     return ha
 
 
-def linear_weighted_moving_average(close: pd.Series, window: int) -> pd.Series:
+def linear_weighted_moving_average(close: SeriesLike, window: int) -> SeriesLike:
     """
     线性加权移动平均（数组权重版）。
+
+    第 i 个值为 [i-window, i) 区间（不含当前 K 线）的加权均值。
     """
-    values = close.to_numpy()
-    lwma = [np.nan] * window
-    weights = np.arange(window) + 1
-    denom = weights.sum()
-    for i in range(window, len(values)):
-        lwma.append((values[i - window : i] * weights).sum() / denom)
-    return pd.Series(lwma, index=close.index)
+    return _wrap(close, _shift(_linear_weighted(np.asarray(close, dtype=float), window)))
 
 
-def parabolic_sar(high: pd.Series, low: pd.Series, acceleration_factor: float = 0.02, max_acceleration_factor: float = 0.2) -> pd.Series:
-    """
-    Parabolic SAR。
-    """
-    high_vals = high.to_numpy()
-    low_vals = low.to_numpy()
+def _parabolic_sar_row(high_vals: np.ndarray, low_vals: np.ndarray, acceleration_factor: float, max_acceleration_factor: float) -> np.ndarray:
+    sar_list = np.empty(len(high_vals))
+    if len(high_vals) == 0:
+        return sar_list
     sar = low_vals[0]
     ep = high_vals[0]
     af = acceleration_factor
     trend = 1
-    sar_list = [sar]
+    sar_list[0] = sar
     for i in range(1, len(high_vals)):
         if trend == 1:
             if low_vals[i] < sar:
@@ -193,92 +279,113 @@ def parabolic_sar(high: pd.Series, low: pd.Series, acceleration_factor: float =
                 if low_vals[i] < ep:
                     ep = low_vals[i]
                     af = min(af + acceleration_factor, max_acceleration_factor)
-        sar_list.append(sar)
-    return pd.Series(sar_list, index=high.index)
+        sar_list[i] = sar
+    return sar_list
 
 
-def pmo(df: pd.DataFrame, fast: int = 35, slow: int = 20, signal: int = 10) -> Tuple[pd.Series, pd.Series]:
+def parabolic_sar(high: SeriesLike, low: SeriesLike, acceleration_factor: float = 0.02, max_acceleration_factor: float = 0.2) -> SeriesLike:
+    """
+    Parabolic SAR。
+
+    趋势翻转依赖上一根的 SAR，属逐 K 线状态机；二维输入按标的逐行计算。
+    """
+    high_vals = np.asarray(high, dtype=float)
+    low_vals = np.asarray(low, dtype=float)
+    if high_vals.ndim == 1:
+        sar = _parabolic_sar_row(high_vals, low_vals, acceleration_factor, max_acceleration_factor)
+    else:
+        sar = np.stack([
+            _parabolic_sar_row(h, l, acceleration_factor, max_acceleration_factor)
+            for h, l in zip(high_vals, low_vals)
+        ])
+    return _wrap(high, sar)
+
+
+def pmo(df: PriceData, fast: int = 35, slow: int = 20, signal: int = 10) -> Tuple[SeriesLike, SeriesLike]:
     """
     Price Momentum Oscillator (PMO)。
     """
-    smoothing_multiplier = 2 / (fast + 1)
-    smoothed = [df["Close"].iloc[0]]
-    for i in range(1, len(df)):
-        smoothed_value = ((df["Close"].iloc[i] - smoothed[-1]) * smoothing_multiplier) + smoothed[-1]
-        smoothed.append(smoothed_value)
-    smoothed = pd.Series(smoothed, index=df.index)
-    price_change = (df["Close"] / df["Close"].shift(1) * 100) - 100
-    pmo_line = 10 * pd.Series(smoothed).ewm(span=slow, adjust=False).mean()
-    pmo_signal = pmo_line.ewm(span=signal, adjust=False).mean()
-    return pmo_line, pmo_signal
+    # smoothed[i] = (close[i] - smoothed[i-1]) · 2/(fast+1) + smoothed[i-1]，首值为收盘价
+    smoothed = _ewm_mean(_column(df, "Close"), alpha=2 / (fast + 1), adjust=False)
+    pmo_line = 10 * _ewm_mean(smoothed, span=slow, adjust=False)
+    pmo_signal = _ewm_mean(pmo_line, span=signal, adjust=False)
+    return _wrap(df, pmo_line), _wrap(df, pmo_signal)
 
 
-def special_k(df: pd.DataFrame) -> pd.Series:
+def special_k(df: PriceData) -> SeriesLike:
     """
     Pring's Special K。
     """
     roc_periods = [10, 15, 20, 30, 40, 65, 75, 100, 195, 265, 390, 530]
     weights = [1, 2, 3, 4, 1, 2, 3, 4, 1, 2, 3, 4]
     sma_periods = [10, 10, 10, 15, 50, 65, 75, 100, 130, 130, 130, 195]
-    result = pd.Series(0, index=df.index, dtype=float)
+    close = _column(df, "Close")
+    result = np.zeros(close.shape)
     for roc_period, weight, sma_period in zip(roc_periods, weights, sma_periods):
-        roc = df["Close"].pct_change(periods=roc_period) * 100
-        sma = roc.rolling(window=sma_period).mean()
-        result += sma * weight
-    return result
+        roc = _pct_change(close, roc_period) * 100
+        result += rolling_mean(roc, sma_period) * weight
+    return _wrap(df, result)
 
 
-def rs_ratio_momentum(df: pd.DataFrame, benchmark: pd.Series, period: int = 14) -> Tuple[pd.Series, pd.Series]:
+def rs_ratio_momentum(df: PriceData, benchmark: SeriesLike, period: int = 14) -> Tuple[SeriesLike, SeriesLike]:
     """
     Relative Strength Ratio & Momentum。
     """
-    rs = df["Adj Close"] / benchmark
-    rs_ratio = rs / rs.rolling(window=period).mean()
-    rs_momentum = rs_ratio.diff(period)
-    return rs_ratio, rs_momentum
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = _column(df, *_ADJ_CLOSE_COLUMNS) / np.asarray(benchmark, dtype=float)
+        rs_ratio = rs / rolling_mean(rs, period)
+    rs_momentum = rs_ratio - _shift(rs_ratio, period)
+    return _wrap(df, rs_ratio), _wrap(df, rs_momentum)
 
 
-def tma(df: pd.DataFrame, period: int = 30, column: str = "Close") -> pd.Series:
+def tma(df: PriceData, period: int = 30, column: str = "Close") -> SeriesLike:
     """
     Triangular Moving Average（TMA）。
     """
-    sma = df[column].rolling(window=period).mean()
-    return pd.Series(sma).rolling(window=period).mean()
+    name, values = _resolve(df, column)
+    return _wrap(df, rolling_mean(rolling_mean(values, period), period), name=name)
 
 
-def vwma(close: pd.Series, volume: pd.Series, window: int) -> pd.Series:
+def vwma(close: SeriesLike, volume: SeriesLike, window: int) -> SeriesLike:
     """
     Volume Weighted Moving Average（VWMA）。
     """
-    cv = close.shift(window) * volume.shift(window)
-    tv = volume.rolling(window).sum()
-    return cv / tv
+    close_vals = np.asarray(close, dtype=float)
+    volume_vals = np.asarray(volume, dtype=float)
+    cv = _shift(close_vals, window) * _shift(volume_vals, window)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return _wrap(close, cv / rolling_sum(volume_vals, window))
 
 
-def vwap(df: pd.DataFrame) -> float:
+def vwap(df: PriceData) -> Union[float, np.ndarray]:
     """
     Volume Weighted Average Price（VWAP）。
+
+    面板输入返回每个标的的 VWAP 一维数组。
     """
-    return float((df["Adj Close"] * df["Volume"]).sum() / df["Volume"].sum())
+    close = _column(df, *_ADJ_CLOSE_COLUMNS)
+    volume = _column(df, "Volume")
+    result = np.nansum(close * volume, axis=-1) / np.nansum(volume, axis=-1)
+    return float(result) if result.ndim == 0 else result
 
 
-def wma(data: pd.Series, window: int) -> np.ndarray:
+def wma(data: SeriesLike, window: int) -> np.ndarray:
     """
     Weighted Moving Average（数组版）。
     """
-    ws = np.zeros(data.shape[0])
-    t_sum = sum(range(1, window + 1))
-    values = data.to_numpy()
-    for i in range(window - 1, data.shape[0]):
-        ws[i] = sum(values[i - window + 1 : i + 1] * np.linspace(1, window, window)) / t_sum
+    ws = _linear_weighted(np.asarray(data, dtype=float), window)
+    ws[..., : window - 1] = 0.0
     return ws
 
 
-def wsma(df: pd.DataFrame, column: str = "Adj Close", window: int = 14) -> pd.Series:
+def wsma(df: PriceData, column: str = "Adj Close", window: int = 14) -> SeriesLike:
     """
     Wilder's Smoothing Moving Average（WSMA）。
     """
-    ema = df[column].ewm(span=window, min_periods=window - 1).mean()
+    if column == "Adj Close":
+        name, values = _resolve(df, *_ADJ_CLOSE_COLUMNS)
+    else:
+        name, values = _resolve(df, column)
+    ema = _ewm_mean(values, span=window, min_periods=window - 1)
     k = 1 / window
-    return df[column] * k + ema * (1 - k)
-
+    return _wrap(df, values * k + ema * (1 - k), name=name)
@@ -5,13 +5,19 @@ CLI 入口：提供最小可用的 data fetch / backtest / strategy list / strat
   python -m core.cli data fetch --market US --code AAPL --start 2026-01-01 --end 2026-01-30
   python -m core.cli backtest --csv data/stock/akshare/US.AAPL_AAPL_20260101_20260130.csv --strategy EnhancedVolumeStrategy
   python -m core.cli backtest --csv data/stock/akshare/US.AAPL_AAPL_20260101_20260130.csv --strategy VCPStrategy
+  python -m core.cli backtest --folder data/stock/akshare --strategy VCPStrategy --workers 8 --headless
+  python -m core.cli sweep --strategy EnhancedVolumeStrategy --folder data/stock/akshare --grid '{"max_single_buy_percent": [0.1, 0.2]}'
   python -m core.cli strategy list
   python -m core.cli strategy analyze --input x/option_trades_all.csv
+
+批量回测（backtest --folder）与参数扫描（sweep）默认把解析后的 K 线缓存到 data/cache/feeds（settings.BATCH_FEED_CACHE_ENABLED），
+CSV 未变化时后续运行直接读取；加 --no-feed-cache 关闭。
 """
 
 from __future__ import annotations
 
 import argparse
+import json
 from pathlib import Path
 from typing import Iterable
 
@@ -20,7 +26,8 @@ import pandas as pd
 from common.logger import create_log
 from core.analysis.trade_schema import normalize_trades
 from core.analysis.trade_strategy_infer import infer_strategy, profile_to_frame
-from core.quant.quant_manage import run_backtest_enhanced_volume_strategy
+from core.quant.quant_manage import run_backtest_enhanced_volume_strategy, run_backtest_enhanced_volume_strategy_multi
+from core.quant.sweep import run_sweep
 from core.stock.data_source_router import fetch_history_with_fallback
 from core.stock.manager_common import write_cached_history
 from core.strategy.strategy_manager import StrategyManager
@@ -66,6 +73,8 @@ def cmd_data_fetch(args: argparse.Namespace) -> int:
 
 
 def cmd_backtest(args: argparse.Namespace) -> int:
+    if args.folder:
+        return _backtest_folder(args)
     csv_path = Path(args.csv) if args.csv else None
     if not csv_path:
         if not all([args.market, args.code, args.start, args.end]):
@@ -106,7 +115,89 @@ def cmd_backtest(args: argparse.Namespace) -> int:
         return 1
 
     init_cash = args.cash if args.cash is not None else settings.INIT_CASH
-    run_backtest_enhanced_volume_strategy(csv_path, strategy_class, init_cash=init_cash)
+    result = run_backtest_enhanced_volume_strategy(
+        csv_path, strategy_class, init_cash=init_cash, output_mode=_output_mode(args)
+    )
+    if result.results_dir:
+        print(result.results_dir)
+    return 0 if result.ok else 1
+
+
+def _output_mode(args: argparse.Namespace) -> str | None:
+    return "headless" if args.headless else None
+
+
+def _feed_cache(args: argparse.Namespace) -> bool | None:
+    return False if args.no_feed_cache else None
+
+
+def _backtest_folder(args: argparse.Namespace) -> int:
+    manager = StrategyManager()
+    strategy_class = manager.get_strategy(args.strategy)
+    if not strategy_class:
+        logger.error("未找到策略：%s", args.strategy)
+        logger.info("可用策略：%s", ", ".join(manager.get_strategy_names()))
+        return 1
+    folder = Path(args.folder)
+    if not folder.is_dir():
+        logger.error("目录不存在：%s", folder)
+        return 1
+    init_cash = args.cash if args.cash is not None else settings.INIT_CASH
+    results = run_backtest_enhanced_volume_strategy_multi(
+        folder,
+        strategy_class,
+        init_cash=init_cash,
+        max_workers=args.workers,
+        output_mode=_output_mode(args),
+        feed_cache=_feed_cache(args),
+    )
+    failures = [result for result in results if not result.ok]
+    for result in failures:
+        print(f"FAILED {result.csv_path}: {result.error}")
+    return 1 if failures else 0
+
+
+def _load_grid(value: str) -> dict:
+    path = Path(value)
+    text = path.read_text(encoding="utf-8") if path.suffix == ".json" and path.exists() else value
+    return json.loads(text)
+
+
+def cmd_sweep(args: argparse.Namespace) -> int:
+    manager = StrategyManager()
+    strategy_class = manager.get_strategy(args.strategy)
+    if not strategy_class:
+        logger.error("未找到策略：%s", args.strategy)
+        logger.info("可用策略：%s", ", ".join(manager.get_strategy_names()))
+        return 1
+    if not args.csv and not args.folder:
+        logger.error("缺少参数：请提供 --csv 或 --folder")
+        return 1
+    try:
+        grid = _load_grid(args.grid)
+    except (OSError, ValueError) as exc:
+        logger.error("参数网格解析失败：%s", exc)
+        return 1
+    init_cash = args.cash if args.cash is not None else settings.INIT_CASH
+    try:
+        result = run_sweep(
+            strategy_class,
+            args.folder or args.csv,
+            grid=grid,
+            samples=args.samples,
+            seed=args.seed,
+            init_cash=init_cash,
+            max_workers=args.workers,
+            feed_cache=_feed_cache(args),
+        )
+    except ValueError as exc:
+        logger.error("%s", exc)
+        return 1
+    output = Path(args.output) if args.output else Path(f"sweep_{strategy_class.__name__}.csv")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    result.to_csv(output, index=False)
+    logger.info("参数扫描结果：%s", output)
+    print(output)
     return 0
 
 
@@ -172,6 +263,8 @@ def build_parser() -> argparse.ArgumentParser:
 
     backtest = subparsers.add_parser("backtest", help="回测")
     backtest.add_argument("--csv", help="本地 CSV 路径")
+    backtest.add_argument("--folder", help="批量回测：CSV 所在目录")
+    backtest.add_argument("--workers", type=int, default=None, help="批量回测进程数（默认 CPU 核数）")
     backtest.add_argument("--market", help="市场（US/HK/CN）")
     backtest.add_argument("--code", help="股票代码")
     backtest.add_argument("--start", help="开始日期 YYYY-MM-DD")
@@ -179,8 +272,23 @@ def build_parser() -> argparse.ArgumentParser:
     backtest.add_argument("--preferred", help="数据源优先级（逗号分隔）")
     backtest.add_argument("--strategy", default="EnhancedVolumeStrategy", help="策略类名")
     backtest.add_argument("--cash", type=float, default=None, help="初始资金")
+    backtest.add_argument("--headless", action="store_true", help="无界面模式：只保存结构化结果，不生成 HTML、不打开浏览器")
+    backtest.add_argument("--no-feed-cache", action="store_true", help="批量回测不使用 K 线解析缓存（默认缓存到 data/cache/feeds）")
     backtest.set_defaults(func=cmd_backtest)
 
+    sweep = subparsers.add_parser("sweep", help="策略参数扫描")
+    sweep.add_argument("--strategy", required=True, help="策略类名")
+    sweep.add_argument("--csv", action="append", help="本地 CSV 路径（可重复）")
+    sweep.add_argument("--folder", help="CSV 所在目录")
+    sweep.add_argument("--grid", required=True, help="参数网格 JSON 字符串或 .json 文件")
+    sweep.add_argument("--samples", type=int, default=None, help="随机采样组数（默认展开完整网格）")
+    sweep.add_argument("--seed", type=int, default=None, help="随机采样种子")
+    sweep.add_argument("--workers", type=int, default=None, help="进程数（默认 CPU 核数）")
+    sweep.add_argument("--cash", type=float, default=None, help="初始资金")
+    sweep.add_argument("--output", help="结果 CSV 路径")
+    sweep.add_argument("--no-feed-cache", action="store_true", help="不使用 K 线解析缓存（默认缓存到 data/cache/feeds）")
+    sweep.set_defaults(func=cmd_sweep)
+
     strategy = subparsers.add_parser("strategy", help="策略相关")
     strategy_sub = strategy.add_subparsers(dest="strategy_cmd", required=True)
     list_cmd = strategy_sub.add_parser("list", help="列出策略")
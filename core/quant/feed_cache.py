@@ -0,0 +1,128 @@
+"""
+K 线 CSV 解析结果的二进制旁路缓存。
+把 get_data_form_csv 规范化后的行情表（日期索引、基准收盘价、RS 评分等派生列）保存到
+settings.FEED_CACHE_ROOT/<文件名>-<路径摘要>.npz，CSV 未变化时直接读取，跳过 read_csv 的日期解析与派生列计算。
+
+数学原理：
+1. 失效判定：键 = (格式版本, CSV 的 mtime_ns 与字节数, 影响派生列的配置)，任一变化即视为未命中并重建。
+2. 列式存储（无 pickle）：数值/布尔/日期列原样保存；字符串列保存为定长 Unicode 数组 + 缺失掩码；
+   分类列保存为整数编码 + 类别表，读取后按原列顺序与类型还原。
+3. 先写临时文件再原子替换，并发进程不会读到半截文件。
+4. 容量上限：总字节数超过 settings.FEED_CACHE_MAX_BYTES 时按最近访问时间（命中时刷新文件 mtime）淘汰最旧条目。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import uuid
+from pathlib import Path
+from typing import Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+import settings
+from common.logger import create_log
+from core.analysis.indicators.feature_cache import _evict_lru
+
+logger = create_log("feed_cache")
+
+FORMAT_VERSION = 1
+_SUFFIX = ".npz"
+_KEY = "__key__"
+_INDEX = "__index__"
+_INDEX_NAME = "__index_name__"
+_COLUMNS = "__columns__"
+_KINDS = "__kinds__"
+
+
+def cache_path(csv_path: str | Path) -> Path:
+    """CSV 对应的缓存文件路径（缓存根目录下按文件名 + 绝对路径摘要区分不同目录的同名文件）。"""
+    csv_path = Path(csv_path)
+    digest = hashlib.blake2b(str(csv_path.resolve()).encode(), digest_size=8).hexdigest()
+    return Path(settings.FEED_CACHE_ROOT) / f"{csv_path.name}-{digest}{_SUFFIX}"
+
+
+def cache_key(csv_path: str | Path, settings_token: Sequence) -> str:
+    """缓存键：格式版本 + CSV 修改时间与大小 + 派生列相关配置。"""
+    stat = Path(csv_path).stat()
+    return repr((FORMAT_VERSION, stat.st_mtime_ns, stat.st_size, tuple(settings_token)))
+
+
+def load_frame(csv_path: str | Path, key: str) -> Optional[pd.DataFrame]:
+    """读取缓存的行情表，未命中、键不一致或文件损坏时返回 None。"""
+    path = cache_path(csv_path)
+    try:
+        with np.load(path, allow_pickle=False) as stored:
+            if str(stored[_KEY]) != key:
+                return None
+            columns = [str(name) for name in stored[_COLUMNS]]
+            kinds = [str(kind) for kind in stored[_KINDS]]
+            data = {}
+            for i, (name, kind) in enumerate(zip(columns, kinds)):
+                values = stored[f"c{i}"]
+                if kind == "category":
+                    data[name] = pd.Categorical.from_codes(values, categories=stored[f"k{i}"].astype(object))
+                elif kind == "object":
+                    values = values.astype(object)
+                    values[stored[f"m{i}"]] = np.nan
+                    data[name] = values
+                else:
+                    data[name] = values
+            index_name = str(stored[_INDEX_NAME]) or None
+            index = pd.DatetimeIndex(stored[_INDEX], name=index_name)
+        frame = pd.DataFrame(data, index=index, columns=columns)
+        os.utime(path)
+        return frame
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def store_frame(csv_path: str | Path, key: str, frame: pd.DataFrame) -> bool:
+    """写入缓存，列类型不支持或目录不可写时跳过并返回 False。"""
+    if not isinstance(frame.index, pd.DatetimeIndex) or frame.index.tz is not None:
+        return False
+    arrays = {
+        _KEY: np.array(key),
+        _COLUMNS: np.array([str(name) for name in frame.columns]),
+        _INDEX: frame.index.to_numpy(dtype="datetime64[ns]"),
+        _INDEX_NAME: np.array(frame.index.name or ""),
+    }
+    kinds = []
+    for i, name in enumerate(frame.columns):
+        series = frame[name]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            if not all(isinstance(value, str) for value in series.cat.categories):
+                return False
+            kinds.append("category")
+            arrays[f"c{i}"] = series.cat.codes.to_numpy()
+            arrays[f"k{i}"] = np.array([str(value) for value in series.cat.categories])
+        elif series.dtype == object:
+            mask = series.isna().to_numpy()
+            present = series[~mask]
+            if not all(isinstance(value, str) for value in present):
+                return False
+            kinds.append("object")
+            arrays[f"c{i}"] = np.where(mask, "", series.to_numpy(dtype=object)).astype(str)
+            arrays[f"m{i}"] = mask
+        elif series.dtype.kind in "biufM":
+            kinds.append(series.dtype.kind)
+            arrays[f"c{i}"] = series.to_numpy()
+        else:
+            return False
+    arrays[_KINDS] = np.array(kinds)
+
+    path = cache_path(csv_path)
+    temp = path.parent / f".{path.name}.{uuid.uuid4().hex}.tmp"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(temp, "wb") as handle:
+            np.savez(handle, **arrays)
+        os.replace(temp, path)
+    except OSError as exc:
+        logger.warning(f"行情缓存写入失败：{path} ({exc})")
+        temp.unlink(missing_ok=True)
+        return False
+    _evict_lru(path.parent, _SUFFIX, settings.FEED_CACHE_MAX_BYTES)
+    return True
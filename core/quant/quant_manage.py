@@ -1,33 +1,180 @@
+import json
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
 
 import backtrader as bt
 import pandas as pd
 import numpy as np
 
 from common.logger import create_log
+from common.util_compact import CATEGORY_COLUMNS, PRICE_VOLUME_COLUMNS, compact_frame
 from common.time_key import get_current_time
+from core.quant import feed_cache
 from core.strategy.trading.trading_commition import CommissionFactory
-from core.visualization.visual_tools_plotly import plotly_draw
+from core.visualization.visual_tools_plotly import plotly_draw, plotly_draw_records
 from pathlib import Path
 import settings
 
 logger = create_log('quant_manage')
 
+# 回测输出模式：html 生成报告并打开浏览器；headless 只保存结构化结果，报告在首次查看时渲染
+OUTPUT_MODES = ("html", "headless")
+BUNDLE_META_FILE = "meta.json"
 
-def run_backtest_enhanced_volume_strategy_multi(kline_csv_folder_path, trading_strategy: bt.Strategy, init_cash=settings.INIT_CASH):
+
+@dataclass
+class BacktestResult:
+    """
+    单标的回测的紧凑结果（可跨进程传递）。
+    :param csv_path: K 线 CSV 路径
+    :param strategy: 策略类名
+    :param metrics: 收益/回撤/交易/信号统计
+    :param trades: 交易记录表
+    :param signals: 信号记录表
+    :param signals_path: 信号 CSV 保存路径
+    :param html_path: 可视化报告路径（无界面模式下为首次查看时渲染的目标路径）
+    :param results_dir: 无界面模式的结构化结果目录
+    :param equity: 逐 bar 账户总资产
+    :param error: 失败原因，成功时为 None
+    """
+    csv_path: str
+    strategy: str
+    metrics: dict = field(default_factory=dict)
+    trades: pd.DataFrame | None = None
+    signals: pd.DataFrame | None = None
+    signals_path: str | None = None
+    html_path: str | None = None
+    results_dir: str | None = None
+    equity: pd.Series | None = None
+    error: str | None = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class EquityCurve(bt.Analyzer):
+    """逐 bar 记录账户总资产。"""
+
+    def start(self):
+        self.dates = []
+        self.values = []
+
+    def next(self):
+        self.dates.append(self.data.datetime.datetime(0))
+        self.values.append(self.strategy.broker.getvalue())
+
+    def get_analysis(self):
+        return pd.Series(self.values, index=pd.DatetimeIndex(self.dates, name="date"), name="equity")
+
+
+def resolve_output_mode(output_mode=None):
+    """输出模式：为空时取 settings.BACKTEST_OUTPUT_MODE。"""
+    mode = output_mode or getattr(settings, "BACKTEST_OUTPUT_MODE", "html")
+    if mode not in OUTPUT_MODES:
+        raise ValueError(f"不支持的输出模式：{mode}，可选：{OUTPUT_MODES}")
+    return mode
+
+
+def run_backtest_enhanced_volume_strategy_multi(kline_csv_folder_path, trading_strategy: bt.Strategy, init_cash=settings.INIT_CASH,
+                                                max_workers=None, progress=None, output_mode=None, feed_cache=None):
     """
-    批量运行增强成交量策略回测
+    批量运行增强成交量策略回测（每个标的在独立进程中回测，单个失败不中断整批）
+    工作进程一律以无界面模式运行，只返回指标/交易/信号等紧凑结果，不生成报告、不打开浏览器。
     :param kline_csv_folder_path: 包含CSV文件的文件夹路径
     :param trading_strategy: 交易策略类
     :param init_cash: 初始资金
+    :param max_workers: 进程数，为空时取 settings.BACKTEST_MAX_WORKERS，再为空时取 CPU 核数；为 1 时在当前进程顺序执行
+    :param progress: 进度回调 progress(完成数, 总数, BacktestResult)
+    :param output_mode: html 在全部回测结束后由主进程渲染各标的报告（不打开浏览器）；headless 只保存结构化结果；
+                        为空时取 settings.BACKTEST_OUTPUT_MODE
+    :param feed_cache: 是否使用 K 线解析缓存（写入 settings.FEED_CACHE_ROOT），为空时取 settings.BATCH_FEED_CACHE_ENABLED
+    :return: 按文件名排序的 BacktestResult 列表
     """
+    output_mode = resolve_output_mode(output_mode)
+    use_cache = settings.BATCH_FEED_CACHE_ENABLED if feed_cache is None else feed_cache
     folder = Path(kline_csv_folder_path)
-    for kline_csv_path in folder.glob("*.csv"):
-        run_backtest_enhanced_volume_strategy(kline_csv_path, trading_strategy,init_cash)
+    csv_paths = sorted(folder.glob("*.csv"))
+    total = len(csv_paths)
+    if max_workers is None:
+        max_workers = settings.BACKTEST_MAX_WORKERS or os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, total or 1))
+    logger.info(f"【批量回测】共 {total} 个标的 | 进程数：{max_workers}")
+
+    results = {}
+
+    def _collect(csv_path, result):
+        results[csv_path] = result
+        if result.ok:
+            logger.info(f"【批量进度】{len(results)}/{total} 完成：{csv_path}")
+        else:
+            logger.warning(f"【批量进度】{len(results)}/{total} 失败：{csv_path} ({result.error})")
+        if progress is not None:
+            progress(len(results), total, result)
+
+    if max_workers == 1:
+        for csv_path in csv_paths:
+            _collect(csv_path, _run_backtest_job(str(csv_path), trading_strategy, init_cash, use_cache))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_run_backtest_job, str(csv_path), trading_strategy, init_cash, use_cache): csv_path
+                for csv_path in csv_paths
+            }
+            for future in as_completed(futures):
+                csv_path = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # 子进程异常退出等无法在任务内捕获的错误
+                    result = BacktestResult(str(csv_path), trading_strategy.__name__, error=str(e))
+                _collect(csv_path, result)
+
+    ordered = [results[csv_path] for csv_path in csv_paths]
+    if output_mode == "html":
+        _render_batch_reports(ordered)
+    failures = [result for result in ordered if not result.ok]
+    logger.info(f"【批量回测结束】成功：{total - len(failures)} | 失败：{len(failures)}")
+    for result in failures:
+        logger.warning(f"【失败标的】{result.csv_path}：{result.error}")
+    return ordered
+
+
+def _run_backtest_job(csv_path, trading_strategy, init_cash, use_cache=None):
+    """进程池任务：以无界面模式回测，捕获所有异常并转为失败结果，保证整批继续执行。"""
+    try:
+        return run_backtest_enhanced_volume_strategy(
+            csv_path, trading_strategy, init_cash, output_mode="headless", use_cache=use_cache
+        )
+    except Exception as e:
+        return BacktestResult(str(csv_path), trading_strategy.__name__, error=f"{type(e).__name__}: {e}")
+
+
+def _render_batch_reports(results):
+    """主进程按结构化结果逐个渲染批量回测报告（不打开浏览器），渲染失败只记录日志。"""
+    for result in results:
+        if not result.ok or not result.results_dir:
+            continue
+        try:
+            result.html_path = str(render_backtest_bundle(result.results_dir))
+        except Exception as e:
+            logger.warning(f"【报告渲染失败】{result.csv_path}：{e}")
 
-def run_backtest_enhanced_volume_strategy(csv_path, trading_strategy: bt.Strategy, init_cash=settings.INIT_CASH):
+
+def run_backtest_enhanced_volume_strategy(csv_path, trading_strategy: bt.Strategy, init_cash=settings.INIT_CASH,
+                                          output_mode=None, use_cache=None):
+    """
+    单标的回测，返回 BacktestResult（数据加载或回测执行失败时 error 非空）。
+    :param output_mode: html 生成报告并打开浏览器；headless 只保存指标/交易/信号/资金曲线，
+                        报告由 render_backtest_bundle 在首次查看时生成；为空时取 settings.BACKTEST_OUTPUT_MODE
+    :param use_cache: 是否使用 K 线解析缓存，为空时取 settings.FEED_CACHE_ENABLED
+    """
+    output_mode = resolve_output_mode(output_mode)
     current_time = get_current_time()
     relative_path = str(csv_path).replace(str(settings.stock_data_root) + '/', '')
+    result = BacktestResult(str(csv_path), trading_strategy.__name__)
     logger.info("=" * 60)
     logger.info("【程序启动】VolumeIndicatorStrategy回测程序")
     logger.info(f"【目标文件】{csv_path}")
@@ -37,26 +184,23 @@ def run_backtest_enhanced_volume_strategy(csv_path, trading_strategy: bt.Strateg
     logger.info("【回测配置】开始初始化回测参数")
     # 加载数据
     try:
-        data = get_data_form_csv(csv_path)
+        data = get_data_form_csv(csv_path, use_cache=use_cache)
     except Exception as e:
         logger.warning(f"【回测终止】数据加载失败：{str(e)}")
-        return
+        result.error = f"数据加载失败：{e}"
+        return result
     # 检查数据量
     data_length = len(data.p.dataname)
     logger.info(f"【数据检查】有效数据量：{data_length} 天")
     if data_length < 50:
         logger.info(f"【风险提示】数据量较少，可能影响策略信号有效性！")
 
-    market_series = data.p.dataname.get('market', pd.Series(['HK']))
-    market = market_series.iloc[0] if not market_series.empty else None
+    market = feed_market(data)
 
     cerebro = bt.Cerebro()
-    cerebro.adddata(data)
-    cerebro.broker.set_cash(init_cash)  # 设置初始资金
-    commission = CommissionFactory.get_commission(market)   # 获取对应市场的佣金配置
-    cerebro.broker.addcommissioninfo(commission)
-    cerebro.broker.set_slippage_fixed(commission.p.slippage)  # 设置固定滑点
-    cerebro.broker.set_coc(True)    # 当设置为True时，Backtrader会使用当前交易日的收盘价来执行订单，而不是默认的下一个交易日的开盘价
+    # 数据源名称用于指标快照续算（去掉文件名中的起止日期，使每日重新拉取的同一标的对应同一快照）
+    cerebro.adddata(data, name=snapshot_data_name(relative_path))
+    commission = configure_broker(cerebro, market, init_cash)
     logger.info(f"【资金配置】初始资金：{init_cash:,.2f} 港元 | 佣金率：{commission.p.commission:.2f}% | 滑点：{commission.p.slippage:.2f} 港元")
     logger.info("=" * 60)
 
@@ -65,6 +209,7 @@ def run_backtest_enhanced_volume_strategy(csv_path, trading_strategy: bt.Strateg
     cerebro.addanalyzer(bt.analyzers.TimeReturn, _name="total_return", timeframe=bt.TimeFrame.NoTimeFrame)
     cerebro.addanalyzer(bt.analyzers.DrawDown, _name="drawdown")
     cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name="trade_analyzer")
+    cerebro.addanalyzer(EquityCurve, _name="equity")
 
     # 启动回测
     logger.info(f"【回测启动】初始资金：{cerebro.broker.getcash():,.2f} 港元")
@@ -77,7 +222,8 @@ def run_backtest_enhanced_volume_strategy(csv_path, trading_strategy: bt.Strateg
         results = cerebro.run()
     except Exception as e:
         logger.warning(f"【回测失败】执行出错：{str(e)}")
-        return
+        result.error = f"执行出错：{e}"
+        return result
     strategy = results[0]
 
     # 打印回测结果
@@ -88,6 +234,7 @@ def run_backtest_enhanced_volume_strategy(csv_path, trading_strategy: bt.Strateg
     try:
         total_return = list(strategy.analyzers.total_return.get_analysis().values())[0] * 100
         final_cash = cerebro.broker.getvalue()
+        result.metrics.update(total_return=total_return, final_value=final_cash)
         logger.info(f"1. 收益情况：总收益率={total_return:.2f}% | 最终资金={final_cash:,.2f} 港元")
     except Exception as e:
         logger.warning(f"1. 收益情况：无法计算 ({str(e)})")
@@ -95,6 +242,7 @@ def run_backtest_enhanced_volume_strategy(csv_path, trading_strategy: bt.Strateg
     # 风险指标
     try:
         max_dd = strategy.analyzers.drawdown.get_analysis()["max"]["drawdown"]
+        result.metrics["max_drawdown"] = max_dd
         logger.info(f"2. 风险指标：最大回撤={max_dd:.2f}%")
     except Exception as e:
         logger.warning(f"2. 风险指标：无法计算 ({str(e)})")
@@ -105,6 +253,7 @@ def run_backtest_enhanced_volume_strategy(csv_path, trading_strategy: bt.Strateg
         total_trades = trade_stats["total"]["total"]
         won_trades = trade_stats.get("won", {}).get("total", 0)
         win_rate = (won_trades / total_trades) * 100 if total_trades > 0 else 0
+        result.metrics.update(total_trades=total_trades, won_trades=won_trades, win_rate=win_rate)
         logger.info(
             f"3. 交易统计：总交易={total_trades} | 盈利={won_trades} | 亏损={total_trades - won_trades} | 胜率={win_rate:.2f}%")
     except Exception as e:
@@ -112,6 +261,12 @@ def run_backtest_enhanced_volume_strategy(csv_path, trading_strategy: bt.Strateg
 
     # 信号统计
     try:
+        result.metrics.update(
+            buy_signals=strategy.buy_signals_count,
+            sell_signals=strategy.sell_signals_count,
+            executed_buys=strategy.executed_buys_count,
+            executed_sells=strategy.executed_sells_count,
+        )
         logger.info(
             f"4. 信号统计：买入信号={strategy.buy_signals_count} | 卖出信号={strategy.sell_signals_count} | 实际买入={strategy.executed_buys_count} | 实际卖出={strategy.executed_sells_count}")
     except Exception as e:
@@ -122,6 +277,7 @@ def run_backtest_enhanced_volume_strategy(csv_path, trading_strategy: bt.Strateg
         if hasattr(strategy, 'indicator') and hasattr(strategy.indicator, 'signal_record_manager'):
             # 获取信号记录并转换为DataFrame
             signals_df = strategy.indicator.signal_record_manager.transform_to_dataframe()
+            result.signals = signals_df
 
             if not signals_df.empty:
                 signal_file_folder = settings.signals_root / relative_path.rsplit('.', 1)[0] / strategy.__class__.__name__
@@ -129,19 +285,106 @@ def run_backtest_enhanced_volume_strategy(csv_path, trading_strategy: bt.Strateg
                 # 保存所有信号到一个文件
                 signals_file_path = os.path.join(signal_file_folder, f"stock_signals_{current_time}.csv")
                 signals_df.to_csv(signals_file_path, index=False, encoding='utf-8-sig')
+                result.signals_path = str(signals_file_path)
                 logger.info(f"5. 信号记录已保存至：{signals_file_path}")
 
     except Exception as e:
         logger.warning(f"信号保存失败：{str(e)}")
 
+    result.trades = strategy.trade_record_manager.transform_to_dataframe()
+    result.equity = strategy.analyzers.equity.get_analysis()
+
     html_file_path = settings.html_root / relative_path.rsplit('.', 1)[0] / strategy.__class__.__name__
     html_file_name = f"stock_with_trades_{current_time}.html"
-    html_path = plotly_draw(csv_path, strategy, init_cash, html_file_name, html_file_path)
-    logger.info(f"6. 回测可视化图表将保存至：{html_path}，对应股票数据：{csv_path}")
+    if output_mode == "headless":
+        bundle_dir = html_file_path / html_file_name.rsplit('.', 1)[0]
+        save_backtest_bundle(result, bundle_dir, init_cash)
+        result.results_dir = str(bundle_dir)
+        result.html_path = str(html_file_path / html_file_name)
+        logger.info(f"6. 回测结构化结果已保存至：{bundle_dir}（报告在首次查看时生成），对应股票数据：{csv_path}")
+    else:
+        html_path = plotly_draw(csv_path, strategy, init_cash, html_file_name, html_file_path)
+        result.html_path = str(html_path)
+        logger.info(f"6. 回测可视化图表将保存至：{html_path}，对应股票数据：{csv_path}")
     logger.info("=" * 60)
     logger.info("【回测结束】\n")
+    return result
+
+
+
+def save_backtest_bundle(result: BacktestResult, bundle_dir, init_cash):
+    """
+    保存无界面模式的结构化结果：meta.json（路径/策略/初始资金/指标）、trades.csv、signals.csv、equity.csv。
+    """
+    bundle_dir = Path(bundle_dir)
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    meta = {
+        "csv_path": result.csv_path,
+        "strategy": result.strategy,
+        "init_cash": init_cash,
+        "metrics": result.metrics,
+    }
+    (bundle_dir / BUNDLE_META_FILE).write_text(json.dumps(meta, ensure_ascii=False, indent=2, default=float), encoding="utf-8")
+    for name, frame in (("trades", result.trades), ("signals", result.signals)):
+        frame = frame if frame is not None else pd.DataFrame()
+        frame.to_csv(bundle_dir / f"{name}.csv", index=False, encoding="utf-8-sig")
+    if result.equity is not None:
+        result.equity.to_csv(bundle_dir / "equity.csv", encoding="utf-8-sig")
+    return bundle_dir
+
+
+def _read_bundle_frame(path):
+    try:
+        return pd.read_csv(path, parse_dates=["date"], encoding="utf-8-sig")
+    except (FileNotFoundError, pd.errors.EmptyDataError, ValueError):
+        return pd.DataFrame()
 
 
+def render_backtest_bundle(bundle_dir, open_browser=False):
+    """
+    由无界面模式的结构化结果生成报告（与 bundle 目录同名的 .html），已生成时直接返回路径。
+    """
+    bundle_dir = Path(bundle_dir)
+    html_path = bundle_dir.with_name(bundle_dir.name + ".html")
+    if html_path.exists():
+        return html_path
+    meta = json.loads((bundle_dir / BUNDLE_META_FILE).read_text(encoding="utf-8"))
+    signals_df = _read_bundle_frame(bundle_dir / "signals.csv")
+    trades_df = _read_bundle_frame(bundle_dir / "trades.csv")
+    output = plotly_draw_records(
+        meta["csv_path"], signals_df, trades_df, meta["init_cash"], html_path.name, str(bundle_dir.parent),
+        open_browser=open_browser,
+    )
+    logger.info(f"【延迟渲染】回测报告已生成：{output}")
+    return Path(output)
+
+
+def configure_broker(cerebro, market, init_cash):
+    """
+    按市场配置初始资金、佣金、固定滑点与收盘价成交，返回佣金模型。
+    """
+    cerebro.broker.set_cash(init_cash)  # 设置初始资金
+    commission = CommissionFactory.get_commission(market)   # 获取对应市场的佣金配置
+    cerebro.broker.addcommissioninfo(commission)
+    cerebro.broker.set_slippage_fixed(commission.p.slippage)  # 设置固定滑点
+    cerebro.broker.set_coc(True)    # 当设置为True时，Backtrader会使用当前交易日的收盘价来执行订单，而不是默认的下一个交易日的开盘价
+    return commission
+
+
+def feed_market(data):
+    """数据源对应的市场代码（缺失时按港股处理）。"""
+    market_series = data.p.dataname.get('market', pd.Series(['HK']))
+    return market_series.iloc[0] if not market_series.empty else None
+
+
+def snapshot_data_name(relative_path):
+    """
+    由 K 线文件相对路径生成指标快照使用的数据源名称：去掉扩展名与文件名末尾的 _起始日期_结束日期。
+    例如 akshare/HK.00700_腾讯控股_20210104_20250127.csv -> akshare/HK.00700_腾讯控股
+    """
+    stem = str(relative_path).rsplit('.', 1)[0]
+    return re.sub(r"_\d{8}_\d{8}$", "", stem)
+
 
 def get_file_names_pathlib(folder_path):
     """
@@ -171,32 +414,74 @@ def _build_default_benchmark_close(close_series: pd.Series | None, index: pd.Ind
     return pd.Series(benchmark_values, index=index)
 
 
-def get_data_form_csv(csv_path):
+class CustomPandasData(bt.feeds.PandasData):
+    """K 线数据源：在 OHLCV 之外附带 VCPPlus 使用的基准收盘价与 RS 评分两条线。"""
+    lines = (
+        "benchmark_close",
+        "rs_rating",
+    )
+    params = (
+        ('datetime', None),
+        ('open', 'open'), ('high', 'high'), ('low', 'low'), ('close', 'close'),
+        ('volume', 'volume'), ('market', 'market'),
+        ('benchmark_close', settings.VCP_PLUS_BENCHMARK_CLOSE_COLUMN),
+        ('rs_rating', settings.VCP_PLUS_RS_RATING_COLUMN),
+        ('openinterest', -1)
+    )
+
+
+def load_kline_frame(csv_path, compact=None, use_cache=None):
+    """
+    读取 K 线 CSV 并规范化：日期索引，补齐基准收盘价与 RS 评分列，可选紧凑类型。
+    结果按 CSV 修改时间与大小缓存到 settings.FEED_CACHE_ROOT 下的二进制文件，CSV 未变化时直接读取。
+    :param csv_path: CSV 文件路径
+    :param compact: 紧凑内存模式（价格/成交量 float32、代码/名称/市场分类编码），为空时取 settings.COMPACT_MEMORY_MODE
+    :param use_cache: 是否使用解析缓存，为空时取 settings.FEED_CACHE_ENABLED
+    """
+    if compact is None:
+        compact = settings.COMPACT_MEMORY_MODE
+    if use_cache is None:
+        use_cache = getattr(settings, "FEED_CACHE_ENABLED", False)
+    benchmark_col = settings.VCP_PLUS_BENCHMARK_CLOSE_COLUMN
+    rs_col = settings.VCP_PLUS_RS_RATING_COLUMN
+    key = None
+    if use_cache:
+        key = feed_cache.cache_key(csv_path, (bool(compact), benchmark_col, rs_col, settings.VCP_PLUS_MIN_RS_RATING))
+        cached = feed_cache.load_frame(csv_path, key)
+        if cached is not None:
+            return cached
+
+    float_columns = (*PRICE_VOLUME_COLUMNS, benchmark_col, rs_col)
+    dtype = None
+    if compact:
+        # 直接按紧凑类型解析，避免先生成 float64/object 列再转换的内存峰值
+        dtype = {name: np.float32 for name in float_columns}
+        dtype.update({name: "category" for name in CATEGORY_COLUMNS})
     df = pd.read_csv(
         csv_path,
         parse_dates=['date'],  # 解析date列为datetime类型
-        index_col='date'  # 将date列设为索引，方便按日期查询
+        index_col='date',  # 将date列设为索引，方便按日期查询
+        dtype=dtype,
     )
-    benchmark_col = settings.VCP_PLUS_BENCHMARK_CLOSE_COLUMN
-    rs_col = settings.VCP_PLUS_RS_RATING_COLUMN
     if benchmark_col not in df.columns or df[benchmark_col].isna().all():
         df[benchmark_col] = _build_default_benchmark_close(df.get("close"), df.index)
     if rs_col not in df.columns or df[rs_col].isna().all():
         df[rs_col] = settings.VCP_PLUS_MIN_RS_RATING
+    if compact:
+        df = compact_frame(df, float_columns)
+    if key is not None:
+        feed_cache.store_frame(csv_path, key, df)
+    return df
 
-    class CustomPandasData(bt.feeds.PandasData):
-        lines = (
-            "benchmark_close",
-            "rs_rating",
-        )
-        params = (
-            ('datetime', None),
-            ('open', 'open'), ('high', 'high'), ('low', 'low'), ('close', 'close'),
-            ('volume', 'volume'), ('market', 'market'),
-            ('benchmark_close', settings.VCP_PLUS_BENCHMARK_CLOSE_COLUMN),
-            ('rs_rating', settings.VCP_PLUS_RS_RATING_COLUMN),
-            ('openinterest', -1)
-        )
+
+def get_data_form_csv(csv_path, compact=None, use_cache=None):
+    """
+    读取 K 线 CSV 并构造 backtrader 数据源。
+    :param csv_path: CSV 文件路径
+    :param compact: 紧凑内存模式（价格/成交量 float32、代码/名称/市场分类编码），为空时取 settings.COMPACT_MEMORY_MODE
+    :param use_cache: 是否使用解析缓存，为空时取 settings.FEED_CACHE_ENABLED
+    """
+    df = load_kline_frame(csv_path, compact=compact, use_cache=use_cache)
 
     data_feed = CustomPandasData(dataname=df)
     data_feed.timeframe = bt.TimeFrame.Days
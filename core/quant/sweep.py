@@ -0,0 +1,221 @@
+"""
+策略参数扫描：对策略 params 的网格 / 随机采样组合批量回测，汇总收益、最大回撤、交易次数与胜率。
+
+数学原理：
+1. 网格为各参数取值的笛卡尔积；随机采样从各参数的候选值（或采样函数）独立抽取，去重后保留 n 组。
+2. 任务按 (CSV, 参数组合分块) 切分到进程池，每个进程对同一 CSV 只解析一次，后续组合复用已解析的行情表；
+   开启解析缓存（默认 settings.BATCH_FEED_CACHE_ENABLED）时各进程与后续扫描直接读取缓存的行情表。
+3. 扫描内只运行 Cerebro 与分析器，不写信号文件、不生成 HTML。
+"""
+
+from __future__ import annotations
+
+import itertools
+import os
+import random
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import backtrader as bt
+import pandas as pd
+
+from common.logger import create_log
+from core.quant.quant_manage import configure_broker, feed_market, get_data_form_csv
+import settings
+
+logger = create_log("quant_sweep")
+
+METRIC_COLUMNS = ["total_return", "max_drawdown", "total_trades", "win_rate", "final_value", "error"]
+
+# 每个进程缓存最近解析的行情表（任务按 CSV 分组提交，少量即可命中）
+_FEED_CACHE_SIZE = 4
+_feed_cache: "OrderedDict[str, Any]" = OrderedDict()
+
+
+def strategy_param_names(strategy) -> List[str]:
+    """策略类 params 中可扫描的参数名。"""
+    return list(strategy.params._getkeys())
+
+
+def expand_grid(grid: Mapping[str, Sequence]) -> List[Dict[str, Any]]:
+    """参数网格展开为组合列表，{'a': [1, 2], 'b': [3]} -> [{'a': 1, 'b': 3}, {'a': 2, 'b': 3}]。"""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(list(grid[name]) for name in names))]
+
+
+def sample_grid(space: Mapping[str, Union[Sequence, Callable]], n_samples: int, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    随机采样参数组合。
+    :param space: 参数名 -> 候选值序列，或接收 random.Random 返回取值的采样函数
+    :param n_samples: 采样组数（候选组合不足时返回全部去重结果）
+    :param seed: 随机种子
+    """
+    rng = random.Random(seed)
+    combos: List[Dict[str, Any]] = []
+    seen = set()
+    attempts = 0
+    while len(combos) < n_samples and attempts < n_samples * 20:
+        attempts += 1
+        combo = {
+            name: candidates(rng) if callable(candidates) else rng.choice(list(candidates))
+            for name, candidates in space.items()
+        }
+        key = tuple(sorted(combo.items()))
+        if key in seen:
+            continue
+        seen.add(key)
+        combos.append(combo)
+    return combos
+
+
+def _validate_combos(strategy, combos: Sequence[Mapping[str, Any]]) -> None:
+    valid = set(strategy_param_names(strategy))
+    unknown = sorted({name for combo in combos for name in combo} - valid)
+    if unknown:
+        raise ValueError(f"{strategy.__name__} 不支持参数 {unknown}，可选参数：{sorted(valid)}")
+
+
+def _load_frame(csv_path: str, use_cache: Optional[bool] = None):
+    """进程内行情缓存：同一 CSV 只解析一次，返回 (行情表, 数据源类)；use_cache 同 get_data_form_csv。"""
+    cached = _feed_cache.get(csv_path)
+    if cached is None:
+        feed = get_data_form_csv(csv_path, use_cache=use_cache)
+        cached = (feed.p.dataname, type(feed))
+        _feed_cache[csv_path] = cached
+        while len(_feed_cache) > _FEED_CACHE_SIZE:
+            _feed_cache.popitem(last=False)
+    else:
+        _feed_cache.move_to_end(csv_path)
+    return cached
+
+
+def _analyzer_metrics(strategy, broker) -> Dict[str, Any]:
+    metrics: Dict[str, Any] = {"final_value": broker.getvalue()}
+    metrics["total_return"] = list(strategy.analyzers.total_return.get_analysis().values())[0] * 100
+    metrics["max_drawdown"] = strategy.analyzers.drawdown.get_analysis()["max"]["drawdown"]
+    trade_stats = strategy.analyzers.trade_analyzer.get_analysis()
+    total_trades = trade_stats.get("total", {}).get("total", 0)
+    won_trades = trade_stats.get("won", {}).get("total", 0)
+    metrics["total_trades"] = total_trades
+    metrics["win_rate"] = won_trades / total_trades * 100 if total_trades > 0 else 0.0
+    return metrics
+
+
+def run_single(
+    csv_path: str,
+    strategy,
+    params: Mapping[str, Any],
+    init_cash: float = settings.INIT_CASH,
+    use_cache: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    单个 (CSV, 参数组合) 回测，返回指标字典；出错时 error 非空。
+    :param use_cache: 是否使用 K 线解析缓存，为空时取 settings.FEED_CACHE_ENABLED
+    """
+    row: Dict[str, Any] = {"csv_path": str(csv_path), **params}
+    try:
+        frame, feed_class = _load_frame(str(csv_path), use_cache)
+        data = feed_class(dataname=frame)
+        data.timeframe = bt.TimeFrame.Days
+        data.compression = 1
+        cerebro = bt.Cerebro(stdstats=False)
+        cerebro.adddata(data)
+        configure_broker(cerebro, feed_market(data), init_cash)
+        cerebro.addstrategy(strategy, **params)
+        cerebro.addanalyzer(bt.analyzers.TimeReturn, _name="total_return", timeframe=bt.TimeFrame.NoTimeFrame)
+        cerebro.addanalyzer(bt.analyzers.DrawDown, _name="drawdown")
+        cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name="trade_analyzer")
+        result = cerebro.run()[0]
+        row.update(_analyzer_metrics(result, cerebro.broker))
+        row["error"] = None
+    except Exception as e:
+        row["error"] = f"{type(e).__name__}: {e}"
+    return row
+
+
+def _run_chunk(
+    csv_path: str, strategy, combos: Sequence[Mapping[str, Any]], init_cash: float, use_cache: Optional[bool] = None
+) -> List[Dict[str, Any]]:
+    return [run_single(csv_path, strategy, combo, init_cash, use_cache) for combo in combos]
+
+
+def _chunk(combos: Sequence[Mapping[str, Any]], size: int) -> List[Sequence[Mapping[str, Any]]]:
+    return [combos[i:i + size] for i in range(0, len(combos), size)]
+
+
+def run_sweep(
+    strategy,
+    csv_paths: Union[str, os.PathLike, Iterable[Union[str, os.PathLike]]],
+    grid: Optional[Mapping[str, Sequence]] = None,
+    samples: Optional[int] = None,
+    seed: Optional[int] = None,
+    init_cash: float = settings.INIT_CASH,
+    max_workers: Optional[int] = None,
+    progress: Optional[Callable[[int, int], None]] = None,
+    feed_cache: Optional[bool] = None,
+) -> pd.DataFrame:
+    """
+    参数扫描。
+    :param strategy: 策略类（继承 StrategyBase）
+    :param csv_paths: CSV 路径列表，或包含 CSV 的目录
+    :param grid: 参数名 -> 候选值；samples 为空时展开完整网格，否则随机采样 samples 组
+    :param samples: 随机采样组数
+    :param seed: 随机采样种子
+    :param init_cash: 初始资金
+    :param max_workers: 进程数，为空时取 settings.BACKTEST_MAX_WORKERS，再为空时取 CPU 核数；为 1 时在当前进程顺序执行
+    :param progress: 进度回调 progress(完成组合数, 总组合数)
+    :param feed_cache: 是否使用 K 线解析缓存（写入 settings.FEED_CACHE_ROOT），为空时取 settings.BATCH_FEED_CACHE_ENABLED
+    :return: 每个 (CSV, 参数组合) 一行：csv_path、参数列、total_return、max_drawdown、total_trades、win_rate、final_value、error
+    """
+    grid = dict(grid or {})
+    use_cache = settings.BATCH_FEED_CACHE_ENABLED if feed_cache is None else feed_cache
+    combos = sample_grid(grid, samples, seed) if samples else expand_grid(grid)
+    _validate_combos(strategy, combos)
+    if isinstance(csv_paths, (str, os.PathLike)) and Path(csv_paths).is_dir():
+        paths = [str(path) for path in sorted(Path(csv_paths).glob("*.csv"))]
+    elif isinstance(csv_paths, (str, os.PathLike)):
+        paths = [str(csv_paths)]
+    else:
+        paths = [str(path) for path in csv_paths]
+
+    total = len(paths) * len(combos)
+    if max_workers is None:
+        max_workers = settings.BACKTEST_MAX_WORKERS or os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, total or 1))
+    # 标的数少于进程数时把组合拆块，保证进程占满；同一 CSV 的块尽量落在同一进程缓存内
+    chunks_per_path = max(1, -(-max_workers // max(len(paths), 1)))
+    chunk_size = max(1, -(-len(combos) // chunks_per_path))
+    jobs = [(path, chunk) for path in paths for chunk in _chunk(combos, chunk_size)]
+    logger.info(f"【参数扫描】{strategy.__name__} | 标的：{len(paths)} | 组合：{len(combos)} | 进程数：{max_workers}")
+
+    rows: List[Dict[str, Any]] = []
+
+    def _collect(chunk_rows):
+        rows.extend(chunk_rows)
+        if progress is not None:
+            progress(len(rows), total)
+
+    if max_workers == 1:
+        for path, chunk in jobs:
+            _collect(_run_chunk(path, strategy, chunk, init_cash, use_cache))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(_run_chunk, path, strategy, chunk, init_cash, use_cache): (path, chunk)
+                for path, chunk in jobs
+            }
+            for future in as_completed(futures):
+                path, chunk = futures[future]
+                try:
+                    chunk_rows = future.result()
+                except Exception as e:
+                    chunk_rows = [{"csv_path": path, **combo, "error": str(e)} for combo in chunk]
+                _collect(chunk_rows)
+
+    param_columns = list(grid)
+    result = pd.DataFrame(rows, columns=["csv_path", *param_columns, *METRIC_COLUMNS])
+    failed = int(result["error"].notna().sum())
+    logger.info(f"【参数扫描结束】成功：{len(result) - failed} | 失败：{failed}")
+    return result.sort_values(["csv_path", *param_columns], kind="stable", ignore_index=True)
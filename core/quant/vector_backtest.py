@@ -0,0 +1,431 @@
+"""
+信号线策略的数组回测快速通道：按 StrategyBase 的仓位规则在预计算的买卖信号数组上模拟成交，
+输出交易记录与资金曲线，并可与 Backtrader 回测逐笔对账。
+
+数学原理：
+1. 与 Cerebro（set_coc=True）一致：第 t 根 K 线的信号以 close[t] 下市价单，在 t+1 根撮合并记账；
+   提交时按 close[t] 伪成交校验现金（开仓后现金 < 0 视为保证金不足拒单），撮合时再校验一次；
+   成交价施加固定滑点（set_slippage_fixed 默认 slip_open=True）：买入 min(close[t] + 滑点, high[t+1])，
+   卖出 max(close[t] - 滑点, low[t+1])，成交额与手续费按成交价计。
+2. 现金按佣金模型的记账方式（与 BackBroker 相同）：
+   - 股票类（stocklike）：开仓扣 数量 × 成交价，平仓收回 数量 × 持仓均价 + 盈亏；持仓市值 = 数量 × 收盘价。
+   - 期货类（stocklike=False，CommissionFactory 的 HK/US/CN 模型均属此类，保证金 margin = 1）：
+     开仓只扣 数量 × margin，平仓收回 数量 × margin；持仓盈亏逐 bar 盯市计入现金
+     （现金 += 数量 × (收盘价 - 上一调整价) × mult，撮合当根先调整到成交价），持仓市值 = 数量 × margin。
+   两种方式下总资产都等于 初始资金 + 已实现与浮动盈亏 - 手续费，但策略可见的现金不同，仓位上限按各自现金计算。
+3. 买入股数 = min(可用现金, 总资产 × 单笔买入比例, 总资产 × 最大持仓比例) // 价格，向下取整到最小交易单位；
+   卖出股数 = min(持仓取整, 总资产 × 单笔卖出比例 / 价格 取整)。
+4. 只在有信号的 K 线上逐笔决策（事件数远小于 K 线数），两次决策之间的盯市调整按 bar 顺序累加（与逐 bar 记账的舍入一致），
+   资金曲线 = 现金 + 持仓市值。
+5. 统计口径与分析器一致：总收益 = 期末资产 / 初始资金 - 1，最大回撤按资金曲线峰值计算，
+   一笔交易为从空仓到再次空仓，净利润（含双边手续费）>= 0 记为盈利，未平仓交易计入总数。
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional, Sequence, Union
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+
+from core.quant.quant_manage import configure_broker, feed_market, get_data_form_csv
+from core.strategy.trading.common import TradeRecordManager
+from core.strategy.trading.trading_commition import CommissionFactory
+import settings
+
+TRADE_COMPARE_COLUMNS = ["date", "action", "price", "size", "total_amount", "commission"]
+SIZING_PARAMS = ("min_order_size", "max_portfolio_percent", "max_single_buy_percent", "max_single_sell_percent")
+
+
+@dataclass(frozen=True)
+class SignalRule:
+    """
+    策略的信号线映射。
+    :param buy_line: 买入信号线名
+    :param sell_line: 卖出信号线名
+    :param position_gated: True 时持仓才响应卖出、空仓才响应买入，且卖出优先（VCP 系列）；
+                           False 时买入优先、无持仓的卖出信号只计数（成交量系列）
+    """
+    buy_line: str
+    sell_line: str
+    position_gated: bool
+
+
+SIGNAL_RULES: Dict[str, SignalRule] = {
+    "EnhancedVolumeStrategy": SignalRule("enhanced_buy_signal", "enhanced_sell_signal", False),
+    "SingleVolumeStrategy": SignalRule("main_buy_signal", "main_sell_signal", False),
+    "VCPStrategy": SignalRule("vcp_signal", "vcp_sell_signal", True),
+    "VCPStrategyLoose": SignalRule("vcp_signal", "vcp_sell_signal", True),
+}
+
+
+@dataclass
+class VectorBacktestResult:
+    """
+    数组回测结果。
+    :param trades: 交易记录表（列与 TradeRecordManager.transform_to_dataframe 一致）
+    :param equity: 每根 K 线收盘后的总资产
+    :param cash: 每根 K 线收盘后的现金
+    :param position: 每根 K 线收盘后的持仓股数
+    :param metrics: total_return / final_value / max_drawdown / total_trades / won_trades / win_rate / 信号计数
+    """
+    trades: pd.DataFrame
+    equity: pd.Series
+    cash: np.ndarray
+    position: np.ndarray
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ReconcileReport:
+    """
+    对账结果。
+    :param matched: 交易逐笔一致（数值在容差内）
+    :param trades: 逐笔对照表（bt_* 为 Backtrader，vec_* 为数组回测，match 为该笔是否一致）
+    :param metrics: 两侧统计指标对照（index 为指标名，列为 backtrader / vector）
+    """
+    matched: bool
+    trades: pd.DataFrame
+    metrics: pd.DataFrame
+
+
+def signal_rule(strategy) -> SignalRule:
+    """按类继承链查找策略的信号线映射。"""
+    for klass in strategy.__mro__:
+        rule = SIGNAL_RULES.get(klass.__name__)
+        if rule is not None:
+            return rule
+    raise ValueError(f"{strategy.__name__} 未登记信号线，可选策略：{sorted(SIGNAL_RULES)}")
+
+
+def _as_signal(values, size: int) -> np.ndarray:
+    """信号数组转为布尔：浮点信号线以非 NaN 表示触发，布尔数组原样使用。"""
+    arr = np.asarray(values)
+    if arr.shape != (size,):
+        raise ValueError(f"信号长度 {arr.shape} 与收盘价长度 {size} 不一致")
+    if arr.dtype == bool:
+        return arr
+    return ~np.isnan(arr.astype(np.float64))
+
+
+def _resolve_commission(commission):
+    if commission is None or isinstance(commission, str):
+        return CommissionFactory.get_commission(commission)
+    return commission
+
+
+def _position_value(comminfo, size, price):
+    """持仓市值（BackBroker shortcash 口径）：股票类为 数量 × 价格，期货类为 数量 × 保证金。"""
+    return comminfo.getvaluesize(size, price)
+
+
+def _broker_value(comminfo, cash, size, position_price, price) -> float:
+    """broker.getvalue()：现金 + 持仓市值，多头持仓按 BackBroker 的去杠杆写法先减后加浮动盈亏。"""
+    value = _position_value(comminfo, size, price)
+    if value > 0:
+        unrealized = comminfo.profitandloss(size, position_price, price)
+        value = 0.0 + (value - unrealized) / comminfo.get_leverage() + unrealized
+    return cash + value
+
+
+def simulate_signals(
+    close,
+    buy_signal,
+    sell_signal,
+    commission: Union[str, bt.CommInfoBase, None] = "HK",
+    high=None,
+    low=None,
+    slippage: Optional[float] = None,
+    init_cash: float = settings.INIT_CASH,
+    index: Optional[Sequence] = None,
+    position_gated: bool = False,
+    min_order_size: int = 100,
+    max_portfolio_percent: float = 0.8,
+    max_single_buy_percent: float = 0.2,
+    max_single_sell_percent: float = 0.3,
+) -> VectorBacktestResult:
+    """
+    在预计算的信号数组上模拟 StrategyBase 的下单与 Cerebro 的撮合。
+    :param close: 收盘价
+    :param buy_signal: 买入信号（浮点信号线或布尔数组）
+    :param sell_signal: 卖出信号
+    :param commission: 市场代码（HK/US/CN）或 CommissionFactory 返回的佣金模型
+    :param high: 最高价，滑点后的买入成交价不超过撮合 K 线最高价（为空时不封顶）
+    :param low: 最低价，滑点后的卖出成交价不低于撮合 K 线最低价（为空时不封底）
+    :param slippage: 固定滑点，为空时取佣金模型的 slippage 参数（无该参数时为 0）
+    :param init_cash: 初始资金
+    :param index: 日期索引，用于交易记录日期与资金曲线索引
+    :param position_gated: 见 SignalRule
+    """
+    close = np.ascontiguousarray(close, dtype=np.float64)
+    n = close.size
+    buy = _as_signal(buy_signal, n)
+    sell = _as_signal(sell_signal, n)
+    # 无日期索引时按 1970-01-01 起的自然日编号
+    index = pd.DatetimeIndex(index) if index is not None else pd.to_datetime(np.arange(n), unit="D")
+    comminfo = _resolve_commission(commission)
+    if slippage is None:
+        slippage = float(getattr(comminfo.p, "slippage", 0.0) or 0.0)
+    high = np.full(n, np.inf) if high is None else np.ascontiguousarray(high, dtype=np.float64)
+    low = np.full(n, -np.inf) if low is None else np.ascontiguousarray(low, dtype=np.float64)
+    lot = min_order_size
+
+    cash = float(init_cash)
+    position = 0.0
+    position_price = 0.0  # 持仓均价（平仓盈亏基准）
+    adjbase = 0.0  # 期货类盯市的上一调整价
+    marked = -1  # 已完成收盘记账的最后一根 K 线
+    cash_curve = np.full(n, float(init_cash))
+    position_curve = np.zeros(n)
+    fill_count = 0
+    manager = TradeRecordManager()
+    buy_count = sell_count = 0
+    trade_pnl = trade_comm = 0.0
+    closed_trades = won_trades = 0
+
+    def mark_to(bar):
+        """逐 bar 收盘记账到 bar（含），期货类持仓按收盘价盯市。"""
+        nonlocal cash, adjbase, marked
+        if bar <= marked:
+            return
+        segment = slice(marked + 1, bar + 1)
+        if position and not comminfo.stocklike:
+            bases = np.concatenate(([adjbase], close[marked + 1 : bar]))
+            curve = np.cumsum(np.concatenate(([cash], comminfo.cashadjust(position, bases, close[segment]))))[1:]
+            cash = float(curve[-1])
+            adjbase = close[bar]
+        else:
+            curve = cash
+        cash_curve[segment] = curve
+        position_curve[segment] = position
+        marked = bar
+
+    def can_open(size, price):
+        return cash - comminfo.getoperationcost(size, price) - comminfo.getcommission(size, price) >= 0.0
+
+    for t in np.flatnonzero(buy | sell):
+        mark_to(t)
+        price = close[t]
+        value = _broker_value(comminfo, cash, position, position_price, price)
+        if position_gated:
+            if position and sell[t]:
+                side = "S"
+            elif not position and buy[t]:
+                side = "B"
+            else:
+                continue
+        else:
+            side = "B" if buy[t] else "S"
+        if side == "B":
+            buy_count += 1
+            usable_cash = min(cash, value * max_single_buy_percent, value * max_portfolio_percent)
+            if not (price > 0 and usable_cash >= price * lot):
+                continue
+            size = max(usable_cash // price, lot) // lot * lot
+        else:
+            sell_count += 1
+            if not position:
+                continue
+            size = min(position // lot * lot, value * max_single_sell_percent / price // lot * lot)
+            if size < lot:
+                continue
+        if t + 1 >= n:
+            # 最后一根 K 线的订单没有下一根撮合
+            continue
+        if side == "B" and not can_open(size, price):
+            continue  # 提交时保证金不足，订单被拒
+        if side == "B":
+            price = min(price + slippage, high[t + 1])
+            if not can_open(size, price):
+                continue  # 撮合时按成交价保证金不足，订单被拒
+        else:
+            price = max(price - slippage, low[t + 1])
+        fee = comminfo.getcommission(size, price)
+        amount = size * price
+        if side == "B":
+            cash -= comminfo.getoperationcost(size, price)
+            cash -= fee
+            if not position:
+                trade_pnl = trade_comm = 0.0
+                position_price = price
+            else:
+                # 已有持仓先从上一调整价盯市到成交价，之后与新开仓位一起以成交价为调整基准
+                cash += comminfo.cashadjust(position, adjbase, price)
+                position_price = (position_price * position + size * price) / (position + size)
+            adjbase = price
+            position += size
+            trade_pnl -= amount
+        else:
+            pnl = comminfo.profitandloss(size, position_price, price)
+            cash += comminfo.getoperationcost(size, position_price) + pnl * comminfo.stocklike
+            cash -= fee
+            cash += comminfo.cashadjust(size, adjbase, price)
+            position -= size
+            if not position:
+                position_price = 0.0
+            trade_pnl += amount
+        trade_comm += fee
+        if side == "S" and not position:
+            closed_trades += 1
+            won_trades += int(trade_pnl - trade_comm >= 0.0)
+        fill_count += 1
+        manager.add_trade_record(
+            trade_id=fill_count,
+            date=index[t + 1].date(),
+            action=side,
+            price=price,
+            size=size,
+            total_amount=amount if side == "B" else -amount,
+            commission=fee,
+            order_type="buy" if side == "B" else "sell",
+            status=bt.Order.Completed,
+        )
+    mark_to(n - 1)
+    equity = cash_curve + _position_value(comminfo, position_curve, close)
+
+    final_value = float(equity[-1]) if n else float(init_cash)
+    peak = np.maximum.accumulate(equity) if n else equity
+    drawdown = float(np.max((peak - equity) / peak) * 100) if n else 0.0
+    total_trades = closed_trades + int(bool(position))
+    metrics = {
+        "total_return": (final_value / init_cash - 1) * 100,
+        "final_value": final_value,
+        "max_drawdown": drawdown,
+        "total_trades": total_trades,
+        "won_trades": won_trades,
+        "win_rate": won_trades / total_trades * 100 if total_trades > 0 else 0,
+        "buy_signals": buy_count,
+        "sell_signals": sell_count,
+    }
+    return VectorBacktestResult(
+        trades=manager.transform_to_dataframe(),
+        equity=pd.Series(equity, index=index, name="equity"),
+        cash=cash_curve,
+        position=position_curve,
+        metrics=metrics,
+    )
+
+
+def _fresh_feed(frame: pd.DataFrame, feed_class):
+    data = feed_class(dataname=frame)
+    data.timeframe = bt.TimeFrame.Days
+    data.compression = 1
+    return data
+
+
+def strategy_signals(strategy, frame: pd.DataFrame, feed_class) -> tuple[np.ndarray, np.ndarray]:
+    """
+    运行策略自身构造的信号指标（runonce 预计算，不执行下单逻辑），返回买卖信号线。
+    策略最小周期之前的信号置为 NaN（Cerebro 在该区间只调用 prenext）。
+    """
+    rule = signal_rule(strategy)
+    signal_only = type(f"{strategy.__name__}Signals", (strategy,), {"next": lambda self: None})
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(_fresh_feed(frame, feed_class))
+    cerebro.addstrategy(signal_only)
+    result = cerebro.run(runonce=True)[0]
+    buy = np.array(getattr(result.indicator.lines, rule.buy_line).array, dtype=np.float64)
+    sell = np.array(getattr(result.indicator.lines, rule.sell_line).array, dtype=np.float64)
+    warmup = max(result._minperiod - 1, 0)
+    buy[:warmup] = np.nan
+    sell[:warmup] = np.nan
+    return buy, sell
+
+
+def _sizing(strategy, params: Mapping[str, Any]) -> Dict[str, Any]:
+    sizing = {name: getattr(strategy.params, name) for name in SIZING_PARAMS}
+    sizing.update({name: value for name, value in params.items() if name in sizing})
+    return sizing
+
+
+def run_vector_backtest(csv_path, strategy, init_cash: float = settings.INIT_CASH, **params) -> VectorBacktestResult:
+    """
+    单标的数组回测：信号取自策略指标，仓位参数取策略 params 默认值（可用关键字覆盖）。
+    """
+    feed = get_data_form_csv(csv_path)
+    frame = feed.p.dataname
+    buy, sell = strategy_signals(strategy, frame, type(feed))
+    return simulate_signals(
+        frame["close"].to_numpy(dtype=np.float64),
+        buy,
+        sell,
+        commission=feed_market(feed),
+        high=frame["high"].to_numpy(dtype=np.float64),
+        low=frame["low"].to_numpy(dtype=np.float64),
+        init_cash=init_cash,
+        index=frame.index,
+        position_gated=signal_rule(strategy).position_gated,
+        **_sizing(strategy, params),
+    )
+
+
+def _backtrader_run(frame: pd.DataFrame, feed_class, market, strategy, init_cash: float, params: Mapping[str, Any]):
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(_fresh_feed(frame, feed_class))
+    configure_broker(cerebro, market, init_cash)
+    cerebro.addstrategy(strategy, **params)
+    cerebro.addanalyzer(bt.analyzers.TimeReturn, _name="total_return", timeframe=bt.TimeFrame.NoTimeFrame)
+    cerebro.addanalyzer(bt.analyzers.DrawDown, _name="drawdown")
+    cerebro.addanalyzer(bt.analyzers.TradeAnalyzer, _name="trade_analyzer")
+    result = cerebro.run()[0]
+    trade_stats = result.analyzers.trade_analyzer.get_analysis()
+    total_trades = trade_stats.get("total", {}).get("total", 0)
+    won_trades = trade_stats.get("won", {}).get("total", 0)
+    metrics = {
+        "total_return": list(result.analyzers.total_return.get_analysis().values())[0] * 100,
+        "final_value": cerebro.broker.getvalue(),
+        "max_drawdown": result.analyzers.drawdown.get_analysis()["max"]["drawdown"],
+        "total_trades": total_trades,
+        "won_trades": won_trades,
+        "win_rate": won_trades / total_trades * 100 if total_trades > 0 else 0,
+        "buy_signals": result.buy_signals_count,
+        "sell_signals": result.sell_signals_count,
+    }
+    return result.trade_record_manager.transform_to_dataframe(), metrics
+
+
+def _trade_frame(trades: pd.DataFrame) -> pd.DataFrame:
+    if trades.empty:
+        return pd.DataFrame(columns=TRADE_COMPARE_COLUMNS)
+    return trades[TRADE_COMPARE_COLUMNS].reset_index(drop=True)
+
+
+def reconcile(csv_path, strategy, init_cash: float = settings.INIT_CASH, rtol: float = 1e-9, atol: float = 1e-6, **params) -> ReconcileReport:
+    """
+    对账模式：同一 CSV 分别跑 Backtrader 与数组回测，逐笔比对日期、方向、价格、数量、金额与手续费。
+    """
+    feed = get_data_form_csv(csv_path)
+    frame, feed_class, market = feed.p.dataname, type(feed), feed_market(feed)
+    bt_trades, bt_metrics = _backtrader_run(frame, feed_class, market, strategy, init_cash, params)
+    buy, sell = strategy_signals(strategy, frame, feed_class)
+    vector = simulate_signals(
+        frame["close"].to_numpy(dtype=np.float64),
+        buy,
+        sell,
+        commission=market,
+        high=frame["high"].to_numpy(dtype=np.float64),
+        low=frame["low"].to_numpy(dtype=np.float64),
+        init_cash=init_cash,
+        index=frame.index,
+        position_gated=signal_rule(strategy).position_gated,
+        **_sizing(strategy, params),
+    )
+
+    left = _trade_frame(bt_trades).add_prefix("bt_")
+    right = _trade_frame(vector.trades).add_prefix("vec_")
+    trades = pd.concat([left, right], axis=1)
+    match = pd.Series(True, index=trades.index)
+    for column in TRADE_COMPARE_COLUMNS:
+        a, b = trades[f"bt_{column}"], trades[f"vec_{column}"]
+        if column in ("date", "action"):
+            same = a.eq(b)
+        else:
+            same = pd.Series(
+                np.isclose(a.astype(float), b.astype(float), rtol=rtol, atol=atol), index=trades.index
+            )
+        match &= same & a.notna() & b.notna()
+    trades["match"] = match
+    metrics = pd.DataFrame({"backtrader": pd.Series(bt_metrics), "vector": pd.Series(vector.metrics)})
+    return ReconcileReport(matched=bool(match.all()), trades=trades, metrics=metrics)
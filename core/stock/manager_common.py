@@ -15,7 +15,9 @@ from typing import Iterable, List, Optional
 import pandas as pd
 from pandas import DataFrame
 
+import settings
 from common.logger import create_log
+from common.util_compact import PRICE_VOLUME_COLUMNS, compact_frame
 
 
 logger = create_log("manager_common")
@@ -166,7 +168,13 @@ def write_cached_history(
         return None
 
 
-def standardize_stock_data(df: DataFrame | None, stock_code: str, stock_name: str, market: str) -> DataFrame:
+def standardize_stock_data(
+    df: DataFrame | None,
+    stock_code: str,
+    stock_name: str,
+    market: str,
+    compact: bool | None = None,
+) -> DataFrame:
     """
     标准化股票数据为统一英文列名与固定输出字段。
 
@@ -175,10 +183,13 @@ def standardize_stock_data(df: DataFrame | None, stock_code: str, stock_name: st
         stock_code: 股票代码
         stock_name: 股票名称
         market: 市场代码（US/HK/CN等）
+        compact: 紧凑内存模式（价格/成交量 float32，代码/名称/市场分类编码），为空时取 settings.COMPACT_MEMORY_MODE
 
     Returns:
         DataFrame: 标准化数据
     """
+    if compact is None:
+        compact = settings.COMPACT_MEMORY_MODE
     if df is None:
         df = pd.DataFrame()
 
@@ -214,4 +225,6 @@ def standardize_stock_data(df: DataFrame | None, stock_code: str, stock_name: st
         )
 
     data = data[REQUIRED_COLUMNS].sort_values("date")
+    if compact:
+        data = compact_frame(data, PRICE_VOLUME_COLUMNS)
     return data
@@ -1,18 +1,123 @@
 import datetime
+import inspect
+from array import array
+
+import numpy as np
 import pandas as pd
 
+import settings
+from core.analysis.indicators.feature_cache import FeatureCache, default_code_version
+from core.strategy.record_buffer import CATEGORY, DATETIME, OBJECT, ColumnarRecordBuffer
+
 def normalize_signal_type(signal_type: str) -> str:
     return signal_type
 
+
+def line_to_numpy(line, end: int) -> np.ndarray:
+    """将 backtrader 线的前 end 个值转为 numpy 数组（runonce 预计算路径使用）。"""
+    return np.asarray(line.array[:end], dtype=float)
+
+
+def write_line(line, start: int, end: int, values: np.ndarray) -> None:
+    """将 numpy 数组批量写入 backtrader 线的 [start, end) 区间。"""
+    line.array[start:end] = array("d", np.asarray(values, dtype=float)[start:end].tolist())
+
+
+def bar_date(data, index: int) -> datetime.date:
+    """获取数据源第 index 根 bar 的日期（与 data.datetime.date() 一致）。"""
+    return data.num2date(data.datetime.array[index]).date()
+
+
+_feature_cache = None
+_feature_cache_configured = False
+
+
+def get_feature_cache():
+    """进程级特征缓存；未显式设置时按 settings.FEATURE_CACHE_* 创建，关闭时返回 None。"""
+    global _feature_cache, _feature_cache_configured
+    if not _feature_cache_configured:
+        if settings.FEATURE_CACHE_ENABLED:
+            _feature_cache = FeatureCache(settings.FEATURE_CACHE_ROOT, settings.FEATURE_CACHE_MAX_BYTES)
+        _feature_cache_configured = True
+    return _feature_cache
+
+
+def set_feature_cache(cache):
+    """显式设置（或传 None 关闭）进程级特征缓存，返回之前的缓存。"""
+    global _feature_cache, _feature_cache_configured
+    previous = get_feature_cache()
+    _feature_cache = cache
+    _feature_cache_configured = True
+    return previous
+
+
+def indicator_source_files(owner) -> list:
+    """指标类及其继承链上本项目基类/混入类的源码文件（代码版本需覆盖共用实现）。"""
+    files = []
+    for klass in owner.__mro__:
+        if klass.__module__.startswith("core."):
+            path = inspect.getsourcefile(klass)
+            if path and path not in files:
+                files.append(path)
+    return files
+
+
+def precompute_features(indicator, params, df: pd.DataFrame, compute) -> pd.DataFrame:
+    """
+    runonce 预计算路径的整段特征表。
+
+    - 同一指标实例内 oncestart/once 多次调用只计算（或读取缓存）一次
+    - 缓存键包含指标类、参数、df 各列内容与指标源码版本；缓存关闭时直接调用 compute()
+    """
+    precomputed = getattr(indicator, "_precomputed_features", None)
+    if precomputed is not None and len(precomputed) == len(df):
+        return precomputed
+
+    cache = get_feature_cache()
+    if cache is None:
+        frame = compute()
+    else:
+        owner = type(indicator)
+        kind = f"{owner.__module__}.{owner.__qualname__}"
+        code_version = default_code_version(*indicator_source_files(owner))
+        inputs = {str(name): df[name].to_numpy() for name in df.columns}
+        frame = cache.get_or_compute(kind, params, inputs, compute, code_version=code_version)
+    indicator._precomputed_features = frame
+    return frame
+
+
 class SignalRecordManager:
+    """信号记录管理器：按列追加到 ColumnarRecordBuffer，signal_type 以小整数编码存储。"""
+
+    SCHEMA = (("date", DATETIME), ("signal_type", CATEGORY), ("signal_description", OBJECT))
+
     def __init__(self):
-        self.signal_records = []
+        self.buffer = ColumnarRecordBuffer(self.SCHEMA)
+
+    @property
+    def signal_records(self):
+        """兼容旧接口：按需物化为 SignalRecord 对象列表。"""
+        return [SignalRecord.from_row(*row) for row in self.buffer.rows()]
+
+    def __len__(self):
+        return len(self.buffer)
 
     def add_signal_record(self, date, signal_type, signal_description):
-        self.signal_records.append(SignalRecord(date, signal_type, signal_description))
+        self.buffer.append(date, signal_type, signal_description)
+
+    def add_signal_records(self, records):
+        """批量添加信号记录，records 为 (date, signal_type, signal_description) 序列。"""
+        self.buffer.extend(records)
 
     def transform_to_dataframe(self):
-        return pd.DataFrame([record.__dict__ for record in self.signal_records])
+        return self.buffer.transform()
+
+    def to_dataframe(self):
+        """零拷贝导出，signal_type 为 Categorical。"""
+        return self.buffer.to_dataframe()
+
+    def to_arrow(self):
+        return self.buffer.to_arrow()
 
 class SignalRecord:
     def __init__(self, date, signal_type, signal_description):
@@ -28,3 +133,11 @@ class SignalRecord:
             raise ValueError('date must be datetime.date or str')
         self.signal_type = signal_type
         self.signal_description = signal_description
+
+    @classmethod
+    def from_row(cls, date, signal_type, signal_description):
+        record = cls.__new__(cls)
+        record.date = date
+        record.signal_type = signal_type
+        record.signal_description = signal_description
+        return record
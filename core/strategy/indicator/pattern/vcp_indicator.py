@@ -16,8 +16,23 @@ import numpy as np
 import backtrader as bt
 import pandas as pd
 
-from core.analysis.indicators.vcp import VCPParams, compute_vcp_features
-from core.strategy.indicator.common import SignalRecordManager
+from core.analysis.indicators.registry import get_registry
+from core.analysis.indicators.swing import SwingPointTracker
+from core.analysis.indicators.vcp import (
+    VCP_TREND_COLUMNS,
+    VCPParams,
+    compute_vcp_feature_series,
+    compute_vcp_features,
+    contraction_summary,
+    create_vcp_swing_tracker,
+)
+from core.strategy.indicator.common import (
+    SignalRecordManager,
+    bar_date,
+    line_to_numpy,
+    write_line,
+)
+from core.strategy.indicator.snapshot import resume_features
 
 
 class VCPIndicator(bt.Indicator):
@@ -61,6 +76,10 @@ class VCPIndicator(bt.Indicator):
         self._debug_printed = False
         self._vcp_bought = False
         self.ema_sell = bt.indicators.EMA(self.data.close, period=self.p.ema_sell_period)
+        # 增量高低点跟踪器：每根 K 线确认一次极值，避免每次重新扫描回溯窗口
+        self._swing = create_vcp_swing_tracker(
+            VCPParams(local_extrema_order=self.p.local_extrema_order, lookback_period=self.p.lookback_period)
+        )
         # 不强制设置超大 minperiod，避免短样本回测时触发 backtrader 内部越界
         # 在 next 中使用 len(self) 自行判断数据是否足够
         self.addminperiod(1)
@@ -89,28 +108,8 @@ class VCPIndicator(bt.Indicator):
             print(f"[警告] _build_feature_frame 获取数据失败: {str(e)}, lookback={lookback}, available={len(self)}")
             return pd.DataFrame()
 
-    def next(self):
-        # ========== 初始化所有信号输出线 ==========
-        # 设为 NaN 表示该 K 线无信号触发（图表上不显示标记）
-        self.lines.stage2_pass[0] = 0  # Stage 2 状态：0=未通过，1=已通过
-        self.lines.vcp_signal[0] = np.nan  # VCP 买入信号价格位置
-        self.lines.vcp_sell_signal[0] = np.nan  # VCP 卖出信号价格位置
-        self.lines.num_contractions[0] = 0  # 有效收缩次数
-        self.lines.max_contraction[0] = np.nan  # 最大收缩幅度
-        self.lines.min_contraction[0] = np.nan  # 最小收缩幅度
-
-        # 数据充分性检查
-        if len(self) < self._min_len:
-            return
-        
-        # ========== 数据准备 ==========
-        # 取最近 lookback_period 条数据构建 DataFrame（便于 evaluate_vcp 处理）
-        # 关键：不能超过当前已加载的数据总长度，否则会导致索引越界
-        lookback = min(len(self), self.p.lookback_period)
-        df = self._build_feature_frame(lookback)
-        
-        # 创建参数对象并调用核心计算函数
-        params = VCPParams(
+    def _vcp_params(self) -> VCPParams:
+        return VCPParams(
             ma_50_period=self.p.ma_50_period,
             ma_150_period=self.p.ma_150_period,
             ma_200_period=self.p.ma_200_period,
@@ -125,29 +124,12 @@ class VCPIndicator(bt.Indicator):
             vol_short_period=self.p.vol_short_period,
             vol_long_period=self.p.vol_long_period,
         )
-        
-        # ========== 调用指标特征计算函数 ==========
-        # 返回值包含均线、收缩、成交量等特征（不做条件判定）
-        # ========== 调用核心 VCP 计算函数 ==========
-        # 返回值包含 6 个关键指标：
-        # - stage2_pass: 是否满足 Stage 2 趋势
-        # - is_vcp: 是否完全满足 VCP 形态
-        # - progress: 进度分值 0-1（反映形态成熟度）
-        # - num_contractions: 有效收缩次数
-        # - max_contraction: 最小收缩幅度
-        # - min_contraction: 最大收缩幅度
-              
-        # 防护：如果 DataFrame 为空，返回无信号
-        if df.empty:
-            return
-            
-        vcp_result = compute_vcp_features(df, params)
-
-        # 调试输出（仅第一次）
-        if self.p.debug_once and not self._debug_printed:
-            print(f"vcp_result @ {self.data.datetime.date(0)}: {vcp_result}")
-            self._debug_printed = True
 
+    def _evaluate_signal(self, vcp_result: dict) -> tuple[bool, bool]:
+        """
+        根据 compute_vcp_features 的结果判定 (stage2_pass, 是否触发 VCP 买入信号)。
+        next() 与 once() 共用同一套判定规则。
+        """
         # ========== 信号过滤阶段 1：Stage 2 检查 ==========
         close_last = vcp_result.get("close_last")
         ma_50 = vcp_result.get("ma_50")
@@ -174,12 +156,9 @@ class VCPIndicator(bt.Indicator):
             and close_last > week_52_high * 0.75
         )
 
-        # 输出 Stage 2 通过状态到指标线
-        self.lines.stage2_pass[0] = 1 if stage2_pass else 0
-
         # 如果未通过 Stage 2 趋势，则无需继续分析
         if not stage2_pass:
-            return
+            return False, False
 
         # ========== 信号过滤阶段 2：VCP 条件检查 ==========
         num_c = vcp_result.get("num_contractions", 0)
@@ -213,12 +192,189 @@ class VCPIndicator(bt.Indicator):
         # - 1.0：要求完全满足所有条件
         # - <1.0：允许部分条件未满足（接近 VCP 即可触发）
         if progress < self.p.progress_threshold:
-            return
+            return True, False
 
         # ========== 信号过滤阶段 3：VCP 完全确认 ==========
         # 当 progress_threshold=1.0 时，只有完全确立的 VCP 才输出信号
         if not all(conditions.values()) and self.p.progress_threshold >= 1.0:
+            return True, False
+        return True, True
+
+    def _evaluate_series(
+        self,
+        df: pd.DataFrame,
+        params: VCPParams,
+        start: int = 0,
+        swing: SwingPointTracker | None = None,
+    ) -> pd.DataFrame:
+        """
+        复现 next() 的逐 bar 判定，返回第 start 行起每个 bar 的 stage2_pass / buy / 收缩统计。
+
+        均线、52 周高低点与成交量均线按整段数据一次性计算（compute_vcp_feature_series），
+        节点取自该数据源的进程级特征注册表（与同一标的上的其他指标/筛选器共享）；
+        逐 bar 只推进增量高低点跟踪器，并仅在 Stage 2 可能通过的 bar 上读取收缩统计。
+        从快照续算时 swing 为处理完第 start-1 行的跟踪器。
+        """
+        size = len(df) - start
+        stage2 = np.zeros(size, dtype=bool)
+        buy = np.zeros(size, dtype=bool)
+        num_c = np.zeros(size, dtype=np.int64)
+        max_c = np.full(size, np.nan)
+        min_c = np.full(size, np.nan)
+
+        if swing is None:
+            swing = create_vcp_swing_tracker(params)
+        registry = get_registry(getattr(self.data, "_name", ""), df)
+        trend = compute_vcp_feature_series(df, params, registry=registry)
+        columns = {name: trend[name].to_numpy() for name in VCP_TREND_COLUMNS}
+        with np.errstate(invalid="ignore"):
+            # Stage 2 的必要条件（NaN 比较为 False），只用于跳过不可能出信号的 bar，最终判定仍由 _evaluate_signal 完成
+            candidate = (
+                (columns["close_last"] > columns["ma_50"])
+                & (columns["ma_50"] > columns["ma_150"])
+                & (columns["ma_150"] > columns["ma_200"])
+                & (columns["ma_200_slope"] > 0)
+            )
+        highs = df["high"].to_numpy()
+        lows = df["low"].to_numpy()
+        for row, i in enumerate(range(start, len(df))):
+            swing.update(highs[i], lows[i])
+            bars = i + 1
+            if bars < self._min_len or not candidate[i]:
+                continue
+            lookback = min(bars, self.p.lookback_period)
+            vcp_result = {name: values[i] for name, values in columns.items()}
+            contraction = swing.contractions()
+            local_high = swing.local_high - (swing.bar_count - lookback)
+            (
+                vcp_result["num_contractions"],
+                vcp_result["max_contraction"],
+                vcp_result["min_contraction"],
+                vcp_result["weeks_of_contraction"],
+            ) = contraction_summary(contraction, local_high, lookback)
+            stage2[row], buy[row] = self._evaluate_signal(vcp_result)
+            if buy[row]:
+                num_c[row] = vcp_result["num_contractions"]
+                max_c[row] = vcp_result["max_contraction"]
+                min_c[row] = vcp_result["min_contraction"]
+
+        return pd.DataFrame(
+            {
+                "stage2_pass": stage2,
+                "buy": buy,
+                "num_contractions": num_c,
+                "max_contraction": max_c,
+                "min_contraction": min_c,
+            }
+        )
+
+    def once(self, start, end):
+        """
+        runonce 预计算路径：逐 bar 判定结果整体写入特征缓存，数据与参数不变的重复回测直接读取；
+        数据源有名称时改为保存指标快照（逐 bar 结果 + 高低点跟踪器），下次只续算追加的 bar。
+        信号线批量写入，买卖信号记录与 _vcp_bought 状态按 bar 顺序推进（与 next() 一致）。
+        """
+        total = self.buflen()
+        df = pd.DataFrame(
+            {
+                "high": line_to_numpy(self.data.high, total),
+                "low": line_to_numpy(self.data.low, total),
+                "close": line_to_numpy(self.data.close, total),
+                "volume": line_to_numpy(self.data.volume, total),
+            }
+        )
+        params = self._vcp_params()
+
+        def compute(start, swing):
+            if swing is None:
+                swing = create_vcp_swing_tracker(params)
+            return self._evaluate_series(df, params, start, swing), swing
+
+        result = resume_features(self, dict(self.p._getitems()), df, compute)
+
+        stage2 = result["stage2_pass"].to_numpy()
+        buy = result["buy"].to_numpy()
+        num_c = result["num_contractions"].to_numpy()
+        max_c = result["max_contraction"].to_numpy()
+        min_c = result["min_contraction"].to_numpy()
+        write_line(self.lines.stage2_pass, start, end, stage2.astype(float))
+        write_line(self.lines.num_contractions, start, end, num_c)
+        write_line(self.lines.max_contraction, start, end, max_c)
+        write_line(self.lines.min_contraction, start, end, min_c)
+
+        active = np.arange(1, total + 1) >= self._min_len
+        if self.p.debug_once and not self._debug_printed and active[start:end].any():
+            first = start + int(np.argmax(active[start:end]))
+            print(f"vcp_result @ {bar_date(self.data, first)}: {result.iloc[first].to_dict()}")
+            self._debug_printed = True
+
+        close = df["close"].to_numpy()
+        ema = line_to_numpy(self.ema_sell, total)
+        signal = np.full(total, np.nan)
+        sell_signal = np.full(total, np.nan)
+        records = []
+        for i in np.flatnonzero(buy[start:end]) + start:
+            date = bar_date(self.data, i)
+            signal[i] = close[i]
+            records.append((date, "vcp_buy", f"VCP形态: {num_c[i]}次收缩"))
+            self._vcp_bought = True
+            if i + 1 > self.p.ema_sell_period and close[i - 1] >= ema[i - 1] and close[i] < ema[i]:
+                sell_signal[i] = close[i]
+                records.append((date, "vcp_sell", f"跌破EMA{self.p.ema_sell_period}"))
+                self._vcp_bought = False
+                if self.p.debug_once:
+                    print(f"vcp_sell @ {date}: close={close[i]:.2f} ema={ema[i]:.2f}")
+
+        write_line(self.lines.vcp_signal, start, end, signal)
+        write_line(self.lines.vcp_sell_signal, start, end, sell_signal)
+        self.signal_record_manager.add_signal_records(records)
+
+    def next(self):
+        # ========== 初始化所有信号输出线 ==========
+        # 设为 NaN 表示该 K 线无信号触发（图表上不显示标记）
+        self.lines.stage2_pass[0] = 0  # Stage 2 状态：0=未通过，1=已通过
+        self.lines.vcp_signal[0] = np.nan  # VCP 买入信号价格位置
+        self.lines.vcp_sell_signal[0] = np.nan  # VCP 卖出信号价格位置
+        self.lines.num_contractions[0] = 0  # 有效收缩次数
+        self.lines.max_contraction[0] = np.nan  # 最大收缩幅度
+        self.lines.min_contraction[0] = np.nan  # 最小收缩幅度
+
+        # 跟踪器需要看到每一根 K 线，因此在数据充分性检查之前更新
+        self._swing.update(self.data.high[0], self.data.low[0])
+
+        # 数据充分性检查
+        if len(self) < self._min_len:
             return
+        
+        # ========== 数据准备 ==========
+        # 取最近 lookback_period 条数据构建 DataFrame（便于 evaluate_vcp 处理）
+        # 关键：不能超过当前已加载的数据总长度，否则会导致索引越界
+        lookback = min(len(self), self.p.lookback_period)
+        df = self._build_feature_frame(lookback)
+        
+        # 防护：如果 DataFrame 为空，返回无信号
+        if df.empty:
+            return
+
+        # ========== 调用指标特征计算函数 ==========
+        # 返回值包含均线、收缩、成交量等特征（不做条件判定）
+        vcp_result = compute_vcp_features(df, self._vcp_params(), swing=self._swing)
+
+        # 调试输出（仅第一次）
+        if self.p.debug_once and not self._debug_printed:
+            print(f"vcp_result @ {self.data.datetime.date(0)}: {vcp_result}")
+            self._debug_printed = True
+
+        stage2_pass, vcp_buy = self._evaluate_signal(vcp_result)
+
+        # 输出 Stage 2 通过状态到指标线
+        self.lines.stage2_pass[0] = 1 if stage2_pass else 0
+        if not vcp_buy:
+            return
+
+        num_c = vcp_result.get("num_contractions", 0)
+        max_c = vcp_result.get("max_contraction")
+        min_c = vcp_result.get("min_contraction")
 
         # ========== VCP 买入信号输出 ==========
         # 将当前收盘价作为信号价格输出（用于图表标记）
@@ -15,8 +15,20 @@ import backtrader as bt
 import pandas as pd
 
 import settings
-from core.analysis.indicators.vcp_plus import VCPPlusParams, evaluate_vcp_plus
-from core.strategy.indicator.common import SignalRecordManager
+from core.analysis.indicators.registry import get_registry
+from core.analysis.indicators.vcp_plus import (
+    VCPPlusParams,
+    create_vcp_plus_swing_tracker,
+    evaluate_vcp_plus,
+    evaluate_vcp_plus_series,
+)
+from core.strategy.indicator.common import (
+    SignalRecordManager,
+    bar_date,
+    line_to_numpy,
+    precompute_features,
+    write_line,
+)
 
 
 class VCPPlusIndicator(bt.Indicator):
@@ -70,6 +82,8 @@ class VCPPlusIndicator(bt.Indicator):
         self._debug_printed = False
         self._vcp_bought = False
         self.ema_sell = bt.indicators.EMA(self.data.close, period=self.p.ema_sell_period)
+        # 逐根 next() 路径使用增量高低点跟踪器，避免每根 K 线重新扫描回溯窗口
+        self._swing = create_vcp_plus_swing_tracker(self._vcp_plus_params())
         self.addminperiod(1)
 
     def _build_feature_frame(self, lookback: int) -> pd.DataFrame:
@@ -90,25 +104,8 @@ class VCPPlusIndicator(bt.Indicator):
             )
         return pd.DataFrame(data)
 
-    def next(self):
-        self.lines.vcp_plus_stage2_pass[0] = 0
-        self.lines.vcp_plus_signal[0] = np.nan
-        self.lines.vcp_plus_sell_signal[0] = np.nan
-        self.lines.vcp_plus_num_contractions[0] = 0
-        self.lines.vcp_plus_max_contraction[0] = np.nan
-        self.lines.vcp_plus_min_contraction[0] = np.nan
-        self.lines.vcp_plus_weeks[0] = 0
-        self.lines.vcp_plus_rs_rating[0] = np.nan
-
-        if len(self) < self._min_len:
-            return
-
-        lookback = min(len(self), self.p.lookback_period)
-        df = self._build_feature_frame(lookback)
-        if df.empty:
-            return
-
-        params = VCPPlusParams(
+    def _vcp_plus_params(self) -> VCPPlusParams:
+        return VCPPlusParams(
             ma_50_period=self.p.ma_50_period,
             ma_150_period=self.p.ma_150_period,
             ma_200_period=self.p.ma_200_period,
@@ -132,7 +129,104 @@ class VCPPlusIndicator(bt.Indicator):
             rs_rating_column=self.p.rs_rating_column,
         )
 
-        result = evaluate_vcp_plus(df, params)
+    def once(self, start, end):
+        """
+        runonce 预计算路径：evaluate_vcp_plus_series 一次性得到每个 bar 的评估结果（可命中特征缓存），
+        均线与斜率节点取自该数据源的进程级特征注册表（与同一标的上的其他指标共享），
+        信号线批量写入，买卖信号记录与 _vcp_bought 状态按 bar 顺序推进（与 next() 一致）。
+        """
+        total = self.buflen()
+        data = {
+            "high": line_to_numpy(self.data.high, total),
+            "low": line_to_numpy(self.data.low, total),
+            "close": line_to_numpy(self.data.close, total),
+            "volume": line_to_numpy(self.data.volume, total),
+        }
+        if hasattr(self.data, "benchmark_close"):
+            data[self.p.benchmark_close_column] = line_to_numpy(self.data.benchmark_close, total)
+        if hasattr(self.data, "rs_rating"):
+            data[self.p.rs_rating_column] = line_to_numpy(self.data.rs_rating, total)
+        df = pd.DataFrame(data)
+        params = self._vcp_plus_params()
+        result = precompute_features(
+            self,
+            params,
+            df,
+            lambda: evaluate_vcp_plus_series(
+                df, params, registry=get_registry(getattr(self.data, "_name", ""), df)
+            ),
+        )
+
+        # 不足最小长度的 bar 保持 next() 中的初始化值
+        active = np.arange(1, total + 1) >= self._min_len
+        stage2 = result["stage2_pass"].to_numpy() & active
+        num_c = np.where(active, result["num_contractions"].to_numpy(), 0)
+        max_c = np.where(active, result["max_contraction"].to_numpy(), np.nan)
+        min_c = np.where(active, result["min_contraction"].to_numpy(), np.nan)
+        weeks = np.where(active, result["weeks_of_contraction"].to_numpy(), 0.0)
+        rs_rating = np.where(active, result["rs_rating"].to_numpy(), np.nan)
+        buy = stage2 & result["vcp_pass"].to_numpy() & result["rs_pass"].to_numpy()
+
+        write_line(self.lines.vcp_plus_stage2_pass, start, end, stage2.astype(float))
+        write_line(self.lines.vcp_plus_num_contractions, start, end, num_c)
+        write_line(self.lines.vcp_plus_max_contraction, start, end, max_c)
+        write_line(self.lines.vcp_plus_min_contraction, start, end, min_c)
+        write_line(self.lines.vcp_plus_weeks, start, end, weeks)
+        write_line(self.lines.vcp_plus_rs_rating, start, end, rs_rating)
+
+        if self.p.debug_once and not self._debug_printed and active[start:end].any():
+            first = start + int(np.argmax(active[start:end]))
+            print(f"vcp_plus_result @ {bar_date(self.data, first)}: {result.iloc[first].to_dict()}")
+            self._debug_printed = True
+
+        close = df["close"].to_numpy()
+        ema = line_to_numpy(self.ema_sell, total)
+        signal = np.full(total, np.nan)
+        sell_signal = np.full(total, np.nan)
+        records = []
+        for i in np.flatnonzero(buy[start:end]) + start:
+            date = bar_date(self.data, i)
+            signal[i] = close[i]
+            rs_text = f", RS={rs_rating[i]:.0f}" if not np.isnan(rs_rating[i]) else ""
+            records.append(
+                (
+                    date,
+                    "vcp_plus_buy",
+                    f"VCPPlus: {num_c[i]}次收缩, max={max_c[i]:.2f}, min={min_c[i]:.2f}{rs_text}",
+                )
+            )
+            self._vcp_bought = True
+            if i + 1 > self.p.ema_sell_period and close[i - 1] >= ema[i - 1] and close[i] < ema[i]:
+                sell_signal[i] = close[i]
+                records.append((date, "vcp_plus_sell", f"跌破EMA{self.p.ema_sell_period}"))
+                self._vcp_bought = False
+
+        write_line(self.lines.vcp_plus_signal, start, end, signal)
+        write_line(self.lines.vcp_plus_sell_signal, start, end, sell_signal)
+        self.signal_record_manager.add_signal_records(records)
+
+    def next(self):
+        self.lines.vcp_plus_stage2_pass[0] = 0
+        self.lines.vcp_plus_signal[0] = np.nan
+        self.lines.vcp_plus_sell_signal[0] = np.nan
+        self.lines.vcp_plus_num_contractions[0] = 0
+        self.lines.vcp_plus_max_contraction[0] = np.nan
+        self.lines.vcp_plus_min_contraction[0] = np.nan
+        self.lines.vcp_plus_weeks[0] = 0
+        self.lines.vcp_plus_rs_rating[0] = np.nan
+
+        self._swing.update(self.data.high[0], self.data.low[0])
+
+        if len(self) < self._min_len:
+            return
+
+        lookback = min(len(self), self.p.lookback_period)
+        df = self._build_feature_frame(lookback)
+        if df.empty:
+            return
+
+        params = self._vcp_plus_params()
+        result = evaluate_vcp_plus(df, params, swing=self._swing)
 
         if self.p.debug_once and not self._debug_printed:
             print(f"vcp_plus_result @ {self.data.datetime.date(0)}: {result}")
@@ -0,0 +1,243 @@
+"""
+指标状态快照与增量续算。
+
+每日任务重复拉取多年 K 线时，指标在 runonce 预计算后把逐 bar 结果与滚动状态（如波段高低点跟踪器）
+按（数据名, 指标类型, 参数）保存；下次运行校验历史未被修订后恢复快照，只计算新追加的 bar。
+
+数学原理：
+1. 行指纹：每根 bar 的 (datetime, open, high, low, close, volume) 按 64 位字做 FNV-1a 混合，
+   任一历史价格被修订（如前复权因子变化）都会改变对应行的指纹。
+2. 对齐：快照共 p 行时，新数据前 p 行的日期与行指纹必须与快照逐行相同（快照是新数据的精确前缀）；
+   历史被修订、取数窗口起点前移或新数据更短时快照作废，按当前数据全量重放。
+3. 续算：从第 p 行开始只计算追加的 bar，结果与在当前数据上全量重放一致。
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import settings
+from core.analysis.indicators.feature_cache import _evict_lru, _params_token, default_code_version
+from core.strategy.indicator.common import indicator_source_files, precompute_features
+
+_SUFFIX = ".snapshot"
+_FNV_OFFSET = np.uint64(0xCBF29CE484222325)
+_FNV_PRIME = np.uint64(0x100000001B3)
+
+
+def row_fingerprints(*columns: np.ndarray) -> np.ndarray:
+    """逐行 64 位指纹（各列按 float64 位模式做 FNV-1a 混合）。"""
+    size = len(columns[0]) if columns else 0
+    fingerprint = np.full(size, _FNV_OFFSET, dtype=np.uint64)
+    for column in columns:
+        bits = np.ascontiguousarray(column, dtype=np.float64).view(np.uint64)
+        fingerprint = (fingerprint ^ bits) * _FNV_PRIME
+    return fingerprint
+
+
+@dataclass
+class IndicatorSnapshot:
+    """
+    指标快照。
+
+    - code_version: 指标源码版本，不一致时快照作废
+    - dates / fingerprints: 逐行日期与行指纹，用于校验历史是否被修订
+    - frame: 逐 bar 结果表（与全量预计算结果同结构）
+    - state: 处理完最后一根 bar 后的滚动状态（指标自定义）
+    """
+
+    code_version: str
+    dates: np.ndarray
+    fingerprints: np.ndarray
+    frame: pd.DataFrame
+    state: Any = None
+
+    @property
+    def bar_count(self) -> int:
+        return len(self.dates)
+
+    def align(self, dates: np.ndarray, fingerprints: np.ndarray) -> Optional[int]:
+        """
+        与新数据对齐，返回快照覆盖的行数；快照不是新数据的精确前缀（历史被修订、起点前移等）时返回 None。
+        """
+        covered = self.bar_count
+        if covered == 0 or len(dates) < covered:
+            return None
+        if not np.array_equal(self.dates, dates[:covered]):
+            return None
+        if not np.array_equal(self.fingerprints, fingerprints[:covered]):
+            return None
+        return covered
+
+
+@dataclass
+class SnapshotStats:
+    """快照使用统计。"""
+
+    resumed: int = 0
+    replayed: int = 0
+    revisions: int = 0
+    appended_bars: int = 0
+    evictions: int = 0
+
+
+class SnapshotStore:
+    """
+    指标快照文件存储（每个键一个文件，原子写入）。
+
+    参数：
+    - root: 快照目录（不存在时首次写入自动创建）
+    - max_bytes: 快照总字节上限，超出后按最近访问时间（读取时刷新文件 mtime）淘汰最旧快照（LRU）
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int = 256 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.stats = SnapshotStats()
+
+    def make_key(self, name: str, kind: str, params: Any) -> str:
+        digest = hashlib.blake2b(digest_size=20)
+        for part in (name, kind, _params_token(params)):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}{_SUFFIX}"
+
+    def load(self, key: str) -> Optional[IndicatorSnapshot]:
+        """读取快照，不存在或无法解析时返回 None。"""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as handle:
+                snapshot = pickle.load(handle)
+            os.utime(path)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError):
+            return None
+        return snapshot if isinstance(snapshot, IndicatorSnapshot) else None
+
+    def save(self, key: str, snapshot: IndicatorSnapshot) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        temp = self.root / f".{key}.{uuid.uuid4().hex}.tmp"
+        with open(temp, "wb") as handle:
+            pickle.dump(snapshot, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp, self._path(key))
+        self.stats.evictions += _evict_lru(self.root, _SUFFIX, self.max_bytes)
+
+    def size_bytes(self) -> int:
+        """当前快照占用的总字节数。"""
+        return sum(entry.stat().st_size for entry in self.root.glob(f"*{_SUFFIX}"))
+
+    def clear(self) -> None:
+        """删除全部快照。"""
+        for entry in self.root.glob(f"*{_SUFFIX}"):
+            entry.unlink(missing_ok=True)
+
+
+_snapshot_store = None
+_snapshot_store_configured = False
+
+
+def get_snapshot_store():
+    """进程级快照存储；未显式设置时按 settings.INDICATOR_SNAPSHOT_* 创建，关闭时返回 None。"""
+    global _snapshot_store, _snapshot_store_configured
+    if not _snapshot_store_configured:
+        if settings.INDICATOR_SNAPSHOT_ENABLED:
+            _snapshot_store = SnapshotStore(settings.INDICATOR_SNAPSHOT_ROOT, settings.INDICATOR_SNAPSHOT_MAX_BYTES)
+        _snapshot_store_configured = True
+    return _snapshot_store
+
+
+def set_snapshot_store(store):
+    """显式设置（或传 None 关闭）进程级快照存储，返回之前的存储。"""
+    global _snapshot_store, _snapshot_store_configured
+    previous = get_snapshot_store()
+    _snapshot_store = store
+    _snapshot_store_configured = True
+    return previous
+
+
+ResumeCompute = Callable[[int, Any], Tuple[pd.DataFrame, Any]]
+
+
+def resume_features(indicator, params, df: pd.DataFrame, compute: ResumeCompute) -> pd.DataFrame:
+    """
+    runonce 预计算路径的整段结果表，数据源有名称且快照可用时从快照续算。
+
+    compute(start, state) 计算第 start 行起（含）的结果行并返回 (结果行, 新状态)：
+    - 全量重放时 start=0, state=None
+    - 续算时 state 为处理完第 start-1 行后的状态
+
+    数据源无名称或快照关闭时等同 precompute_features。
+    """
+    store = get_snapshot_store()
+    name = getattr(indicator.data, "_name", "")
+    if store is None or not name:
+        return precompute_features(indicator, params, df, lambda: compute(0, None)[0])
+
+    precomputed = getattr(indicator, "_precomputed_features", None)
+    if precomputed is not None and len(precomputed) == len(df):
+        return precomputed
+
+    owner = type(indicator)
+    kind = f"{owner.__module__}.{owner.__qualname__}"
+    code_version = default_code_version(*indicator_source_files(owner), __file__)
+    dates = np.asarray(indicator.data.datetime.array[: len(df)], dtype=float)
+    fingerprints = row_fingerprints(dates, *(df[column].to_numpy(dtype=float) for column in df.columns))
+
+    key = store.make_key(name, kind, params)
+    snapshot = store.load(key)
+    covered = None
+    if snapshot is not None and snapshot.code_version == code_version:
+        covered = snapshot.align(dates, fingerprints)
+        if covered is None:
+            store.stats.revisions += 1
+
+    if covered is None:
+        frame, state = compute(0, None)
+        store.stats.replayed += 1
+    else:
+        if covered < len(df):
+            rows, state = compute(covered, snapshot.state)
+            frame = pd.concat([snapshot.frame, rows.reset_index(drop=True)], ignore_index=True)
+        else:
+            frame, state = snapshot.frame, snapshot.state
+        store.stats.resumed += 1
+        store.stats.appended_bars += len(df) - covered
+
+    store.save(key, IndicatorSnapshot(code_version, dates, fingerprints, frame, state))
+    indicator._precomputed_features = frame
+    indicator._snapshot_resumed = covered is not None
+    return frame
+
+
+def resume_window_features(
+    indicator,
+    params,
+    df: pd.DataFrame,
+    compute: Callable[[pd.DataFrame, int], pd.DataFrame],
+    warmup: int,
+) -> pd.DataFrame:
+    """
+    无滚动状态、第 t 行只依赖 [t - warmup, t] 的特征表的 resume_features。
+
+    compute(frame, bar_offset) 计算 frame 每一行的结果（frame 第 0 行之前已有 bar_offset 根 bar）；
+    续算时只对追加段及其前 warmup 根 bar 调用 compute，再截去前置部分。
+    """
+
+    def resume(start, state):
+        begin = max(0, start - warmup)
+        rows = compute(df.iloc[begin:].reset_index(drop=True), begin)
+        return rows.iloc[start - begin :], None
+
+    return resume_features(indicator, params, df, resume)
+
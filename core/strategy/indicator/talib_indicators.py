@@ -4,10 +4,14 @@ TA-Lib 指标函数集合。
 
 数学原理：
 1. 指标公式基于 TA-Lib 实现（如 EMA、MACD、RSI 等）。
-2. 输入支持 kline 列表或 DataFrame，统一为 numpy 数组计算。
+2. 输入支持 kline 列表、DataFrame 或列字典，统一为连续 float64 数组计算。
+3. compute_many 只拆分一次 kline，再按 (指标, 参数) 规格批量计算；
+   symbols × bars 的二维面板逐行复用同一份拆分结果，输出按行堆叠为二维数组。
 """
 
 # 第一组：Python 标准库
+from collections.abc import Mapping
+from typing import NamedTuple
 
 # 第二组：第三方库（按字母排序）
 import numpy as np
@@ -41,6 +45,8 @@ __all__ = [
     "STDDEV",
     "TRIX",
     "VOLUME",
+    "KlineColumns",
+    "compute_many",
 ]
 
 
@@ -62,29 +68,28 @@ def _require_talib():
         ) from _talib_import_error
 
 
+class KlineColumns(NamedTuple):
+    """拆分后的 open/high/low/close/volume 连续 float64 数组。"""
+
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+
+_FIELDS = KlineColumns._fields
+
+
 def _split_kline(kline):
-    """拆分 kline 为 open/high/low/close/volume 数组。"""
-    if hasattr(kline, "columns"):
-        high = kline["high"].to_numpy(dtype=float)
-        low = kline["low"].to_numpy(dtype=float)
-        close = kline["close"].to_numpy(dtype=float)
-        open_ = kline["open"].to_numpy(dtype=float)
-        volume = kline["volume"].to_numpy(dtype=float)
-        return open_, high, low, close, volume
-    records = kline
-    length = len(records)
-    open_ = np.zeros(length)
-    high = np.zeros(length)
-    low = np.zeros(length)
-    close = np.zeros(length)
-    volume = np.zeros(length)
-    for idx, item in enumerate(records):
-        open_[idx] = item[1]
-        high[idx] = item[2]
-        low[idx] = item[3]
-        close[idx] = item[4]
-        volume[idx] = item[5]
-    return open_, high, low, close, volume
+    """拆分 kline 为 open/high/low/close/volume 数组（已拆分的 KlineColumns 原样返回）。"""
+    if isinstance(kline, KlineColumns):
+        return kline
+    if hasattr(kline, "columns") or isinstance(kline, Mapping):
+        return KlineColumns(*(np.ascontiguousarray(kline[field], dtype=float) for field in _FIELDS))
+    # 记录列表一次性转换为 (5, n) 的 C 连续数组，每一行即为一个连续字段
+    matrix = np.array([item[1:6] for item in kline], dtype=float).reshape(-1, 5).T.copy()
+    return KlineColumns(*matrix)
 
 
 def ATR(length, kline):
@@ -96,6 +101,8 @@ def ATR(length, kline):
 
 def CurrentBar(kline):
     """返回 k 线数据长度。"""
+    if isinstance(kline, KlineColumns):
+        return len(kline.close)
     return len(kline)
 
 
@@ -242,3 +249,83 @@ def VOLUME(kline):
     """返回成交量序列。"""
     _, _, _, _, volume = _split_kline(kline)
     return volume
+
+
+_INDICATORS = {
+    func.__name__: func
+    for func in (
+        ATR, CurrentBar, BOLL, CCI, HIGHEST, MA, MACD, EMA, KAMA, KDJ, LOWEST,
+        OBV, RSI, ROC, STOCHRSI, SAR, STDDEV, TRIX, VOLUME,
+    )
+}
+
+
+def _spec_key(name, params):
+    if not params:
+        return name
+    values = params.values() if isinstance(params, Mapping) else params
+    return "_".join([name, *(str(value) for value in values)])
+
+
+def _normalize_specs(specs):
+    """统一为 [(key, name, params)]；规格可为指标名、(指标名, 参数) 或 {key: 规格}。"""
+    items = specs.items() if isinstance(specs, Mapping) else ((None, spec) for spec in specs)
+    normalized = []
+    for key, spec in items:
+        name, params = (spec, ()) if isinstance(spec, str) else (spec[0], spec[1] if len(spec) > 1 else ())
+        if name not in _INDICATORS:
+            raise ValueError(f"未知指标: {name}")
+        if not isinstance(params, (Mapping, list, tuple)):
+            params = (params,)
+        normalized.append((key if key is not None else _spec_key(name, params), name, params))
+    return normalized
+
+
+def _evaluate(columns, specs):
+    results = {}
+    for key, name, params in specs:
+        func = _INDICATORS[name]
+        if isinstance(params, Mapping):
+            results[key] = func(kline=columns, **params)
+        else:
+            results[key] = func(*params, kline=columns)
+    return results
+
+
+def _is_panel(kline):
+    return isinstance(kline, Mapping) and np.ndim(kline["close"]) == 2
+
+
+def _stack(rows):
+    if isinstance(rows[0], dict):
+        return {field: np.stack([row[field] for row in rows]) for field in rows[0]}
+    return np.stack(rows)
+
+
+def compute_many(kline, specs):
+    """
+    批量计算多个指标，kline 只拆分一次。
+
+    参数：
+    - kline: kline 记录列表、DataFrame、字段 → 一维数组的字典，
+      或字段 → 二维数组（symbols × bars）的面板字典
+    - specs: 指标规格列表，元素为指标名（如 "OBV"）或 (指标名, 参数)，参数为位置参数元组或关键字字典，
+      如 [("RSI", (14,)), ("MACD", (12, 26, 9)), ("STDDEV", {"length": 20, "nbdev": 2})]；
+      也可传入 {输出键: 规格} 字典自定义输出键
+
+    返回：
+    - 字典：输出键（默认 "RSI_14" 形式）→ 指标结果；多输出指标返回子字典。
+      面板输入时每个结果按 symbol 堆叠为 (symbols, bars) 二维数组
+    """
+    normalized = _normalize_specs(specs)
+    if not _is_panel(kline):
+        return _evaluate(_split_kline(kline), normalized)
+
+    panel = KlineColumns(*(np.ascontiguousarray(kline[field], dtype=float) for field in _FIELDS))
+    per_symbol = [
+        _evaluate(KlineColumns(*(field[row] for field in panel)), normalized)
+        for row in range(panel.close.shape[0])
+    ]
+    if not per_symbol:
+        return {key: np.empty((0, panel.close.shape[1])) for key, _, _ in normalized}
+    return {key: _stack([result[key] for result in per_symbol]) for key, _, _ in normalized}
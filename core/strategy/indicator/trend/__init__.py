@@ -0,0 +1,7 @@
+"""
+趋势类指标集合。
+
+数学原理：
+1. 指标以信号线形式输出，供策略使用。
+2. 具体算法见各指标实现。
+"""
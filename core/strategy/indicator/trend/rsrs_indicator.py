@@ -0,0 +1,115 @@
+"""
+RSRS 阻力支撑相对强度信号指标。
+输出 Beta、Z-Score、修正 RSRS 与持仓状态线，持仓翻转时给出买卖信号，供策略层调用。
+
+数学原理：
+1. 窗口内以最低价为自变量、最高价为因变量做线性回归，斜率 Beta 衡量支撑与阻力的相对强度。
+2. Beta 的 Z-Score 超过买入阈值持有、低于卖出阈值空仓，其余保持前一状态。
+3. runonce 路径整段向量化计算，逐 bar 路径用滑动和 O(1) 更新，两者逐 bar 一致。
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import backtrader as bt
+import pandas as pd
+
+from core.analysis.migrations.vcp_from_youtuber.rsrs_indicator import RsrsConfig, RsrsStream, compute_rsrs
+from core.strategy.indicator.common import (
+    SignalRecordManager,
+    bar_date,
+    line_to_numpy,
+    precompute_features,
+    write_line,
+)
+
+
+class RSRSIndicator(bt.Indicator):
+    lines = ("rsrs_beta", "rsrs_zscore", "rsrs", "rsrs_position", "rsrs_buy_signal", "rsrs_sell_signal")
+    params = (
+        ("window", 18),  # 回归窗口
+        ("z_window", 600),  # Beta 标准化窗口
+        ("threshold_buy", 0.7),  # Z-Score 买入阈值
+        ("threshold_sell", -0.7),  # Z-Score 卖出阈值
+    )
+
+    plotinfo = dict(subplot=True)
+    plotlines = dict(
+        rsrs_buy_signal=dict(marker="", _plotskip=True),
+        rsrs_sell_signal=dict(marker="", _plotskip=True),
+    )
+
+    def __init__(self):
+        self.signal_record_manager = SignalRecordManager()
+        self._stream = RsrsStream(self._rsrs_config())
+        self._last_position = 0.0
+        self.addminperiod(1)
+
+    def _rsrs_config(self) -> RsrsConfig:
+        return RsrsConfig(
+            window=self.p.window,
+            z_window=self.p.z_window,
+            threshold_buy=self.p.threshold_buy,
+            threshold_sell=self.p.threshold_sell,
+        )
+
+    def once(self, start, end):
+        """
+        runonce 预计算路径：compute_rsrs 一次性得到整段结果（可命中特征缓存），
+        持仓翻转处批量写入买卖信号与信号记录（与 next() 一致）。
+        """
+        total = self.buflen()
+        df = pd.DataFrame(
+            {
+                "high": line_to_numpy(self.data.high, total),
+                "low": line_to_numpy(self.data.low, total),
+                "close": line_to_numpy(self.data.close, total),
+            }
+        )
+        config = self._rsrs_config()
+        result = precompute_features(self, config, df, lambda: compute_rsrs(df, config))
+
+        zscore = result["zscore"].to_numpy()
+        position = result["position"].to_numpy()
+        previous = np.concatenate([[0.0], position[:-1]])
+        buy = (position == 1) & (previous == 0)
+        sell = (position == 0) & (previous == 1)
+        close = df["close"].to_numpy()
+
+        write_line(self.lines.rsrs_beta, start, end, result["beta"].to_numpy())
+        write_line(self.lines.rsrs_zscore, start, end, zscore)
+        write_line(self.lines.rsrs, start, end, result["rsrs"].to_numpy())
+        write_line(self.lines.rsrs_position, start, end, position)
+        write_line(self.lines.rsrs_buy_signal, start, end, np.where(buy, close, np.nan))
+        write_line(self.lines.rsrs_sell_signal, start, end, np.where(sell, close, np.nan))
+
+        records = []
+        for i in np.flatnonzero((buy | sell)[start:end]) + start:
+            signal_type = "rsrs_buy" if buy[i] else "rsrs_sell"
+            records.append((bar_date(self.data, i), signal_type, f"RSRS Z={zscore[i]:.2f}"))
+        self.signal_record_manager.add_signal_records(records)
+        if end > 0:
+            self._last_position = float(position[end - 1])
+
+    def next(self):
+        result = self._stream.update(self.data.high[0], self.data.low[0])
+        position = result["position"]
+        self.lines.rsrs_beta[0] = result["beta"]
+        self.lines.rsrs_zscore[0] = result["zscore"]
+        self.lines.rsrs[0] = result["rsrs"]
+        self.lines.rsrs_position[0] = position
+        self.lines.rsrs_buy_signal[0] = np.nan
+        self.lines.rsrs_sell_signal[0] = np.nan
+
+        if position != self._last_position:
+            close = self.data.close[0]
+            if position == 1:
+                self.lines.rsrs_buy_signal[0] = close
+                signal_type = "rsrs_buy"
+            else:
+                self.lines.rsrs_sell_signal[0] = close
+                signal_type = "rsrs_sell"
+            self.signal_record_manager.add_signal_record(
+                self.data.datetime.date(), signal_type, f"RSRS Z={result['zscore']:.2f}"
+            )
+        self._last_position = position
@@ -0,0 +1,136 @@
+"""
+成交量信号指标的公共部分：信号线与参数声明、特征窗口，以及 runonce 预计算路径。
+
+数学原理：
+1. 逐 bar 路径取最近 min_len 根 bar 计算最新特征；RSI 前值与 KDJ 两次平滑所需的 bar 可能多于 min_len，
+   这些特征在窗口内为 NaN（相关条件不成立）。
+2. 预计算路径对整段数据计算一次特征，再按 min_len 窗口截断（truncate_volume_features），
+   与逐 bar 路径在同一 bar 上取值一致；第 t 根 bar 的特征只依赖 [t - warmup, t] 的数据（见 volume_signal_warmup）。
+"""
+
+import numpy as np
+import pandas as pd
+
+from core.analysis.indicators.volume import (
+    VolumeIndicatorParams,
+    compute_latest_volume_features,
+    compute_volume_features,
+    compute_volume_signals,
+    truncate_volume_features,
+    volume_signal_warmup,
+)
+from core.strategy.indicator.common import (
+    SignalRecordManager,
+    bar_date,
+    line_to_numpy,
+    write_line,
+)
+from core.strategy.indicator.snapshot import resume_window_features
+
+VOLUME_SIGNAL_LINES = ('main_buy_signal', 'main_sell_signal', 'enhanced_buy_signal', 'enhanced_sell_signal')
+VOLUME_SIGNAL_PARAMS = (
+    ('n1', 1),  # 短期均线周期
+    ('n2', 5),  # 中期均线周期
+    ('n3', 20),  # 长期均线周期
+    ('rsi_period', 14),  # RSI计算周期
+    ('boll_period', 20),  # 布林带周期
+    ('boll_width', 2),  # 布林带宽度倍数
+    ('kdj_period', 9)  # KDJ周期
+)
+# 为每个信号线设置绘图样式：不直接显示线
+VOLUME_SIGNAL_PLOTLINES = {name: dict(marker='', _plotskip=True) for name in VOLUME_SIGNAL_LINES}
+
+
+class VolumeSignalMixin:
+    """
+    成交量信号指标的共用实现（与 bt.Indicator 一起继承，信号线与参数取上方常量）。
+    子类在 __init__ 中调用 _setup_volume_signals()，在 next() 中通过 _latest_volume_features() 取最新特征。
+    """
+
+    def _setup_volume_signals(self):
+        self.signal_record_manager = SignalRecordManager()
+        self._min_len = max(self.p.n3, self.p.rsi_period + 1, self.p.boll_period, self.p.kdj_period, 3)
+        self.addminperiod(self._min_len)
+
+    def _build_feature_frame(self, lookback: int) -> pd.DataFrame:
+        data = {
+            "open": np.array(self.data.open.get(size=lookback)),
+            "high": np.array(self.data.high.get(size=lookback)),
+            "low": np.array(self.data.low.get(size=lookback)),
+            "close": np.array(self.data.close.get(size=lookback)),
+            "volume": np.array(self.data.volume.get(size=lookback)),
+        }
+        return pd.DataFrame(data)
+
+    def _volume_params(self) -> VolumeIndicatorParams:
+        return VolumeIndicatorParams(
+            n1=self.p.n1,
+            n2=self.p.n2,
+            n3=self.p.n3,
+            rsi_period=self.p.rsi_period,
+            boll_period=self.p.boll_period,
+            boll_width=self.p.boll_width,
+            kdj_period=self.p.kdj_period,
+        )
+
+    def _latest_volume_features(self):
+        """当前 bar 的特征字典（取最近 _min_len 根 bar 计算）。"""
+        df = self._build_feature_frame(self._min_len)
+        return compute_latest_volume_features(df, self._volume_params())
+
+    def once(self, start, end):
+        """
+        runonce 预计算路径：整段数据只计算一次特征（可命中特征缓存，或从指标快照续算追加的 bar），
+        批量写入信号线与信号记录。
+        特征按 next() 的 _min_len 窗口截断，信号判定规则与逐 bar 路径一致。
+        """
+        total = self.buflen()
+        df = pd.DataFrame(
+            {
+                "open": line_to_numpy(self.data.open, total),
+                "high": line_to_numpy(self.data.high, total),
+                "low": line_to_numpy(self.data.low, total),
+                "close": line_to_numpy(self.data.close, total),
+                "volume": line_to_numpy(self.data.volume, total),
+            }
+        )
+        params = self._volume_params()
+        flags = resume_window_features(
+            self,
+            params,
+            df,
+            lambda frame, bar_offset: compute_volume_signals(
+                frame,
+                params,
+                features=truncate_volume_features(compute_volume_features(frame, params), params, self._min_len),
+                min_len=self._min_len,
+                bar_offset=bar_offset,
+            ),
+            warmup=volume_signal_warmup(params),
+        )
+        low = df["low"].to_numpy()
+        high = df["high"].to_numpy()
+        main_buy = flags["main_buy"].to_numpy()
+        main_sell = flags["main_sell"].to_numpy()
+        enhanced_buy = flags["enhanced_buy"].to_numpy()
+        enhanced_sell = flags["enhanced_sell"].to_numpy()
+
+        write_line(self.lines.main_buy_signal, start, end, np.where(main_buy, low * 0.96, np.nan))
+        write_line(self.lines.main_sell_signal, start, end, np.where(main_sell, high * 1.05, np.nan))
+        write_line(self.lines.enhanced_buy_signal, start, end, np.where(enhanced_buy, low * 0.90, np.nan))
+        write_line(self.lines.enhanced_sell_signal, start, end, np.where(enhanced_sell, high * 1.08, np.nan))
+
+        # 按 bar 顺序批量生成信号记录（同一 bar 内顺序与 next() 一致）
+        records = []
+        any_signal = main_buy | main_sell | enhanced_buy | enhanced_sell
+        for i in np.flatnonzero(any_signal[start:end]) + start:
+            date = bar_date(self.data, i)
+            if main_buy[i]:
+                records.append((date, 'normal_buy', '多'))
+            if main_sell[i]:
+                records.append((date, 'normal_sell', '空'))
+            if enhanced_buy[i]:
+                records.append((date, 'strong_buy', '强多'))
+            if enhanced_sell[i]:
+                records.append((date, 'strong_sell', '强空'))
+        self.signal_record_manager.add_signal_records(records)
@@ -1,52 +1,28 @@
 import numpy as np
 import backtrader as bt
-import pandas as pd
 
-from core.analysis.indicators.volume import VolumeIndicatorParams, compute_latest_volume_features
-from core.strategy.indicator.common import SignalRecordManager
+from core.strategy.indicator.volume.common import (
+    VOLUME_SIGNAL_LINES,
+    VOLUME_SIGNAL_PARAMS,
+    VOLUME_SIGNAL_PLOTLINES,
+    VolumeSignalMixin,
+)
 
 
-class EnhancedVolumeIndicator(bt.Indicator):
+class EnhancedVolumeIndicator(VolumeSignalMixin, bt.Indicator):
     """
     基于成交量和多个技术指标的增强交易信号指示器
     包含成交量分析、RSI、布林带和KDJ指标的综合分析
     """
-    lines = ('main_buy_signal', 'main_sell_signal', 'enhanced_buy_signal', 'enhanced_sell_signal')
-    params = (
-        ('n1', 1),  # 短期均线周期
-        ('n2', 5),  # 中期均线周期
-        ('n3', 20),  # 长期均线周期
-        ('rsi_period', 14),  # RSI计算周期
-        ('boll_period', 20),  # 布林带周期
-        ('boll_width', 2),  # 布林带宽度倍数
-        ('kdj_period', 9)  # KDJ周期
-    )
+    lines = VOLUME_SIGNAL_LINES
+    params = VOLUME_SIGNAL_PARAMS
 
     # 设置绘图参数，让信号在主图上显示
     plotinfo = dict(subplot=False)
-
-    # 为每个信号线设置绘图样式
-    plotlines = dict(
-        main_buy_signal=dict(marker='', _plotskip=True),  # 不直接显示线
-        main_sell_signal=dict(marker='', _plotskip=True),  # 不直接显示线
-        enhanced_buy_signal=dict(marker='', _plotskip=True),  # 不直接显示线
-        enhanced_sell_signal=dict(marker='', _plotskip=True)  # 不直接显示线
-    )
+    plotlines = VOLUME_SIGNAL_PLOTLINES
 
     def __init__(self):
-        self.signal_record_manager = SignalRecordManager()
-        self._min_len = max(self.p.n3, self.p.rsi_period + 1, self.p.boll_period, self.p.kdj_period, 3)
-        self.addminperiod(self._min_len)
-
-    def _build_feature_frame(self, lookback: int) -> pd.DataFrame:
-        data = {
-            "open": np.array(self.data.open.get(size=lookback)),
-            "high": np.array(self.data.high.get(size=lookback)),
-            "low": np.array(self.data.low.get(size=lookback)),
-            "close": np.array(self.data.close.get(size=lookback)),
-            "volume": np.array(self.data.volume.get(size=lookback)),
-        }
-        return pd.DataFrame(data)
+        self._setup_volume_signals()
 
     def next(self):
         # 初始化信号值
@@ -58,17 +34,7 @@ class EnhancedVolumeIndicator(bt.Indicator):
         if len(self) < self._min_len:
             return
 
-        params = VolumeIndicatorParams(
-            n1=self.p.n1,
-            n2=self.p.n2,
-            n3=self.p.n3,
-            rsi_period=self.p.rsi_period,
-            boll_period=self.p.boll_period,
-            boll_width=self.p.boll_width,
-            kdj_period=self.p.kdj_period,
-        )
-        df = self._build_feature_frame(self._min_len)
-        features = compute_latest_volume_features(df, params)
+        features = self._latest_volume_features()
         if not features:
             return
 
@@ -0,0 +1,182 @@
+"""
+信号/交易记录的列式追加缓冲区。
+
+数学原理：
+1. 每列预分配 NumPy 数组，容量不足时按 2 倍扩容，追加的摊还成本为 O(1)。
+2. 日期存为 datetime64[ns]，数值存为 float64，低基数字符串（信号类型、买卖方向）存为 int16 编码 + 类别表。
+3. 导出 DataFrame / Arrow 时直接引用已写入部分的数组视图，不逐条构造对象。
+"""
+
+from __future__ import annotations
+
+import datetime
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# 列类型：日期 / 数值 / 低基数类别 / 任意对象
+DATETIME = "datetime"
+NUMBER = "number"
+CATEGORY = "category"
+OBJECT = "object"
+
+_STORAGE_DTYPES = {
+    DATETIME: "datetime64[ns]",
+    NUMBER: np.float64,
+    CATEGORY: np.int16,
+    OBJECT: object,
+}
+
+
+def to_datetime64(date) -> np.datetime64:
+    """将 datetime.date 或日期字符串转换为 datetime64[ns]，其他类型抛 ValueError（与原记录类一致）。"""
+    if type(date) is datetime.date:
+        return np.datetime64(date, "ns")
+    if type(date) is str:
+        return pd.Timestamp(date).to_datetime64()
+    raise ValueError("date must be datetime.date or str")
+
+
+class ColumnarRecordBuffer:
+    """
+    按列存储的可增长记录缓冲区。
+
+    schema 为 (列名, 列类型) 序列，列类型取 DATETIME / NUMBER / CATEGORY / OBJECT。
+    NUMBER 列若写入的值全部为整数，transform 时还原为 int64（与逐对象构造 DataFrame 的类型推断一致）。
+    """
+
+    def __init__(self, schema: Sequence[Tuple[str, str]], capacity: int = 64):
+        self.schema = list(schema)
+        self.names = [name for name, _ in self.schema]
+        self._kinds = dict(self.schema)
+        self._size = 0
+        self._columns: Dict[str, np.ndarray] = {
+            name: np.empty(capacity, dtype=_STORAGE_DTYPES[kind]) for name, kind in self.schema
+        }
+        self._categories: Dict[str, List[str]] = {name: [] for name, kind in self.schema if kind == CATEGORY}
+        self._codes: Dict[str, Dict[str, int]] = {name: {} for name in self._categories}
+        self._integral = {name: True for name, kind in self.schema if kind == NUMBER}
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, size: int) -> None:
+        capacity = len(next(iter(self._columns.values())))
+        if size <= capacity:
+            return
+        capacity = max(size, capacity * 2)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            self._columns[name] = grown
+
+    def _encode(self, name: str, value) -> int:
+        codes = self._codes[name]
+        code = codes.get(value)
+        if code is None:
+            code = len(codes)
+            codes[value] = code
+            self._categories[name].append(value)
+        return code
+
+    def append(self, *values) -> None:
+        """按 schema 顺序追加一条记录。"""
+        self.extend((values,))
+
+    def extend(self, rows: Iterable[Sequence]) -> None:
+        """批量追加记录，每条记录按 schema 顺序给出各列的值。"""
+        rows = rows if isinstance(rows, (list, tuple)) else list(rows)
+        if not rows:
+            return
+        start = self._size
+        self._reserve(start + len(rows))
+        for position, (name, kind) in enumerate(self.schema):
+            values = [row[position] for row in rows]
+            target = self._columns[name][start : start + len(rows)]
+            if kind == DATETIME:
+                target[:] = [to_datetime64(value) for value in values]
+            elif kind == CATEGORY:
+                target[:] = [self._encode(name, value) for value in values]
+            elif kind == NUMBER:
+                if self._integral[name]:
+                    self._integral[name] = all(
+                        isinstance(value, (int, np.integer)) and not isinstance(value, bool) for value in values
+                    )
+                target[:] = values
+            else:
+                target[:] = values
+        self._size = start + len(rows)
+
+    def column(self, name: str) -> np.ndarray:
+        """已写入部分的数组视图（类别列为编码）。"""
+        return self._columns[name][: self._size]
+
+    def categories(self, name: str) -> List[str]:
+        return list(self._categories[name])
+
+    def _series_values(self, name: str):
+        if self._kinds[name] == CATEGORY:
+            return pd.Categorical.from_codes(self.column(name), categories=self._categories[name])
+        return self.column(name)
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        零拷贝导出：数值/日期/对象列直接引用缓冲区视图，类别列为 pandas Categorical。
+
+        返回的 DataFrame 与缓冲区共享内存，后续追加不会改变已导出的行。
+        """
+        return pd.DataFrame({name: self._series_values(name) for name in self.names}, copy=False)
+
+    def to_arrow(self):
+        """导出为 pyarrow.Table（数值与日期列零拷贝，类别列为字典编码）。"""
+        try:
+            import pyarrow as pa  # type: ignore
+        except Exception as exc:  # pragma: no cover - optional dependency
+            raise ImportError("pyarrow is required for to_arrow") from exc
+        arrays = {}
+        for name in self.names:
+            kind = self._kinds[name]
+            if kind == CATEGORY:
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    pa.array(self.column(name)), pa.array(self._categories[name], type=pa.string())
+                )
+            elif kind == OBJECT:
+                arrays[name] = pa.array(self.column(name).tolist())
+            else:
+                arrays[name] = pa.array(self.column(name))
+        return pa.table(arrays)
+
+    def transform(self) -> pd.DataFrame:
+        """
+        兼容导出：与逐条记录对象构造的 DataFrame 列类型一致
+        （类别列还原为字符串、全整数的数值列还原为 int64、空缓冲区返回空 DataFrame）。
+        """
+        if self._size == 0:
+            return pd.DataFrame()
+        data = {}
+        for name, kind in self.schema:
+            values = self.column(name)
+            if kind == CATEGORY:
+                values = np.asarray(self._categories[name], dtype=object)[values]
+            elif kind == NUMBER and self._integral[name]:
+                values = values.astype(np.int64)
+            else:
+                values = values.copy()
+            data[name] = values
+        return pd.DataFrame(data)
+
+    def rows(self) -> Iterable[Tuple]:
+        """按 schema 顺序逐条返回 Python 值（日期为 pd.Timestamp，类别为字符串）。"""
+        decoded = []
+        for name, kind in self.schema:
+            values = self.column(name)
+            if kind == CATEGORY:
+                decoded.append([self._categories[name][code] for code in values])
+            elif kind == DATETIME:
+                decoded.append([pd.Timestamp(value) for value in values])
+            elif kind == NUMBER and self._integral[name]:
+                decoded.append(values.astype(np.int64).tolist())
+            else:
+                decoded.append(values.tolist())
+        return zip(*decoded)
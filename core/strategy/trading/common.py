@@ -3,20 +3,53 @@ import pandas as pd
 import backtrader as bt
 from common.logger import create_log
 import settings
+from core.strategy.record_buffer import CATEGORY, DATETIME, NUMBER, ColumnarRecordBuffer
 
 logger = create_log("trade_strategy_common")
 
 
 class TradeRecordManager:
+    """交易记录管理器：按列追加到 ColumnarRecordBuffer，买卖方向与订单类型以小整数编码存储。"""
+
+    SCHEMA = (
+        ("date", DATETIME),
+        ("trade_id", NUMBER),
+        ("action", CATEGORY),
+        ("price", NUMBER),
+        ("size", NUMBER),
+        ("total_amount", NUMBER),
+        ("commission", NUMBER),
+        ("order_type", CATEGORY),
+        ("status", NUMBER),
+    )
+
     def __init__(self):
-        self.trade_records = []
+        self.buffer = ColumnarRecordBuffer(self.SCHEMA)
+
+    @property
+    def trade_records(self):
+        """兼容旧接口：按需物化为 TradeRecord 对象列表。"""
+        return [TradeRecord.from_row(*row) for row in self.buffer.rows()]
+
+    def __len__(self):
+        return len(self.buffer)
 
     def add_trade_record(self, trade_id, date, action, price, size, total_amount, commission, order_type, status):
-        self.trade_records.append(
-            TradeRecord(trade_id, date, action, price, size, total_amount, commission, order_type, status))
+        try:
+            self.buffer.append(date, trade_id, action, price, size, total_amount, commission, order_type, status)
+        except ValueError:
+            logger.info(type(date))
+            raise
 
     def transform_to_dataframe(self):
-        return pd.DataFrame([record.__dict__ for record in self.trade_records])
+        return self.buffer.transform()
+
+    def to_dataframe(self):
+        """零拷贝导出，action / order_type 为 Categorical。"""
+        return self.buffer.to_dataframe()
+
+    def to_arrow(self):
+        return self.buffer.to_arrow()
 
 
 class TradeRecord:
@@ -53,6 +86,20 @@ class TradeRecord:
         self.order_type = order_type
         self.status = status
 
+    @classmethod
+    def from_row(cls, date, trade_id, action, price, size, total_amount, commission, order_type, status):
+        record = cls.__new__(cls)
+        record.date = date
+        record.trade_id = trade_id
+        record.action = action
+        record.price = price
+        record.size = size
+        record.total_amount = total_amount
+        record.commission = commission
+        record.order_type = order_type
+        record.status = status
+        return record
+
 
 class StrategyBase(bt.Strategy):
     """
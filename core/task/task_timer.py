@@ -96,7 +96,7 @@ def run_backtest(csv_path, backtest_config):
 
     Args:
         csv_path: CSV文件路径
-        backtest_config: 回测配置，包含strategy, init_cash等
+        backtest_config: 回测配置，包含strategy, init_cash, output_mode（html/headless，缺省取 settings.BACKTEST_OUTPUT_MODE）等
 
     Returns:
         bool: 是否成功
@@ -104,6 +104,7 @@ def run_backtest(csv_path, backtest_config):
     try:
         strategy_name = backtest_config.get('strategy', 'EnhancedVolumeStrategy')
         init_cash = backtest_config.get('init_cash', settings.INIT_CASH)
+        output_mode = backtest_config.get('output_mode')
 
         # 获取策略类
         strategy_class = global_strategy_manager.get_strategy(strategy_name)
@@ -112,7 +113,7 @@ def run_backtest(csv_path, backtest_config):
             return False
 
         # 执行回测
-        run_backtest_enhanced_volume_strategy(csv_path, strategy_class, init_cash)
+        run_backtest_enhanced_volume_strategy(csv_path, strategy_class, init_cash, output_mode=output_mode)
         logger.info(f"回测完成: {csv_path}, 策略: {strategy_name}")
         return True
     except Exception as e:
@@ -10,12 +10,14 @@ import os
 import webbrowser
 from pathlib import Path
 from datetime import datetime
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 from common.logger import create_log
 from common.util_csv import load_stock_data
+from core.analysis.kernels import trade_walk
 from core.visualization.visual_demo import get_sample_signal_records, get_sample_trade_records, get_sample_asset_records
 from core.strategy.indicator.common import normalize_signal_type
 from settings import stock_data_root, html_root
@@ -688,66 +690,41 @@ def calculate_holdings(df_continuous, valid_trades, initial_capital):
         holdings_data['total_assets'] = initial_capital
         return holdings_data
 
-    # 初始化持仓量和资金
-    total_holdings = 0  # 当前持仓量
-    capital = initial_capital   # 剩余资金
-    holdings_value = 0
-    total_cost = 0.0  # 总持仓成本
-    adjusted_cost = 0.0    # 持仓成本
-
-    # 计算持仓量变化和总资产变化
-    holdings_history = []
-    asset_history = []
-    adjusted_cost_history = []
-
-
-    for date in df_continuous.index:
-        # 检查该日期是否有交易
-        day_trades = valid_trades[valid_trades['date'] == date]
-        for _, trade in day_trades.iterrows():
-            if trade['action'] == 'B':
-                # 买入，持仓量增加
-                if date in df_continuous.index.dropna():
-                    buy_price = trade['price']
-                    buy_size = trade['size']
-                    commission = trade['commission']
-                    current_cost = buy_size * buy_price + commission
-                    total_cost += current_cost
-                    capital -= current_cost
-                    total_holdings += buy_size
-                    adjusted_cost = total_cost / total_holdings
-            elif trade['action'] == 'S':
-                # 卖出，持仓量减少
-                if date in df_continuous.index.dropna():
-                    sell_price = trade['price']
-                    sell_size = trade['size']
-                    commission = trade['commission']
-                    current_cost = sell_size * sell_price - commission
-                    total_cost -= current_cost
-                    capital += current_cost
-                    total_holdings -= sell_size
-                    # 如果全部卖出，重置持仓成本
-                    if total_holdings <= 0:
-                        adjusted_cost = 0.0
-                        total_cost = 0.0
-                        total_holdings = 0
-                    else:
-                        adjusted_cost = total_cost / total_holdings
-
-        # 保存当日持仓量
-        holdings_history.append(total_holdings)
-        adjusted_cost_history.append(adjusted_cost)
-
-        # 计算总资产（现金+持仓市值）
-        if date in df_continuous.index.dropna():
-            current_price = df_continuous.loc[date, 'close']
-            holdings_value = total_holdings * current_price
-        total_assets = capital + holdings_value
-        asset_history.append(total_assets)
+    # 按成交顺序推演每笔成交后的持仓量、持仓成本与现金（同一日期内保持原有顺序）
+    trade_bar = df_continuous.index.get_indexer(valid_trades['date'])
+    trade_bar = np.where(valid_trades['date'].notna().to_numpy(), trade_bar, -1)
+    order = np.argsort(trade_bar, kind='stable')
+    order = order[trade_bar[order] >= 0]
+    trades = valid_trades.iloc[order]
+    trade_bar = trade_bar[order]
+    is_buy = (trades['action'] == 'B').to_numpy()
+    keep = is_buy | (trades['action'] == 'S').to_numpy()
+    trades, trade_bar, is_buy = trades[keep], trade_bar[keep], is_buy[keep]
+    holdings, adjusted_cost, capital = trade_walk(
+        is_buy,
+        trades['price'].to_numpy(dtype=float),
+        trades['size'].to_numpy(dtype=float),
+        trades['commission'].to_numpy(dtype=float),
+        initial_capital,
+    )
+
+    # 每个日期取当日最后一笔成交后的状态（第 0 个状态为建仓前），无成交时沿用前一状态
+    last = np.searchsorted(trade_bar, np.arange(len(df_continuous)), side='right')
+    holdings_history = np.concatenate([[0.0], holdings])[last]
+    adjusted_cost_history = np.concatenate([[0.0], adjusted_cost])[last]
+    capital_history = np.concatenate([[float(initial_capital)], capital])[last]
+
+    # 计算总资产（现金+持仓市值），日期缺失的行沿用前一持仓市值
+    valid_date = ~df_continuous.index.isna()
+    market_value = holdings_history * df_continuous['close'].to_numpy(dtype=float)
+    source = np.maximum.accumulate(np.where(valid_date, np.arange(len(df_continuous)), -1))
+    holdings_value = np.where(source >= 0, market_value[np.maximum(source, 0)], 0.0)
 
     # 添加持仓量和总资产数据到DataFrame
+    if pd.api.types.is_integer_dtype(valid_trades['size']):
+        holdings_history = holdings_history.astype(np.int64)
     holdings_data['holdings'] = holdings_history
-    holdings_data['total_assets'] = asset_history
+    holdings_data['total_assets'] = capital_history + holdings_value
     holdings_data['adjusted_cost'] = adjusted_cost_history
 
     return holdings_data
@@ -1083,7 +1060,7 @@ def create_trading_chart(chart_title_prefix, df, valid_signals, valid_trades, ho
     return fig
 
 
-def save_and_show_chart(fig, file_name, output_dir=None, report_payload=None):
+def save_and_show_chart(fig, file_name, output_dir=None, report_payload=None, open_browser=True):
     """
     保存图表并在浏览器中显示
 
@@ -1091,6 +1068,7 @@ def save_and_show_chart(fig, file_name, output_dir=None, report_payload=None):
         fig: Plotly图表对象
         output_dir: 输出目录路径（可选）
         report_payload: 报告元数据
+        open_browser: 是否在浏览器中打开（服务端延迟渲染时关闭）
 
     返回:
         保存的文件路径
@@ -1127,10 +1105,11 @@ def save_and_show_chart(fig, file_name, output_dir=None, report_payload=None):
     Path(file_path).write_text(html_content, encoding="utf-8")
 
     # 在浏览器中显示图表
-    try:
-        webbrowser.open(Path(file_path).resolve().as_uri())
-    except Exception as exc:
-        logger.warning(f"浏览器打开失败：{exc}")
+    if open_browser:
+        try:
+            webbrowser.open(Path(file_path).resolve().as_uri())
+        except Exception as exc:
+            logger.warning(f"浏览器打开失败：{exc}")
 
     return file_path
 
@@ -1140,6 +1119,14 @@ def plotly_draw(kline_csv_path, strategy, initial_capital, html_file_name,html_f
     signals_df = signal_record_manager.transform_to_dataframe()
     trade_record_manager = strategy.trade_record_manager
     trades_df = trade_record_manager.transform_to_dataframe()
+    return plotly_draw_records(kline_csv_path, signals_df, trades_df, initial_capital, html_file_name, html_file_path)
+
+
+def plotly_draw_records(kline_csv_path, signals_df, trades_df, initial_capital, html_file_name, html_file_path,
+                        open_browser=True):
+    """
+    由信号表与交易表生成回测报告（plotly_draw 与无界面模式的延迟渲染共用）。
+    """
     # 1. 加载股票数据
     df = load_stock_data(kline_csv_path)
 
@@ -1176,6 +1163,6 @@ def plotly_draw(kline_csv_path, strategy, initial_capital, html_file_name,html_f
     fig = create_trading_chart(stock_info, df_continuous, valid_signals, valid_trades, holdings_data, initial_capital)
     report_payload = build_report_payload(stock_info, df_continuous, valid_signals, valid_trades, holdings_data, initial_capital)
     # 7. 保存和显示图表
-    output_path = save_and_show_chart(fig, html_file_name, html_file_path, report_payload)
+    output_path = save_and_show_chart(fig, html_file_name, html_file_path, report_payload, open_browser=open_browser)
 
     return output_path
@@ -11,6 +11,7 @@ import multiprocessing
 
 import secrets
 from datetime import datetime
+from pathlib import Path
 from functools import wraps
 
 from core.signal.signal_handler import signal_get, signals_analyze
@@ -25,7 +26,7 @@ from common.util_html import signals_to_html
 from core.stock import manager_baostock, manager_akshare, manager_futu, manager_yfinance
 from core.strategy.strategy_manager import global_strategy_manager
 from common.logger import create_log
-from core.quant.quant_manage import run_backtest_enhanced_volume_strategy, run_backtest_enhanced_volume_strategy_multi
+from core.quant.quant_manage import BUNDLE_META_FILE, render_backtest_bundle, run_backtest_enhanced_volume_strategy, run_backtest_enhanced_volume_strategy_multi
 from settings import stock_data_root, html_root, signals_root
 
 # 初始化Flask应用
@@ -312,26 +313,33 @@ def get_backtest_results():
 
                             strategy_path = stock_path / strategy_dir
                             if os.path.isdir(strategy_path):
-                                for result_file in os.listdir(strategy_path):
-                                    if result_file.endswith('.html'):
-                                        # 获取文件创建时间
+                                result_files = set(os.listdir(strategy_path))
+                                for result_file in sorted(result_files):
+                                    # 无界面模式的结构化结果目录，报告尚未生成时按对应的 .html 路径列出，查看时再渲染
+                                    if (strategy_path / result_file / BUNDLE_META_FILE).exists() and f"{result_file}.html" not in result_files:
+                                        file_path = strategy_path / result_file / BUNDLE_META_FILE
+                                        result_file = f"{result_file}.html"
+                                    elif result_file.endswith('.html'):
                                         file_path = strategy_path / result_file
-                                        run_time = datetime.fromtimestamp(os.path.getctime(file_path)).strftime('%Y-%m-%d %H:%M:%S')
-
-                                        # 应用日期筛选
-                                        if date_filter and not run_time.startswith(date_filter):
-                                            continue
-
-                                        # 构建结果路径
-                                        relative_path = f"{source}/{stock_dir}/{strategy_dir}/{result_file}"
-
-                                        results.append({
-                                            'stock': stock_dir,
-                                            'source': source,
-                                            'strategy': strategy_dir,
-                                            'run_time': run_time,
-                                            'path': relative_path
-                                        })
+                                    else:
+                                        continue
+                                    # 获取文件创建时间
+                                    run_time = datetime.fromtimestamp(os.path.getctime(file_path)).strftime('%Y-%m-%d %H:%M:%S')
+
+                                    # 应用日期筛选
+                                    if date_filter and not run_time.startswith(date_filter):
+                                        continue
+
+                                    # 构建结果路径
+                                    relative_path = f"{source}/{stock_dir}/{strategy_dir}/{result_file}"
+
+                                    results.append({
+                                        'stock': stock_dir,
+                                        'source': source,
+                                        'strategy': strategy_dir,
+                                        'run_time': run_time,
+                                        'path': relative_path
+                                    })
 
         # 按运行时间降序排序
         results.sort(key=lambda x: x['run_time'], reverse=True)
@@ -372,6 +380,10 @@ def show_result(result_path):
     try:
         # 获取实际文件路径
         actual_path = os.path.join(html_root, result_path)
+        bundle_dir = Path(actual_path).with_suffix('')
+        if not os.path.exists(actual_path) and (bundle_dir / BUNDLE_META_FILE).exists():
+            # 无界面模式的结果在首次查看时渲染报告
+            actual_path = str(render_backtest_bundle(bundle_dir))
         if not os.path.exists(actual_path):
             error_response_data = {'success': False, 'message': 'Result file not found', 'data':{}}
             error_response = make_response(json.dumps(error_response_data, ensure_ascii=False))
@@ -108,3 +108,39 @@ VCP_PLUS_REQUIRE_CONSOLIDATION = True
 VCP_PLUS_EMA_SELL_PERIOD = 5
 VCP_PLUS_BENCHMARK_CLOSE_COLUMN = "benchmark_close"
 VCP_PLUS_RS_RATING_COLUMN = "rs_rating"
+
+
+# 指标特征磁盘缓存（runonce 预计算结果按 数据指纹 + 参数 + 代码版本 复用；默认关闭，批量回测/参数扫描时开启）
+FEATURE_CACHE_ENABLED = False
+FEATURE_CACHE_ROOT = data_root / 'cache' / 'features'
+FEATURE_CACHE_MAX_BYTES = 256 * 1024 * 1024  # 缓存总容量上限，超出后按最近访问时间淘汰
+
+# 指标状态快照（有名称的数据源在 runonce 预计算后保存逐 bar 结果与滚动状态，下次只续算追加的 bar）
+# 默认关闭：快照为 pickle 文件，仅在每日增量任务中按需开启
+INDICATOR_SNAPSHOT_ENABLED = False
+INDICATOR_SNAPSHOT_ROOT = data_root / 'cache' / 'snapshots'
+INDICATOR_SNAPSHOT_MAX_BYTES = 256 * 1024 * 1024  # 快照总容量上限，超出后按最近访问时间淘汰
+
+# K 线解析缓存（规范化后的行情表按 CSV 修改时间与大小保存为二进制文件，CSV 未变化时直接读取）
+# 默认关闭，开启后统一写入 data/cache/feeds（已在 .gitignore 中忽略），不在行情目录旁生成文件
+FEED_CACHE_ENABLED = False
+FEED_CACHE_ROOT = data_root / 'cache' / 'feeds'
+FEED_CACHE_MAX_BYTES = 512 * 1024 * 1024  # 缓存总容量上限，超出后按最近访问时间淘汰
+# 批量回测（backtest --folder）与参数扫描（sweep）默认开启解析缓存：同一批 CSV 会在多个进程、多次运行中反复解析
+# 可用命令行 --no-feed-cache 或函数参数 feed_cache=False 关闭
+BATCH_FEED_CACHE_ENABLED = True
+
+
+# 热点循环内核后端："auto"（安装 numba 时使用 JIT 编译，否则纯 NumPy）/ "numba" / "numpy"
+KERNEL_BACKEND = "auto"
+
+
+# 紧凑内存模式：行情与特征表以 float32 / 分类编码 / int8 信号存储（大规模标的面板筛选时开启）
+COMPACT_MEMORY_MODE = False
+
+
+# 批量回测进程数：None 时取 CPU 核数，1 时在当前进程顺序执行
+BACKTEST_MAX_WORKERS = None
+
+# 回测输出模式："html" 生成 Plotly 报告并打开浏览器；"headless" 只保存指标/交易/信号/资金曲线，报告在首次查看时生成
+BACKTEST_OUTPUT_MODE = "html"
@@ -4,10 +4,14 @@ Pytest 公共配置与 fixture。
 
 # Front Code X
 
+import sys
+
 import numpy as np
 import pandas as pd
 import pytest
 
+import settings
+
 
 @pytest.fixture
 def sample_prices():
@@ -39,7 +43,54 @@ def sample_ohlcv_df():
     )
 
 
+@pytest.fixture
+def make_trending_df():
+    """
+    带上升漂移的随机 K 线生成器：make(length, seed=0, noisy_open=False)。
+    收盘价为几何随机游走，noisy_open 为真时开盘价在收盘价附近随机扰动，否则等于收盘价。
+    """
+
+    def make(length: int, seed: int = 0, noisy_open: bool = False) -> pd.DataFrame:
+        rng = np.random.default_rng(seed)
+        close = 50 * np.exp(np.cumsum(rng.normal(0.001, 0.02, length)))
+        open_ = close * (1 + rng.normal(0, 0.01, length)) if noisy_open else close
+        return pd.DataFrame(
+            {
+                "date": pd.bdate_range("2019-01-01", periods=length).strftime("%Y-%m-%d"),
+                "open": open_,
+                "high": close * (1 + rng.uniform(0, 0.02, length)),
+                "low": close * (1 - rng.uniform(0, 0.02, length)),
+                "close": close,
+                "volume": rng.lognormal(13, 0.5, length),
+                "market": "US",
+            }
+        )
+
+    return make
+
+
 @pytest.fixture(autouse=True)
 def fixed_seed():
     np.random.seed(1)
     yield
+
+
+@pytest.fixture(autouse=True)
+def isolated_caches(tmp_path, monkeypatch):
+    """磁盘缓存目录指向本用例的临时目录，测试不向仓库 data/cache 写入文件。"""
+    monkeypatch.setattr(settings, "FEATURE_CACHE_ROOT", tmp_path / "cache" / "features")
+    monkeypatch.setattr(settings, "INDICATOR_SNAPSHOT_ROOT", tmp_path / "cache" / "snapshots")
+    monkeypatch.setattr(settings, "FEED_CACHE_ROOT", tmp_path / "cache" / "feeds")
+    # 进程级缓存按 settings 惰性创建，已导入时重置为未配置，使其在本用例内按临时目录重建
+    for module_name, attr in (
+        ("core.strategy.indicator.common", "_feature_cache"),
+        ("core.strategy.indicator.snapshot", "_snapshot_store"),
+    ):
+        module = sys.modules.get(module_name)
+        if module is not None:
+            monkeypatch.setattr(module, attr, None)
+            monkeypatch.setattr(module, f"{attr}_configured", False)
+    registry = sys.modules.get("core.analysis.indicators.registry")
+    if registry is not None:
+        registry.clear_registries()
+    yield
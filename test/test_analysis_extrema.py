@@ -0,0 +1,95 @@
+"""
+局部极值向量化识别一致性测试。
+
+数学原理：
+1. 向量化窗口归约结果应与原先三处逐点循环实现（VCP / VCPPlus / 筛选器）完全一致，
+   包括并列取值与 NaN 口径。
+2. 批量二维输入的每一行应与单序列结果一致。
+"""
+
+import numpy as np
+import pytest
+
+from core.analysis.indicators.extrema import local_extrema, local_extrema_mask
+
+
+def _loop_vcp(arr, order, mode):
+    if len(arr) < order * 2 + 1:
+        return np.array([], dtype=int)
+    idx = []
+    for i in range(order, len(arr) - order):
+        window = arr[i - order : i + order + 1]
+        center = arr[i]
+        if mode == "max" and center == window.max():
+            idx.append(i)
+        if mode == "min" and center == window.min():
+            idx.append(i)
+    return np.array(idx, dtype=int)
+
+
+def _loop_vcp_plus(arr, order, mode):
+    if len(arr) < order * 2 + 1:
+        return np.array([], dtype=int)
+    idx = []
+    for i in range(order, len(arr) - order):
+        window = arr[i - order : i + order + 1]
+        if mode == "max" and arr[i] == np.nanmax(window):
+            idx.append(i)
+        elif mode == "min" and arr[i] == np.nanmin(window):
+            idx.append(i)
+    return np.array(idx, dtype=int)
+
+
+def _loop_screener(arr, order, mode):
+    if len(arr) < order * 2 + 1:
+        return np.array([], dtype=int)
+    idx = []
+    for i in range(order, len(arr) - order):
+        window = arr[i - order : i + order + 1]
+        center = arr[i]
+        if mode == "max" and np.all(center >= window) and center == window.max():
+            idx.append(i)
+        if mode == "min" and np.all(center <= window) and center == window.min():
+            idx.append(i)
+    return np.array(idx, dtype=int)
+
+
+def _make_prices(length: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    # 取整制造并列极值，并插入零散 NaN 与一段全 NaN
+    prices = np.round(100 + np.cumsum(rng.normal(0, 1, length)))
+    prices[rng.random(length) < 0.03] = np.nan
+    prices[50:80] = np.nan
+    return prices
+
+
+@pytest.mark.mock_only
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+@pytest.mark.parametrize("mode", ["max", "min"])
+@pytest.mark.parametrize("order", [1, 3, 10])
+def test_local_extrema_matches_loops(mode, order):
+    for seed in range(3):
+        prices = _make_prices(400, seed)
+        assert local_extrema(prices, order, mode).tolist() == _loop_vcp(prices, order, mode).tolist()
+        assert local_extrema(prices, order, mode).tolist() == _loop_screener(prices, order, mode).tolist()
+        assert (
+            local_extrema(prices, order, mode, ignore_nan=True).tolist()
+            == _loop_vcp_plus(prices, order, mode).tolist()
+        )
+
+
+@pytest.mark.mock_only
+def test_local_extrema_short_series():
+    assert local_extrema(np.arange(5.0), 3, "max").size == 0
+    with pytest.raises(ValueError):
+        local_extrema(np.arange(10.0), 2, "median")
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize("ignore_nan", [False, True])
+def test_local_extrema_mask_batched(ignore_nan):
+    panel = np.vstack([_make_prices(300, seed) for seed in range(4)])
+    mask = local_extrema_mask(panel, 5, "max", ignore_nan=ignore_nan)
+    assert mask.shape == panel.shape
+    for row in range(panel.shape[0]):
+        assert np.flatnonzero(mask[row]).tolist() == local_extrema(panel[row], 5, "max", ignore_nan=ignore_nan).tolist()
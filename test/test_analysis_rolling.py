@@ -0,0 +1,211 @@
+"""
+滚动统计基础函数测试。
+
+数学原理：
+1. 线性序列 y = a·t + b 的任意窗口斜率恒为 a。
+2. 前缀和闭式斜率应与逐窗口最小二乘（nansum 处理缺失值）一致。
+3. 分块前缀/后缀极值与单调队列增量极值均应与 pandas rolling min/max 完全一致。
+4. 滚动和/均值/方差以逐窗口两遍法（np.nansum / np.nanvar）为黄金输出；RSI 与 KDJ 与原 pandas 写法一致。
+5. 滚动均值等于窗口真实均值（有理数精确计算）的就近舍入，窗口为 1 时逐位等于原值。
+"""
+
+from fractions import Fraction
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.analysis.indicators.rolling import (
+    RollingExtreme,
+    kdj_smooth,
+    rolling_max,
+    rolling_mean,
+    rolling_min,
+    rolling_slope,
+    rolling_std,
+    rolling_sum,
+    rolling_var,
+    rsi_averages,
+)
+
+
+def _window_slope(values: np.ndarray) -> float:
+    y = values.astype(float)
+    x = np.arange(1, len(y) + 1, dtype=float)
+    numerator = len(y) * np.nansum(x * y) - x.sum() * np.nansum(y)
+    denominator = len(y) * np.dot(x, x) - x.sum() ** 2
+    return numerator / denominator if denominator != 0 else 0.0
+
+
+@pytest.mark.mock_only
+def test_rolling_slope_linear_series():
+    values = 3.5 * np.arange(300) + 100.0
+    slope = rolling_slope(values, 20)
+    assert np.isnan(slope[:19]).all()
+    assert np.allclose(slope[19:], 3.5)
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize("window, min_periods", [(20, None), (5, 3), (2, 1), (200, 150)])
+def test_rolling_slope_matches_rolling_apply(window, min_periods):
+    rng = np.random.default_rng(0)
+    values = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, 3000)))
+    values[rng.random(values.size) < 0.05] = np.nan
+    values[7] = np.inf
+
+    expected = (
+        pd.Series(values)
+        .rolling(window=window, min_periods=window if min_periods is None else min_periods)
+        .apply(_window_slope, raw=True)
+        .to_numpy()
+    )
+    actual = rolling_slope(values, window, min_periods)
+
+    assert np.array_equal(np.isnan(actual), np.isnan(expected))
+    assert np.allclose(actual, expected, rtol=1e-9, atol=1e-9, equal_nan=True)
+
+
+@pytest.mark.mock_only
+def test_rolling_slope_batched_rows():
+    rng = np.random.default_rng(1)
+    panel = rng.normal(50, 2, (4, 500))
+    panel[2, :40] = np.nan
+    actual = rolling_slope(panel, 20)
+    for row in range(panel.shape[0]):
+        assert np.allclose(actual[row], rolling_slope(panel[row], 20), equal_nan=True)
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize("mode", ["max", "min"])
+@pytest.mark.parametrize("window, min_periods", [(1, None), (3, None), (9, 4), (260, None), (260, 1)])
+def test_rolling_extreme_matches_pandas(mode, window, min_periods):
+    rng = np.random.default_rng(2)
+    values = np.round(rng.normal(100, 3, 1200))
+    values[rng.random(values.size) < 0.05] = np.nan
+    values[11] = np.inf
+
+    rolling = pd.Series(values).rolling(window=window, min_periods=window if min_periods is None else min_periods)
+    expected = (rolling.max() if mode == "max" else rolling.min()).to_numpy()
+    batch = (rolling_max if mode == "max" else rolling_min)(values, window, min_periods)
+    assert np.array_equal(batch, expected, equal_nan=True)
+
+    stream = RollingExtreme(window, mode, min_periods)
+    incremental = []
+    for value in values:
+        stream.push(value)
+        incremental.append(stream.value())
+    assert np.array_equal(np.array(incremental), expected, equal_nan=True)
+
+
+@pytest.mark.mock_only
+def test_rolling_extreme_batched_rows():
+    rng = np.random.default_rng(3)
+    panel = rng.normal(50, 2, (3, 400))
+    actual = rolling_min(panel, 30)
+    for row in range(panel.shape[0]):
+        assert np.array_equal(actual[row], rolling_min(panel[row], 30), equal_nan=True)
+
+
+def _golden_windows(values: np.ndarray, window: int, min_periods: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """逐窗口两遍法：返回 (有效值个数, 和, ddof=0 方差)，窗口不完整的前段按实际长度。"""
+    size = values.size
+    count = np.zeros(size)
+    total = np.full(size, np.nan)
+    var = np.full(size, np.nan)
+    for end in range(size):
+        chunk = values[max(0, end - window + 1) : end + 1]
+        chunk = chunk[np.isfinite(chunk)]
+        count[end] = chunk.size
+        if chunk.size >= max(min_periods, 1):
+            total[end] = chunk.sum()
+            var[end] = np.mean((chunk - chunk.mean()) ** 2)
+    return count, total, var
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize("scale", [1.0, 1e8])
+@pytest.mark.parametrize("window, min_periods", [(1, None), (5, None), (20, 10), (70, None), (200, 1)])
+def test_rolling_moments_match_golden(scale, window, min_periods):
+    rng = np.random.default_rng(4)
+    # 大均值、小波动：E[x²]-E[x]² 直接相减会丢失全部有效位
+    values = scale * (1000 + rng.normal(0, 1, 900))
+    values[rng.random(values.size) < 0.05] = np.nan
+    values[13] = np.inf
+    values[400:430] = scale * 1000  # 常数段方差应为 0
+
+    count, total, var = _golden_windows(values, window, window if min_periods is None else min_periods)
+    with np.errstate(invalid="ignore"):
+        mean = total / count
+
+    assert np.allclose(rolling_sum(values, window, min_periods), total, rtol=1e-12, equal_nan=True)
+    assert np.allclose(rolling_mean(values, window, min_periods), mean, rtol=1e-12, equal_nan=True)
+    assert np.allclose(rolling_var(values, window, min_periods), var, rtol=1e-7, atol=(scale * 1e-6) ** 2, equal_nan=True)
+    assert np.allclose(rolling_std(values, window, min_periods), np.sqrt(var), rtol=1e-7, atol=scale * 1e-6, equal_nan=True)
+
+    expected = pd.Series(values).rolling(window=window, min_periods=window if min_periods is None else min_periods)
+    assert np.allclose(rolling_mean(values, window, min_periods), expected.mean().to_numpy(), rtol=1e-10, equal_nan=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sample_var = np.where(count > 1, var * count / (count - 1), np.nan)
+    assert np.allclose(
+        rolling_var(values, window, min_periods, ddof=1), sample_var, rtol=1e-7, atol=(scale * 1e-6) ** 2, equal_nan=True
+    )
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize("window", [1, 3, 5, 20, 150])
+def test_rolling_mean_is_correctly_rounded(window):
+    rng = np.random.default_rng(6)
+    values = rng.lognormal(10, 1, 400)
+    values[1::2] = np.round(values[1::2], 2)  # 价格刻度数据：十进制下恰好相等的均值不应因舍入翻转比较
+
+    actual = rolling_mean(values, window)
+    for end in range(window - 1, values.size):
+        exact = sum(Fraction(value) for value in values[end - window + 1 : end + 1]) / window
+        assert actual[end] == float(exact)
+    if window == 1:
+        assert np.array_equal(actual, values)
+
+
+@pytest.mark.mock_only
+def test_rolling_moments_batched_rows():
+    rng = np.random.default_rng(5)
+    panel = rng.lognormal(13, 0.5, (3, 300))
+    panel[1, :25] = np.nan
+    for func in (rolling_sum, rolling_mean, rolling_std):
+        actual = func(panel, 20)
+        for row in range(panel.shape[0]):
+            assert np.array_equal(actual[row], func(panel[row], 20), equal_nan=True)
+    assert rolling_mean(np.empty((2, 0)), 5).shape == (2, 0)
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize("min_periods", [None, 1])
+def test_rsi_averages_match_pandas(min_periods):
+    rng = np.random.default_rng(6)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 400))))
+    close.iloc[50] = np.nan
+
+    delta = close.diff()
+    rolling_kwargs = {"window": 14, "min_periods": 14 if min_periods is None else min_periods}
+    expected_up = delta.clip(lower=0).rolling(**rolling_kwargs).mean().to_numpy()
+    expected_down = (-delta.clip(upper=0)).rolling(**rolling_kwargs).mean().to_numpy()
+    avg_up, avg_down = rsi_averages(close.to_numpy(), 14, min_periods)
+    assert np.allclose(avg_up, expected_up, rtol=1e-10, equal_nan=True)
+    assert np.allclose(avg_down, expected_down, rtol=1e-10, equal_nan=True)
+
+    expected_up = delta.where(delta > 0, 0.0).rolling(window=14).mean().to_numpy()
+    avg_up, _ = rsi_averages(close.to_numpy(), 14, missing_as_zero=True)
+    assert np.allclose(avg_up, expected_up, rtol=1e-10, equal_nan=True)
+
+
+@pytest.mark.mock_only
+def test_kdj_smooth_matches_pandas():
+    rng = np.random.default_rng(7)
+    rsv = pd.Series(rng.uniform(0, 100, 200))
+    rsv.iloc[:8] = np.nan
+    expected_k = rsv.rolling(window=3, min_periods=3).mean()
+    expected_d = expected_k.rolling(window=3, min_periods=3).mean()
+    k, d, j = kdj_smooth(rsv.to_numpy(), 3)
+    assert np.allclose(k, expected_k.to_numpy(), rtol=1e-12, equal_nan=True)
+    assert np.allclose(d, expected_d.to_numpy(), rtol=1e-12, equal_nan=True)
+    assert np.allclose(j, (3 * expected_k - 2 * expected_d).to_numpy(), rtol=1e-12, equal_nan=True)
@@ -4,13 +4,26 @@
 数学原理：
 1. 滚动均值/标准差应在样本量足够时输出有限值。
 2. RSI 输出应处于 0~100。
+3. 流式累加器逐 bar 输出应与批量计算一致。
+4. NumPy 滚动统计实现应与原 pandas rolling 写法的输出一致（黄金输出）。
+5. 参数网格批量计算的每组结果应与单组计算逐位一致，且相同窗口只计算一次。
+6. 黄金信号：由 pandas rolling 特征判定的买卖信号应与当前实现逐 bar 相同（不只比较特征的近似相等）。
 """
 
 import numpy as np
 import pandas as pd
+import itertools
+
 import pytest
 
-from core.analysis.indicators.volume import VolumeIndicatorParams, compute_volume_features
+from core.analysis.indicators import volume as volume_module
+from core.analysis.indicators.volume import (
+    VolumeFeatureStream,
+    VolumeIndicatorParams,
+    compute_volume_feature_grid,
+    compute_volume_features,
+    compute_volume_signals,
+)
 
 
 @pytest.mark.mock_only
@@ -35,3 +48,164 @@ def test_volume_features_basic():
     assert 0 <= last["rsi"] <= 100
     assert isinstance(last["is_3_down"], (bool, np.bool_))
     assert isinstance(last["is_3_up"], (bool, np.bool_))
+
+
+@pytest.mark.mock_only
+def test_volume_feature_stream_matches_batch():
+    rng = np.random.default_rng(7)
+    length = 300
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, length)))
+    open_ = close * (1 + rng.normal(0, 0.01, length))
+    df = pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) * 1.01,
+            "low": np.minimum(open_, close) * 0.99,
+            "close": close,
+            "volume": rng.lognormal(14, 0.5, length),
+        }
+    )
+    params = VolumeIndicatorParams()
+    batch = compute_volume_features(df, params)
+    stream = VolumeFeatureStream(params)
+
+    for idx, row in enumerate(df.itertuples(index=False)):
+        latest = stream.update(row.open, row.high, row.low, row.close, row.volume)
+        expected = batch.iloc[idx]
+        assert list(latest.keys()) == list(batch.columns)
+        for key, value in latest.items():
+            if isinstance(value, bool):
+                assert value == bool(expected[key])
+            elif pd.isna(expected[key]):
+                assert np.isnan(value)
+            else:
+                assert value == pytest.approx(expected[key], rel=1e-9, abs=1e-9)
+
+
+def _pandas_reference_features(df: pd.DataFrame, params: VolumeIndicatorParams) -> pd.DataFrame:
+    """迁移前的 pandas rolling 写法，作为黄金输出。"""
+    close, volume = df["close"], df["volume"]
+    delta = close.diff()
+    avg_up = delta.clip(lower=0).rolling(params.rsi_period).mean()
+    avg_down = (-delta.clip(upper=0)).rolling(params.rsi_period).mean()
+    rsi = avg_up / (avg_up + avg_down + 1e-10) * 100
+    boll_mid = close.rolling(params.boll_period).mean()
+    boll_std = close.rolling(params.boll_period).std(ddof=0)
+    rsv = (close - df["low"].rolling(params.kdj_period).min()) / (
+        df["high"].rolling(3).max() - df["low"].rolling(3).min() + 1e-10
+    ) * 100
+    k = rsv.rolling(3).mean()
+    d = k.rolling(3).mean()
+    streak = lambda flags: flags.rolling(3).apply(lambda x: 1.0 if np.all(x) else 0.0, raw=True).astype(bool)
+    return pd.DataFrame(
+        {
+            "ma_vol_today": volume.rolling(params.n1).mean(),
+            "ma_close_today": close.rolling(params.n1).mean(),
+            "ma_vol_5": volume.rolling(params.n2).mean(),
+            "ma_close_5": close.rolling(params.n2).mean(),
+            "ma_vol_20": volume.rolling(params.n3).mean(),
+            "ma_close_20": close.rolling(params.n3).mean(),
+            "vol_std_5": volume.rolling(params.n2).std(ddof=0),
+            "vol_std_20": volume.rolling(params.n3).std(ddof=0),
+            "rsi": rsi,
+            "rsi_prev": rsi.shift(1),
+            "boll_top": boll_mid + boll_std * params.boll_width,
+            "boll_bot": boll_mid - boll_std * params.boll_width,
+            "k": k,
+            "d": d,
+            "j": 3 * k - 2 * d,
+            "is_3_down": streak(df["close"] < df["open"]),
+            "is_3_up": streak(df["close"] > df["open"]),
+        }
+    )
+
+
+@pytest.mark.mock_only
+def test_volume_features_match_pandas_reference():
+    rng = np.random.default_rng(11)
+    length = 400
+    close = 20 * np.exp(np.cumsum(rng.normal(0, 0.02, length)))
+    df = pd.DataFrame(
+        {
+            "open": close * (1 + rng.normal(0, 0.01, length)),
+            "high": close * (1 + rng.uniform(0, 0.03, length)),
+            "low": close * (1 - rng.uniform(0, 0.03, length)),
+            "close": close,
+            "volume": rng.lognormal(15, 0.6, length),
+        }
+    )
+    params = VolumeIndicatorParams()
+    features = compute_volume_features(df, params)
+    expected = _pandas_reference_features(df, params)
+    pd.testing.assert_frame_equal(features[expected.columns], expected, rtol=1e-9)
+    # 今日均线（n1=1）即原值本身
+    assert np.array_equal(features["ma_close_today"], df["close"])
+    assert np.array_equal(features["ma_vol_today"], df["volume"])
+
+
+@pytest.mark.mock_only
+@pytest.mark.slow
+@pytest.mark.parametrize(
+    "params", [VolumeIndicatorParams(), VolumeIndicatorParams(n2=3, n3=10, rsi_period=25, boll_period=12)]
+)
+def test_volume_signals_match_pandas_reference(params):
+    flips = 0
+    bars = 0
+    for seed in range(12):
+        rng = np.random.default_rng(seed)
+        length = 5000
+        close = 50 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, length)))
+        open_ = close * (1 + rng.normal(0, 0.01, length))
+        df = pd.DataFrame(
+            {
+                "open": open_,
+                "high": np.maximum(open_, close) * (1 + rng.uniform(0, 0.02, length)),
+                "low": np.minimum(open_, close) * (1 - rng.uniform(0, 0.02, length)),
+                "close": close,
+                "volume": rng.lognormal(13, 0.5, length),
+            }
+        )
+        actual = compute_volume_signals(df, params)
+        expected = compute_volume_signals(df, params, features=_pandas_reference_features(df, params))
+        flips += int((actual != expected).to_numpy().sum())
+        bars += length
+        assert expected["main_buy"].any() or expected["main_sell"].any()
+    assert bars == 60000
+    assert flips == 0
+
+
+@pytest.mark.mock_only
+def test_volume_feature_grid_matches_single_params(monkeypatch):
+    rng = np.random.default_rng(11)
+    length = 300
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, length)))
+    df = pd.DataFrame(
+        {
+            "open": close * (1 + rng.normal(0, 0.01, length)),
+            "high": close * 1.02,
+            "low": close * 0.98,
+            "close": close,
+            "volume": rng.lognormal(13, 0.5, length),
+        },
+        index=pd.RangeIndex(1000, 1000 + length, name="bar"),
+    )
+    grid = [
+        VolumeIndicatorParams(n2=n2, n3=n3, rsi_period=rsi, boll_width=width, kdj_period=kdj)
+        for n2, n3, rsi, width, kdj in itertools.product([3, 5], [10, 20], [9, 14], [1.5, 2.0, 2.5], [9, 14])
+    ]
+
+    calls = []
+    original = volume_module.rolling_mean
+    monkeypatch.setattr(volume_module, "rolling_mean", lambda *args, **kw: calls.append(args[1]) or original(*args, **kw))
+    result = compute_volume_feature_grid(df, grid)
+    # 48 组参数只涉及 n1/n2/n3/boll_period 共 5 个不同窗口
+    assert sorted(calls) == [1, 3, 5, 10, 20]
+    monkeypatch.undo()
+
+    assert result.values.shape == (len(grid), len(result.columns), length)
+    long = result.to_long()
+    assert long.index.names == ["param_id", "bar"]
+    for position in (0, 17, len(grid) - 1):
+        expected = compute_volume_features(df, grid[position])
+        pd.testing.assert_frame_equal(result.frame(position), expected)
+        pd.testing.assert_frame_equal(long.loc[position], expected)
@@ -0,0 +1,46 @@
+"""
+指标基准测试套件的一致性门禁。
+
+数学原理：
+1. 同一份确定性合成行情上，逐 bar 路径与预计算路径输出应一致。
+2. 基准报告每个用例、每种模式各一条记录，逐 bar 记录携带一致性结果。
+"""
+
+import json
+
+import pytest
+
+from tools import bench_indicators
+
+
+@pytest.mark.slow
+@pytest.mark.mock_only
+def test_benchmark_modes_agree():
+    results = bench_indicators.run_benchmarks(lengths=[320], widths=[2], per_bar_bars=15)
+    cases = {result.case for result in results}
+    assert set(bench_indicators.FUNCTION_CASES) <= cases
+    assert "indicator:RSRSIndicator" in cases
+    per_bar = [result for result in results if result.mode == "per_bar"]
+    assert per_bar and all(result.parity for result in per_bar), [r.case for r in per_bar if not r.parity]
+    # 速率按各模式实际评估的 bar 数计算：只评估采样尾段的用例两种模式计数相同
+    bars = {(result.case, result.mode): result.bars for result in results}
+    for case in ("vcp_features", "screener"):
+        assert bars[(case, "precomputed")] == bars[(case, "per_bar")] == 2 * 15
+    assert bars[("vcp_plus", "precomputed")] == 2 * 320
+
+
+@pytest.mark.mock_only
+def test_benchmark_report_is_json(tmp_path):
+    output = tmp_path / "bench.json"
+    code = bench_indicators.main(
+        ["--lengths", "300", "--cases", "volume_features", "rsrs", "--no-indicators", "--output", str(output)]
+    )
+    report = json.loads(output.read_text(encoding="utf-8"))
+    assert code == 0
+    assert {(row["case"], row["mode"]) for row in report} == {
+        ("volume_features", "per_bar"),
+        ("volume_features", "precomputed"),
+        ("rsrs", "per_bar"),
+        ("rsrs", "precomputed"),
+    }
+    assert all(row["length"] == 300 and row["width"] == 1 for row in report)
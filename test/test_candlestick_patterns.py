@@ -46,3 +46,63 @@ def test_detect_patterns_returns_expected_keys(monkeypatch, capsys):
     }
     for series in result.values():
         assert len(series) == len(df)
+
+
+def _fake_cdl_talib():
+    fake_talib = Mock()
+    fake_talib.get_function_groups.return_value = {"Pattern Recognition": ["CDLHAMMER", "CDLDOJI"]}
+    fake_talib.CDLDOJI.side_effect = lambda o, h, l, c: np.where(np.arange(len(c)) % 3 == 0, 100, 0)
+    fake_talib.CDLHAMMER.side_effect = lambda o, h, l, c: np.where(c > o, -100, 0)
+    return fake_talib
+
+
+def _ohlc(length):
+    index = pd.date_range("2024-01-01", periods=length, freq="D")
+    open_ = np.linspace(10, 20, length)
+    close = open_ + np.where(np.arange(length) % 2 == 0, 0.5, -0.5)
+    return pd.DataFrame(
+        {"open": open_, "high": open_ + 1, "low": open_ - 1, "close": close}, index=index
+    )
+
+
+def test_scan_patterns_sparse_table(monkeypatch):
+    monkeypatch.setattr(cp, "_require_talib", _fake_cdl_talib)
+    df = _ohlc(6)
+    result = cp.scan_patterns(df, symbol="AAA")
+    assert list(result.columns) == cp.SCAN_COLUMNS
+    assert set(result["pattern"]) == {"CDLDOJI", "CDLHAMMER"}
+    assert (result["strength"] != 0).all()
+    doji = result[result["pattern"] == "CDLDOJI"]
+    assert list(doji["date"]) == [df.index[0], df.index[3]]
+
+    tail = cp.scan_patterns(df, last_n=2, symbol="AAA")
+    assert tail["date"].min() >= df.index[-2]
+
+
+def test_scan_universe_folder(monkeypatch, tmp_path):
+    monkeypatch.setattr(cp, "_require_talib", _fake_cdl_talib)
+    for code in ("HK.00700", "US.AAPL"):
+        _ohlc(5).rename_axis("date").to_csv(tmp_path / f"{code}_name_20240101_20240105.csv")
+    result = cp.scan_universe(tmp_path, max_workers=1)
+    assert set(result["symbol"]) == {"HK.00700", "US.AAPL"}
+    assert result.equals(result.sort_values(["symbol", "date", "pattern"], ignore_index=True))
+    frames = {"X": _ohlc(5)}
+    pd.testing.assert_frame_equal(
+        cp.scan_universe(frames, max_workers=1),
+        cp.scan_patterns(frames["X"], symbol="X").sort_values(["symbol", "date", "pattern"], ignore_index=True),
+    )
+
+
+@pytest.mark.slow
+def test_scan_universe_skips_bad_file(monkeypatch, tmp_path):
+    monkeypatch.setattr(cp, "_require_talib", _fake_cdl_talib)
+    for code in ("HK.00700", "US.AAPL"):
+        _ohlc(5).rename_axis("date").to_csv(tmp_path / f"{code}_name_20240101_20240105.csv")
+    bad = tmp_path / "US.BAD_name_20240101_20240105.csv"
+    bad.write_text("open,close\n1,2\n")  # 缺少 date 列，读取失败
+
+    result = cp.scan_universe(tmp_path, max_workers=2)
+    assert set(result["symbol"]) == {"HK.00700", "US.AAPL"}
+    assert list(result.attrs["errors"]) == [str(bad)]
+    assert "date" in result.attrs["errors"][str(bad)]
+    assert cp.scan_universe(tmp_path, max_workers=1).attrs["errors"].keys() == {str(bad)}
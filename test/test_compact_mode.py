@@ -0,0 +1,81 @@
+"""
+紧凑内存模式测试。
+
+数学原理：
+1. float32 存储的相对误差不超过 2^-24，指标以 float64 计算后降精度，结果与默认模式在容差内一致。
+2. 分类编码与 int8 信号只改变存储类型，不改变取值。
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from common.util_compact import compact_frame
+from core.analysis.indicators.vcp_plus import VCPPlusParams, evaluate_vcp_plus_series
+from core.analysis.indicators.volume import compute_volume_features, compute_volume_signals
+from core.stock.manager_common import standardize_stock_data
+
+HK_IDENTITY = dict(stock_code="HK.00700", stock_name="腾讯控股", market="HK")
+
+
+@pytest.mark.mock_only
+def test_compact_frame_dtypes_and_memory(make_trending_df):
+    df = make_trending_df(400, noisy_open=True).assign(**HK_IDENTITY)
+    df["flag"] = df["close"] > df["open"]
+    compact = compact_frame(df)
+
+    for name in ("open", "high", "low", "close", "volume"):
+        assert compact[name].dtype == np.float32
+        np.testing.assert_allclose(compact[name], df[name], rtol=2**-24)
+    for name in ("stock_code", "stock_name", "market"):
+        assert isinstance(compact[name].dtype, pd.CategoricalDtype)
+        assert (compact[name].astype(str) == df[name]).all()
+    assert compact["flag"].dtype == np.int8
+    assert compact["date"].dtype == df["date"].dtype
+    assert compact.memory_usage(deep=True).sum() < df.memory_usage(deep=True).sum() / 3
+
+
+@pytest.mark.mock_only
+def test_standardize_and_loader_compact(tmp_path, make_trending_df):
+    raw = make_trending_df(60, noisy_open=True).assign(**HK_IDENTITY)
+    out = standardize_stock_data(raw, "HK.00700", "腾讯控股", "HK", compact=True)
+    expected = standardize_stock_data(raw, "HK.00700", "腾讯控股", "HK", compact=False)
+    assert out["close"].dtype == np.float32 and isinstance(out["market"].dtype, pd.CategoricalDtype)
+    np.testing.assert_allclose(out["close"], expected["close"], rtol=2**-24)
+    assert out["amount"].isna().all()
+
+    from core.quant.quant_manage import get_data_form_csv
+
+    csv_path = tmp_path / "compact.csv"
+    raw.to_csv(csv_path, index=False)
+    compact = get_data_form_csv(csv_path, compact=True).p.dataname
+    default = get_data_form_csv(csv_path, compact=False).p.dataname
+    assert compact["close"].dtype == np.float32 and compact["benchmark_close"].dtype == np.float32
+    assert isinstance(compact["market"].dtype, pd.CategoricalDtype)
+    np.testing.assert_allclose(compact["close"], default["close"], rtol=2**-24)
+    np.testing.assert_allclose(compact["benchmark_close"], default["benchmark_close"], rtol=2**-23)
+
+
+@pytest.mark.mock_only
+def test_indicator_features_compact_parity(make_trending_df):
+    reference = make_trending_df(400, noisy_open=True).assign(**HK_IDENTITY)
+    df = compact_frame(reference)
+
+    features = compute_volume_features(df, compact=True)
+    expected = compute_volume_features(reference)
+    assert set(features.dtypes) == {np.dtype(np.float32), np.dtype(np.int8)}
+    for name in expected.columns:
+        if expected[name].dtype == bool:
+            assert (features[name].astype(bool) == expected[name]).all(), name
+        else:
+            np.testing.assert_allclose(features[name], expected[name], rtol=1e-4, atol=1e-3, err_msg=name)
+
+    signals = compute_volume_signals(df, compact=True)
+    assert set(signals.dtypes) == {np.dtype(np.int8)}
+
+    params = VCPPlusParams(lookback_period=300, require_rs_rating=False, require_rs_slope=False)
+    series = evaluate_vcp_plus_series(df, params, compact=True)
+    expected = evaluate_vcp_plus_series(reference, params)
+    assert series["stage2_pass"].dtype == np.int8 and series["max_contraction"].dtype == np.float32
+    # 价格以 float32 存储后极少数临界比较可能翻转，按整体一致率检验
+    assert (series["stage2_pass"].astype(bool) == expected["stage2_pass"]).mean() > 0.99
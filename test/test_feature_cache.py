@@ -0,0 +1,120 @@
+"""
+指标特征磁盘缓存测试。
+
+数学原理：
+1. 同一（数据指纹, 指标类型, 参数, 代码版本）命中缓存，任一项变化即未命中。
+2. 总容量超过上限时按最近访问时间淘汰最旧条目。
+3. 命中缓存的 runonce 回测不再调用特征计算，输出与逐 bar 路径一致。
+"""
+
+import os
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.analysis.indicators.feature_cache import FeatureCache
+from core.strategy.indicator import common as indicator_common
+
+
+def _frame(length: int = 50, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "flag": rng.random(length) > 0.5,
+            "count": rng.integers(0, 5, length),
+            "value": rng.normal(0, 1, length),
+        }
+    )
+
+
+@pytest.mark.mock_only
+def test_feature_cache_roundtrip_and_stats(tmp_path):
+    cache = FeatureCache(tmp_path)
+    inputs = {"close": np.arange(10, dtype=float)}
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return _frame()
+
+    first = cache.get_or_compute("demo", {"window": 5}, inputs, compute, code_version="v1")
+    second = cache.get_or_compute("demo", {"window": 5}, inputs, compute, code_version="v1")
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+    assert list(second.dtypes) == [np.dtype(bool), np.dtype(np.int64), np.dtype(float)]
+    assert (cache.stats.hits, cache.stats.misses, cache.stats.writes) == (1, 1, 1)
+    assert cache.stats.hit_rate == 0.5
+
+    key = cache.make_key("demo", {"window": 5}, inputs, code_version="v1")
+    assert cache.make_key("demo", {"window": 6}, inputs, code_version="v1") != key
+    assert cache.make_key("demo", {"window": 5}, inputs, code_version="v2") != key
+    assert cache.make_key("other", {"window": 5}, inputs, code_version="v1") != key
+    changed = {"close": inputs["close"].copy()}
+    changed["close"][3] += 1e-9
+    assert cache.make_key("demo", {"window": 5}, changed, code_version="v1") != key
+
+
+@pytest.mark.mock_only
+def test_feature_cache_lru_eviction(tmp_path):
+    cache = FeatureCache(tmp_path)
+    for name in ("a", "b", "c"):
+        cache.put(name, _frame(2000))
+    entry_size = (tmp_path / "a.npz").stat().st_size
+    # 访问 a 使其成为最近使用，随后把上限压到两条，应淘汰 b
+    os.utime(tmp_path / "a.npz", ns=(0, 1))
+    os.utime(tmp_path / "b.npz", ns=(0, 2))
+    os.utime(tmp_path / "c.npz", ns=(0, 3))
+    assert cache.get("a") is not None
+
+    cache.max_bytes = entry_size * 2
+    cache.put("d", _frame(2000))
+    assert sorted(path.stem for path in tmp_path.glob("*.npz")) == ["a", "d"]
+    assert cache.stats.evictions == 2
+    assert cache.size_bytes() <= cache.max_bytes
+
+
+@pytest.mark.mock_only
+def test_vcp_indicator_reuses_cached_features(tmp_path, monkeypatch, make_trending_df):
+    from core.quant.quant_manage import get_data_form_csv
+    from core.strategy.indicator.pattern.vcp_indicator import VCPIndicator
+
+    csv_path = tmp_path / "vcp.csv"
+    make_trending_df(320, seed=4).to_csv(csv_path, index=False)
+
+    class _Holder(bt.Strategy):
+        def __init__(self):
+            self.indicator = VCPIndicator(progress_threshold=0.5)
+
+    def _run(runonce: bool):
+        cerebro = bt.Cerebro(stdstats=False)
+        cerebro.adddata(get_data_form_csv(csv_path))
+        cerebro.addstrategy(_Holder)
+        indicator = cerebro.run(runonce=runonce)[0].indicator
+        lines = {name: np.array(getattr(indicator.lines, name).array) for name in indicator.lines.getlinealiases()}
+        return indicator.signal_record_manager.transform_to_dataframe(), lines
+
+    cache = FeatureCache(tmp_path / "cache")
+    monkeypatch.setattr(indicator_common, "_feature_cache", cache)
+    monkeypatch.setattr(indicator_common, "_feature_cache_configured", True)
+
+    once_records, once_lines = _run(True)
+    assert (cache.stats.hits, cache.stats.misses) == (0, 1)
+
+    # 第二次回测命中缓存，特征计算不应再被调用
+    def _fail(*args, **kwargs):
+        raise AssertionError("命中缓存时不应重新计算特征")
+
+    monkeypatch.setattr(VCPIndicator, "_evaluate_series", _fail)
+    cached_records, cached_lines = _run(True)
+    assert cache.stats.hits == 1
+    monkeypatch.undo()
+
+    next_records, next_lines = _run(False)
+    assert not once_records.empty
+    pd.testing.assert_frame_equal(once_records, next_records)
+    pd.testing.assert_frame_equal(cached_records, next_records)
+    for name, values in once_lines.items():
+        np.testing.assert_array_equal(values, next_lines[name])
+        np.testing.assert_array_equal(cached_lines[name], next_lines[name])
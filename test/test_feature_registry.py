@@ -0,0 +1,177 @@
+"""
+单标的特征注册表测试。
+
+数学原理：
+1. 回溯窗口视图（全历史节点截取末尾 lookback 项、前 warmup 项置 NaN）等于对 df.tail(lookback) 重新计算。
+2. 各指标传入注册表与不传注册表的输出一致。
+3. 同一标的上运行多个指标时，共享节点（如 sma(close,200)）只计算一次并计入复用统计。
+4. 进程级共享注册表按标的与输入列指纹复用，数据变化时重建。
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.analysis.indicators.registry import FeatureRegistry, get_registry
+from core.analysis.indicators.rolling import rolling_max, rolling_mean, rolling_slope
+from core.analysis.indicators.vcp import VCPParams, compute_vcp_feature_series, compute_vcp_features
+from core.analysis.indicators.vcp_plus import VCPPlusParams, evaluate_vcp_plus, evaluate_vcp_plus_series
+from core.analysis.migrations.vcp_from_youtuber.minervini_filters import minervini_trend_template
+from core.analysis.migrations.vcp_screener import trend_template, vcp
+
+
+def _with_spx(df: pd.DataFrame, seed: int = 0) -> pd.DataFrame:
+    """追加基准指数收盘价列。"""
+    rng = np.random.default_rng(seed + 1)
+    return df.assign(spx_close=4000 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, len(df)))))
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize("lookback", [300, 252, 30])
+def test_tail_view_matches_tail_recompute(lookback, make_trending_df):
+    df = _with_spx(make_trending_df(420))
+    registry = FeatureRegistry(df)
+    close_tail = df["close"].tail(lookback).to_numpy()
+    high_tail = df["high"].tail(lookback).to_numpy()
+
+    sma_20 = registry.sma("close", 20)
+    assert np.allclose(registry.values(sma_20, lookback), rolling_mean(close_tail, 20), rtol=1e-12, equal_nan=True)
+    high_node = registry.rolling_max("high", 50)
+    assert np.array_equal(registry.values(high_node, lookback), rolling_max(high_tail, 50), equal_nan=True)
+    slope_node = registry.slope(sma_20, 10)
+    expected = rolling_slope(rolling_mean(close_tail, 20), 10)
+    assert np.allclose(registry.values(slope_node, lookback), expected, rtol=1e-9, atol=1e-12, equal_nan=True)
+
+    with pytest.raises(ValueError):
+        registry.values(sma_20).__setitem__(0, 1.0)
+
+
+@pytest.mark.mock_only
+def test_indicators_match_with_and_without_registry(make_trending_df):
+    df = _with_spx(make_trending_df(420))
+    registry = FeatureRegistry(df, symbol="DEMO")
+
+    direct = compute_vcp_features(df, VCPParams())
+    shared = compute_vcp_features(df, VCPParams(), registry=registry)
+    for key, value in direct.items():
+        if isinstance(value, float):
+            assert shared[key] == pytest.approx(value, rel=1e-10, nan_ok=True), key
+
+    assert evaluate_vcp_plus(df, VCPPlusParams(), registry=registry) == evaluate_vcp_plus(df, VCPPlusParams())
+
+    expected = minervini_trend_template(df)
+    actual = minervini_trend_template(df, registry=registry)
+    pd.testing.assert_series_equal(actual["pass"], expected["pass"])
+    pd.testing.assert_series_equal(actual["ma_200"], expected["ma_200"], rtol=1e-10)
+
+    expected = trend_template(df)
+    actual = trend_template(df, registry=registry)
+    pd.testing.assert_series_equal(actual["Pass"], expected["Pass"])
+    pd.testing.assert_series_equal(actual["52_week_low"], expected["52_week_low"])
+    assert vcp(df, registry=registry) == vcp(df)
+
+    reused = registry.reused()
+    # sma(close,200) 被四个指标请求，只计算一次
+    assert reused["sma(close,200)"] >= 3
+    assert "slope(sma(close,200),20)" in reused
+    assert "sma(volume,30)" in reused
+    assert registry.nodes().count("sma(close,200)") == 1
+
+    with pytest.raises(ValueError):
+        minervini_trend_template(df.tail(300), registry=registry)
+
+
+@pytest.mark.mock_only
+def test_check_compares_input_fingerprint(make_trending_df):
+    df = _with_spx(make_trending_df(300))
+    registry = FeatureRegistry(df, symbol="DEMO")
+    registry.check(df.copy())
+    # 派生列与列名大小写不影响判定
+    registry.check(df.rename(columns=str.upper).assign(ma_50=0.0))
+
+    changed = df.copy()
+    changed.loc[150, "close"] *= 1.01
+    with pytest.raises(ValueError):
+        registry.check(changed)
+    with pytest.raises(ValueError):
+        registry.check(df.drop(columns="volume"))
+
+
+@pytest.mark.mock_only
+def test_vcp_feature_series_shares_registry_nodes(make_trending_df):
+    df = _with_spx(make_trending_df(420))
+    registry = FeatureRegistry(df, symbol="DEMO")
+    series = compute_vcp_feature_series(df, VCPParams(), registry=registry)
+    pd.testing.assert_frame_equal(series, compute_vcp_feature_series(df, VCPParams()))
+
+    direct = compute_vcp_features(df, VCPParams(), registry=registry)
+    for key in ("ma_50", "ma_200", "ma_200_slope", "week_52_low", "vol_ma_long"):
+        assert series[key].iloc[-1] == pytest.approx(direct[key], rel=1e-10), key
+    assert registry.reused()["sma(close,200)"] >= 1
+
+
+@pytest.mark.mock_only
+def test_shared_registry_keyed_by_symbol_and_fingerprint(make_trending_df):
+    df = make_trending_df(300)
+    registry = get_registry("DEMO", df)
+    # 列名大小写、派生列与附加列不影响复用；附加列并入后供节点读取
+    assert get_registry("DEMO", df.rename(columns=str.upper).assign(ma_50=0.0)) is registry
+    assert get_registry("DEMO", _with_spx(df)) is registry
+    assert registry.values(registry.ratio("close", "spx_close")).shape == (300,)
+    assert get_registry("OTHER", df) is not registry
+    assert get_registry("", df) is not get_registry("", df)
+
+    changed = df.copy()
+    changed.loc[150, "close"] *= 1.01
+    rebuilt = get_registry("DEMO", changed)
+    assert rebuilt is not registry and rebuilt.matches(changed)
+    assert get_registry("DEMO", _with_spx(changed, seed=5)) is rebuilt
+    # 附加列取值与已并入的不一致时重建
+    assert get_registry("DEMO", _with_spx(changed, seed=6)) is not rebuilt
+
+
+@pytest.mark.mock_only
+def test_second_consumer_reuses_shared_registry(make_trending_df):
+    df = _with_spx(make_trending_df(420))
+    params = VCPPlusParams(benchmark_close_column="spx_close")
+    trend = minervini_trend_template(df, symbol="DEMO")
+    pd.testing.assert_frame_equal(trend, minervini_trend_template(df))
+    registry = get_registry("DEMO", df)
+    assert "slope(sma(close,200),20)" not in registry.reused()
+
+    series = evaluate_vcp_plus_series(df, params, registry=get_registry("DEMO", df))
+    pd.testing.assert_frame_equal(series, evaluate_vcp_plus_series(df, params))
+    # 第二个使用方直接命中第一个使用方计算的均线与斜率节点
+    reused = registry.reused()
+    assert reused["sma(close,50)"] >= 1 and reused["slope(sma(close,200),20)"] >= 1
+
+
+@pytest.mark.mock_only
+def test_bt_indicators_share_registry_with_screener(tmp_path, make_trending_df):
+    import backtrader as bt
+
+    from core.quant.quant_manage import get_data_form_csv
+    from core.strategy.indicator.pattern.vcp_indicator import VCPIndicator
+    from core.strategy.indicator.pattern.vcp_plus_indicator import VCPPlusIndicator
+
+    df = make_trending_df(420)
+    csv_path = tmp_path / "US.DEMO_DEMO.csv"
+    df.to_csv(csv_path, index=False)
+
+    class _Holder(bt.Strategy):
+        def __init__(self):
+            self.vcp = VCPIndicator()
+            self.vcp_plus = VCPPlusIndicator(require_rs_rating=False, require_rs_slope=False)
+
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(get_data_form_csv(csv_path), name="US.DEMO")
+    cerebro.addstrategy(_Holder)
+    cerebro.run()
+
+    frame = pd.read_csv(csv_path)[["high", "low", "close", "volume"]]
+    registry = get_registry("US.DEMO", frame)
+    # VCPPlusIndicator 复用 VCPIndicator 已计算的均线节点
+    assert registry.reused()["sma(close,200)"] >= 1
+    before = registry.usage["sma(close,50)"]
+    minervini_trend_template(frame, symbol="US.DEMO")
+    assert registry.usage["sma(close,50)"] == before + 1
@@ -0,0 +1,87 @@
+"""
+K 线解析缓存测试。
+验证二进制缓存的列类型还原、按 CSV 修改时间/大小失效，以及 get_data_form_csv 命中缓存后结果不变。
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.quant import feed_cache, quant_manage
+
+
+def _write_kline(path, periods=60, base=100.0):
+    close = [base + i * 0.5 for i in range(periods)]
+    pd.DataFrame(
+        {
+            "date": pd.date_range("2024-01-01", periods=periods, freq="D").strftime("%Y-%m-%d"),
+            "open": close,
+            "high": [value + 1 for value in close],
+            "low": [value - 1 for value in close],
+            "close": close,
+            "volume": [1000000 + i for i in range(periods)],
+            "amount": 0,
+            "stock_code": "US.TEST",
+            "stock_name": "TEST",
+            "market": "US",
+        }
+    ).to_csv(path, index=False)
+
+
+@pytest.mark.mock_only
+def test_store_and_load_round_trip(tmp_path):
+    csv_path = tmp_path / "US.TEST_TEST.csv"
+    _write_kline(csv_path)
+    # 解析得到的日期索引不带 freq，缓存也不保存 freq
+    index = pd.DatetimeIndex(["2024-01-01", "2024-01-02", "2024-01-03"], name="date")
+    frame = pd.DataFrame(
+        {
+            "close": np.array([1.5, np.nan, 2.5], dtype=np.float32),
+            "volume": np.array([1, 2, 3], dtype=np.int64),
+            "flag": [True, False, True],
+            "stock_name": ["腾讯控股", np.nan, "TEST"],
+            "market": pd.Categorical(["HK", "US", "HK"]),
+        },
+        index=index,
+    )
+    key = feed_cache.cache_key(csv_path, ("token",))
+    assert feed_cache.store_frame(csv_path, key, frame)
+    # 缓存写入统一的缓存根目录，不在 CSV 旁生成文件
+    assert feed_cache.cache_path(csv_path).parent == quant_manage.settings.FEED_CACHE_ROOT
+    assert not (tmp_path / ".feed_cache").exists()
+
+    loaded = feed_cache.load_frame(csv_path, key)
+    pd.testing.assert_frame_equal(loaded, frame)
+    assert feed_cache.load_frame(csv_path, feed_cache.cache_key(csv_path, ("other",))) is None
+
+
+@pytest.mark.mock_only
+def test_cache_invalidated_when_csv_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(quant_manage.settings, "FEED_CACHE_ENABLED", True)
+    csv_path = tmp_path / "US.TEST_TEST.csv"
+    _write_kline(csv_path)
+    first = quant_manage.load_kline_frame(csv_path, compact=False)
+    assert feed_cache.cache_path(csv_path).exists()
+
+    _write_kline(csv_path, periods=80, base=50.0)
+    stat = csv_path.stat()
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = quant_manage.load_kline_frame(csv_path, compact=False)
+    assert len(first) == 60 and len(second) == 80
+    assert second["close"].iloc[0] == 50.0
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize("compact", [False, True])
+def test_cached_feed_matches_fresh_parse(tmp_path, compact):
+    csv_path = tmp_path / "US.TEST_TEST.csv"
+    _write_kline(csv_path)
+    fresh = quant_manage.get_data_form_csv(csv_path, compact=compact, use_cache=False)
+    assert not feed_cache.cache_path(csv_path).exists()
+
+    quant_manage.get_data_form_csv(csv_path, compact=compact, use_cache=True)
+    cached = quant_manage.get_data_form_csv(csv_path, compact=compact, use_cache=True)
+    pd.testing.assert_frame_equal(cached.p.dataname, fresh.p.dataname)
+    assert type(cached) is type(fresh) is quant_manage.CustomPandasData
@@ -17,3 +17,4 @@ def test_indicator_manager_discovers_volume_and_pattern_indicators():
     assert "EnhancedVolumeIndicator" in names
     assert "SingleVolumeIndicator" in names
     assert "VCPIndicator" in names
+    assert "RSRSIndicator" in names
@@ -0,0 +1,143 @@
+"""
+指标状态快照与增量续算测试。
+
+数学原理：
+1. 历史未修订时，从快照续算追加 bar 的结果与全量重放完全一致，且只计算追加的 bar。
+2. 任一历史 bar 被修订（行指纹变化）时回退为全量重放。
+3. 取数窗口起点前移时快照不再是新数据的精确前缀，按当前数据全量重放，结果与冷启动一致。
+"""
+
+import os
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.quant.quant_manage import get_data_form_csv, snapshot_data_name
+from core.strategy.indicator import common as indicator_common
+from core.strategy.indicator import snapshot as indicator_snapshot
+from core.strategy.indicator.pattern.vcp_indicator import VCPIndicator
+from core.strategy.indicator.snapshot import IndicatorSnapshot, SnapshotStore
+from core.strategy.indicator.volume.enhanced_volume import EnhancedVolumeIndicator
+
+
+def _run(tmp_path, df: pd.DataFrame, indicator_class, name: str = "demo", **kwargs):
+    csv_path = tmp_path / f"{name or 'unnamed'}_{len(df)}.csv"
+    df.to_csv(csv_path, index=False)
+
+    class _Holder(bt.Strategy):
+        def __init__(self):
+            self.indicator = indicator_class(**kwargs)
+
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(get_data_form_csv(csv_path), name=name)
+    cerebro.addstrategy(_Holder)
+    indicator = cerebro.run()[0].indicator
+    lines = {alias: np.array(getattr(indicator.lines, alias).array) for alias in indicator.lines.getlinealiases()}
+    return indicator, indicator.signal_record_manager.transform_to_dataframe(), lines
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = SnapshotStore(tmp_path / "snapshots")
+    monkeypatch.setattr(indicator_snapshot, "_snapshot_store", store)
+    monkeypatch.setattr(indicator_snapshot, "_snapshot_store_configured", True)
+    monkeypatch.setattr(indicator_common, "_feature_cache", None)
+    monkeypatch.setattr(indicator_common, "_feature_cache_configured", True)
+    return store
+
+
+def _assert_same(actual, expected, rows=slice(None)):
+    _, actual_records, actual_lines = actual
+    _, expected_records, expected_lines = expected
+    pd.testing.assert_frame_equal(actual_records, expected_records)
+    for alias, values in expected_lines.items():
+        np.testing.assert_array_equal(actual_lines[alias][rows], values[rows], err_msg=alias)
+
+
+@pytest.mark.mock_only
+def test_vcp_snapshot_resumes_appended_bars(tmp_path, store, make_trending_df, monkeypatch):
+    full = make_trending_df(330, seed=4, noisy_open=True)
+    _run(tmp_path, full.iloc[:320], VCPIndicator, progress_threshold=0.5)
+    assert (store.stats.replayed, store.stats.resumed) == (1, 0)
+
+    starts = []
+    original = VCPIndicator._evaluate_series
+
+    def _record(self, df, params, start=0, swing=None):
+        starts.append(start)
+        return original(self, df, params, start, swing)
+
+    monkeypatch.setattr(VCPIndicator, "_evaluate_series", _record)
+    resumed = _run(tmp_path, full, VCPIndicator, progress_threshold=0.5)
+    assert resumed[0]._snapshot_resumed and starts == [320]
+    assert (store.stats.resumed, store.stats.appended_bars) == (1, 10)
+
+    expected = _run(tmp_path, full, VCPIndicator, name="", progress_threshold=0.5)
+    assert not expected[1].empty
+    _assert_same(resumed, expected)
+
+
+@pytest.mark.mock_only
+def test_snapshot_detects_revised_history(tmp_path, store, make_trending_df):
+    full = make_trending_df(330, seed=4, noisy_open=True)
+    _run(tmp_path, full.iloc[:320], VCPIndicator, progress_threshold=0.5)
+
+    revised = full.copy()
+    revised.loc[100, "close"] *= 1.01  # 历史价格被修订（如复权因子变化）
+    replayed = _run(tmp_path, revised, VCPIndicator, progress_threshold=0.5)
+    assert not replayed[0]._snapshot_resumed
+    assert (store.stats.revisions, store.stats.replayed) == (1, 2)
+    _assert_same(replayed, _run(tmp_path, revised, VCPIndicator, name="", progress_threshold=0.5))
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize(
+    "indicator_class, kwargs",
+    [(EnhancedVolumeIndicator, {}), (VCPIndicator, dict(progress_threshold=0.5))],
+)
+def test_snapshot_replays_when_window_shifts(tmp_path, store, make_trending_df, indicator_class, kwargs):
+    full = make_trending_df(420, seed=4, noisy_open=True)
+    _run(tmp_path, full.iloc[:380], indicator_class, **kwargs)
+
+    # 第二天的取数窗口起点前移 30 根、末尾追加 20 根：快照作废，按当前数据全量重放
+    shifted = full.iloc[30:400].reset_index(drop=True)
+    replayed = _run(tmp_path, shifted, indicator_class, **kwargs)
+    assert not replayed[0]._snapshot_resumed
+    assert (store.stats.revisions, store.stats.replayed) == (1, 2)
+    _assert_same(replayed, _run(tmp_path, shifted, indicator_class, name="", **kwargs))
+
+    # 之后同一窗口起点只追加 bar 时从重放后的快照续算，结果仍与冷启动一致
+    appended = full.iloc[30:].reset_index(drop=True)
+    resumed = _run(tmp_path, appended, indicator_class, **kwargs)
+    assert resumed[0]._snapshot_resumed and store.stats.appended_bars == 20
+    cold = _run(tmp_path, appended, indicator_class, name="", **kwargs)
+    assert not cold[1].empty
+    _assert_same(resumed, cold)
+
+
+@pytest.mark.mock_only
+def test_snapshot_store_lru_eviction(tmp_path):
+    store = SnapshotStore(tmp_path)
+    rows = np.arange(2000)
+    snapshot = IndicatorSnapshot("v", 0, rows.astype(float), rows.astype(np.uint64), pd.DataFrame({"x": np.ones(2000)}))
+    for key in ("a", "b", "c"):
+        store.save(key, snapshot)
+    entry_size = (tmp_path / "a.snapshot").stat().st_size
+    for stamp, key in enumerate(("a", "b", "c"), start=1):
+        os.utime(tmp_path / f"{key}.snapshot", ns=(0, stamp))
+    # 读取 a 使其成为最近使用，随后把上限压到两条，应淘汰 b、c
+    assert store.load("a") is not None
+
+    store.max_bytes = entry_size * 2
+    store.save("d", snapshot)
+    assert sorted(path.stem for path in tmp_path.glob("*.snapshot")) == ["a", "d"]
+    assert store.stats.evictions == 2
+    assert store.size_bytes() <= store.max_bytes
+
+
+@pytest.mark.mock_only
+def test_snapshot_data_name_strips_date_range():
+    assert snapshot_data_name("akshare/HK.00700_腾讯控股_20210104_20250127.csv") == "akshare/HK.00700_腾讯控股"
+    assert snapshot_data_name("futu/demo.csv") == "futu/demo"
@@ -0,0 +1,214 @@
+"""
+热点循环内核测试（numpy / numba 两套后端矩阵）。
+
+数学原理：
+1. 每个内核都以原始的逐元素 Python 循环为黄金输出，两套后端必须逐位一致。
+2. 滞回状态机对缺失值保持前一状态，首个触发点之前为 0。
+3. 未安装 numba 时 numba 后端的用例跳过，强制切换到 numba 抛 ImportError。
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.analysis import kernels
+from core.analysis.kernels import (
+    KERNEL_BACKENDS,
+    adjust_local_high_low,
+    available_kernel_backends,
+    contraction_depths,
+    gbm_final_prices,
+    get_kernel_backend,
+    hysteresis_position,
+    set_kernel_backend,
+    trade_walk,
+)
+
+
+@pytest.fixture(params=KERNEL_BACKENDS)
+def backend(request):
+    if request.param not in available_kernel_backends():
+        pytest.skip(f"{request.param} 后端不可用")
+    previous = set_kernel_backend(request.param)
+    yield request.param
+    set_kernel_backend(previous)
+
+
+def _reference_adjust(local_high, local_low):
+    i = 0
+    j = 0
+    adjusted_high = []
+    adjusted_low = []
+    while i < len(local_high) and j < len(local_low):
+        if local_high[i] < local_low[j]:
+            while i < len(local_high) and local_high[i] < local_low[j]:
+                i += 1
+            if i > 0:
+                adjusted_high.append(local_high[i - 1])
+        elif local_high[i] > local_low[j]:
+            while j < len(local_low) and local_high[i] > local_low[j]:
+                j += 1
+            if j > 0:
+                adjusted_low.append(local_low[j - 1])
+        else:
+            i += 1
+            j += 1
+    if i < len(local_high) and adjusted_high and j > 0:
+        adjusted_high.pop(-1)
+        while i < len(local_high) and local_high[i] > local_low[j - 1]:
+            i += 1
+        if i > 0:
+            adjusted_high.append(local_high[i - 1])
+        adjusted_high.append(local_high[-1])
+        adjusted_low.append(local_low[j - 1])
+    if j < len(local_low) and adjusted_low and i > 0:
+        adjusted_low.pop(-1)
+        while j < len(local_low) and local_high[i - 1] > local_low[j]:
+            j += 1
+        if j > 0:
+            adjusted_low.append(local_low[j - 1])
+        adjusted_low.append(local_low[-1])
+        adjusted_high.append(local_high[i - 1])
+    return adjusted_high, adjusted_low
+
+
+def _reference_contractions(highs, lows, local_high, local_low):
+    contraction = []
+    high_idx = local_high[::-1]
+    low_idx = local_low[::-1]
+    i = 0
+    j = 0
+    while i < len(low_idx) and j < len(high_idx):
+        if low_idx[i] > high_idx[j]:
+            high_val = highs[high_idx[j]]
+            low_val = lows[low_idx[i]]
+            contraction.append(round((high_val - low_val) / high_val * 100, 2))
+            i += 1
+            j += 1
+        else:
+            j += 1
+    return contraction
+
+
+def _random_extrema(rng, size):
+    points = np.sort(rng.choice(500, size=size, replace=False))
+    is_high = rng.random(size) < 0.5
+    return points[is_high], points[~is_high]
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize("seed", range(5))
+def test_adjust_local_high_low_matches_reference(backend, seed):
+    rng = np.random.default_rng(seed)
+    local_high, local_low = _random_extrema(rng, 40)
+    expected_high, expected_low = _reference_adjust(local_high, local_low)
+    actual_high, actual_low = adjust_local_high_low(local_high, local_low)
+    assert actual_high.tolist() == [int(v) for v in expected_high]
+    assert actual_low.tolist() == [int(v) for v in expected_low]
+
+
+@pytest.mark.mock_only
+def test_adjust_local_high_low_empty(backend):
+    high, low = adjust_local_high_low(np.array([], dtype=int), np.array([3, 5]))
+    assert high.size == 0 and low.size == 0
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize("seed", range(5))
+def test_contraction_depths_matches_reference(backend, seed):
+    rng = np.random.default_rng(seed)
+    highs = 100 + rng.normal(0, 5, 500).cumsum()
+    lows = highs - rng.uniform(0.5, 3.0, 500)
+    local_high, local_low = _random_extrema(rng, 30)
+    expected = _reference_contractions(highs, lows, local_high, local_low)
+    assert contraction_depths(highs, lows, local_high, local_low) == expected
+
+
+@pytest.mark.mock_only
+def test_contraction_depths_skip_zero_high(backend):
+    highs = np.array([0.0, 1.0, 10.0, 1.0])
+    lows = np.array([0.0, 0.5, 5.0, 0.5])
+    depths = contraction_depths(highs, lows, np.array([0, 2]), np.array([1, 3]), skip_zero_high=True)
+    assert depths == [95.0]
+
+
+@pytest.mark.mock_only
+def test_hysteresis_position_matches_loop(backend):
+    rng = np.random.default_rng(2)
+    values = rng.normal(0, 1, 2000)
+    values[rng.random(values.size) < 0.1] = np.nan
+    expected = np.zeros(values.size)
+    current = 0
+    for i, z in enumerate(values):
+        if not np.isnan(z):
+            if z > 0.7:
+                current = 1
+            elif z < -0.7:
+                current = 0
+        expected[i] = current
+    np.testing.assert_array_equal(hysteresis_position(values, 0.7, -0.7), expected)
+
+
+@pytest.mark.mock_only
+def test_trade_walk_resets_after_full_exit(backend):
+    holdings, adjusted, capital = trade_walk(
+        np.array([True, True, False, False]),
+        np.array([10.0, 12.0, 13.0, 9.0]),
+        np.array([100.0, 100.0, 100.0, 100.0]),
+        np.array([1.0, 1.0, 1.0, 1.0]),
+        10000.0,
+    )
+    np.testing.assert_array_equal(holdings, [100.0, 200.0, 100.0, 0.0])
+    assert adjusted[1] == pytest.approx((1001.0 + 1201.0) / 200)
+    assert adjusted[-1] == 0.0
+    assert capital[-1] == pytest.approx(10000.0 - 1001.0 - 1201.0 + 1299.0 + 899.0)
+
+
+@pytest.mark.mock_only
+def test_gbm_final_prices_matches_path_loop(backend):
+    rng = np.random.default_rng(4)
+    shocks = rng.normal(0.0, 0.5, size=(200, 60))
+    prices = np.zeros((200, 60))
+    prices[:, 0] = 50.0
+    for i in range(1, 60):
+        prices[:, i] = np.maximum(0, prices[:, i - 1] + shocks[:, i] * prices[:, i - 1])
+    np.testing.assert_array_equal(gbm_final_prices(50.0, shocks), prices[:, -1])
+
+
+@pytest.mark.mock_only
+def test_calculate_holdings_matches_daily_loop(backend):
+    from core.visualization.visual_tools_plotly import calculate_holdings
+
+    dates = pd.date_range("2024-01-01", periods=6, freq="D")
+    df = pd.DataFrame({"close": [10.0, 11.0, 12.0, 11.5, 13.0, 12.0]}, index=dates)
+    trades = pd.DataFrame(
+        {
+            "date": [dates[1], dates[1], dates[3], dates[4]],
+            "action": ["B", "B", "S", "S"],
+            "price": [11.0, 11.0, 11.5, 13.0],
+            "size": [100, 50, 50, 100],
+            "commission": [1.0, 1.0, 1.0, 1.0],
+        }
+    )
+    result = calculate_holdings(df, trades, 10000.0)
+    assert result["holdings"].tolist() == [0, 150, 150, 100, 0, 0]
+    cash_after_buys = 10000.0 - 1101.0 - 551.0
+    assert result["total_assets"].iloc[0] == 10000.0
+    assert result["total_assets"].iloc[2] == pytest.approx(cash_after_buys + 150 * 12.0)
+    assert result["total_assets"].iloc[-1] == pytest.approx(cash_after_buys + 574.0 + 1299.0)
+    assert result["adjusted_cost"].iloc[-1] == 0.0
+
+
+@pytest.mark.mock_only
+def test_forcing_missing_backend_raises():
+    if kernels.NUMBA_AVAILABLE:
+        pytest.skip("numba 已安装")
+    with pytest.raises(ImportError):
+        set_kernel_backend("numba")
+    assert get_kernel_backend() == "numpy"
+
+
+@pytest.mark.mock_only
+def test_unknown_backend_rejected():
+    with pytest.raises(ValueError):
+        set_kernel_backend("cuda")
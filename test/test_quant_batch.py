@@ -0,0 +1,92 @@
+"""
+批量回测测试。
+验证失败收集、进度回调与多进程结果一致性。
+"""
+
+import pandas as pd
+import pytest
+
+from core.quant import quant_manage
+from core.quant.quant_manage import BacktestResult, run_backtest_enhanced_volume_strategy_multi
+
+
+def _write_kline(path, periods=120, drift=0.1):
+    dates = pd.date_range("2023-01-01", periods=periods, freq="D")
+    close = [100 + i * drift + (i % 7) for i in range(periods)]
+    pd.DataFrame(
+        {
+            "date": dates.strftime("%Y-%m-%d"),
+            "open": close,
+            "high": [value + 1 for value in close],
+            "low": [value - 1 for value in close],
+            "close": close,
+            "volume": [1000000 + (i % 5) * 300000 for i in range(periods)],
+            "amount": 0,
+            "stock_code": "US.TEST",
+            "stock_name": "TEST",
+            "market": "US",
+        }
+    ).to_csv(path, index=False)
+
+
+class _DummyStrategy:
+    pass
+
+
+@pytest.mark.mock_only
+def test_multi_collects_failures_without_aborting(tmp_path, monkeypatch):
+    for name in ("b.csv", "a.csv", "c.csv"):
+        (tmp_path / name).write_text("date\n")
+
+    def fake_run(csv_path, trading_strategy, init_cash, output_mode=None, use_cache=None):
+        # 批量任务在工作进程内一律无界面运行，默认使用 K 线解析缓存
+        assert output_mode == "headless"
+        assert use_cache is True
+        if csv_path.endswith("b.csv"):
+            raise RuntimeError("boom")
+        return BacktestResult(csv_path, trading_strategy.__name__, metrics={"total_return": 1.0})
+
+    monkeypatch.setattr(quant_manage, "run_backtest_enhanced_volume_strategy", fake_run)
+    seen = []
+    results = run_backtest_enhanced_volume_strategy_multi(
+        tmp_path,
+        _DummyStrategy,
+        max_workers=1,
+        progress=lambda done, total, result: seen.append((done, total)),
+        output_mode="headless",
+    )
+    assert [result.csv_path.rsplit("/", 1)[-1] for result in results] == ["a.csv", "b.csv", "c.csv"]
+    assert [result.ok for result in results] == [True, False, True]
+    assert "RuntimeError: boom" in results[1].error
+    assert seen == [(1, 3), (2, 3), (3, 3)]
+
+
+@pytest.mark.mock_only
+@pytest.mark.slow
+def test_multi_process_pool_matches_sequential(tmp_path, monkeypatch):
+    from core.strategy.trading.volume.enhanced_volume import EnhancedVolumeStrategy
+
+    def _no_plot(*args, **kwargs):
+        raise AssertionError("工作进程不应绘图")
+
+    rendered = []
+    monkeypatch.setattr(quant_manage, "plotly_draw", _no_plot)
+    monkeypatch.setattr(quant_manage, "render_backtest_bundle", lambda bundle_dir: rendered.append(bundle_dir) or "report.html")
+    monkeypatch.setattr(quant_manage.settings, "signals_root", tmp_path / "signals")
+    monkeypatch.setattr(quant_manage.settings, "html_root", tmp_path / "html")
+    data_dir = tmp_path / "kline"
+    data_dir.mkdir()
+    for i in range(3):
+        _write_kline(data_dir / f"US.T{i}_T{i}.csv", drift=0.05 * (i + 1))
+
+    sequential = run_backtest_enhanced_volume_strategy_multi(
+        data_dir, EnhancedVolumeStrategy, max_workers=1, output_mode="headless"
+    )
+    parallel = run_backtest_enhanced_volume_strategy_multi(data_dir, EnhancedVolumeStrategy, max_workers=2, output_mode="html")
+    assert all(result.ok for result in parallel)
+    # 报告只在主进程按请求渲染
+    assert rendered == [result.results_dir for result in parallel]
+    assert all(result.html_path == "report.html" for result in parallel)
+    assert [result.metrics for result in parallel] == [result.metrics for result in sequential]
+    for left, right in zip(parallel, sequential):
+        pd.testing.assert_frame_equal(left.trades, right.trades)
@@ -0,0 +1,86 @@
+"""
+无界面回测输出测试。
+验证结构化结果落盘、不渲染报告，以及首次查看时的延迟渲染。
+"""
+
+import json
+
+import pandas as pd
+import pytest
+
+from core.quant import quant_manage
+from core.quant.quant_manage import render_backtest_bundle, resolve_output_mode, run_backtest_enhanced_volume_strategy
+
+
+def _write_kline(path, periods=150):
+    dates = pd.date_range("2023-01-01", periods=periods, freq="D")
+    close = [100 + i * 0.1 + (i % 9) for i in range(periods)]
+    pd.DataFrame(
+        {
+            "date": dates.strftime("%Y-%m-%d"),
+            "open": close,
+            "high": [value + 1 for value in close],
+            "low": [value - 1 for value in close],
+            "close": close,
+            "volume": [1000000 + (i % 4) * 400000 for i in range(periods)],
+            "amount": 0,
+            "stock_code": "US.TEST",
+            "stock_name": "TEST",
+            "market": "US",
+        }
+    ).to_csv(path, index=False)
+
+
+@pytest.mark.mock_only
+def test_resolve_output_mode(monkeypatch):
+    monkeypatch.setattr(quant_manage.settings, "BACKTEST_OUTPUT_MODE", "headless")
+    assert resolve_output_mode(None) == "headless"
+    assert resolve_output_mode("html") == "html"
+    with pytest.raises(ValueError):
+        resolve_output_mode("pdf")
+
+
+@pytest.mark.mock_only
+@pytest.mark.slow
+def test_headless_backtest_persists_results_and_renders_lazily(tmp_path, monkeypatch):
+    from core.strategy.trading.volume.enhanced_volume import EnhancedVolumeStrategy
+
+    data_root = tmp_path / "stock"
+    (data_root / "akshare").mkdir(parents=True)
+    csv_path = data_root / "akshare" / "US.TEST_TEST.csv"
+    _write_kline(csv_path)
+    monkeypatch.setattr(quant_manage.settings, "stock_data_root", data_root)
+    monkeypatch.setattr(quant_manage.settings, "html_root", tmp_path / "html")
+    monkeypatch.setattr(quant_manage.settings, "signals_root", tmp_path / "signals")
+
+    def fail_draw(*args, **kwargs):
+        raise AssertionError("headless mode must not render the report")
+
+    monkeypatch.setattr(quant_manage, "plotly_draw", fail_draw)
+    result = run_backtest_enhanced_volume_strategy(csv_path, EnhancedVolumeStrategy, output_mode="headless")
+    assert result.ok
+
+    bundle = tmp_path / "html" / "akshare" / "US.TEST_TEST" / "EnhancedVolumeStrategy" / result.html_path.rsplit("/", 1)[-1][:-5]
+    assert str(bundle) == result.results_dir
+    assert {path.name for path in bundle.iterdir()} == {"meta.json", "trades.csv", "signals.csv", "equity.csv"}
+    meta = json.loads((bundle / "meta.json").read_text(encoding="utf-8"))
+    assert meta["strategy"] == "EnhancedVolumeStrategy"
+    assert meta["metrics"]["final_value"] == pytest.approx(result.metrics["final_value"])
+    equity = pd.read_csv(bundle / "equity.csv", encoding="utf-8-sig")
+    assert len(equity) == 150
+    assert not list((tmp_path / "html").rglob("*.html"))
+
+    calls = []
+
+    def fake_render(kline_csv_path, signals_df, trades_df, initial_capital, html_file_name, html_file_path, open_browser=True):
+        calls.append((kline_csv_path, open_browser))
+        output = f"{html_file_path}/{html_file_name}"
+        with open(output, "w", encoding="utf-8") as handle:
+            handle.write("<html></html>")
+        return output
+
+    monkeypatch.setattr(quant_manage, "plotly_draw_records", fake_render)
+    html_path = render_backtest_bundle(bundle)
+    assert str(html_path) == result.html_path
+    assert render_backtest_bundle(bundle) == html_path
+    assert calls == [(str(csv_path), False)]
@@ -0,0 +1,117 @@
+"""
+策略参数扫描测试。
+验证网格展开、随机采样、参数校验、结果表结构与 K 线解析缓存的使用。
+"""
+
+import pandas as pd
+import pytest
+
+from core.quant import sweep
+from core.quant.sweep import expand_grid, run_sweep, sample_grid
+
+
+def _write_kline(path, periods=150):
+    dates = pd.date_range("2023-01-01", periods=periods, freq="D")
+    close = [100 + i * 0.1 + (i % 9) for i in range(periods)]
+    pd.DataFrame(
+        {
+            "date": dates.strftime("%Y-%m-%d"),
+            "open": close,
+            "high": [value + 1 for value in close],
+            "low": [value - 1 for value in close],
+            "close": close,
+            "volume": [1000000 + (i % 4) * 400000 for i in range(periods)],
+            "amount": 0,
+            "stock_code": "US.TEST",
+            "stock_name": "TEST",
+            "market": "US",
+        }
+    ).to_csv(path, index=False)
+
+
+@pytest.mark.mock_only
+def test_expand_grid_cartesian_product():
+    combos = expand_grid({"a": [1, 2], "b": ["x", "y", "z"]})
+    assert len(combos) == 6
+    assert combos[0] == {"a": 1, "b": "x"}
+    assert combos[-1] == {"a": 2, "b": "z"}
+    assert expand_grid({}) == [{}]
+
+
+@pytest.mark.mock_only
+def test_sample_grid_deterministic_and_unique():
+    space = {"a": [1, 2, 3], "b": lambda rng: rng.choice([0.1, 0.2])}
+    first = sample_grid(space, 4, seed=7)
+    assert first == sample_grid(space, 4, seed=7)
+    assert len({tuple(sorted(combo.items())) for combo in first}) == 4
+    assert len(sample_grid({"a": [1, 2]}, 10, seed=1)) == 2
+
+
+@pytest.mark.mock_only
+def test_run_sweep_rejects_unknown_params(tmp_path):
+    from core.strategy.trading.volume.enhanced_volume import EnhancedVolumeStrategy
+
+    with pytest.raises(ValueError):
+        run_sweep(EnhancedVolumeStrategy, tmp_path, grid={"no_such_param": [1]}, max_workers=1)
+
+
+@pytest.mark.mock_only
+@pytest.mark.slow
+def test_run_sweep_results_table(tmp_path, monkeypatch):
+    from core.strategy.trading.volume.enhanced_volume import EnhancedVolumeStrategy
+
+    _write_kline(tmp_path / "US.T1_T1.csv")
+    _write_kline(tmp_path / "US.T2_T2.csv", periods=180)
+    loads = []
+    original = sweep.get_data_form_csv
+    monkeypatch.setattr(
+        sweep, "get_data_form_csv", lambda path, **kwargs: loads.append(path) or original(path, **kwargs)
+    )
+    sweep._feed_cache.clear()
+
+    grid = {"max_single_buy_percent": [0.1, 0.2], "min_order_size": [100]}
+    result = run_sweep(EnhancedVolumeStrategy, tmp_path, grid=grid, max_workers=1)
+    assert result.columns.tolist() == ["csv_path", "max_single_buy_percent", "min_order_size", *sweep.METRIC_COLUMNS]
+    assert len(result) == 4
+    assert result["error"].isna().all()
+    # 每个 CSV 只解析一次
+    assert len(loads) == 2
+    assert not list(tmp_path.rglob("*.html"))
+
+
+@pytest.mark.mock_only
+@pytest.mark.slow
+def test_run_sweep_reads_feed_cache(tmp_path, monkeypatch):
+    import settings
+    from core.quant import feed_cache
+    from core.strategy.trading.volume.enhanced_volume import EnhancedVolumeStrategy
+
+    data_dir = tmp_path / "kline"
+    data_dir.mkdir()
+    _write_kline(data_dir / "US.T1_T1.csv")
+    hits = []
+    original = feed_cache.load_frame
+
+    def load_frame(*args):
+        frame = original(*args)
+        hits.append(frame is not None)
+        return frame
+
+    monkeypatch.setattr(feed_cache, "load_frame", load_frame)
+    grid = {"max_single_buy_percent": [0.1, 0.2]}
+
+    # 显式关闭时不读写缓存
+    sweep._feed_cache.clear()
+    run_sweep(EnhancedVolumeStrategy, data_dir, grid=grid, max_workers=1, feed_cache=False)
+    assert hits == [] and not list(tmp_path.rglob("*.npz"))
+
+    # 默认开启：首次扫描解析 CSV 并写入缓存，后续扫描（新进程的进程内缓存为空）直接读取
+    assert settings.BATCH_FEED_CACHE_ENABLED
+    sweep._feed_cache.clear()
+    first = run_sweep(EnhancedVolumeStrategy, data_dir, grid=grid, max_workers=1)
+    assert hits == [False]
+    assert list(settings.FEED_CACHE_ROOT.glob("*.npz"))
+    sweep._feed_cache.clear()
+    second = run_sweep(EnhancedVolumeStrategy, data_dir, grid=grid, max_workers=1)
+    assert hits == [False, True]
+    pd.testing.assert_frame_equal(first, second)
@@ -0,0 +1,81 @@
+"""
+列式记录缓冲区测试。
+验证扩容、兼容导出与零拷贝导出。
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.strategy.indicator.common import SignalRecordManager
+from core.strategy.record_buffer import CATEGORY, DATETIME, NUMBER, OBJECT, ColumnarRecordBuffer
+from core.strategy.trading.common import TradeRecordManager
+
+
+pytestmark = pytest.mark.mock_only
+
+
+def test_buffer_grows_past_capacity():
+    buffer = ColumnarRecordBuffer((("date", DATETIME), ("kind", CATEGORY), ("value", NUMBER)), capacity=2)
+    for i in range(5):
+        buffer.append(datetime.date(2024, 1, i + 1), "buy" if i % 2 else "sell", i)
+    assert len(buffer) == 5
+    assert buffer.column("value").tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert buffer.column("kind").dtype == np.int16
+    assert buffer.categories("kind") == ["sell", "buy"]
+
+
+def test_signal_manager_matches_legacy_dataframe():
+    manager = SignalRecordManager()
+    assert manager.transform_to_dataframe().empty
+    manager.add_signal_record(datetime.date(2024, 1, 2), "normal_buy", "多")
+    manager.add_signal_records([("2024-01-03", "normal_sell", "空"), (datetime.date(2024, 1, 4), "normal_buy", "多")])
+    expected = pd.DataFrame(
+        {
+            "date": pd.to_datetime(["2024-01-02", "2024-01-03", "2024-01-04"]),
+            "signal_type": ["normal_buy", "normal_sell", "normal_buy"],
+            "signal_description": ["多", "空", "多"],
+        }
+    )
+    pd.testing.assert_frame_equal(manager.transform_to_dataframe(), expected)
+    assert [record.signal_type for record in manager.signal_records] == ["normal_buy", "normal_sell", "normal_buy"]
+    assert manager.signal_records[0].date == pd.Timestamp("2024-01-02")
+    with pytest.raises(ValueError):
+        manager.add_signal_record(20240105, "normal_buy", "多")
+    assert len(manager) == 3
+
+
+def test_signal_manager_zero_copy_dataframe():
+    manager = SignalRecordManager()
+    manager.add_signal_records([("2024-01-02", "strong_buy", "强多"), ("2024-01-03", "strong_sell", "强空")])
+    df = manager.to_dataframe()
+    assert isinstance(df["signal_type"].dtype, pd.CategoricalDtype)
+    assert df["signal_type"].tolist() == ["strong_buy", "strong_sell"]
+    assert np.shares_memory(df["date"].to_numpy(), manager.buffer.column("date"))
+
+
+def test_trade_manager_preserves_column_types():
+    manager = TradeRecordManager()
+    manager.add_trade_record(1, datetime.date(2024, 1, 2), "B", 10.5, 100, 1050.0, 5.0, "buy", 4)
+    manager.add_trade_record(2, "2024-01-05", "S", 11.0, 100, 1100.0, 5.5, "sell", 4)
+    df = manager.transform_to_dataframe()
+    assert df.columns.tolist() == [
+        "date", "trade_id", "action", "price", "size", "total_amount", "commission", "order_type", "status",
+    ]
+    assert df["trade_id"].dtype == np.int64 and df["size"].dtype == np.int64
+    assert df["price"].dtype == np.float64
+    assert df["action"].tolist() == ["B", "S"]
+    assert manager.trade_records[1].order_type == "sell"
+    with pytest.raises(ValueError):
+        manager.add_trade_record(3, None, "B", 1.0, 1, 1.0, 0.0, "buy", 4)
+
+
+def test_to_arrow_requires_pyarrow():
+    pa = pytest.importorskip("pyarrow")
+    buffer = ColumnarRecordBuffer((("date", DATETIME), ("kind", CATEGORY), ("note", OBJECT)))
+    buffer.append("2024-01-02", "buy", "x")
+    table = buffer.to_arrow()
+    assert table.num_rows == 1
+    assert pa.types.is_dictionary(table.schema.field("kind").type)
@@ -0,0 +1,57 @@
+"""
+RSRS 信号指标测试。
+
+数学原理：
+1. runonce 预计算路径与逐 bar 流式路径在同一 bar 上数学等价。
+2. 因此两种路径输出的指标线与买卖信号记录应一致（浮点线按容差比较）。
+"""
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.strategy.indicator.common import set_feature_cache
+from core.strategy.indicator.trend.rsrs_indicator import RSRSIndicator
+
+
+def _make_ohlc(length: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, length)))
+    high = close * (1 + rng.uniform(0.001, 0.03, length))
+    low = close * (1 - rng.uniform(0.001, 0.03, length))
+    return pd.DataFrame(
+        {"open": close, "high": high, "low": low, "close": close, "volume": 1000.0},
+        index=pd.bdate_range("2020-01-01", periods=length),
+    )
+
+
+class _IndicatorHolder(bt.Strategy):
+    def __init__(self):
+        self.indicator = RSRSIndicator(window=18, z_window=120)
+
+
+def _run(df: pd.DataFrame, runonce: bool):
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.addstrategy(_IndicatorHolder)
+    indicator = cerebro.run(runonce=runonce)[0].indicator
+    lines = {name: np.array(getattr(indicator.lines, name).array) for name in indicator.lines.getlinealiases()}
+    return indicator.signal_record_manager.transform_to_dataframe(), lines
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize("seed", [0, 2])
+def test_rsrs_indicator_once_matches_next(seed):
+    previous = set_feature_cache(None)
+    try:
+        df = _make_ohlc(500, seed)
+        once_records, once_lines = _run(df, runonce=True)
+        next_records, next_lines = _run(df, runonce=False)
+    finally:
+        set_feature_cache(previous)
+
+    assert not once_records.empty
+    pd.testing.assert_frame_equal(once_records, next_records)
+    for name, values in once_lines.items():
+        np.testing.assert_allclose(values, next_lines[name], rtol=1e-8, atol=1e-10, equal_nan=True)
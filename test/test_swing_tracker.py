@@ -0,0 +1,116 @@
+"""
+增量波段高低点跟踪器一致性测试。
+
+数学原理：
+1. 每根 K 线更新后，跟踪器的高低点、收缩列表与收缩次数应与对回溯窗口重新扫描的批量函数完全一致。
+2. 传入跟踪器的 compute_vcp_features / evaluate_vcp_plus / vcp 结果应与不传时一致。
+"""
+
+import numpy as np
+import pytest
+
+from core.analysis.indicators import vcp as vcp_module
+from core.analysis.indicators import vcp_plus as vcp_plus_module
+from core.analysis.indicators.extrema import local_extrema
+from core.analysis.indicators.swing import SwingPointTracker
+from core.analysis.indicators.vcp import VCPParams, compute_vcp_features, create_vcp_swing_tracker
+from core.analysis.indicators.vcp_plus import VCPPlusParams, create_vcp_plus_swing_tracker, evaluate_vcp_plus
+from core.analysis.migrations import vcp_screener
+
+
+def _make_high_low(length: int, seed: int, with_nan: bool = False) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, length))
+    # 取整制造相同价格，覆盖并列极值与同一根 K 线同时为高低点的情况
+    high = np.round(close + rng.uniform(0, 2, length))
+    low = np.round(close - rng.uniform(0, 2, length))
+    if with_nan:
+        high[rng.random(length) < 0.02] = np.nan
+        low[rng.random(length) < 0.02] = np.nan
+    return high, low
+
+
+def _batch_vcp(highs, lows, order):
+    local_high = local_extrema(highs, order, "max")
+    local_low = local_extrema(lows, order, "min")
+    contraction = (
+        vcp_module._contractions(highs, lows, local_high, local_low)
+        if len(local_high) >= 2 and len(local_low) >= 2
+        else []
+    )
+    return local_high, local_low, contraction
+
+
+def _batch_vcp_plus(highs, lows, order):
+    local_high = local_extrema(highs, order, "max", ignore_nan=True)
+    local_low = local_extrema(lows, order, "min", ignore_nan=True)
+    local_high, local_low = vcp_plus_module._adjust_local_high_low(local_high, local_low)
+    contraction = (
+        vcp_plus_module._contractions(highs, lows, local_high, local_low)
+        if local_high.size >= 2 and local_low.size >= 2
+        else []
+    )
+    return local_high, local_low, contraction
+
+
+@pytest.mark.mock_only
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+@pytest.mark.parametrize("adjust", [False, True])
+@pytest.mark.parametrize("seed, order, lookback, with_nan", [(0, 3, 40, False), (1, 2, 25, True), (2, 5, 60, False)])
+def test_tracker_matches_batch_rescan(adjust, seed, order, lookback, with_nan):
+    high, low = _make_high_low(160, seed, with_nan)
+    tracker = SwingPointTracker(order=order, lookback=lookback, adjust=adjust, ignore_nan=adjust, skip_zero_high=adjust)
+    batch = _batch_vcp_plus if adjust else _batch_vcp
+    num_contractions = vcp_plus_module._num_contractions if adjust else vcp_module._num_contractions
+
+    for idx in range(len(high)):
+        tracker.update(high[idx], low[idx])
+        start = max(0, idx + 1 - lookback)
+        local_high, local_low, contraction = batch(high[start : idx + 1], low[start : idx + 1], order)
+
+        assert (tracker.local_high - start).tolist() == list(local_high), idx
+        assert (tracker.local_low - start).tolist() == list(local_low), idx
+        assert tracker.contractions() == contraction, idx
+
+        summary = tracker.summary()
+        num_c = num_contractions(contraction) if contraction else 0
+        assert summary.num_contractions == num_c
+        if num_c:
+            assert summary.max_contraction == contraction[num_c - 1]
+            assert summary.min_contraction == contraction[0]
+            assert summary.anchor_high_index - start == local_high[::-1][num_c - 1]
+        if len(local_high):
+            assert summary.last_high_index - start == local_high[-1]
+
+
+@pytest.mark.mock_only
+def test_feature_functions_accept_tracker(make_trending_df):
+    df = make_trending_df(320, seed=4)
+    df["benchmark_close"] = df["close"] / np.linspace(1.0, 1.2, len(df))
+    vcp_params = VCPParams(lookback_period=240)
+    plus_params = VCPPlusParams(lookback_period=260, require_rs_rating=False)
+    vcp_swing = create_vcp_swing_tracker(vcp_params)
+    plus_swing = create_vcp_plus_swing_tracker(plus_params)
+    screener_swing = vcp_screener.create_swing_tracker()
+
+    for idx in range(len(df)):
+        row = df.iloc[idx]
+        vcp_swing.update(row["high"], row["low"])
+        plus_swing.update(row["high"], row["low"])
+        screener_swing.update(row["high"], row["low"])
+        if idx < 220:
+            continue
+        window = df.iloc[: idx + 1]
+        tail = window.tail(vcp_params.lookback_period)
+
+        expected = compute_vcp_features(tail, vcp_params)
+        actual = compute_vcp_features(tail, vcp_params, swing=vcp_swing)
+        for key in ("local_high", "local_low", "contraction", "num_contractions", "max_contraction", "min_contraction", "weeks_of_contraction"):
+            assert actual[key] == expected[key], (idx, key)
+
+        tail = window.tail(plus_params.lookback_period)
+        assert evaluate_vcp_plus(tail, plus_params, swing=plus_swing) == pytest.approx(
+            evaluate_vcp_plus(tail, plus_params), nan_ok=True
+        ), idx
+
+        assert vcp_screener.vcp(window, swing=screener_swing) == vcp_screener.vcp(window), idx
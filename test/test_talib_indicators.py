@@ -59,3 +59,63 @@ def test_macd_uses_talib():
     finally:
         ti.talib = old_talib
         ti._talib_import_error = old_error
+
+
+def test_split_kline_columns_contiguous():
+    """验证记录列表拆分为连续 float64 数组，已拆分结果原样返回。"""
+    kline = [["t1", 1, 2, 0.5, 1.5, 10], ["t2", 2, 3, 1.5, 2.5, 20]]
+    columns = ti._split_kline(kline)
+    assert all(arr.flags["C_CONTIGUOUS"] and arr.dtype == np.float64 for arr in columns)
+    assert ti._split_kline(columns) is columns
+    assert ti.CurrentBar(columns) == 2
+
+
+def test_compute_many_splits_once():
+    """验证批量计算只拆分一次并按规格生成输出键。"""
+    fake_talib = Mock()
+    fake_talib.RSI.side_effect = lambda close, timeperiod: close * timeperiod
+    fake_talib.MACD.return_value = (np.array([1.0]), np.array([2.0]), np.array([3.0]))
+    fake_talib.STDDEV.side_effect = lambda close, timeperiod, nbdev: close * nbdev
+    old_talib = ti.talib
+    old_error = ti._talib_import_error
+    ti.talib = fake_talib
+    ti._talib_import_error = None
+    kline = [["t1", 1, 2, 0.5, 1.5, 10], ["t2", 2, 3, 1.5, 2.5, 20]]
+    try:
+        result = ti.compute_many(
+            kline,
+            [("RSI", (14,)), ("MACD", (12, 26, 9)), ("STDDEV", {"length": 20, "nbdev": 2}), "VOLUME"],
+        )
+        assert result["RSI_14"].tolist() == [21.0, 35.0]
+        assert result["MACD_12_26_9"]["MACD"].tolist() == [6.0]
+        assert result["STDDEV_20_2"].tolist() == [3.0, 5.0]
+        assert result["VOLUME"].tolist() == [10.0, 20.0]
+        assert ti.compute_many(kline, {"fast": ("RSI", 6)})["fast"].tolist() == [9.0, 15.0]
+        with pytest.raises(ValueError):
+            ti.compute_many(kline, [("UNKNOWN", ())])
+    finally:
+        ti.talib = old_talib
+        ti._talib_import_error = old_error
+
+
+def test_compute_many_panel():
+    """验证 symbols × bars 面板逐行计算并堆叠为二维结果。"""
+    fake_talib = Mock()
+    fake_talib.RSI.side_effect = lambda close, timeperiod: close + timeperiod
+    fake_talib.STOCH.side_effect = lambda high, low, close, **kwargs: (high - low, close)
+    old_talib = ti.talib
+    old_error = ti._talib_import_error
+    ti.talib = fake_talib
+    ti._talib_import_error = None
+    base = np.arange(6, dtype=float).reshape(2, 3)
+    panel = {"open": base, "high": base + 2, "low": base - 1, "close": base + 0.5, "volume": base * 100}
+    try:
+        result = ti.compute_many(panel, [("RSI", (14,)), ("KDJ", (9, 3, 3))])
+        assert result["RSI_14"].shape == (2, 3)
+        np.testing.assert_array_equal(result["RSI_14"], base + 14.5)
+        np.testing.assert_array_equal(result["KDJ_9_3_3"]["k"], np.full((2, 3), 3.0))
+        np.testing.assert_array_equal(result["KDJ_9_3_3"]["d"], base + 0.5)
+        assert fake_talib.RSI.call_count == 2
+    finally:
+        ti.talib = old_talib
+        ti._talib_import_error = old_error
@@ -4,6 +4,7 @@
 
 # Front Code X
 import numpy as np
+import pandas as pd
 import pytest
 
 from core.analysis import technical_indicators_ext as ti
@@ -54,3 +55,66 @@ def test_wma_wsma(sample_ohlcv_df):
     wsma = ti.wsma(sample_ohlcv_df)
     assert len(wma) == len(sample_ohlcv_df)
     assert len(wsma) == len(sample_ohlcv_df)
+
+
+def _random_ohlcv(rng, size=300):
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, size)))
+    high = close * (1 + rng.uniform(0.001, 0.02, size))
+    low = close * (1 - rng.uniform(0.001, 0.02, size))
+    open_ = low + (high - low) * rng.uniform(0, 1, size)
+    volume = rng.integers(1000, 10000, size).astype(float)
+    return pd.DataFrame(
+        {"Open": open_, "High": high, "Low": low, "Close": close, "Adj Close": close, "Volume": volume}
+    )
+
+
+def test_weighted_moving_average_matches_rolling_apply():
+    series = _random_ohlcv(np.random.default_rng(0))["Close"]
+    weights = np.arange(1, 11)
+    expected = series.rolling(10).apply(lambda x: np.dot(x, weights) / weights.sum(), raw=True)
+    result = ti.weighted_moving_average(series, 10)
+    assert result.index.equals(series.index) and result.name == "Close"
+    np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), equal_nan=True)
+    lwma = ti.linear_weighted_moving_average(series, 10)
+    np.testing.assert_allclose(lwma.to_numpy()[11:], expected.to_numpy()[10:-1])
+    assert lwma.iloc[:10].isna().all()
+
+
+def test_recursive_smoothing_matches_loops():
+    df = _random_ohlcv(np.random.default_rng(1))
+    ha = ti.heiken_ashi(df)
+    ha_open = np.zeros(len(df))
+    ha_open[0] = (df["Open"].iloc[0] + df["Close"].iloc[0]) / 2
+    for i in range(1, len(df)):
+        ha_open[i] = (ha_open[i - 1] + ha["HA_Close"].iloc[i - 1]) / 2
+    np.testing.assert_allclose(ha["HA_Open"].to_numpy(), ha_open)
+
+    multiplier = 2 / 36
+    smoothed = [df["Close"].iloc[0]]
+    for value in df["Close"].iloc[1:]:
+        smoothed.append((value - smoothed[-1]) * multiplier + smoothed[-1])
+    expected = 10 * pd.Series(smoothed).ewm(span=20, adjust=False).mean()
+    np.testing.assert_allclose(ti.pmo(df)[0].to_numpy(), expected.to_numpy())
+
+
+def test_lowercase_schema_matches_capitalized():
+    df = _random_ohlcv(np.random.default_rng(2))
+    lower = df.drop(columns="Adj Close").rename(columns=str.lower)
+    for func in (ti.adxvma, ti.ease_of_movement, ti.chaikin_oscillator, ti.tsi, ti.fishy_turbo, ti.special_k):
+        np.testing.assert_allclose(func(lower).to_numpy(), func(df).to_numpy(), equal_nan=True)
+
+
+def test_panel_matches_per_symbol():
+    frames = [_random_ohlcv(np.random.default_rng(seed)) for seed in range(3)]
+    panel = {
+        name.lower(): np.vstack([frame[name].to_numpy() for frame in frames])
+        for name in ("Open", "High", "Low", "Close", "Volume")
+    }
+    for func in (ti.accumulation_distribution_line, ti.adxvma, ti.force_index, ti.chaikin_oscillator, ti.tsi, ti.wsma):
+        result = func(panel)
+        assert result.shape == panel["close"].shape
+        for row, frame in enumerate(frames):
+            np.testing.assert_allclose(result[row], func(frame).to_numpy(), equal_nan=True)
+    ha = ti.heiken_ashi(panel)
+    np.testing.assert_allclose(ha["HA_Open"][1], ti.heiken_ashi(frames[1])["HA_Open"].to_numpy())
+    np.testing.assert_allclose(ti.vwap(panel), [ti.vwap(frame) for frame in frames])
@@ -6,7 +6,7 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from core.analysis.migrations.vcp_from_youtuber.rsrs_indicator import RsrsConfig, compute_rsrs
+from core.analysis.migrations.vcp_from_youtuber.rsrs_indicator import RsrsConfig, RsrsStream, compute_rsrs
 from core.analysis.migrations.vcp_from_youtuber.rs_rating import compute_rs_scores
 from core.analysis.migrations.vcp_from_youtuber.rsi_signal import compute_rsi_signal
 
@@ -29,6 +29,28 @@ def test_compute_rsrs_columns():
         assert col in result.columns
 
 
+@pytest.mark.mock_only
+def test_rsrs_stream_matches_batch():
+    rng = np.random.default_rng(5)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 600)))
+    data = pd.DataFrame(
+        {
+            "high": close * (1 + rng.uniform(0.001, 0.03, close.size)),
+            "low": close * (1 - rng.uniform(0.001, 0.03, close.size)),
+            "close": close,
+        }
+    )
+    config = RsrsConfig(window=18, z_window=120)
+    expected = compute_rsrs(data, config=config)
+    stream = RsrsStream(config)
+    rows = [stream.update(high, low) for high, low in zip(data["high"], data["low"])]
+    actual = pd.DataFrame(rows)
+    for col in ["beta", "r2", "zscore", "rsrs"]:
+        np.testing.assert_allclose(actual[col].to_numpy(), expected[col].to_numpy(), rtol=1e-8, atol=1e-10, equal_nan=True)
+    np.testing.assert_array_equal(actual["position"].to_numpy(), expected["position"].to_numpy())
+    assert expected["position"].nunique() == 2
+
+
 @pytest.mark.mock_only
 def test_compute_rsi_signal():
     periods = 50
@@ -0,0 +1,97 @@
+"""
+VCPPlus 全序列评估与指标预计算路径一致性测试。
+
+数学原理：
+1. evaluate_vcp_plus_series 第 i 行应与 evaluate_vcp_plus(df[:i+1]) 完全一致。
+2. 局部极值只依赖以该点为中心的完整窗口，因此全序列一次识别后按回溯窗口截取即可复现逐 bar 结果。
+3. 参数网格批量评估的每组结果应与单组 evaluate_vcp_plus_series 完全一致。
+"""
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.analysis.indicators.vcp_plus import (
+    VCPPlusParams,
+    evaluate_vcp_plus,
+    evaluate_vcp_plus_grid,
+    evaluate_vcp_plus_series,
+)
+
+
+def _with_benchmark(df: pd.DataFrame, seed: int) -> pd.DataFrame:
+    """追加相对强度所需的基准收盘价与 RS 评级列。"""
+    rng = np.random.default_rng(seed)
+    return df.assign(
+        benchmark_close=df["close"] / np.linspace(1.0, 1.2, len(df)),
+        rs_rating=rng.choice([60.0, 80.0, np.nan], len(df)),
+    )
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize(
+    "params",
+    [
+        VCPPlusParams(lookback_period=300),
+        VCPPlusParams(lookback_period=240, min_contraction_depth=40.0, require_consolidation=False, require_rs_rating=False),
+    ],
+)
+def test_vcp_plus_series_matches_per_bar(params, make_trending_df):
+    df = _with_benchmark(make_trending_df(330, seed=1), seed=1)
+    series = evaluate_vcp_plus_series(df, params)
+
+    assert len(series) == len(df)
+    for idx in range(200, len(df)):
+        expected = evaluate_vcp_plus(df.iloc[: idx + 1], params)
+        row = series.iloc[idx]
+        for key, value in expected.items():
+            if value is None or (isinstance(value, float) and np.isnan(value)):
+                assert np.isnan(row[key]), (idx, key)
+            else:
+                assert row[key] == value, (idx, key)
+
+
+@pytest.mark.mock_only
+def test_vcp_plus_indicator_once_matches_next(tmp_path, make_trending_df):
+    from core.quant.quant_manage import get_data_form_csv
+    from core.strategy.indicator.pattern.vcp_plus_indicator import VCPPlusIndicator
+
+    csv_path = tmp_path / "vcp_plus.csv"
+    make_trending_df(300, seed=4).to_csv(csv_path, index=False)
+
+    class _Holder(bt.Strategy):
+        def __init__(self):
+            self.indicator = VCPPlusIndicator(min_contraction_depth=40.0, require_consolidation=False)
+
+    def _run(runonce: bool):
+        cerebro = bt.Cerebro(stdstats=False)
+        cerebro.adddata(get_data_form_csv(csv_path))
+        cerebro.addstrategy(_Holder)
+        indicator = cerebro.run(runonce=runonce)[0].indicator
+        lines = {name: np.array(getattr(indicator.lines, name).array) for name in indicator.lines.getlinealiases()}
+        return indicator.signal_record_manager.transform_to_dataframe(), lines, indicator._vcp_bought
+
+    once_records, once_lines, once_bought = _run(True)
+    next_records, next_lines, next_bought = _run(False)
+
+    assert not once_records.empty
+    pd.testing.assert_frame_equal(once_records, next_records)
+    assert once_bought == next_bought
+    for name, values in once_lines.items():
+        np.testing.assert_array_equal(values, next_lines[name])
+
+
+@pytest.mark.mock_only
+def test_vcp_plus_grid_matches_series(make_trending_df):
+    df = _with_benchmark(make_trending_df(330, seed=2), seed=2)
+    grid = [
+        VCPPlusParams(lookback_period=lookback, min_contraction_depth=depth, local_extrema_order=order)
+        for lookback in (240, 300)
+        for depth in (15.0, 40.0)
+        for order in (5, 10)
+    ]
+    result = evaluate_vcp_plus_grid(df, grid)
+    assert result.index.nlevels == 2 and len(result) == len(grid) * len(df)
+    for position, params in enumerate(grid):
+        pd.testing.assert_frame_equal(result.loc[position], evaluate_vcp_plus_series(df, params))
@@ -0,0 +1,174 @@
+"""
+数组回测快速通道测试。
+验证仓位规则、撮合时点、拒单、统计口径与 Backtrader 对账。
+"""
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.quant.vector_backtest import SIGNAL_RULES, reconcile, run_vector_backtest, signal_rule, simulate_signals
+
+
+class _FlatFee(bt.CommInfoBase):
+    """每笔固定手续费的股票类佣金模型（现金按成交额扣减）。"""
+
+    params = (("stocklike", True), ("commtype", bt.CommInfoBase.COMM_FIXED), ("fee", 0.0))
+
+    def __init__(self, fee):
+        super().__init__()
+        self.p.fee = fee
+
+    def _getcommission(self, size, price, pseudoexec):
+        return self.p.fee
+
+
+NAN = np.nan
+SIZING = dict(min_order_size=100, max_portfolio_percent=0.8, max_single_buy_percent=0.5, max_single_sell_percent=1.0)
+
+
+@pytest.mark.mock_only
+def test_round_trip_fills_next_bar_at_signal_close():
+    close = np.array([10.0, 10.0, 11.0, 9.0, 12.0, 13.0])
+    buy = np.array([NAN, 1, NAN, NAN, NAN, NAN])
+    sell = np.array([NAN, NAN, NAN, NAN, 1, NAN])
+    index = pd.date_range("2024-01-01", periods=6, freq="D")
+    result = simulate_signals(close, buy, sell, commission=_FlatFee(10.0), init_cash=10000.0, index=index, **SIZING)
+
+    trades = result.trades
+    assert trades["action"].tolist() == ["B", "S"]
+    assert trades["date"].tolist() == [index[2], index[5]]
+    assert trades["price"].tolist() == [10.0, 12.0]
+    assert trades["size"].tolist() == [500.0, 500.0]
+    assert trades["total_amount"].tolist() == [5000.0, -6000.0]
+    np.testing.assert_allclose(result.equity.to_numpy(), [10000, 10000, 10490, 9490, 10990, 10980])
+    np.testing.assert_array_equal(result.position, [0, 0, 500, 500, 500, 0])
+    assert result.metrics["total_return"] == pytest.approx(9.8)
+    assert result.metrics["max_drawdown"] == pytest.approx(1000 / 10490 * 100)
+    assert result.metrics["total_trades"] == 1 and result.metrics["won_trades"] == 1
+
+
+@pytest.mark.mock_only
+def test_fixed_slippage_capped_by_fill_bar_range():
+    close = np.array([10.0, 10.0, 10.0, 12.0, 12.0])
+    high = np.array([10.5, 10.5, 10.1, 12.5, 12.5])
+    low = np.array([9.5, 9.5, 9.5, 11.5, 11.9])
+    buy = np.array([NAN, 1, NAN, NAN, NAN])
+    sell = np.array([NAN, NAN, NAN, 1, NAN])
+    result = simulate_signals(
+        close, buy, sell, commission=_FlatFee(0.0), high=high, low=low, slippage=0.3, init_cash=10000.0, **SIZING
+    )
+    # 买入 10.3 超过撮合 K 线最高价 10.1，按最高价成交；卖出 11.7 低于最低价 11.9，按最低价成交
+    assert result.trades["price"].tolist() == [10.1, 11.9]
+    assert result.trades["total_amount"].tolist() == pytest.approx([5050.0, -5950.0])
+
+
+@pytest.mark.mock_only
+def test_position_gate_ignores_repeat_buys():
+    close = np.full(6, 10.0)
+    buy = np.array([1, 1, 1, NAN, NAN, NAN])
+    sell = np.full(6, NAN)
+    gated = simulate_signals(close, buy, sell, commission=_FlatFee(0.0), init_cash=10000.0, position_gated=True, **SIZING)
+    free = simulate_signals(close, buy, sell, commission=_FlatFee(0.0), init_cash=10000.0, position_gated=False, **SIZING)
+    assert len(gated.trades) == 1
+    # 第三次买入时现金已用尽
+    assert len(free.trades) == 2
+    assert gated.metrics["buy_signals"] == 1 and free.metrics["buy_signals"] == 3
+    assert gated.metrics["total_trades"] == 1 and gated.metrics["won_trades"] == 0
+
+
+@pytest.mark.mock_only
+def test_insufficient_cash_and_last_bar_orders_skipped():
+    close = np.array([10.0, 10.0, 10.0])
+    all_in = dict(SIZING, max_portfolio_percent=1.0, max_single_buy_percent=1.0)
+    rejected = simulate_signals(close, [True, False, False], [False] * 3, commission=_FlatFee(10.0), init_cash=1000.0, **all_in)
+    assert rejected.trades.empty
+    assert rejected.metrics["buy_signals"] == 1
+    last_bar = simulate_signals(close, [False, False, True], [False] * 3, commission=_FlatFee(0.0), init_cash=10000.0, **SIZING)
+    assert last_bar.trades.empty
+    np.testing.assert_array_equal(last_bar.equity.to_numpy(), [10000.0] * 3)
+
+
+@pytest.mark.mock_only
+def test_signal_rule_follows_inheritance():
+    from core.strategy.trading.pattern.vcp_strategy import VCPStrategy
+
+    class Custom(VCPStrategy):
+        pass
+
+    assert signal_rule(Custom).buy_line == "vcp_signal"
+    assert signal_rule(Custom).position_gated
+    with pytest.raises(ValueError):
+        signal_rule(object)
+
+
+STRATEGY_PATHS = {
+    "EnhancedVolumeStrategy": "core.strategy.trading.volume.enhanced_volume",
+    "SingleVolumeStrategy": "core.strategy.trading.volume.single_volume_",
+    "VCPStrategy": "core.strategy.trading.pattern.vcp_strategy",
+    "VCPStrategyLoose": "core.strategy.trading.pattern.vcp_strategy_loose",
+}
+
+
+def _load_strategy(name: str):
+    import importlib
+
+    return getattr(importlib.import_module(STRATEGY_PATHS[name]), name)
+
+
+def _write_csv(path, market: str, periods: int = 900, seed: int = 0, level: float = 100.0):
+    rng = np.random.default_rng(seed)
+    close = level * np.exp(np.cumsum(rng.normal(0.001, 0.02, periods)))
+    open_ = close * (1 + rng.normal(0, 0.01, periods))
+    pd.DataFrame(
+        {
+            "date": pd.date_range("2020-01-01", periods=periods, freq="D").strftime("%Y-%m-%d"),
+            "open": open_,
+            "high": np.maximum(open_, close) * 1.01,
+            "low": np.minimum(open_, close) * 0.99,
+            "close": close,
+            "volume": rng.integers(500000, 3000000, periods),
+            "amount": 0,
+            "stock_code": f"{market}.TEST",
+            "stock_name": "TEST",
+            "market": market,
+        }
+    ).to_csv(path, index=False)
+    return path
+
+
+def _assert_reconciled(report):
+    assert report.matched, report.trades
+    np.testing.assert_allclose(report.metrics["backtrader"].astype(float), report.metrics["vector"].astype(float), rtol=1e-6)
+
+
+@pytest.mark.mock_only
+def test_reconcile_covers_every_signal_rule():
+    assert set(STRATEGY_PATHS) == set(SIGNAL_RULES)
+
+
+@pytest.mark.mock_only
+@pytest.mark.slow
+@pytest.mark.parametrize("strategy_name", sorted(SIGNAL_RULES))
+def test_reconcile_matches_backtrader(tmp_path, strategy_name):
+    report = reconcile(_write_csv(tmp_path / "US.TEST_TEST.csv", "US"), _load_strategy(strategy_name))
+    _assert_reconciled(report)
+    assert report.trades["bt_action"].notna().sum() > 0
+
+
+@pytest.mark.mock_only
+@pytest.mark.slow
+@pytest.mark.parametrize("market", ["HK", "US"])
+def test_reconcile_when_cash_limits_consecutive_buys(tmp_path, market):
+    # 低价股按股计保证金（margin = 1），连续买入后可用现金先于总资产比例耗尽
+    csv_path = _write_csv(tmp_path / f"{market}.TEST_TEST.csv", market, level=1.5)
+    strategy = _load_strategy("SingleVolumeStrategy")
+    report = reconcile(csv_path, strategy, max_single_buy_percent=0.5)
+    _assert_reconciled(report)
+    assert "BBB" in "".join(report.trades["bt_action"].dropna())
+
+    result = run_vector_backtest(csv_path, strategy, max_single_buy_percent=0.5)
+    buys = result.trades.loc[result.trades["action"] == "B", "date"]
+    decision_bars = result.equity.index.get_indexer(pd.to_datetime(buys)) - 1
+    assert (result.cash[decision_bars] < result.equity.to_numpy()[decision_bars] * 0.5).any()
@@ -0,0 +1,113 @@
+"""
+成交量指标 runonce 预计算路径一致性测试。
+
+数学原理：
+1. 预计算路径对整段数据一次性计算滚动特征，逐 bar 路径对尾部窗口计算，二者在同一 bar 上数学等价。
+2. 因此两种路径输出的信号线与信号记录应完全一致。
+3. 逐 bar 路径只取最近 min_len 根 bar：每根 bar 在该尾部窗口上单独计算的信号即为黄金输出，
+   回看期超过 min_len 的特征（RSI 前值、KDJ 平滑）在窗口内不可得，相关条件不成立。
+"""
+
+import backtrader as bt
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.analysis.indicators.volume import VolumeIndicatorParams, compute_volume_signals
+from core.strategy.indicator.volume.enhanced_volume import EnhancedVolumeIndicator
+from core.strategy.indicator.volume.single_volume import SingleVolumeIndicator
+
+
+def _make_ohlcv(length: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, length)))
+    open_ = close * (1 + rng.normal(0, 0.01, length))
+    high = np.maximum(open_, close) * (1 + rng.uniform(0, 0.01, length))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.01, length))
+    volume = rng.lognormal(13, 0.6, length)
+    return pd.DataFrame(
+        {"open": open_, "high": high, "low": low, "close": close, "volume": volume},
+        index=pd.bdate_range("2020-01-01", periods=length),
+    )
+
+
+class _IndicatorHolder(bt.Strategy):
+    params = (("indicator_class", None), ("indicator_params", None))
+
+    def __init__(self):
+        self.indicator = self.p.indicator_class(**(self.p.indicator_params or {}))
+
+
+def _run(df: pd.DataFrame, indicator_class, runonce: bool, indicator_params=None):
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.addstrategy(_IndicatorHolder, indicator_class=indicator_class, indicator_params=indicator_params)
+    strategy = cerebro.run(runonce=runonce)[0]
+    indicator = strategy.indicator
+    lines = {name: np.array(getattr(indicator.lines, name).array) for name in indicator.lines.getlinealiases()}
+    return indicator.signal_record_manager.transform_to_dataframe(), lines
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize("indicator_class", [EnhancedVolumeIndicator, SingleVolumeIndicator])
+@pytest.mark.parametrize("seed", [0, 3])
+@pytest.mark.parametrize(
+    "indicator_params",
+    [
+        None,
+        # RSI 前值所需 bar 数超过最小有效 bar 数
+        dict(n2=3, n3=10, rsi_period=25, boll_period=12),
+        # KDJ 两次平滑所需 bar 数超过最小有效 bar 数
+        dict(kdj_period=30, boll_width=1.5),
+    ],
+)
+def test_volume_indicator_once_matches_next(indicator_class, seed, indicator_params):
+    df = _make_ohlcv(400, seed)
+    once_records, once_lines = _run(df, indicator_class, runonce=True, indicator_params=indicator_params)
+    next_records, next_lines = _run(df, indicator_class, runonce=False, indicator_params=indicator_params)
+
+    assert not once_records.empty
+    pd.testing.assert_frame_equal(once_records, next_records)
+    for name, values in once_lines.items():
+        np.testing.assert_array_equal(values, next_lines[name])
+
+
+@pytest.mark.mock_only
+def test_volume_signals_respect_min_bars():
+    df = _make_ohlcv(120, 1)
+    flags = compute_volume_signals(df, VolumeIndicatorParams())
+
+    assert list(flags.columns) == ["main_buy", "main_sell", "enhanced_buy", "enhanced_sell"]
+    assert not flags.iloc[:50].to_numpy().any()
+    assert not (flags["enhanced_buy"] & ~flags["main_buy"]).any()
+
+
+@pytest.mark.mock_only
+@pytest.mark.parametrize(
+    "indicator_params",
+    [dict(n2=3, n3=10, rsi_period=25, boll_period=12), dict(kdj_period=30, boll_width=1.5)],
+)
+def test_volume_indicator_matches_min_len_window(indicator_params):
+    df = _make_ohlcv(400, 0)
+    params = VolumeIndicatorParams(**indicator_params)
+    min_len = max(params.n3, params.rsi_period + 1, params.boll_period, params.kdj_period, 3)
+    frame = df.reset_index(drop=True)
+    expected = pd.DataFrame(
+        [
+            compute_volume_signals(
+                frame.iloc[end + 1 - min_len : end + 1], params, min_len=min_len, bar_offset=end + 1 - min_len
+            ).iloc[-1]
+            for end in range(min_len - 1, len(frame))
+        ]
+    ).to_numpy()
+
+    for runonce in (True, False):
+        _, lines = _run(df, EnhancedVolumeIndicator, runonce=runonce, indicator_params=indicator_params)
+        actual = np.column_stack(
+            [
+                ~np.isnan(lines[name][min_len - 1 :])
+                for name in ("main_buy_signal", "main_sell_signal", "enhanced_buy_signal", "enhanced_sell_signal")
+            ]
+        )
+        np.testing.assert_array_equal(actual, expected)
+    assert expected[:, :2].any()
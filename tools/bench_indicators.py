@@ -0,0 +1,368 @@
+"""
+Indicator micro-benchmarks with per-bar vs precomputed parity gates.
+
+Generates deterministic synthetic OHLCV for several lengths and widths (number
+of symbols), times every case in both modes and checks that the two modes
+produce the same output:
+
+- volume_features: VolumeFeatureStream (per bar) vs compute_volume_features
+- vcp_features:    compute_vcp_features rescanning each tail vs the incremental swing tracker
+- vcp_plus:        evaluate_vcp_plus per bar vs evaluate_vcp_plus_series
+- screener:        vcp_screener.vcp rescanning each window vs the incremental swing tracker
+- rsrs:            RsrsStream (per bar) vs compute_rsrs
+- indicator:<Cls>: every registered bt.Indicator with runonce=False vs runonce=True
+
+Window-rescanning per-bar modes are timed over the last --per-bar-bars bars only;
+backtrader per-bar runs are skipped above --max-next-length bars.
+
+Usage:
+    python -m tools.bench_indicators --lengths 1000 10000 100000 --widths 1 4 --output bench_output.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_LENGTHS = (1000, 10000, 100000)
+DEFAULT_WIDTHS = (1,)
+
+
+@dataclass
+class BenchResult:
+    case: str
+    mode: str
+    length: int
+    width: int
+    bars: int
+    seconds: float
+    bars_per_second: float
+    parity: Optional[bool] = None
+    detail: str = ""
+
+
+def synthetic_ohlcv(length: int, seed: int) -> pd.DataFrame:
+    """Deterministic trending OHLCV with a benchmark close and an RS rating column."""
+    rng = np.random.default_rng(seed)
+    close = 50 * np.exp(np.cumsum(rng.normal(0.0005, 0.02, length)))
+    open_ = close * (1 + rng.normal(0, 0.01, length))
+    return pd.DataFrame(
+        {
+            "open": open_,
+            "high": np.maximum(open_, close) * (1 + rng.uniform(0, 0.02, length)),
+            "low": np.minimum(open_, close) * (1 - rng.uniform(0, 0.02, length)),
+            "close": close,
+            "volume": rng.lognormal(13, 0.5, length),
+            "benchmark_close": close / np.linspace(1.0, 1.2, length),
+            "rs_rating": 80.0,
+        },
+        index=pd.bdate_range("1990-01-01", periods=length),
+    )
+
+
+def _timed(func: Callable[[], object]) -> Tuple[object, float]:
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def _same(expected, actual) -> bool:
+    """Recursive equality for dicts/tuples/arrays; floats compare with a tight tolerance, NaN == NaN."""
+    if isinstance(expected, dict):
+        return expected.keys() == actual.keys() and all(_same(expected[k], actual[k]) for k in expected)
+    if isinstance(expected, (list, tuple)):
+        return len(expected) == len(actual) and all(_same(e, a) for e, a in zip(expected, actual))
+    if expected is None or actual is None:
+        return expected is None and actual is None or _is_nan(expected) and _is_nan(actual)
+    if isinstance(expected, (bool, np.bool_)) or isinstance(actual, (bool, np.bool_)):
+        return bool(expected) == bool(actual)
+    expected_arr = np.asarray(expected, dtype=float)
+    actual_arr = np.asarray(actual, dtype=float)
+    return expected_arr.shape == actual_arr.shape and bool(
+        np.allclose(expected_arr, actual_arr, rtol=1e-8, atol=1e-10, equal_nan=True)
+    )
+
+
+def _is_nan(value) -> bool:
+    return value is None or (isinstance(value, float) and np.isnan(value))
+
+
+# ---------------------------------------------------------------------------
+# Function-level cases: each returns (per_bar(df), precomputed(df), compare(a, b), per_bar_bars, precomputed_bars)
+# where the bar counts are the bars each mode actually evaluates
+# ---------------------------------------------------------------------------
+
+def _volume_case(df: pd.DataFrame, per_bar_bars: int):
+    from core.analysis.indicators.volume import VolumeFeatureStream, VolumeIndicatorParams, compute_volume_features
+
+    params = VolumeIndicatorParams()
+
+    def per_bar():
+        stream = VolumeFeatureStream(params)
+        rows = [stream.update(*row) for row in df[["open", "high", "low", "close", "volume"]].itertuples(index=False)]
+        return pd.DataFrame(rows)
+
+    def precomputed():
+        return compute_volume_features(df, params)
+
+    def compare(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+        return all(_same(b[col].to_numpy(dtype=float), a[col].to_numpy(dtype=float)) for col in b.columns)
+
+    return per_bar, precomputed, compare, len(df), len(df)
+
+
+def _sampled(df: pd.DataFrame, per_bar_bars: int, warmup: int) -> range:
+    return range(max(warmup, len(df) - per_bar_bars), len(df))
+
+
+def _vcp_case(df: pd.DataFrame, per_bar_bars: int):
+    from core.analysis.indicators.vcp import VCPParams, compute_vcp_features, create_vcp_swing_tracker
+
+    params = VCPParams()
+    keys = ("local_high", "local_low", "contraction", "num_contractions", "max_contraction", "min_contraction", "weeks_of_contraction")
+    bars = _sampled(df, per_bar_bars, params.ma_200_period)
+
+    def per_bar():
+        return [
+            {key: compute_vcp_features(df.iloc[: idx + 1].tail(params.lookback_period), params)[key] for key in keys}
+            for idx in bars
+        ]
+
+    def precomputed():
+        swing = create_vcp_swing_tracker(params)
+        results = []
+        for idx, (high, low) in enumerate(zip(df["high"].to_numpy(), df["low"].to_numpy())):
+            swing.update(high, low)
+            if idx >= bars.start:
+                tail = df.iloc[: idx + 1].tail(params.lookback_period)
+                result = compute_vcp_features(tail, params, swing=swing)
+                results.append({key: result[key] for key in keys})
+        return results
+
+    return per_bar, precomputed, _same, len(bars), len(bars)
+
+
+def _vcp_plus_case(df: pd.DataFrame, per_bar_bars: int):
+    from core.analysis.indicators.vcp_plus import VCPPlusParams, evaluate_vcp_plus, evaluate_vcp_plus_series
+
+    params = VCPPlusParams()
+    bars = _sampled(df, per_bar_bars, params.ma_200_period + params.ma_trend_period)
+
+    def per_bar():
+        return [evaluate_vcp_plus(df.iloc[: idx + 1], params) for idx in bars]
+
+    def precomputed():
+        return evaluate_vcp_plus_series(df, params)
+
+    def compare(rows: List[dict], series: pd.DataFrame) -> bool:
+        return all(
+            _same({key: series[key].iloc[idx] for key in row}, row) for idx, row in zip(bars, rows)
+        )
+
+    return per_bar, precomputed, compare, len(bars), len(df)
+
+
+def _screener_case(df: pd.DataFrame, per_bar_bars: int):
+    from core.analysis.migrations import vcp_screener
+
+    bars = _sampled(df, per_bar_bars, 30)
+
+    def per_bar():
+        return [vcp_screener.vcp(df.iloc[: idx + 1]) for idx in bars]
+
+    def precomputed():
+        swing = vcp_screener.create_swing_tracker()
+        results = []
+        for idx, (high, low) in enumerate(zip(df["high"].to_numpy(), df["low"].to_numpy())):
+            swing.update(high, low)
+            if idx >= bars.start:
+                results.append(vcp_screener.vcp(df.iloc[: idx + 1], swing=swing))
+        return results
+
+    return per_bar, precomputed, _same, len(bars), len(bars)
+
+
+def _rsrs_case(df: pd.DataFrame, per_bar_bars: int):
+    from core.analysis.migrations.vcp_from_youtuber.rsrs_indicator import RsrsConfig, RsrsStream, compute_rsrs
+
+    config = RsrsConfig()
+
+    def per_bar():
+        stream = RsrsStream(config)
+        return pd.DataFrame([stream.update(high, low) for high, low in zip(df["high"], df["low"])])
+
+    def precomputed():
+        return compute_rsrs(df, config)
+
+    def compare(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+        return all(_same(b[col].to_numpy(), a[col].to_numpy()) for col in a.columns)
+
+    return per_bar, precomputed, compare, len(df), len(df)
+
+
+FUNCTION_CASES: Dict[str, Callable] = {
+    "volume_features": _volume_case,
+    "vcp_features": _vcp_case,
+    "vcp_plus": _vcp_plus_case,
+    "screener": _screener_case,
+    "rsrs": _rsrs_case,
+}
+
+
+# ---------------------------------------------------------------------------
+# bt.Indicator cases
+# ---------------------------------------------------------------------------
+
+def _run_indicator(df: pd.DataFrame, indicator_class, runonce: bool):
+    import backtrader as bt
+
+    class _Holder(bt.Strategy):
+        def __init__(self):
+            self.indicator = indicator_class()
+
+    cerebro = bt.Cerebro(stdstats=False)
+    cerebro.adddata(bt.feeds.PandasData(dataname=df))
+    cerebro.addstrategy(_Holder)
+    indicator = cerebro.run(runonce=runonce)[0].indicator
+    lines = {name: np.array(getattr(indicator.lines, name).array) for name in indicator.lines.getlinealiases()}
+    manager = getattr(indicator, "signal_record_manager", None)
+    records = manager.transform_to_dataframe() if manager is not None else pd.DataFrame()
+    return lines, records
+
+
+def _compare_indicator(a, b) -> bool:
+    lines_a, records_a = a
+    lines_b, records_b = b
+    return _same(lines_a, lines_b) and records_a.equals(records_b)
+
+
+def registered_indicators() -> List[type]:
+    from core.strategy.indicator_manager import IndicatorManager
+
+    return list(IndicatorManager().get_all_indicators())
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def _bench_pair(
+    case: str,
+    length: int,
+    frames: List[pd.DataFrame],
+    build: Callable[[pd.DataFrame], Tuple[Optional[Callable], Callable, Callable, int, int]],
+) -> List[BenchResult]:
+    per_bar_time = precomputed_time = 0.0
+    per_bar_bars = precomputed_bars = 0
+    parity: Optional[bool] = True
+    skipped = False
+    for df in frames:
+        per_bar, precomputed, compare, bars, evaluated = build(df)
+        expected, seconds = _timed(precomputed)
+        precomputed_time += seconds
+        precomputed_bars += evaluated
+        if per_bar is None:
+            skipped = True
+            continue
+        actual, seconds = _timed(per_bar)
+        per_bar_time += seconds
+        per_bar_bars += bars
+        parity = parity and bool(compare(actual, expected))
+
+    width = len(frames)
+    results = [
+        BenchResult(case, "precomputed", length, width, precomputed_bars, precomputed_time,
+                    precomputed_bars / precomputed_time if precomputed_time else float("inf")),
+    ]
+    if skipped:
+        results.append(BenchResult(case, "per_bar", length, width, 0, 0.0, 0.0, None, "skipped"))
+    else:
+        results.append(
+            BenchResult(case, "per_bar", length, width, per_bar_bars, per_bar_time,
+                        per_bar_bars / per_bar_time if per_bar_time else float("inf"), parity)
+        )
+    return results
+
+
+def run_benchmarks(
+    lengths: Iterable[int] = DEFAULT_LENGTHS,
+    widths: Iterable[int] = DEFAULT_WIDTHS,
+    cases: Optional[Iterable[str]] = None,
+    per_bar_bars: int = 200,
+    max_next_length: int = 10000,
+    include_indicators: bool = True,
+) -> List[BenchResult]:
+    """
+    Run every case for each (length, width) and return the timing/parity records.
+
+    Feature caches and indicator snapshots are disabled while timing so that
+    every run computes from scratch.
+    """
+    from core.strategy.indicator.common import set_feature_cache
+    from core.strategy.indicator.snapshot import set_snapshot_store
+
+    selected = list(cases) if cases is not None else list(FUNCTION_CASES)
+    previous_cache = set_feature_cache(None)
+    previous_store = set_snapshot_store(None)
+    results: List[BenchResult] = []
+    try:
+        for length in lengths:
+            for width in widths:
+                frames = [synthetic_ohlcv(length, seed) for seed in range(width)]
+                for case in selected:
+                    results.extend(_bench_pair(case, length, frames, lambda df, c=case: FUNCTION_CASES[c](df, per_bar_bars)))
+                if not include_indicators:
+                    continue
+                for indicator_class in registered_indicators():
+                    def build(df, cls=indicator_class):
+                        per_bar = (lambda: _run_indicator(df, cls, False)) if length <= max_next_length else None
+                        return per_bar, (lambda: _run_indicator(df, cls, True)), _compare_indicator, len(df), len(df)
+
+                    results.extend(_bench_pair(f"indicator:{indicator_class.__name__}", length, frames, build))
+    finally:
+        set_feature_cache(previous_cache)
+        set_snapshot_store(previous_store)
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Indicator micro-benchmarks with per-bar/precomputed parity gates")
+    parser.add_argument("--lengths", type=int, nargs="+", default=list(DEFAULT_LENGTHS))
+    parser.add_argument("--widths", type=int, nargs="+", default=list(DEFAULT_WIDTHS))
+    parser.add_argument("--cases", nargs="+", choices=list(FUNCTION_CASES), default=None)
+    parser.add_argument("--per-bar-bars", type=int, default=200)
+    parser.add_argument("--max-next-length", type=int, default=10000)
+    parser.add_argument("--no-indicators", action="store_true", help="skip registered bt.Indicator runs")
+    parser.add_argument("--output", default=None, help="write the JSON report here instead of stdout")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        args.lengths,
+        args.widths,
+        args.cases,
+        per_bar_bars=args.per_bar_bars,
+        max_next_length=args.max_next_length,
+        include_indicators=not args.no_indicators,
+    )
+    report = json.dumps([asdict(result) for result in results], indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(report)
+    else:
+        print(report)
+
+    failures = [f"{r.case} (length={r.length}, width={r.width})" for r in results if r.parity is False]
+    for failure in failures:
+        print(f"[PARITY FAIL] {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())